@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+ONNX Export Script'i
+Embedding modelini ONNX'e (int8 quantize) aktarir ve PyTorch ciktisiyla karsilastirir
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Proje root'una path ekle
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.services.embedding_service import EmbeddingPipeline
+from src.services.onnx_encoder import OnnxEncoder
+
+SAMPLE_TEXTS = [
+    "EBOB ve EKOK ile ilgili bir problem",
+    "Bir ucgenin ic acilari toplami kac derecedir?",
+    "Ali'nin yasi, kardesinin yasinin 3 katindan 4 eksiktir. Kardesi 6 yasinda ise Ali kac yasindadir?",
+    "Uslu ifadeler: 2^5 x 2^3 islemi sonucunda elde edilen sayinin 4'e bolumunden kalan kactir?",
+    "Karekoklu ifadelerde toplama ve cikarma",
+]
+
+
+def _latency_ms(encode, text: str, repeats: int = 20) -> float:
+    encode(text)
+    start = time.perf_counter()
+    for _ in range(repeats):
+        encode(text)
+    return (time.perf_counter() - start) / repeats * 1000
+
+
+def main():
+    """Export et ve dogrula"""
+    parser = argparse.ArgumentParser(description="Embedding modelini ONNX'e aktar")
+    parser.add_argument(
+        "--model",
+        default=EmbeddingPipeline.TURKISH_MODELS[0],
+        help="SentenceTransformer modeli (varsayilan: birincil Turkce model)",
+    )
+    parser.add_argument("--output", default=None, help="Hedef dizin (varsayilan: EMBEDDING_ONNX_PATH altinda)")
+    parser.add_argument("--no-quantize", action="store_true", help="Sadece float32 model yaz")
+    parser.add_argument("--skip-check", action="store_true", help="PyTorch ile karsilastirmayi atla")
+    args = parser.parse_args()
+
+    output = Path(args.output) if args.output else OnnxEncoder.model_dir(args.model)
+    quantize = not args.no_quantize
+
+    print("=" * 60)
+    print(f"Model: {args.model}")
+    print(f"Hedef: {output}")
+    print("=" * 60)
+
+    OnnxEncoder.export(args.model, output, quantize=quantize)
+    if args.skip_check:
+        return 0
+
+    from sentence_transformers import SentenceTransformer
+
+    reference = SentenceTransformer(args.model, device="cpu")
+    expected = reference.encode(SAMPLE_TEXTS, normalize_embeddings=True)
+    torch_ms = _latency_ms(lambda t: reference.encode(t, normalize_embeddings=True), SAMPLE_TEXTS[2])
+    print(f"\nPyTorch: {torch_ms:.1f} ms/sorgu")
+
+    for quantized in ([False, True] if quantize else [False]):
+        model_file = OnnxEncoder.QUANTIZED_FILE if quantized else OnnxEncoder.MODEL_FILE
+        encoder = OnnxEncoder(output, quantized=quantized)
+        actual = encoder.encode(SAMPLE_TEXTS, normalize_embeddings=True)
+        cosine = (actual * expected).sum(axis=1)
+        ms = _latency_ms(lambda t: encoder.encode(t, normalize_embeddings=True), SAMPLE_TEXTS[2])
+        size_mb = (output / model_file).stat().st_size / 1024 / 1024
+        print(
+            f"{model_file}: {ms:.1f} ms/sorgu, {size_mb:.0f} MB, "
+            f"cosine min {cosine.min():.4f} / ort {cosine.mean():.4f}"
+        )
+        if cosine.min() < 0.98:
+            print("UYARI: PyTorch ciktisindan belirgin sapma var")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
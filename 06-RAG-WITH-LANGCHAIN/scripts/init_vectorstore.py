@@ -4,6 +4,7 @@ Vector Store Baslatma Script'i
 Soru CSV'sini yukleyip FAISS index olusturur
 """
 
+import argparse
 import sys
 from pathlib import Path
 
@@ -15,8 +16,29 @@ from src.config import settings
 from src.services.embedding_service import EmbeddingPipeline
 
 
+def parse_args():
+    """Komut satiri argumanlari"""
+    parser = argparse.ArgumentParser(description="FAISS vectorstore olustur/guncelle")
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Mevcut index'i sadece yeni/degisen satirlarla guncelle "
+        "(varsayilan: sifirdan olustur)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Encode process sayisi (0 = tum cekirdekler, "
+        "varsayilan: EMBEDDING_ENCODE_WORKERS)",
+    )
+    return parser.parse_args()
+
+
 def main():
     """Vectorstore baslat"""
+    args = parse_args()
+
     print("=" * 60)
     print("LGS RAG - Vectorstore Baslatma")
     print("=" * 60)
@@ -46,24 +68,60 @@ def main():
     print("\nEmbedding modeli yukleniyor...")
     pipeline = EmbeddingPipeline()
     pipeline.load_model()
-
-    # Sorulari yukle
-    print("\nSorular yukleniyor...")
-    texts, metadata = EmbeddingPipeline.load_questions_from_csv(str(csv_path))
-    print(f"Yuklendi: {len(texts)} soru")
-
-    # Embedding olustur
-    print("\nEmbedding'ler olusturuluyor...")
-    embeddings = pipeline.embed_batch(texts)
-    print(f"Embedding boyutu: {embeddings.shape}")
-
-    # Index olustur
-    print("\nFAISS index olusturuluyor...")
-    pipeline.build_index(embeddings, metadata)
-
-    # Kaydet
-    print("\nIndex kaydediliyor...")
-    pipeline.save_index()
+    if args.workers is not None:
+        pipeline.encode_workers = args.workers
+
+    if args.incremental and EmbeddingPipeline.index_exists():
+        # Artimli guncelleme: sadece fark embed edilir
+        print("\nMevcut index yukleniyor...")
+        pipeline.load_index()
+
+        print("\nCSV farki isleniyor...")
+        stats = pipeline.update_from_csv(str(csv_path))
+        print(
+            f"Eklenen: {stats['added']}, Silinen: {stats['removed']}, "
+            f"Degismeyen: {stats['unchanged']}, Toplam: {stats['total']}"
+        )
+
+        if stats["added"] or stats["removed"]:
+            print("\nYeni index nesli kaydediliyor...")
+            pipeline.save_index()
+        else:
+            print("\nDegisiklik yok, index ayni kaldi.")
+    else:
+        if args.incremental:
+            print("\nMevcut index bulunamadi, tam olusturma yapiliyor.")
+
+        # Sorulari yukle
+        print("\nSorular yukleniyor...")
+        texts, metadata = EmbeddingPipeline.load_questions_from_csv(str(csv_path))
+        print(f"Yuklendi: {len(texts)} soru")
+
+        # Embedding olustur (parca parca diske yazilir, bellekte tek kopya kalmaz)
+        print("\nEmbedding'ler olusturuluyor...")
+        embeddings_path = Path(settings.vector_store_path) / ".embeddings.tmp.npy"
+        embeddings_path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            embeddings = pipeline.embed_batch(texts, out_path=embeddings_path)
+            print(f"Embedding boyutu: {embeddings.shape}")
+
+            # Index olustur
+            print("\nFAISS index olusturuluyor...")
+            pipeline.build_index(embeddings, metadata)
+            if pipeline.compression.enabled:
+                report = pipeline.evaluate_compression(embeddings)
+                print(
+                    f"Sikistirma ({report['mode']}): {report['bytes_per_vector']} byte/vektor "
+                    f"(x{report['compression_ratio']}), recall@{report['k']}: {report['recall']} "
+                    f"(yeniden siralamasiz {report['recall_without_rerank']})"
+                )
+            del embeddings
+        finally:
+            embeddings_path.unlink(missing_ok=True)
+
+        # Kaydet
+        print("\nIndex kaydediliyor...")
+        pipeline.save_index()
 
     # Test
     print("\n" + "=" * 60)
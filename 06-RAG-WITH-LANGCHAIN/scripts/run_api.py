@@ -3,6 +3,7 @@
 API Sunucu Baslatma Script'i
 """
 
+import argparse
 import sys
 from pathlib import Path
 
@@ -16,18 +17,36 @@ from src.config import settings
 
 def main():
     """API sunucuyu baslat"""
+    parser = argparse.ArgumentParser(description="LGS RAG API sunucusu")
+    parser.add_argument("--host", default=settings.api_host, help="Dinlenecek adres")
+    parser.add_argument("--port", type=int, default=settings.api_port, help="Port")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker sayisi; verilirse model/index bir kez yuklenip worker'lar fork edilir",
+    )
+    args = parser.parse_args()
+
     print("=" * 60)
     print("LGS RAG API Sunucusu")
     print("=" * 60)
-    print(f"Host: {settings.api_host}")
-    print(f"Port: {settings.api_port}")
-    print(f"Docs: http://localhost:{settings.api_port}/docs")
+    print(f"Host: {args.host}")
+    print(f"Port: {args.port}")
+    print(f"Workers: {args.workers or 'reload (gelistirme)'}")
+    print(f"Docs: http://localhost:{args.port}/docs")
     print("=" * 60)
 
+    if args.workers:
+        from src.api.server import serve
+
+        serve(host=args.host, port=args.port, workers=args.workers)
+        return
+
     uvicorn.run(
         "src.api.main:app",
-        host=settings.api_host,
-        port=settings.api_port,
+        host=args.host,
+        port=args.port,
         reload=True,
         log_level=settings.log_level.lower(),
     )
@@ -35,4 +54,3 @@ def main():
 
 if __name__ == "__main__":
     main()
-
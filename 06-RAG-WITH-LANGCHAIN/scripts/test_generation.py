@@ -5,6 +5,7 @@ Manuel olarak soru uretimi test eder
 """
 
 import sys
+import argparse
 import asyncio
 import json
 from pathlib import Path
@@ -37,8 +38,7 @@ async def test_generation():
     pipeline.load_model()
 
     # Index yukle veya olustur
-    index_path = Path(settings.vector_store_path) / "faiss.index"
-    if index_path.exists():
+    if EmbeddingPipeline.index_exists():
         pipeline.load_index()
     else:
         print("   Index bulunamadi, once init_vectorstore.py calistirin!")
@@ -47,7 +47,7 @@ async def test_generation():
     set_embedding_pipeline(pipeline)
 
     # Filter service
-    filter_service = FilterService(list(pipeline.id_to_metadata.values()))
+    filter_service = FilterService.from_id_map(pipeline.id_to_metadata)
     print(f"   Filter service: {len(filter_service.all_metadata)} soru")
 
     # Retriever
@@ -112,8 +112,24 @@ async def test_generation():
     return 0
 
 
+def parse_args():
+    """Komut satiri argumanlari"""
+    parser = argparse.ArgumentParser(description="Manuel soru uretim testi")
+    parser.add_argument(
+        "--cache",
+        choices=["off", "on", "record", "replay"],
+        default=None,
+        help="LLM yanit cache modu (varsayilan: LLM_CACHE_MODE). "
+        "record ile kaydedilen calisma replay ile LLM'e gitmeden tekrarlanir",
+    )
+    return parser.parse_args()
+
+
 def main():
     """Ana fonksiyon"""
+    args = parse_args()
+    if args.cache:
+        settings.llm_cache_mode = args.cache
     return asyncio.run(test_generation())
 
 
@@ -6,10 +6,16 @@ LGS RAG Soru Uretim API'si
 from contextlib import asynccontextmanager
 from datetime import datetime
 from pathlib import Path
+from typing import Any, Callable, Literal, Optional
+import asyncio
 import json
+import multiprocessing
+import os
+import time
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 
 from ..config import settings
 from ..models.api_models import (
@@ -17,6 +23,7 @@ from ..models.api_models import (
     GenerateResponse,
     BatchGenerateRequest,
     BatchGenerateResponse,
+    JobSubmitRequest,
     HealthResponse,
     ErrorResponse,
 )
@@ -31,102 +38,340 @@ from ..services.retriever import QuestionRetriever
 from ..services.output_formatter import RAGOutputFormatter
 from ..services.prompt_builder import PromptBuilder
 from ..services.llm_client import LLMClientFactory
-from ..services.question_generator import QuestionGenerator, QuestionGenerationError
+from ..services.question_generator import (
+    BatchItemResult,
+    QuestionGenerator,
+    QuestionGenerationError,
+)
 from ..services.combination_selector import CombinationSelector
+from ..services.job_queue import GenerationJobQueue, JobStatus
 from ..services.diversity_service import DiversityService
+from ..services.semantic_dedup import SemanticDuplicateGuard
+from .readiness import ComponentUnavailable, Readiness
 
 
 # Global instances
 _generator: QuestionGenerator = None
 _selector: CombinationSelector = None
 _diversity: DiversityService = None
+_jobs: GenerationJobQueue = None
+_preloaded: Optional[tuple[EmbeddingPipeline, FilterService]] = None
+_readiness: Optional[Readiness] = None
 
+# Baslangicta yuklenen bilesenler (health ciktisindaki sira)
+COMPONENTS = ("search", "llm", "selector", "diversity", "generator", "jobs", "retrieval_cache")
 
-@asynccontextmanager
-async def lifespan(app: FastAPI):
+
+def load_search_stack(
+    mmap: bool = False, build_missing: bool = True
+) -> tuple[EmbeddingPipeline, FilterService]:
     """
-    Uygulama yasam dongusu
-    Baslangicta servisleri yukle
+    Embedding modeli, FAISS index, metadata ve FilterService'i yukle
+
+    Args:
+        mmap: FAISS index'i salt okunur mmap ile ac (prefork modunda
+            worker'lar ayni sayfalari paylasir)
+        build_missing: Index yoksa CSV'den olustur (False ise hata ver)
+
+    Returns:
+        (pipeline, filter_service)
+
+    Raises:
+        FileNotFoundError: Index yoksa ve build_missing False ise
     """
-    global _generator, _selector, _diversity
+    if not build_missing and not EmbeddingPipeline.index_exists():
+        raise FileNotFoundError(
+            f"Index bulunamadi: {settings.vector_store_path} "
+            "(once scripts/init_vectorstore.py calistirin)"
+        )
 
-    print("Servisler baslatiliyor...")
+    pipeline = EmbeddingPipeline()
+    pipeline.load_model()
+
+    # Index mevcut mu kontrol et
+    if EmbeddingPipeline.index_exists():
+        pipeline.load_index(mmap=mmap)
+    else:
+        _build_index(pipeline)
+
+    # Filter service
+    filter_service = FilterService.from_id_map(pipeline.id_to_metadata)
+    return pipeline, filter_service
+
+
+def _build_index(pipeline: EmbeddingPipeline):
+    """Soru CSV'sinden index olustur ve kaydet (model yuklenmis olmali)"""
+    csv_path = settings.questions_csv_path
+    if not Path(csv_path).exists():
+        # Varsayilan yol dene
+        # From src/api/main.py: parent -> api/, parent -> src/, parent -> 06-RAG-WITH-LANGCHAIN/, parent -> workspace root
+        csv_path = Path(__file__).parent.parent.parent.parent / "lgs-model" / "data" / "processed" / "dataset_ocr_li.csv"
+
+    print(f"Index bulunamadi, yeni olusturuluyor: {csv_path}")
+    texts, metadata = EmbeddingPipeline.load_questions_from_csv(str(csv_path))
+    embeddings = pipeline.embed_batch(texts)
+    pipeline.build_index(embeddings, metadata)
+    pipeline.save_index()
+
+
+def build_search_index():
+    """Modeli yukleyip index'i olustur (preload'un tek seferlik child process'i)"""
+    pipeline = EmbeddingPipeline()
+    pipeline.load_model()
+    _build_index(pipeline)
+
+
+def _build_index_in_child():
+    """
+    Eksik index'i ayri bir process'te olustur ve bitmesini bekle
+
+    Inference (tokenizer/OpenMP thread havuzlari) sadece child'da calisir;
+    parent fork oncesi temiz kalir.
+
+    Raises:
+        RuntimeError: Child basarisiz olduysa veya index yazilmadiysa
+    """
+    context = multiprocessing.get_context("fork" if hasattr(os, "fork") else "spawn")
+    process = context.Process(target=build_search_index, name="index-build")
+    process.start()
+    process.join()
+    if process.exitcode != 0 or not EmbeddingPipeline.index_exists():
+        raise RuntimeError(f"Index olusturulamadi (child cikis kodu {process.exitcode})")
+
+
+def preload():
+    """
+    Agir artifact'lari worker'lar fork edilmeden once yukle (bkz. api/server.py)
+
+    Fork sonrasi model agirliklari copy-on-write ile, mmap'li index ve
+    metadata page cache uzerinden paylasilir; her worker'in lifespan'i
+    bunlari tekrar yuklemez. Parent fork oncesi inference yapmamalidir
+    (tokenizer/OpenMP thread havuzlari fork sonrasi kilitlenebilir); eksik
+    index bu yuzden tek seferlik bir child process'te olusturulur.
+
+    Raises:
+        RuntimeError: Eksik index olusturulamadiysa
+    """
+    global _preloaded
+    if not EmbeddingPipeline.index_exists():
+        _build_index_in_child()
+    _preloaded = load_search_stack(mmap=True, build_missing=False)
+
+
+def _load_selector() -> CombinationSelector:
+    """Combination selector (configs.json varsa onu kullan, yoksa mock)"""
+    config_path = Path(settings.configs_path)
+    if config_path.exists():
+        try:
+            with open(config_path, "r", encoding="utf-8") as f:
+                config_data = json.load(f)
+            config = ConfigSchema(**config_data)
+            print(f"Config yuklendi: {config_path}")
+        except Exception as e:
+            print(f"Config dosyasi okunamadi, mock config kullaniliyor: {e}")
+            config = ConfigSchema.create_mock()
+    else:
+        print(f"Config dosyasi bulunamadi, mock config kullaniliyor: {config_path}")
+        config = ConfigSchema.create_mock()
+
+    return CombinationSelector(config)
+
+
+def _create_llm_client():
+    """LLM Client (cache'i temizle, sonra yeni instance olustur)"""
+    LLMClientFactory.clear_cache()
+    return LLMClientFactory.create()
+
+
+def _create_diversity() -> DiversityService:
+    """Diversity service (tekrar gecmisi; yol verilirse worker'lar arasi paylasimli)"""
+    return DiversityService(
+        max_history=settings.diversity_max_history,
+        duplicate_threshold=settings.diversity_duplicate_threshold,
+        num_perm=settings.diversity_num_perm,
+        shingle_size=settings.diversity_shingle_size,
+        history_path=settings.diversity_history_path,
+    )
+
+
+def _build_generator(pipeline: EmbeddingPipeline, retriever: QuestionRetriever, llm_client) -> QuestionGenerator:
+    """Generator (semantik tekrar kontrolu acik ve yerel encoder varsa guard ile)"""
+    duplicate_guard = None
+    if settings.semantic_dedup_enabled and pipeline.model is None:
+        # OpenAI embedding'de yerel encoder yok (retrieval sadece filtre ile)
+        print("Semantik tekrar kontrolu devre disi: yerel embedding modeli yok")
+    elif settings.semantic_dedup_enabled:
+        duplicate_guard = SemanticDuplicateGuard(
+            pipeline,
+            threshold=settings.semantic_duplicate_threshold,
+            max_history=settings.semantic_dedup_history,
+        )
+
+    return QuestionGenerator(
+        retriever=retriever,
+        formatter=RAGOutputFormatter(format_type="markdown"),
+        prompt_builder=PromptBuilder(),
+        llm_client=llm_client,
+        duplicate_guard=duplicate_guard,
+    )
+
+
+def _start_jobs(generator: QuestionGenerator) -> GenerationJobQueue:
+    """Arka plan uretim isleri (yarim kalan isler kaldigi yerden devam eder)"""
+    jobs = GenerationJobQueue()
+    jobs.start(generator)
+    return jobs
+
+
+async def _initialize(readiness: Readiness):
+    """
+    Servisleri arka planda asamali yukle
+
+    1. Birbirinden bagimsiz bilesenler eszamanli: search (model + index +
+       filtre), llm, selector, diversity
+    2. generator: search ve llm'e baglidir; 1. asamanin tamami bittikten
+       sonra hazir olur, boylece generator'u bekleyen istekler selector ve
+       diversity'yi de yuklenmis bulur
+    3. jobs ve retrieval_cache (cache isinmasi istekler sunulurken surer)
+    """
+    global _generator, _selector, _diversity, _jobs
+
+    def _search():
+        # Prefork modunda parent'tan miras
+        if _preloaded is not None:
+            return _preloaded
+        return load_search_stack()
+
+    search, llm_client, selector, diversity = await asyncio.gather(
+        readiness.load("search", _search),
+        readiness.load("llm", _create_llm_client),
+        readiness.load("selector", _load_selector),
+        readiness.load("diversity", _create_diversity),
+        return_exceptions=True,
+    )
+
+    if not isinstance(selector, BaseException):
+        _selector = selector
+    # Kalici gecmis acilamazsa bellek ici gecmisle devam et
+    _diversity = diversity if not isinstance(diversity, BaseException) else DiversityService()
+
+    missing = [
+        name for name, value in (("search", search), ("llm", llm_client))
+        if isinstance(value, BaseException)
+    ]
+    if missing:
+        for name in ("generator", "jobs", "retrieval_cache"):
+            readiness.fail(name, f"bagimlilik yuklenemedi: {', '.join(missing)}")
+        return
+
+    pipeline, filter_service = search
+    set_embedding_pipeline(pipeline)
+    retriever = QuestionRetriever(pipeline, filter_service)
 
     try:
-        # Embedding pipeline
-        csv_path = settings.questions_csv_path
-        if not Path(csv_path).exists():
-            # Varsayilan yol dene
-            # From src/api/main.py: parent -> api/, parent -> src/, parent -> 06-RAG-WITH-LANGCHAIN/, parent -> workspace root
-            csv_path = Path(__file__).parent.parent.parent.parent / "lgs-model" / "data" / "processed" / "dataset_ocr_li.csv"
-
-        pipeline = EmbeddingPipeline()
-        pipeline.load_model()
-
-        # Index mevcut mu kontrol et
-        index_path = Path(settings.vector_store_path) / "faiss.index"
-        if index_path.exists():
-            pipeline.load_index()
-        else:
-            print(f"Index bulunamadi, yeni olusturuluyor: {csv_path}")
-            texts, metadata = EmbeddingPipeline.load_questions_from_csv(str(csv_path))
-            embeddings = pipeline.embed_batch(texts)
-            pipeline.build_index(embeddings, metadata)
-            pipeline.save_index()
-
-        set_embedding_pipeline(pipeline)
-
-        # Filter service
-        filter_service = FilterService(list(pipeline.id_to_metadata.values()))
-
-        # Retriever
-        retriever = QuestionRetriever(pipeline, filter_service)
-
-        # LLM Client (cache'i temizle, sonra yeni instance olustur)
-        LLMClientFactory.clear_cache()
-        llm_client = LLMClientFactory.create()
-
-        # Generator
-        _generator = QuestionGenerator(
-            retriever=retriever,
-            formatter=RAGOutputFormatter(format_type="markdown"),
-            prompt_builder=PromptBuilder(),
-            llm_client=llm_client,
+        _generator = await readiness.load(
+            "generator", _build_generator, pipeline, retriever, llm_client, blocking=False
         )
+    except Exception:
+        readiness.fail("jobs", "bagimlilik yuklenemedi: generator")
+        readiness.fail("retrieval_cache", "bagimlilik yuklenemedi: generator")
+        return
 
-        # Combination selector (configs.json varsa onu kullan, yoksa mock)
-        config_path = Path(settings.configs_path)
-        if config_path.exists():
-            try:
-                with open(config_path, "r", encoding="utf-8") as f:
-                    config_data = json.load(f)
-                config = ConfigSchema(**config_data)
-                print(f"Config yuklendi: {config_path}")
-            except Exception as e:
-                print(f"Config dosyasi okunamadi, mock config kullaniliyor: {e}")
-                config = ConfigSchema.create_mock()
-        else:
-            print(f"Config dosyasi bulunamadi, mock config kullaniliyor: {config_path}")
-            config = ConfigSchema.create_mock()
+    try:
+        _jobs = await readiness.load("jobs", _start_jobs, _generator, blocking=False)
+    except Exception:
+        pass
+
+    # Tum kombinasyonlarin retrieval sonuclarini onceden hesapla
+    if _selector is None:
+        readiness.fail("retrieval_cache", "bagimlilik yuklenemedi: selector")
+        return
+    try:
+        cached = await readiness.load(
+            "retrieval_cache",
+            retriever.warm_cache,
+            [c.model_dump() for c in _selector.combinations],
+        )
+        print(f"Retrieval cache hazir: {cached} kombinasyon")
+    except Exception:
+        pass
 
-        _selector = CombinationSelector(config)
 
-        # Diversity service
-        _diversity = DiversityService()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Uygulama yasam dongusu
 
-        print("Servisler hazir!")
+    Servisler arka planda yuklenir; port hemen acilir. Durum
+    /api/v1/health'ten izlenir, istekler ihtiyac duydugu bilesen hazir
+    olana kadar bekler (STARTUP_WAIT_TIMEOUT).
+    """
+    global _readiness
 
-    except Exception as e:
-        print(f"Servis baslatma hatasi: {e}")
-        # Mock modda calis
-        _generator = None
-        _selector = None
-        _diversity = DiversityService()
+    print("Servisler baslatiliyor...")
+    _readiness = Readiness(COMPONENTS)
+    startup = asyncio.create_task(_initialize(_readiness))
 
     yield
 
     # Cleanup
     print("Servisler kapatiliyor...")
+    if not startup.done():
+        startup.cancel()
+    await asyncio.gather(startup, return_exceptions=True)
+    if _jobs is not None:
+        await _jobs.stop()
+        _jobs.close()
+    if _diversity is not None:
+        _diversity.close()
+
+
+def get_generator() -> Optional[QuestionGenerator]:
+    """Yuklenmis generator (henuz hazir degilse None)"""
+    return _generator
+
+
+def get_selector() -> Optional[CombinationSelector]:
+    """Yuklenmis combination selector (henuz hazir degilse None)"""
+    return _selector
+
+
+def get_jobs() -> Optional[GenerationJobQueue]:
+    """Yuklenmis is kuyrugu (henuz hazir degilse None)"""
+    return _jobs
+
+
+async def _await_component(name: str, getter: Callable[[], Any], required: bool = True):
+    """
+    Bileseni getir; baslangic suruyorsa hazir olmasini bekle
+
+    Args:
+        name: Readiness bilesen adi
+        getter: Bileseni donduren fonksiyon (None = hazir degil)
+        required: Hazir olmazsa 503 firlat (False ise None doner)
+
+    Raises:
+        HTTPException: 503 (required ve bilesen hazir degil)
+    """
+    component = getter()
+    if component is not None:
+        return component
+
+    reason = "servis baslatilmadi"
+    if _readiness is not None:
+        try:
+            await _readiness.wait(name, timeout=settings.startup_wait_timeout)
+            component = getter()
+        except ComponentUnavailable as e:
+            reason = e.reason
+
+    if component is None and required:
+        raise HTTPException(
+            status_code=503,
+            detail=f"Servis hazir degil ({name}: {reason})",
+            headers={"Retry-After": "5"},
+        )
+    return component
 
 
 # FastAPI app
@@ -161,19 +406,39 @@ async def root():
 async def health_check():
     """
     Sistem saglik kontrolu
+
+    status: starting (yukleme suruyor), healthy veya degraded (en az bir
+    bilesen yuklenemedi). Bilesen basina durum ve yukleme suresi doner.
     """
+    if _readiness is None:
+        return HealthResponse(
+            status="starting",
+            version="1.0.0",
+            timestamp=datetime.now(),
+            components={name: {"status": "pending"} for name in COMPONENTS},
+        )
+
     return HealthResponse(
-        status="healthy" if _generator else "degraded",
+        status=_readiness.status,
         version="1.0.0",
         timestamp=datetime.now(),
-        components={
-            "generator": "ready" if _generator else "not_initialized",
-            "selector": "ready" if _selector else "not_initialized",
-            "diversity": "ready",
-        },
+        components=_readiness.snapshot(),
     )
 
 
+@app.get("/api/v1/ready", tags=["System"])
+async def readiness_check():
+    """
+    Hazirlik kontrolu (load balancer / readiness probe)
+
+    Soru uretimi hazirsa 200, degilse 503 doner.
+    """
+    ready = _readiness is not None and _readiness.is_ready("generator")
+    if not ready:
+        raise HTTPException(status_code=503, detail="Servis hazir degil")
+    return {"ready": True}
+
+
 @app.post("/api/v1/generate", response_model=GenerateResponse, tags=["Generation"])
 async def generate_question(request: GenerateRequest):
     """
@@ -182,12 +447,9 @@ async def generate_question(request: GenerateRequest):
     - **filters**: Kombinasyon filtreleri (opsiyonel)
     - **specific_combination**: Spesifik kombinasyon (opsiyonel)
     - **style_instruction**: Stil talimati (opsiyonel)
+    - **hedge_candidates**: Paralel aday sayisi (opsiyonel, spekulatif uretim)
     """
-    if _generator is None:
-        raise HTTPException(
-            status_code=503,
-            detail="Soru uretim servisi hazir degil",
-        )
+    generator = await _await_component("generator", get_generator)
 
     try:
         # Kombinasyon sec
@@ -213,15 +475,51 @@ async def generate_question(request: GenerateRequest):
         if not style and _diversity:
             style = _diversity.get_random_style()
 
-        # Uret
-        question = await _generator.generate_question(
-            combination=combination,
-            style_instruction=style,
-        )
+        # Uret: tekrar eden aday reddedilir (tek aday yeniden uretilir,
+        # paralel adaylarda ilk gecerli ve tekrar etmeyen kazanir)
+        guard = generator.duplicate_guard
+
+        async def _accept(q) -> bool:
+            text = f"{q.hikaye} {q.soru}"
+            # MinHash + (paylasimli gecmiste) SQLite sorgusu event loop'u bloklamasin
+            if _diversity and await asyncio.to_thread(_diversity.is_duplicate, text):
+                return False
+            if guard is None:
+                return True
+            # Encode + FAISS aramasi event loop'u bloklamasin; gecmise sadece
+            # kazanan aday eklenir (asagida)
+            try:
+                return not await asyncio.to_thread(guard.is_duplicate, text, False)
+            except Exception as e:
+                # Embedding hatasi uretimi durdurmasin: tekrar degil say
+                print(f"Semantik tekrar kontrolu atlandi: {e}")
+                return True
+
+        candidates = request.hedge_candidates or settings.generation_hedge_candidates
+        if candidates > 1:
+            question = await generator.generate_question_hedged(
+                combination=combination,
+                style_instruction=style,
+                candidates=candidates,
+                accept=_accept,
+            )
+        else:
+            question = await generator.generate_question(
+                combination=combination,
+                style_instruction=style,
+                max_attempts=settings.max_generation_attempts,
+                accept=_accept,
+            )
 
         # Tekrar takibi
+        text = f"{question.hikaye} {question.soru}"
+        if guard is not None:
+            try:
+                await asyncio.to_thread(guard.record, [text])
+            except Exception as e:
+                print(f"Semantik tekrar gecmisine eklenemedi: {e}")
         if _diversity:
-            _diversity.add_to_history(f"{question.hikaye} {question.soru}")
+            await asyncio.to_thread(_diversity.add_to_history, text)
 
         return GenerateResponse(
             success=True,
@@ -243,6 +541,91 @@ async def generate_question(request: GenerateRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _prepare_batch(
+    request: BatchGenerateRequest | JobSubmitRequest,
+    fill: bool = False,
+) -> tuple[list[dict], list[Optional[str]]]:
+    """
+    Toplu uretim icin kombinasyonlari ve stilleri sec
+
+    Args:
+        request: Toplu uretim istegi
+        fill: Cesitlilikte kombinasyonlar tukenirse yeni turla count'a tamamla
+
+    Returns:
+        (combinations, styles) - ayni uzunlukta listeler
+    """
+    # Kombinasyonlari sec
+    if _selector:
+        filters = None
+        if request.filters:
+            filters = CombinationFilters(**request.filters.model_dump())
+        combinations = []
+        while len(combinations) < request.count:
+            selected = _selector.select_multiple(
+                count=request.count - len(combinations),
+                filters=filters,
+                ensure_diversity=request.ensure_diversity,
+            )
+            combinations.extend(selected)
+            if not fill or not selected:
+                break
+    else:
+        # Default kombinasyonlar
+        combinations = [
+            {"alt_konu": "ebob_ekok", "zorluk": 3, "gorsel_tipi": "yok"}
+            for _ in range(request.count)
+        ]
+
+    combinations = [
+        combo.model_dump() if hasattr(combo, "model_dump") else combo
+        for combo in combinations
+    ]
+
+    # Stiller sirayla secilir, uretim eszamanli calisir
+    styles = [
+        _diversity.get_random_style()
+        if request.ensure_diversity and _diversity
+        else None
+        for _ in combinations
+    ]
+
+    return combinations, styles
+
+
+def _count_unfilled(stats: dict, requested: int) -> dict:
+    """
+    Kombinasyon secilemeyen kalemleri basarisiz say
+
+    Filtre veya cesitlilik nedeniyle count'tan az kombinasyon secilirse
+    eksik kalemler NoCombinationAvailable hatasiyla failed'a eklenir;
+    boylece her zaman requested = generated + failed olur.
+
+    Args:
+        stats: generated/failed/errors_by_type iceren istatistik
+        requested: Istenen soru sayisi
+
+    Returns:
+        Guncellenmis stats
+    """
+    unfilled = requested - stats["generated"] - stats["failed"]
+    if unfilled > 0:
+        stats["failed"] += unfilled
+        stats["errors_by_type"]["NoCombinationAvailable"] = unfilled
+    stats["requested"] = requested
+    return stats
+
+
+def _failure_record(item: BatchItemResult) -> dict:
+    """Basarisiz kalemi JSON'a uygun dict'e cevir"""
+    return {
+        "index": item.index,
+        "combination": item.combination,
+        "error": item.error,
+        "error_type": item.error_type,
+    }
+
+
 @app.post("/api/v1/generate/batch", response_model=BatchGenerateResponse, tags=["Generation"])
 async def generate_batch(request: BatchGenerateRequest):
     """
@@ -252,59 +635,25 @@ async def generate_batch(request: BatchGenerateRequest):
     - **filters**: Kombinasyon filtreleri (opsiyonel)
     - **ensure_diversity**: Cesitlilik garantisi
     """
-    if _generator is None:
-        raise HTTPException(
-            status_code=503,
-            detail="Soru uretim servisi hazir degil",
-        )
+    generator = await _await_component("generator", get_generator)
 
     try:
-        questions = []
-        failed = 0
+        combinations, styles = _prepare_batch(request)
 
-        # Kombinasyonlari sec
-        if _selector:
-            filters = None
-            if request.filters:
-                filters = CombinationFilters(**request.filters.model_dump())
-            combinations = _selector.select_multiple(
-                count=request.count,
-                filters=filters,
-                ensure_diversity=request.ensure_diversity,
-            )
-        else:
-            # Default kombinasyonlar
-            combinations = [
-                {"alt_konu": "ebob_ekok", "zorluk": 3, "gorsel_tipi": "yok"}
-                for _ in range(request.count)
-            ]
-
-        # Her kombinasyon icin uret
-        for combo in combinations:
-            try:
-                style = None
-                if request.ensure_diversity and _diversity:
-                    style = _diversity.get_random_style()
-
-                question = await _generator.generate_question(
-                    combination=combo.model_dump() if hasattr(combo, "model_dump") else combo,
-                    style_instruction=style,
-                )
-                questions.append(question.model_dump())
+        result = await generator.generate_batch_detailed(
+            combinations,
+            ensure_diversity=False,
+            styles=styles,
+        )
 
-            except Exception as e:
-                print(f"Uretim hatasi: {e}")
-                failed += 1
+        stats = _count_unfilled(result.stats(), request.count)
 
         return BatchGenerateResponse(
             success=True,
             data={
-                "questions": questions,
-                "stats": {
-                    "requested": request.count,
-                    "generated": len(questions),
-                    "failed": failed,
-                },
+                "questions": [q.model_dump() for q in result.questions],
+                "failures": [_failure_record(item) for item in result.failures],
+                "stats": stats,
             },
         )
 
@@ -312,19 +661,192 @@ async def generate_batch(request: BatchGenerateRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/api/v1/generate/batch/stream", tags=["Generation"])
+async def generate_batch_stream(
+    request: BatchGenerateRequest,
+    stream_format: Literal["ndjson", "sse"] = Query("ndjson", alias="format"),
+):
+    """
+    Akisli toplu soru uretimi
+
+    Her soru validasyondan gecer gecmez gonderilir; sonunda istatistik
+    kaydi gelir. Sunucu uretilen sorulari bellekte biriktirmez.
+
+    Kayit tipleri:
+    - **question**: {"type", "index", "data"}
+    - **failure**: {"type", "index", "combination", "error", "error_type"}
+    - **stats**: {"type", requested, generated, failed, errors_by_type, elapsed_seconds}
+      (secilemeyen kombinasyonlar NoCombinationAvailable olarak failed'a eklenir)
+
+    - **format**: "ndjson" (satir basina JSON) veya "sse" (server-sent events)
+    """
+    generator = await _await_component("generator", get_generator)
+
+    try:
+        combinations, styles = _prepare_batch(request)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    jobs = generator.build_jobs(combinations, ensure_diversity=False, styles=styles)
+
+    def encode(record: dict) -> str:
+        payload = json.dumps(record, ensure_ascii=False)
+        if stream_format == "sse":
+            return f"event: {record['type']}\ndata: {payload}\n\n"
+        return payload + "\n"
+
+    async def records():
+        started = time.perf_counter()
+        generated = 0
+        errors_by_type: dict[str, int] = {}
+
+        async for item in generator.iter_batch(jobs):
+            if item.ok:
+                generated += 1
+                yield encode({
+                    "type": "question",
+                    "index": item.index,
+                    "data": item.question.model_dump(mode="json"),
+                })
+            else:
+                errors_by_type[item.error_type] = errors_by_type.get(item.error_type, 0) + 1
+                yield encode({"type": "failure", **_failure_record(item)})
+
+        yield encode(_count_unfilled({
+            "type": "stats",
+            "requested": request.count,
+            "generated": generated,
+            "failed": len(jobs) - generated,
+            "errors_by_type": errors_by_type,
+            "elapsed_seconds": round(time.perf_counter() - started, 3),
+        }, request.count))
+
+    media_type = "text/event-stream" if stream_format == "sse" else "application/x-ndjson"
+    return StreamingResponse(records(), media_type=media_type)
+
+
+@app.post("/api/v1/jobs", status_code=202, tags=["Jobs"])
+async def submit_job(request: JobSubmitRequest):
+    """
+    Arka plan uretim isi olustur
+
+    Is hemen kuyruga alinir ve kimligi doner; ilerleme
+    /api/v1/jobs/{job_id} ile izlenir, sonuclar sayfa sayfa alinir.
+
+    - **count**: Uretilecek soru sayisi (1-JOB_MAX_COUNT)
+    - **filters**: Kombinasyon filtreleri (opsiyonel)
+    - **ensure_diversity**: Cesitlilik garantisi
+    - **max_attempts**: Kalem basina maksimum deneme
+    """
+    generator = await _await_component("generator", get_generator)
+    jobs_queue = await _await_component("jobs", get_jobs)
+    if request.count > settings.job_max_count:
+        raise HTTPException(
+            status_code=422,
+            detail=f"count en fazla {settings.job_max_count} olabilir",
+        )
+
+    combinations, styles = _prepare_batch(request, fill=True)
+    jobs = generator.build_jobs(combinations, ensure_diversity=False, styles=styles)
+    job_id = jobs_queue.submit(jobs, params=request.model_dump(mode="json"))
+
+    return {"job_id": job_id, "status": JobStatus.QUEUED, "total": len(jobs)}
+
+
+async def _get_job_or_404(job_id: str) -> dict:
+    """Is durumunu getir, yoksa 404 (kuyruk yukleniyorsa bekler)"""
+    jobs_queue = await _await_component("jobs", get_jobs)
+    job = jobs_queue.get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Is bulunamadi: {job_id}")
+    return job
+
+
+@app.get("/api/v1/jobs", tags=["Jobs"])
+async def list_jobs(limit: int = Query(20, ge=1, le=100)):
+    """
+    Son isleri listele
+    """
+    jobs_queue = await _await_component("jobs", get_jobs)
+    return {"jobs": jobs_queue.list_jobs(limit=limit)}
+
+
+@app.get("/api/v1/jobs/{job_id}", tags=["Jobs"])
+async def get_job(job_id: str):
+    """
+    Is durumu ve ilerlemesi
+    """
+    return await _get_job_or_404(job_id)
+
+
+@app.get("/api/v1/jobs/{job_id}/events", tags=["Jobs"])
+async def stream_job_progress(job_id: str):
+    """
+    Is ilerlemesini NDJSON olarak akit (is bitince akis kapanir)
+    """
+    await _get_job_or_404(job_id)
+
+    async def records():
+        async for state in _jobs.iter_progress(job_id):
+            yield json.dumps(state, ensure_ascii=False) + "\n"
+
+    return StreamingResponse(records(), media_type="application/x-ndjson")
+
+
+@app.get("/api/v1/jobs/{job_id}/results", tags=["Jobs"])
+async def get_job_results(
+    job_id: str,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=500),
+    include_failures: bool = False,
+):
+    """
+    Tamamlanan sorulari sayfa sayfa getir
+
+    - **offset** / **limit**: Sayfalama
+    - **include_failures**: Basarisiz kalemleri de dondur
+    """
+    job = await _get_job_or_404(job_id)
+    items = _jobs.get_results(
+        job_id,
+        offset=offset,
+        limit=limit,
+        include_failures=include_failures,
+    )
+
+    return {
+        "job_id": job_id,
+        "status": job["status"],
+        "offset": offset,
+        "limit": limit,
+        "total": job["completed"] + (job["failed"] if include_failures else 0),
+        "items": items,
+    }
+
+
+@app.delete("/api/v1/jobs/{job_id}", tags=["Jobs"])
+async def cancel_job(job_id: str):
+    """
+    Isi iptal et (tamamlanan sorular korunur)
+    """
+    await _get_job_or_404(job_id)
+    return {"job_id": job_id, "cancelled": _jobs.cancel(job_id)}
+
+
 @app.get("/api/v1/combinations", tags=["Combinations"])
 async def list_combinations():
     """
     Mevcut kombinasyonlari listele
     """
-    if _selector is None:
+    selector = await _await_component("selector", get_selector, required=False)
+    if selector is None:
         return {
             "message": "Kombinasyon secici hazir degil",
             "combinations": [],
         }
 
-    combinations = [c.model_dump() for c in _selector.combinations]
-    stats = _selector.get_statistics()
+    combinations = [c.model_dump() for c in selector.combinations]
+    stats = selector.get_statistics()
 
     return {
         "total": len(combinations),
@@ -338,9 +860,12 @@ async def get_stats():
     """
     Sistem istatistikleri
     """
+    usage = getattr(_generator.llm, "usage", None) if _generator else None
     stats = {
         "diversity": _diversity.get_stats() if _diversity else None,
         "selector": _selector.get_statistics() if _selector else None,
+        # Provider'in raporladigi cache'li/cache'siz token sayilari
+        "llm_usage": usage.to_dict() if usage is not None else None,
     }
 
     return stats
@@ -0,0 +1,150 @@
+"""
+Bilesen Hazirlik Takibi
+Arka planda yuklenen servislerin durumu, yukleme sureleri ve hazirlik beklemesi
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Optional
+
+
+class ComponentUnavailable(Exception):
+    """Bilesen yuklenemedi veya bekleme suresi doldu"""
+
+    def __init__(self, name: str, reason: str):
+        self.name = name
+        self.reason = reason
+        super().__init__(f"{name} hazir degil: {reason}")
+
+
+@dataclass
+class ComponentState:
+    """Tek bilesenin yukleme durumu"""
+
+    name: str
+    status: str = "pending"  # pending | loading | ready | failed
+    started_at: Optional[float] = None
+    seconds: Optional[float] = None
+    error: Optional[str] = None
+
+    @property
+    def settled(self) -> bool:
+        return self.status in ("ready", "failed")
+
+    def to_dict(self) -> dict:
+        return {
+            "status": self.status,
+            "seconds": round(self.seconds, 3) if self.seconds is not None else None,
+            "error": self.error,
+        }
+
+
+class Readiness:
+    """
+    Baslangic bilesenlerinin hazirlik kaydi
+
+    Her bilesen load() ile yuklenir; durum (pending -> loading -> ready/failed)
+    ve sure kaydedilir. wait() bilesen hazir olana kadar (timeout ile) bekler,
+    boylece istekler baslangic sirasinda hemen 503 almak yerine yuklemenin
+    bitmesini bekler.
+    """
+
+    def __init__(self, names: Iterable[str]):
+        """
+        Args:
+            names: Takip edilecek bilesen adlari (health ciktisindaki sira)
+        """
+        self.started_at = time.perf_counter()
+        self.components = {name: ComponentState(name) for name in names}
+        self._events = {name: asyncio.Event() for name in self.components}
+
+    async def load(
+        self,
+        name: str,
+        fn: Callable[..., Any],
+        *args,
+        blocking: bool = True,
+        **kwargs,
+    ) -> Any:
+        """
+        Bileseni yukle ve durumunu kaydet
+
+        Args:
+            name: Bilesen adi
+            fn: Yukleyici fonksiyon
+            blocking: True ise fn thread'de calisir (event loop'u bloklamaz);
+                event loop gerektiren yukleyiciler icin False
+            *args, **kwargs: fn argumanlari
+
+        Returns:
+            fn sonucu
+
+        Raises:
+            fn'in firlattigi hata (durum 'failed' olarak kaydedilir)
+        """
+        state = self.components[name]
+        state.status = "loading"
+        state.started_at = time.perf_counter()
+        try:
+            if blocking:
+                result = await asyncio.to_thread(fn, *args, **kwargs)
+            else:
+                result = fn(*args, **kwargs)
+        except Exception as e:
+            self.fail(name, str(e) or type(e).__name__)
+            raise
+
+        state.seconds = time.perf_counter() - state.started_at
+        state.status = "ready"
+        self._events[name].set()
+        print(f"Bilesen hazir: {name} ({state.seconds:.2f}s)")
+        return result
+
+    def fail(self, name: str, reason: str):
+        """Bileseni basarisiz olarak isaretle (bekleyenler hemen hata alir)"""
+        state = self.components[name]
+        if state.started_at is not None:
+            state.seconds = time.perf_counter() - state.started_at
+        state.status = "failed"
+        state.error = reason
+        self._events[name].set()
+        print(f"Bilesen yuklenemedi: {name} ({reason})")
+
+    def is_ready(self, name: str) -> bool:
+        return self.components[name].status == "ready"
+
+    async def wait(self, name: str, timeout: Optional[float] = None):
+        """
+        Bilesen hazir olana kadar bekle
+
+        Args:
+            name: Bilesen adi
+            timeout: Maksimum bekleme (saniye, None = suresiz)
+
+        Raises:
+            ComponentUnavailable: Bilesen yuklenemedi veya sure doldu
+        """
+        state = self.components[name]
+        if not state.settled:
+            try:
+                await asyncio.wait_for(self._events[name].wait(), timeout)
+            except asyncio.TimeoutError:
+                raise ComponentUnavailable(name, f"{timeout:g}s icinde yuklenmedi ({state.status})")
+
+        if state.status == "failed":
+            raise ComponentUnavailable(name, state.error or "yuklenemedi")
+
+    @property
+    def status(self) -> str:
+        """starting (yukleme suruyor), healthy veya degraded (en az bir hata)"""
+        states = self.components.values()
+        if any(state.status == "failed" for state in states):
+            return "degraded"
+        if all(state.status == "ready" for state in states):
+            return "healthy"
+        return "starting"
+
+    def snapshot(self) -> dict:
+        """Bilesen durumlari ve sureleri"""
+        return {name: state.to_dict() for name, state in self.components.items()}
@@ -0,0 +1,142 @@
+"""
+Prefork API Sunucusu
+Model ve index'i parent process'te bir kez yukleyip uvicorn worker'larini fork eder
+"""
+
+import gc
+import os
+import signal
+import socket
+import time
+from typing import Optional
+
+import uvicorn
+
+from ..config import settings
+from . import main
+
+
+def _bind(host: str, port: int) -> socket.socket:
+    """Tum worker'larin paylasacagi dinleme soketi"""
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.set_inheritable(True)
+    return sock
+
+
+def _run_worker(sock: socket.socket, log_level: str):
+    """Child process: uvicorn'u miras alinan soket uzerinde calistir"""
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+
+    config = uvicorn.Config(main.app, log_level=log_level)
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+def _spawn(sock: socket.socket, log_level: str) -> int:
+    """Yeni worker fork et"""
+    pid = os.fork()
+    if pid == 0:
+        code = 0
+        try:
+            _run_worker(sock, log_level)
+        except BaseException as e:
+            print(f"Worker hatasi ({os.getpid()}): {e}")
+            code = 1
+        finally:
+            os._exit(code)
+    return pid
+
+
+def serve(
+    host: Optional[str] = None,
+    port: Optional[int] = None,
+    workers: Optional[int] = None,
+    log_level: Optional[str] = None,
+    preload: Optional[bool] = None,
+):
+    """
+    API sunucusunu baslat
+
+    uvicorn'un kendi --workers modu her worker'i spawn ile bastan baslatir;
+    her biri modeli ve index'i ayri ayri yukler. Burada parent process
+    main.preload() ile embedding modelini, FAISS index'i (mmap) ve metadata
+    deposunu (mmap) bir kez yukler, sonra worker'lari fork eder. Model
+    agirliklari copy-on-write ile, index ve metadata page cache uzerinden
+    paylasilir; worker basina ek bellek sadece LLM client, kuyruk ve
+    cache'ler gibi istek durumudur. Index yoksa parent'ta degil, tek
+    seferlik bir child process'te olusturulur (fork oncesi inference yok).
+
+    Args:
+        host: Dinlenecek adres (None ise settings)
+        port: Port (None ise settings)
+        workers: Worker sayisi (None ise settings)
+        log_level: uvicorn log seviyesi (None ise settings)
+        preload: Fork oncesi yukleme (None ise settings.api_preload)
+    """
+    host = host or settings.api_host
+    port = port or settings.api_port
+    workers = max(1, workers or settings.api_workers)
+    log_level = (log_level or settings.log_level).lower()
+    preload = settings.api_preload if preload is None else preload
+
+    if not hasattr(os, "fork") or not preload:
+        # Fork yok (Windows) veya on-yukleme kapali: klasik uvicorn worker'lari
+        uvicorn.run(
+            "src.api.main:app", host=host, port=port, workers=workers, log_level=log_level
+        )
+        return
+
+    # Tokenizer thread havuzu fork ile uyumsuz; parent'ta inference yapilmaz
+    os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
+
+    print(f"Model ve index yukleniyor (parent {os.getpid()})...")
+    try:
+        main.preload()
+    except RuntimeError as e:
+        raise SystemExit(f"Prefork baslatilamadi: {e}") from e
+    # Yuklenen nesneleri GC taramasindan cikar; aksi halde refcount/GC
+    # yazmalari paylasilan sayfalari worker'larda kopyalatir
+    gc.collect()
+    gc.freeze()
+
+    sock = _bind(host, port)
+    print(f"{workers} worker fork ediliyor: http://{host}:{port}")
+
+    children: set[int] = set()
+    stopping = False
+
+    def _stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                children.discard(pid)
+
+    signal.signal(signal.SIGTERM, _stop)
+    signal.signal(signal.SIGINT, _stop)
+
+    for _ in range(workers):
+        children.add(_spawn(sock, log_level))
+
+    try:
+        while children:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+            except InterruptedError:
+                continue
+
+            children.discard(pid)
+            if not stopping:
+                print(f"Worker {pid} sonlandi (durum {status}), yeniden baslatiliyor")
+                time.sleep(1)
+                if not stopping:
+                    children.add(_spawn(sock, log_level))
+    finally:
+        sock.close()
@@ -20,6 +20,26 @@ class Settings(BaseSettings):
     llm_model: str = Field("gpt-4-turbo-preview", env="LLM_MODEL")
     llm_temperature: float = Field(0.7, env="LLM_TEMPERATURE")
     llm_max_tokens: int = Field(4000, env="LLM_MAX_TOKENS")
+    # Model cikti token ust siniri (None ise LLMClientFactory.MAX_OUTPUT_TOKENS tablosu)
+    llm_max_output_tokens: int | None = Field(None, ge=1, env="LLM_MAX_OUTPUT_TOKENS")
+    # Yaniti akisla al, alanlari geldikce dogrula; hatali yanitta erken kes
+    llm_streaming: bool = Field(True, env="LLM_STREAMING")
+    llm_prompt_caching: bool = Field(True, env="LLM_PROMPT_CACHING")
+
+    # LLM Concurrency (provider basina ayni anda acik cagri limiti)
+    llm_max_concurrency: int = Field(4, ge=1, env="LLM_MAX_CONCURRENCY")
+    llm_concurrency_overrides: dict[str, int] = Field(
+        default_factory=dict, env="LLM_CONCURRENCY_OVERRIDES"
+    )  # Ornek: {"gemini": 8, "openai": 16}
+
+    # LLM Response Cache (off | on | record | replay)
+    llm_cache_mode: Literal["off", "on", "record", "replay"] = Field(
+        "off", env="LLM_CACHE_MODE"
+    )
+    llm_cache_path: Path = Field(Path("./data/llm_cache"), env="LLM_CACHE_PATH")
+    llm_cache_ttl_seconds: float = Field(
+        7 * 24 * 3600, ge=0, env="LLM_CACHE_TTL_SECONDS"
+    )  # 0 = suresiz
 
     # Embedding Settings
     embedding_model: str = Field("text-embedding-3-small", env="EMBEDDING_MODEL")
@@ -27,12 +47,39 @@ class Settings(BaseSettings):
         "openai", env="EMBEDDING_PROVIDER"
     )
 
+    # Embedding Backend (torch: SentenceTransformer, onnx: ONNX Runtime, bkz. scripts/export_onnx.py)
+    embedding_backend: Literal["torch", "onnx"] = Field("torch", env="EMBEDDING_BACKEND")
+    embedding_onnx_path: Path = Field(Path("./models/onnx"), env="EMBEDDING_ONNX_PATH")
+    embedding_onnx_quantize: bool = Field(True, env="EMBEDDING_ONNX_QUANTIZE")
+
+    # Embedding Cache (kalici, process'ler arasi paylasilan)
+    embedding_cache_enabled: bool = Field(True, env="EMBEDDING_CACHE_ENABLED")
+    embedding_cache_path: Path = Field(
+        Path("./vectorstore/embedding_cache"), env="EMBEDDING_CACHE_PATH"
+    )
+    embedding_cache_max_entries: int = Field(
+        50000, ge=1, env="EMBEDDING_CACHE_MAX_ENTRIES"
+    )
+
+    # Embedding Encode (toplu encode; workers 0 = cekirdek sayisi, batch bellek butcesi MB)
+    embedding_encode_workers: int = Field(1, ge=0, env="EMBEDDING_ENCODE_WORKERS")
+    embedding_encode_memory_mb: int = Field(512, ge=16, env="EMBEDDING_ENCODE_MEMORY_MB")
+    embedding_encode_max_batch: int = Field(256, ge=1, env="EMBEDDING_ENCODE_MAX_BATCH")
+    embedding_encode_chunk_size: int = Field(2048, ge=1, env="EMBEDDING_ENCODE_CHUNK_SIZE")
+
     # Vector Store Settings
     vector_store_type: Literal["faiss", "chroma"] = Field(
         "faiss", env="VECTOR_STORE_TYPE"
     )
     vector_store_path: Path = Field(Path("./vectorstore"), env="VECTOR_STORE_PATH")
 
+    # FAISS Index Compression: boyut indirgeme (none/pca/truncate), saklama tipi
+    # (float32/float16/sq8) ve tam hassasiyetli yeniden siralama aday carpani
+    index_reduction: Literal["none", "pca", "truncate"] = Field("none", env="INDEX_REDUCTION")
+    index_dim: int = Field(256, ge=8, env="INDEX_DIM")
+    index_storage: Literal["float32", "float16", "sq8"] = Field("float32", env="INDEX_STORAGE")
+    index_rerank_factor: int = Field(4, ge=0, env="INDEX_RERANK_FACTOR")
+
     # Data Paths
     configs_path: Path = Field(
         Path("../lgs-model/outputs/configs.json"), env="CONFIGS_PATH"
@@ -45,20 +92,52 @@ class Settings(BaseSettings):
         Path("./data/generated_questions"), env="GENERATED_QUESTIONS_PATH"
     )
 
+    # Generation Job Queue (generated_questions_path/jobs.sqlite)
+    job_workers: int = Field(1, ge=1, env="JOB_WORKERS")
+    job_max_count: int = Field(5000, ge=1, env="JOB_MAX_COUNT")
+
+    # Tekrar tespiti (MinHash/LSH). Yol verilirse tum worker'lar ayni gecmisi paylasir
+    diversity_max_history: int = Field(100000, ge=1, env="DIVERSITY_MAX_HISTORY")
+    diversity_duplicate_threshold: float = Field(
+        0.85, gt=0, le=1, env="DIVERSITY_DUPLICATE_THRESHOLD"
+    )
+    diversity_num_perm: int = Field(128, ge=16, env="DIVERSITY_NUM_PERM")
+    diversity_shingle_size: int = Field(1, ge=1, env="DIVERSITY_SHINGLE_SIZE")
+    diversity_history_path: Path | None = Field(None, env="DIVERSITY_HISTORY_PATH")
+
+    # Semantik tekrar kontrolu (kaynak soru bankasi + son kabul edilen uretimler)
+    semantic_dedup_enabled: bool = Field(True, env="SEMANTIC_DEDUP_ENABLED")
+    semantic_duplicate_threshold: float = Field(
+        0.9, gt=0, le=1, env="SEMANTIC_DUPLICATE_THRESHOLD"
+    )
+    semantic_dedup_history: int = Field(10000, ge=1, env="SEMANTIC_DEDUP_HISTORY")
+
     # RAG Settings
     retrieval_top_k: int = Field(5, env="RETRIEVAL_TOP_K")
     similarity_threshold: float = Field(0.7, env="SIMILARITY_THRESHOLD")
     max_generation_attempts: int = Field(3, env="MAX_GENERATION_ATTEMPTS")
 
+    # Spekulatif uretim: /generate icin paralel aday sayisi (1 = kapali)
+    generation_hedge_candidates: int = Field(1, ge=1, le=8, env="GENERATION_HEDGE_CANDIDATES")
+    generation_hedge_delay: float = Field(0.0, ge=0, env="GENERATION_HEDGE_DELAY")
+
+    # Toplu uretim: LLM cagrisi basina soru sayisi (1 = her soru ayri cagri)
+    generation_questions_per_call: int = Field(1, ge=1, le=20, env="GENERATION_QUESTIONS_PER_CALL")
+
     # API Settings
     api_host: str = Field("0.0.0.0", env="API_HOST")
     api_port: int = Field(8000, env="API_PORT")
     api_workers: int = Field(4, env="API_WORKERS")
+    api_preload: bool = Field(True, env="API_PRELOAD")
+    startup_wait_timeout: float = Field(30.0, env="STARTUP_WAIT_TIMEOUT")
     debug: bool = Field(False, env="DEBUG")
 
-    # Rate Limiting (opsiyonel)
+    # Rate Limiting (opsiyonel, provider/model basina token bucket)
     rate_limit_rpm: int | None = Field(None, env="RATE_LIMIT_RPM")
     rate_limit_tpm: int | None = Field(None, env="RATE_LIMIT_TPM")
+    rate_limit_overrides: dict[str, dict[str, int]] = Field(
+        default_factory=dict, env="RATE_LIMIT_OVERRIDES"
+    )  # Ornek: {"gemini": {"rpm": 1000}, "openai:gpt-4o": {"rpm": 500, "tpm": 30000}}
 
     # Logging Settings
     log_level: Literal["DEBUG", "INFO", "WARNING", "ERROR"] = Field(
@@ -7,6 +7,7 @@ from .api_models import (
     GenerateResponse,
     BatchGenerateRequest,
     BatchGenerateResponse,
+    JobSubmitRequest,
     HealthResponse,
     ErrorResponse,
 )
@@ -23,6 +24,7 @@ __all__ = [
     "GenerateResponse",
     "BatchGenerateRequest",
     "BatchGenerateResponse",
+    "JobSubmitRequest",
     "HealthResponse",
     "ErrorResponse",
 ]
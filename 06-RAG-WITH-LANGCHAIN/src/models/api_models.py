@@ -24,6 +24,10 @@ class GenerateRequest(BaseModel):
     style_instruction: Optional[str] = Field(
         default=None, description="Stil talimati (cesitlilik icin)"
     )
+    hedge_candidates: Optional[int] = Field(
+        default=None, ge=1, le=8,
+        description="Paralel aday sayisi (None ise GENERATION_HEDGE_CANDIDATES)",
+    )
 
     class Config:
         json_schema_extra = {
@@ -63,6 +67,23 @@ class BatchGenerateRequest(BaseModel):
     )
 
 
+class JobSubmitRequest(BaseModel):
+    """
+    Arka plan uretim isi istegi (buyuk toplu uretimler icin)
+    """
+
+    count: int = Field(..., ge=1, description="Uretilecek soru sayisi (ust sinir: JOB_MAX_COUNT)")
+    filters: Optional[CombinationFilters] = Field(
+        default=None, description="Kombinasyon filtreleri"
+    )
+    ensure_diversity: bool = Field(
+        default=True, description="Cesitlilik garantisi"
+    )
+    max_attempts: int = Field(
+        default=1, ge=1, le=5, description="Kalem basina maksimum deneme"
+    )
+
+
 class BatchGenerateResponse(BaseModel):
     """
     Toplu soru uretim yaniti
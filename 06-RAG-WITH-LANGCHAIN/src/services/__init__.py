@@ -5,6 +5,11 @@ from .embedding_service import (
     get_embedding_pipeline,
     set_embedding_pipeline,
 )
+from .embedding_cache import EmbeddingCache
+from .encode_engine import EncodeEngine
+from .index_compression import IndexCompression
+from .onnx_encoder import OnnxEncoder
+from .metadata_store import MetadataStore, MetadataRow
 from .filter_service import (
     FilterCriteria,
     FilterService,
@@ -30,14 +35,46 @@ from .llm_client import (
     LLMClientFactory,
     get_llm_client,
     parse_llm_response,
+    parse_llm_batch_response,
+    LLMUsage,
+)
+from .llm_cache import (
+    CachedLLMClient,
+    CacheMissError,
+    LLMResponseCache,
+)
+from .stream_parser import (
+    IncrementalJSONParser,
+    StreamParseError,
+)
+from .rate_limiter import (
+    RateLimiter,
+    TokenBucket,
+    estimate_tokens,
+)
+from .semantic_dedup import (
+    DuplicateMatch,
+    SemanticDuplicateGuard,
 )
 from .question_generator import (
     QuestionGenerator,
+    BatchItemResult,
+    BatchResult,
     QuestionGenerationError,
     ValidationError,
+    DuplicateQuestionError,
     InsufficientExamplesError,
     generate_single_question,
 )
+from .job_queue import (
+    GenerationJobQueue,
+    JobStatus,
+)
+from .minhash_lsh import (
+    MinHasher,
+    MinHashLSH,
+    SQLiteMinHashLSH,
+)
 from .diversity_service import (
     DiversityService,
     DiverseQuestionGenerator,
@@ -57,6 +94,12 @@ __all__ = [
     "initialize_vectorstore",
     "get_embedding_pipeline",
     "set_embedding_pipeline",
+    "EmbeddingCache",
+    "EncodeEngine",
+    "IndexCompression",
+    "OnnxEncoder",
+    "MetadataStore",
+    "MetadataRow",
     # Filter
     "FilterCriteria",
     "FilterService",
@@ -78,13 +121,34 @@ __all__ = [
     "LLMClientFactory",
     "get_llm_client",
     "parse_llm_response",
+    "parse_llm_batch_response",
+    "LLMUsage",
+    "CachedLLMClient",
+    "CacheMissError",
+    "LLMResponseCache",
+    "IncrementalJSONParser",
+    "StreamParseError",
+    "RateLimiter",
+    "TokenBucket",
+    "estimate_tokens",
     # Generator
+    "DuplicateMatch",
+    "SemanticDuplicateGuard",
     "QuestionGenerator",
+    "BatchItemResult",
+    "BatchResult",
     "QuestionGenerationError",
     "ValidationError",
+    "DuplicateQuestionError",
     "InsufficientExamplesError",
     "generate_single_question",
+    # Jobs
+    "GenerationJobQueue",
+    "JobStatus",
     # Diversity
+    "MinHasher",
+    "MinHashLSH",
+    "SQLiteMinHashLSH",
     "DiversityService",
     "DiverseQuestionGenerator",
     # Selector
@@ -35,6 +35,9 @@ class CombinationSelector:
         self.policy = policy or config.selection_policy or SelectionPolicy()
         self.combinations = config.combinations
 
+        # (filtre, politika) -> onceden hesaplanmis sampler
+        self._samplers: dict[tuple, _Sampler] = {}
+
     def select(
         self,
         filters: Optional[CombinationFilters] = None,
@@ -50,24 +53,22 @@ class CombinationSelector:
         Returns:
             Secilen Combination
         """
-        # Filtreleme
-        candidates = self._apply_filters(self.combinations, filters)
+        sampler = self._get_sampler(filters)
 
         # Haric tutma
+        mask = None
         if exclude:
             exclude_set = {self._combo_key(e) for e in exclude}
-            candidates = [c for c in candidates if self._combo_key(c.model_dump()) not in exclude_set]
-
-        if not candidates:
+            mask = np.fromiter(
+                (key not in exclude_set for key in sampler.keys),
+                dtype=bool,
+                count=len(sampler.keys),
+            )
+
+        idx = sampler.draw(mask)
+        if idx is None:
             raise ValueError("Filtreleme sonrasi kombinasyon kalmadi")
-
-        # Secim moduna gore sec
-        if self.policy.mode == "weighted_sampling":
-            return self._weighted_sample(candidates)
-        elif self.policy.mode == "top_k":
-            return self._top_k_sample(candidates)
-        else:  # random
-            return random.choice(candidates)
+        return sampler.candidates[idx]
 
     def select_multiple(
         self,
@@ -78,6 +79,10 @@ class CombinationSelector:
         """
         Birden fazla kombinasyon sec
         
+        ensure_diversity ile secim tekrarsizdir ve art arda select(exclude=...)
+        cagrilariyla ayni dagilimi verir, ama tum secim tek seferde yapilir
+        (filtreleme ve agirliklar onceden hesaplanmis sampler'dan gelir).
+
         Args:
             count: Secilecek sayi
             filters: Filtreler
@@ -86,23 +91,39 @@ class CombinationSelector:
         Returns:
             Combination listesi
         """
-        results = []
-        exclude = []
-
-        for _ in range(count):
-            try:
-                combo = self.select(
-                    filters=filters,
-                    exclude=exclude if ensure_diversity else None,
-                )
-                results.append(combo)
-                if ensure_diversity:
-                    exclude.append(combo.model_dump())
-            except ValueError:
-                # Kombinasyon kalmadi
-                break
-
-        return results
+        sampler = self._get_sampler(filters)
+        if count <= 0 or not sampler.candidates:
+            return []
+
+        if ensure_diversity:
+            indices = sampler.draw_unique(count)
+        else:
+            indices = sampler.draw_many(count)
+
+        return [sampler.candidates[i] for i in indices]
+
+    def _get_sampler(self, filters: Optional[CombinationFilters]) -> "_Sampler":
+        """(filtre, politika) icin onceden hesaplanmis sampler"""
+        key = (
+            filters.model_dump_json() if filters is not None else None,
+            self.policy.model_dump_json(),
+        )
+        sampler = self._samplers.get(key)
+        if sampler is None:
+            candidates = self._apply_filters(self.combinations, filters)
+            sampler = _Sampler(
+                candidates=candidates,
+                keys=[self._combo_key(c.model_dump()) for c in candidates],
+                weights=self._weights(candidates),
+                mode=self.policy.mode,
+                top_k=self.policy.top_k,
+            )
+            self._samplers[key] = sampler
+        return sampler
+
+    def clear_cache(self):
+        """Sampler cache'ini temizle (combinations veya policy degistiyse)"""
+        self._samplers.clear()
 
     def _apply_filters(
         self,
@@ -135,37 +156,21 @@ class CombinationSelector:
 
         return results
 
-    def _weighted_sample(self, candidates: list[Combination]) -> Combination:
+    def _weights(self, candidates: list[Combination]) -> np.ndarray:
         """
-        Weighted sampling ile secim
+        Secim agirliklari
         
         Agirlik = lgs_skor^alpha
         Softmax with temperature
         """
         # Agirliklari hesapla
-        weights = np.array([c.lgs_skor ** self.policy.alpha for c in candidates])
+        weights = np.array([c.lgs_skor ** self.policy.alpha for c in candidates], dtype=float)
 
         # Softmax with temperature
         if self.policy.temperature != 1.0:
             weights = np.exp(np.log(weights + 1e-10) / self.policy.temperature)
 
-        # Normalize
-        weights = weights / weights.sum()
-
-        # Sec
-        idx = np.random.choice(len(candidates), p=weights)
-        return candidates[idx]
-
-    def _top_k_sample(self, candidates: list[Combination]) -> Combination:
-        """Top-K icerisinden rastgele sec"""
-        # Skorlara gore sirala
-        sorted_candidates = sorted(candidates, key=lambda c: c.lgs_skor, reverse=True)
-
-        # Top-K al
-        top_k = sorted_candidates[: self.policy.top_k]
-
-        # Rastgele sec
-        return random.choice(top_k)
+        return weights
 
     def _combo_key(self, combo: dict) -> str:
         """Kombinasyon icin unique key"""
@@ -200,3 +205,118 @@ class CombinationSelector:
 
         return stats
 
+
+class _Sampler:
+    """
+    Sabit aday listesi uzerinde onceden hesaplanmis ornekleyici
+
+    - weighted_sampling: kumulatif agirlik (cdf) + ikili arama; tekrarsiz
+      secim Efraimidis-Spirakis anahtarlariyla tek seferde
+    - top_k: skora gore sirali liste; her secim kalanlarin ilk k'sindan
+    - random: uniform
+    """
+
+    def __init__(
+        self,
+        candidates: list[Combination],
+        keys: list[str],
+        weights: np.ndarray,
+        mode: str,
+        top_k: int,
+    ):
+        self.candidates = candidates
+        self.keys = keys
+        self.mode = mode
+        self.top_k = top_k
+        self.weights = weights
+        self.cdf = np.cumsum(weights) if len(weights) else weights
+        # top_k: skora gore azalan (esitlerde orijinal sira korunur)
+        self.order = sorted(range(len(candidates)), key=lambda i: -candidates[i].lgs_skor)
+
+    def draw(self, mask: Optional[np.ndarray] = None) -> Optional[int]:
+        """Tek secim (mask: False olan adaylar haric)"""
+        n = len(self.candidates)
+        if n == 0 or (mask is not None and not mask.any()):
+            return None
+
+        if self.mode == "weighted_sampling":
+            if mask is None:
+                return self._search(self.cdf)
+            return self._search(np.cumsum(self.weights * mask), mask)
+
+        if self.mode == "top_k":
+            order = self.order if mask is None else [i for i in self.order if mask[i]]
+            return random.choice(order[: self.top_k])
+
+        if mask is None:
+            return random.randrange(n)
+        return random.choice(np.flatnonzero(mask).tolist())
+
+    def draw_many(self, count: int) -> list[int]:
+        """Tekrarli secim"""
+        if self.mode == "weighted_sampling":
+            total = self.cdf[-1]
+            if total <= 0:
+                return random.choices(range(len(self.candidates)), k=count)
+            u = np.random.random(count) * total
+            idx = np.searchsorted(self.cdf, u, side="right")
+            # u == total (yuvarlama): son pozitif agirlikli aday
+            last = np.searchsorted(self.cdf, total, side="left")
+            return np.where(idx < len(self.cdf), idx, last).tolist()
+
+        pool = self.order[: self.top_k] if self.mode == "top_k" else range(len(self.candidates))
+        return random.choices(pool, k=count)
+
+    def draw_unique(self, count: int) -> list[int]:
+        """
+        Tekrarsiz secim (ayni kombinasyon anahtari bir kez)
+
+        Art arda tekrar haric tutularak yapilan tekli secimlerle ayni dagilim.
+        """
+        if self.mode == "weighted_sampling":
+            # Efraimidis-Spirakis: E_i / w_i kucukten buyuge = sirali agirlikli cekilis
+            with np.errstate(divide="ignore"):
+                keys = np.random.exponential(size=len(self.weights)) / self.weights
+            sequence = np.argsort(keys, kind="stable").tolist()
+        elif self.mode == "top_k":
+            sequence = self._sliding_top_k()
+        else:
+            sequence = random.sample(range(len(self.candidates)), len(self.candidates))
+
+        selected, seen = [], set()
+        for i in sequence:
+            if self.keys[i] in seen:
+                continue
+            seen.add(self.keys[i])
+            selected.append(i)
+            if len(selected) == count:
+                break
+        return selected
+
+    def _sliding_top_k(self):
+        """Kalanlarin ilk k'sindan rastgele secim dizisi (lazy)"""
+        window = list(self.order[: self.top_k])
+        rest = iter(self.order[self.top_k :])
+        while window:
+            j = random.randrange(len(window))
+            yield window[j]
+            nxt = next(rest, None)
+            if nxt is None:
+                window[j] = window[-1]
+                window.pop()
+            else:
+                window[j] = nxt
+
+    def _search(self, cdf: np.ndarray, mask: Optional[np.ndarray] = None) -> int:
+        """cdf uzerinde ikili arama ile tek cekilis"""
+        total = cdf[-1]
+        if total <= 0:
+            # Tum agirliklar sifir: uniform
+            allowed = range(len(cdf)) if mask is None else np.flatnonzero(mask).tolist()
+            return random.choice(allowed)
+        idx = int(np.searchsorted(cdf, np.random.random() * total, side="right"))
+        if idx >= len(cdf):
+            # u == total (yuvarlama): sona kisitlamak sifir agirlikli/maskeli
+            # adayi dondurebilir; son pozitif agirlikli adaya dus
+            idx = int(np.searchsorted(cdf, total, side="left"))
+        return idx
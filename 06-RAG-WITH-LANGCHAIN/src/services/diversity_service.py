@@ -4,10 +4,14 @@ Ayni konfigurasyondan farkli sorular uretmek icin
 """
 
 import random
+from pathlib import Path
 from typing import Optional
 from collections import deque
 
+import numpy as np
+
 from .prompt_builder import PromptBuilder
+from .minhash_lsh import MinHasher, MinHashLSH, SQLiteMinHashLSH, normalize_tokens, shingle
 
 
 class DiversityService:
@@ -17,7 +21,7 @@ class DiversityService:
     Ozellikler:
     - Rastgele stil secimi
     - Dinamik temperature ayarlama
-    - Tekrar tespiti (Jaccard similarity)
+    - Tekrar tespiti (MinHash/LSH ile tahmini Jaccard similarity)
     - Ornek siralama karistirma
     """
 
@@ -26,21 +30,44 @@ class DiversityService:
         prompt_builder: Optional[PromptBuilder] = None,
         max_history: int = 100,
         duplicate_threshold: float = 0.85,
+        num_perm: int = 128,
+        shingle_size: int = 1,
+        history_path: Optional[str | Path] = None,
     ):
         """
         Args:
             prompt_builder: Prompt olusturucu (stil varyasyonlari icin)
-            max_history: Gecmis soru sayisi limiti
+            max_history: Gecmis soru sayisi limiti (yuz binler mertebesinde olabilir)
             duplicate_threshold: Tekrar tespit esigi (0-1)
+            num_perm: MinHash imza uzunlugu (buyudukce tahmin hassaslasir)
+            shingle_size: Kelime shingle uzunlugu (1 = kelime seti)
+            history_path: Paylasimli SQLite gecmis dosyasi (None ise process ici)
         """
         self.prompt_builder = prompt_builder or PromptBuilder()
         self.max_history = max_history
         self.duplicate_threshold = duplicate_threshold
+        self.shingle_size = shingle_size
 
         # Gecmis takibi
         self.used_styles: deque[str] = deque(maxlen=20)
-        self.recent_questions: deque[str] = deque(maxlen=max_history)
-        self.recent_embeddings: deque[set[str]] = deque(maxlen=max_history)
+        self.recent_questions: deque[str] = deque(maxlen=min(max_history, 100))
+
+        # Tekrar indeksi (imzalar; metinlerin kendisi saklanmaz)
+        self.hasher = MinHasher(num_perm=num_perm)
+        if history_path is not None:
+            self.history = SQLiteMinHashLSH(
+                history_path,
+                threshold=duplicate_threshold,
+                num_perm=num_perm,
+                capacity=max_history,
+                seed=self.hasher.seed,
+            )
+        else:
+            self.history = MinHashLSH(
+                threshold=duplicate_threshold,
+                num_perm=num_perm,
+                capacity=max_history,
+            )
 
     def get_random_style(self, exclude_recent: int = 3) -> str:
         """
@@ -114,46 +141,39 @@ class DiversityService:
 
         return base_prompt + random.choice(variations)
 
-    def is_duplicate(self, new_question: str) -> bool:
+    def is_duplicate(self, new_question: str, threshold: Optional[float] = None) -> bool:
         """
-        Tekrar kontrolu (Jaccard similarity)
-        
+        Tekrar kontrolu (MinHash/LSH)
+
+        Sadece LSH bucket'larini paylasan gecmis sorular aday olur; benzerlik
+        MinHash imzalarindan tahmin edilir. Gecmis boyutundan bagimsiz hizlidir.
+
         Args:
             new_question: Yeni soru metni
-            
+            threshold: Esik (None ise duplicate_threshold). LSH bantlari
+                duplicate_threshold'a gore secildigi icin cok daha dusuk
+                esiklerde bazi benzerler aday olmayabilir.
+
         Returns:
             True ise tekrar, False ise yeni
         """
         if not new_question:
             return False
 
-        # Kelime seti olustur
-        new_words = self._tokenize(new_question)
-
-        # Son sorularla karsilastir
-        for recent_words in self.recent_embeddings:
-            similarity = self._jaccard_similarity(new_words, recent_words)
-            if similarity > self.duplicate_threshold:
-                return True
+        signature = self._signature(new_question)
+        if signature is None:
+            return False
 
-        return False
+        threshold = self.duplicate_threshold if threshold is None else threshold
+        return self.history.max_similarity(signature) > threshold
 
     def _tokenize(self, text: str) -> set[str]:
-        """Metni kelime setine cevir"""
-        # Basit tokenizasyon: kucuk harf, boslukla ayir
-        words = text.lower().split()
-        # Stop words'leri haric tutmuyoruz (daha iyi benzerlik icin)
-        return set(words)
+        """Metni Turkce normalize edilmis shingle setine cevir"""
+        return shingle(normalize_tokens(text), self.shingle_size)
 
-    def _jaccard_similarity(self, set1: set, set2: set) -> float:
-        """Jaccard similarity hesapla"""
-        if not set1 or not set2:
-            return 0.0
-
-        intersection = len(set1 & set2)
-        union = len(set1 | set2)
-
-        return intersection / union if union > 0 else 0.0
+    def _signature(self, text: str):
+        """Metnin MinHash imzasi (bos metin icin None)"""
+        return self.hasher.signature(self._tokenize(text))
 
     def add_to_history(self, question: str):
         """
@@ -164,7 +184,9 @@ class DiversityService:
         """
         if question:
             self.recent_questions.append(question)
-            self.recent_embeddings.append(self._tokenize(question))
+            signature = self._signature(question)
+            if signature is not None:
+                self.history.add(signature)
 
     def shuffle_examples(
         self,
@@ -195,67 +217,101 @@ class DiversityService:
         combinations: list[dict],
         count: int,
         prefer_high_score: bool = True,
+        stratify_by: Optional[list[str]] = None,
     ) -> list[dict]:
         """
         Cesitli kombinasyon secimi
         
+        Tekrarsiz agirlikli secim Gumbel-top-k ile tek seferde yapilir:
+        log(lgs_skor^2) + Gumbel gurultusu en buyuk count kayit, art arda
+        agirlikli cekilislerle ayni dagilimi verir.
+
         Args:
             combinations: Tum kombinasyonlar
             count: Secilecek sayi
             prefer_high_score: Yuksek skorlulari tercih et
+            stratify_by: Katman alanlari (or. ["alt_konu", "zorluk"]); secim
+                katmanlara esit paylastirilir, kucuk katmanlarin eksigi
+                digerlerine devredilir
             
         Returns:
             Secilen kombinasyonlar
         """
         if len(combinations) <= count:
             return combinations.copy()
+        if count <= 0:
+            return []
 
-        # Skorlara gore agirlikli secim
+        # Gumbel-top-k anahtarlari (uniform secimde sadece gurultu)
+        gumbel = np.random.gumbel(size=len(combinations))
         if prefer_high_score:
-            weights = [c.get("lgs_skor", 0.5) ** 2 for c in combinations]
-            total = sum(weights)
-            if total > 0:
-                weights = [w / total for w in weights]
-            else:
-                weights = None
+            weights = np.array([c.get("lgs_skor", 0.5) ** 2 for c in combinations], dtype=float)
+            with np.errstate(divide="ignore"):
+                keys = np.log(weights) + gumbel
         else:
-            weights = None
-
-        # Rastgele secim (tekrarsiz)
-        indices = list(range(len(combinations)))
-        selected_indices = []
-
-        for _ in range(count):
-            if not indices:
+            keys = gumbel
+
+        if not stratify_by:
+            # Sifir agirliklilar (-inf) en sona, kendi aralarinda rastgele
+            order = np.lexsort((-gumbel, -keys))[:count]
+            return [combinations[i] for i in order]
+
+        # Katman id'leri
+        strata: dict[tuple, int] = {}
+        stratum_ids = np.array(
+            [
+                strata.setdefault(tuple(c.get(f) for f in stratify_by), len(strata))
+                for c in combinations
+            ]
+        )
+        sizes = np.bincount(stratum_ids, minlength=len(strata))
+        quotas = self._stratum_quotas(sizes, count)
+
+        # Katman ici sira: anahtara gore azalan
+        order = np.lexsort((-gumbel, -keys, stratum_ids))
+        starts = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+        ranks = np.empty(len(combinations), dtype=np.int64)
+        ranks[order] = np.arange(len(combinations)) - starts[stratum_ids[order]]
+
+        selected = np.flatnonzero(ranks < quotas[stratum_ids])
+        # Katmanlar arasi sirali dagit (ilk N secim de yayilmis olsun)
+        selected = selected[np.lexsort((-keys[selected], ranks[selected]))]
+        return [combinations[i] for i in selected]
+
+    @staticmethod
+    def _stratum_quotas(sizes: np.ndarray, count: int) -> np.ndarray:
+        """count'u katmanlara esit dagit; dolan katmanlarin payi digerlerine gecer"""
+        quotas = np.zeros(len(sizes), dtype=np.int64)
+        remaining = count
+        while remaining > 0:
+            open_strata = np.flatnonzero(quotas < sizes)
+            if len(open_strata) == 0:
                 break
-
-            if weights:
-                remaining_weights = [weights[i] for i in indices]
-                total = sum(remaining_weights)
-                if total > 0:
-                    remaining_weights = [w / total for w in remaining_weights]
-                    idx = random.choices(indices, weights=remaining_weights, k=1)[0]
-                else:
-                    idx = random.choice(indices)
-            else:
-                idx = random.choice(indices)
-
-            selected_indices.append(idx)
-            indices.remove(idx)
-
-        return [combinations[i] for i in selected_indices]
+            share, extra = divmod(remaining, len(open_strata))
+            add = np.full(len(open_strata), share, dtype=np.int64)
+            # Artan birimler rastgele katmanlara
+            add[np.random.permutation(len(open_strata))[:extra]] += 1
+            add = np.minimum(add, sizes[open_strata] - quotas[open_strata])
+            quotas[open_strata] += add
+            remaining -= int(add.sum())
+        return quotas
 
     def clear_history(self):
         """Gecmisi temizle"""
         self.used_styles.clear()
         self.recent_questions.clear()
-        self.recent_embeddings.clear()
+        self.history.clear()
+
+    def close(self):
+        """Gecmis indeksini kapat (paylasimli backend icin)"""
+        self.history.close()
 
     def get_stats(self) -> dict:
         """Istatistikleri don"""
         return {
             "used_styles_count": len(self.used_styles),
             "recent_questions_count": len(self.recent_questions),
+            "history_size": len(self.history),
             "max_history": self.max_history,
             "duplicate_threshold": self.duplicate_threshold,
         }
@@ -0,0 +1,293 @@
+"""
+Kalici Embedding Cache
+(model_name, normalize metin) ozetine gore disk uzerinde embedding saklama
+"""
+
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from ..config import settings
+
+
+class EmbeddingCache:
+    """
+    Disk tabanli, boyut sinirli (LRU) embedding cache
+
+    Yapi:
+    - vectors_<dim>.f32: float32 memory-mapped vektor dosyasi (max_entries x dim)
+    - digests_<dim>.bin: her satirdaki vektorun anahtar ozeti (max_entries x 16 byte)
+    - index.sqlite: anahtar -> slot eslemesi ve son kullanim zamani
+
+    Anahtar, model adi ve normalize edilmis metnin SHA-256 ozetidir; Python'un
+    hash() fonksiyonunun aksine process'ler ve yeniden baslatmalar arasinda
+    sabittir. Ayni dizini birden fazla uvicorn worker'i ve
+    init_vectorstore.py ayni anda kullanabilir:
+
+    - Yazicilar slot ayirma ve satir yazmayi BEGIN IMMEDIATE icinde yapar
+      (SQLite yazma kilidiyle siralanir). Satir once gecersiz kilinir
+      (ozet sifirlanir), sonra vektor ve yeni ozet yazilir.
+    - Okuyucu kilit almaz; ozeti vektor kopyasindan once ve sonra okur ve
+      ikisi de anahtarla eslesmezse kaydi yok sayar. Baska process'in silip
+      uzerine yazdigi, yarim kalan veya ROLLBACK edilen satir yanlis metnin
+      vektoru olarak donmez, cache miss olur.
+    """
+
+    DIGEST_SIZE = 16
+
+    _WHITESPACE = re.compile(r"\s+")
+
+    def __init__(
+        self,
+        model_name: str,
+        dimension: int,
+        path: Optional[str | Path] = None,
+        max_entries: Optional[int] = None,
+    ):
+        """
+        Args:
+            model_name: Embedding model adi (anahtarin parcasi)
+            dimension: Vektor boyutu
+            path: Cache dizini (None ise settings'den alinir)
+            max_entries: Maksimum kayit sayisi (None ise settings'den alinir)
+        """
+        self.model_name = model_name
+        self.dimension = dimension
+        self.path = Path(path or settings.embedding_cache_path)
+        self.max_entries = max_entries or settings.embedding_cache_max_entries
+        self.path.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(
+            str(self.path / "index.sqlite"),
+            timeout=30,
+            isolation_level=None,  # Transaction'lari elle yonet
+            check_same_thread=False,
+        )
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                dim INTEGER NOT NULL,
+                slot INTEGER NOT NULL,
+                last_used REAL NOT NULL
+            )
+            """
+        )
+        self._db.execute(
+            "CREATE UNIQUE INDEX IF NOT EXISTS idx_entries_slot ON entries(dim, slot)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_entries_lru ON entries(last_used)")
+
+        self._vectors = self._open_rows(f"vectors_{self.dimension}.f32", "float32", self.dimension)
+        self._digests = self._open_rows(f"digests_{self.dimension}.bin", "uint8", self.DIGEST_SIZE)
+
+    def _open_rows(self, name: str, dtype: str, width: int) -> np.memmap:
+        """max_entries satirlik memmap dosyasini ac (yoksa olustur)"""
+        row_file = self.path / name
+        shape = (self.max_entries, width)
+        expected_size = self.max_entries * width * np.dtype(dtype).itemsize
+
+        if not row_file.exists() or row_file.stat().st_size < expected_size:
+            # Seyrek dosya: diskte sadece yazilan satirlar yer kaplar
+            with open(row_file, "ab") as f:
+                f.truncate(expected_size)
+
+        return np.memmap(row_file, dtype=dtype, mode="r+", shape=shape)
+
+    def _digest(self, key: str) -> bytes:
+        """Satirda saklanan anahtar ozeti"""
+        return bytes.fromhex(key)[: self.DIGEST_SIZE]
+
+    @classmethod
+    def normalize_text(cls, text: str) -> str:
+        """Unicode NFC + bosluk sadelestirme (buyuk/kucuk harf korunur)"""
+        return cls._WHITESPACE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+
+    def make_key(self, text: str) -> str:
+        """Sabit cache anahtari: sha256(model_name + normalize metin)"""
+        payload = f"{self.model_name}\x00{self.normalize_text(text)}"
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, text: str) -> Optional[np.ndarray]:
+        """
+        Tek metin icin cache'den embedding al
+
+        Args:
+            text: Giris metni
+
+        Returns:
+            Embedding vektoru veya None
+        """
+        return self.get_many([text])[0]
+
+    def get_many(self, texts: list[str]) -> list[Optional[np.ndarray]]:
+        """
+        Toplu cache okuma
+
+        Args:
+            texts: Metin listesi
+
+        Returns:
+            Her metin icin embedding veya None (ayni sirada)
+        """
+        keys = [self.make_key(t) for t in texts]
+        results: list[Optional[np.ndarray]] = [None] * len(keys)
+        if not keys:
+            return results
+
+        with self._lock:
+            slots = self._existing_slots(list(dict.fromkeys(keys)))
+
+            for i, key in enumerate(keys):
+                slot = slots.get(key)
+                if slot is None:
+                    continue
+                # Kopya sirasinda satir baska process tarafindan degistirildiyse
+                # ozetlerden biri tutmaz
+                digest = self._digest(key)
+                before = self._digests[slot].tobytes()
+                vector = np.array(self._vectors[slot])
+                if before == digest and self._digests[slot].tobytes() == digest:
+                    results[i] = vector
+
+            if slots:
+                now = time.time()
+                self._db.executemany(
+                    "UPDATE entries SET last_used = ? WHERE key = ?",
+                    [(now, k) for k in slots],
+                )
+
+        return results
+
+    def put(self, text: str, vector: np.ndarray):
+        """
+        Tek embedding'i cache'e yaz
+
+        Args:
+            text: Giris metni
+            vector: Embedding vektoru
+        """
+        self.put_many([text], np.asarray(vector).reshape(1, -1))
+
+    def put_many(self, texts: list[str], vectors: np.ndarray):
+        """
+        Toplu cache yazma (gerekirse en eski kayitlar silinir)
+
+        Args:
+            texts: Metin listesi
+            vectors: Embedding matrisi (N x D)
+        """
+        if len(texts) != len(vectors):
+            raise ValueError("Metin ve vektor sayilari eslesmiyor")
+
+        pending = {self.make_key(t): v for t, v in zip(texts, vectors)}
+        if not pending:
+            return
+        if len(pending) > self.max_entries:
+            # Kapasiteden fazlasi zaten hemen silinecekti
+            pending = dict(list(pending.items())[-self.max_entries :])
+
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                now = time.time()
+                existing = self._existing_slots(list(pending))
+                # Once mevcutlari tazele ki LRU silme onlari secmesin
+                self._db.executemany(
+                    "UPDATE entries SET last_used = ? WHERE key = ?",
+                    [(now, k) for k in existing],
+                )
+
+                new_keys = [k for k in pending if k not in existing]
+                free_slots = self._allocate_slots(len(new_keys))
+                self._db.executemany(
+                    "INSERT INTO entries(key, dim, slot, last_used) VALUES (?, ?, ?, ?)",
+                    [(k, self.dimension, s, now) for k, s in zip(new_keys, free_slots)],
+                )
+
+                # Satirlar yazma kilidi altinda: once gecersiz kil, sonra vektor,
+                # en son ozet (okuyucu yarim satiri kabul etmez)
+                rows = {**dict(zip(new_keys, free_slots)), **existing}
+                for slot in rows.values():
+                    self._digests[slot] = 0
+                for key, slot in rows.items():
+                    self._vectors[slot] = pending[key]
+                for key, slot in rows.items():
+                    self._digests[slot] = np.frombuffer(self._digest(key), dtype="uint8")
+                self._vectors.flush()
+                self._digests.flush()
+
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+
+    def _existing_slots(self, keys: list[str]) -> dict[str, int]:
+        """Buyuk anahtar listeleri icin parcali slot sorgusu"""
+        slots: dict[str, int] = {}
+        for start in range(0, len(keys), 500):
+            chunk = keys[start : start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            slots.update(
+                self._db.execute(
+                    f"SELECT key, slot FROM entries WHERE dim = ? AND key IN ({placeholders})",
+                    [self.dimension, *chunk],
+                ).fetchall()
+            )
+        return slots
+
+    def _allocate_slots(self, count: int) -> list[int]:
+        """
+        Bos slot ayir; yer yoksa en eski (LRU) kayitlari sil
+        Transaction icinde cagrilmalidir.
+
+        Slotlar her zaman 0..n-1 araliginda bitisiktir: yeni kayitlar sona
+        eklenir, silinen kayitlarin slotlari ayni transaction'da yeniden
+        kullanilir.
+        """
+        if count == 0:
+            return []
+
+        used = self._db.execute(
+            "SELECT COUNT(*) FROM entries WHERE dim = ?", (self.dimension,)
+        ).fetchone()[0]
+        free = list(range(used, min(used + count, self.max_entries)))
+
+        shortage = count - len(free)
+        if shortage > 0:
+            evicted = self._db.execute(
+                "SELECT key, slot FROM entries WHERE dim = ? ORDER BY last_used ASC LIMIT ?",
+                (self.dimension, shortage),
+            ).fetchall()
+            self._db.executemany("DELETE FROM entries WHERE key = ?", [(k,) for k, _ in evicted])
+            free.extend(slot for _, slot in evicted)
+
+        return free
+
+    def __len__(self) -> int:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT COUNT(*) FROM entries WHERE dim = ?", (self.dimension,)
+            ).fetchone()
+        return int(row[0])
+
+    def clear(self):
+        """Bu boyuttaki tum kayitlari sil"""
+        with self._lock:
+            self._db.execute("DELETE FROM entries WHERE dim = ?", (self.dimension,))
+
+    def close(self):
+        """Dosya ve baglantilari kapat"""
+        with self._lock:
+            self._vectors.flush()
+            self._digests.flush()
+            self._db.close()
@@ -3,16 +3,26 @@ R-01: Embedding Pipeline Kurulumu
 Turkce embedding modeli ve FAISS index yonetimi
 """
 
+import hashlib
+import json
+import os
 import pickle
+import re
+import shutil
+from collections.abc import Mapping
 from pathlib import Path
 from typing import Optional
 
 import numpy as np
 import pandas as pd
 import faiss
-from sentence_transformers import SentenceTransformer
 
 from ..config import settings
+from .embedding_cache import EmbeddingCache
+from .encode_engine import EncodeEngine, SentenceTransformerFactory
+from .index_compression import IndexCompression
+from .onnx_encoder import OnnxEncoder, OnnxEncoderFactory
+from .metadata_store import MetadataStore
 
 
 class EmbeddingPipeline:
@@ -26,6 +36,19 @@ class EmbeddingPipeline:
     4. Benzerlik aramasi
     """
 
+    # Index dosya duzeni: <vector_store_path>/gen-NNNNNN/{faiss.index, metadata/}
+    # CURRENT dosyasi aktif nesli gosterir (eski duzen: dogrudan faiss.index)
+    # metadata/: kolonsal, memory-mapped MetadataStore (eski: metadata.pkl)
+    INDEX_FILE = "faiss.index"
+    METADATA_DIR = "metadata"
+    METADATA_FILE = "metadata.pkl"
+    # Sikistirilmis index icin tam hassasiyetli vektorler (yeniden siralama)
+    VECTORS_FILE = "vectors.npy"
+    VECTOR_IDS_FILE = "vector_ids.npy"
+    CURRENT_FILE = "CURRENT"
+    KEEP_GENERATIONS = 2
+    _GENERATION_DIR = re.compile(r"^gen-(\d+)$")
+
     # Turkce embedding modelleri
     TURKISH_MODELS = [
         "emrecan/bert-base-turkish-cased-mean-nli-stsb-tr",  # Birincil
@@ -41,11 +64,22 @@ class EmbeddingPipeline:
             model_name: Kullanilacak model adi (None ise ayarlardan alinir)
         """
         self.model_name = model_name or self._select_model()
-        self.model: Optional[SentenceTransformer] = None
+        # SentenceTransformer veya OnnxEncoder (ayni encode arayuzu)
+        self.model = None
+        # load_model() sonrasi: torch, onnx veya onnx-int8
+        self.backend: Optional[str] = None
         self.dimension: int = 0
         self.index: Optional[faiss.Index] = None
-        self.id_to_metadata: dict[int, dict] = {}
-        self._cache: dict[str, np.ndarray] = {}
+        # build/update sonrasi dict, load_index sonrasi salt okunur MetadataStore
+        self.id_to_metadata: Mapping[int, Mapping] = {}
+        self.cache: Optional[EmbeddingCache] = None
+        self.generation: int = 0
+        self.index_mmap: bool = False
+        self.compression = IndexCompression.from_settings()
+        # Yeniden siralama icin tam vektorler (sirali id'lerle hizali)
+        self.vectors: Optional[np.ndarray] = None
+        self.vector_ids: Optional[np.ndarray] = None
+        self.encode_workers: int = settings.embedding_encode_workers
 
     def _select_model(self) -> str:
         """
@@ -76,9 +110,43 @@ class EmbeddingPipeline:
             self.dimension = OPENAI_DIMENSIONS.get(self.model_name, 1536)
         else:
             print(f"Model yukleniyor: {self.model_name}")
-            self.model = SentenceTransformer(self.model_name)
+            self.model = self._load_onnx() if settings.embedding_backend == "onnx" else None
+            if self.model is None:
+                # torch import'u pahali; sadece bu yolda yuklenir
+                from sentence_transformers import SentenceTransformer
+
+                self.model = SentenceTransformer(self.model_name)
+                self.backend = "torch"
             self.dimension = self.model.get_sentence_embedding_dimension()
-            print(f"Model yuklendi. Dimension: {self.dimension}")
+            print(f"Model yuklendi ({self.backend}). Dimension: {self.dimension}")
+
+            if settings.embedding_cache_enabled:
+                # Quantize model vektorleri torch ciktisindan biraz farkli; ayri anahtar
+                cache_name = self.model_name
+                if self.backend != "torch":
+                    cache_name = f"{self.model_name}#{self.backend}"
+                self.cache = EmbeddingCache(cache_name, self.dimension)
+                print(f"Embedding cache: {self.cache.path} ({len(self.cache)} kayit)")
+
+    def _load_onnx(self) -> Optional[OnnxEncoder]:
+        """
+        ONNX export'unu yukle (bkz. scripts/export_onnx.py)
+
+        Returns:
+            OnnxEncoder; export veya onnxruntime yoksa None (torch'a donulur)
+        """
+        quantized = settings.embedding_onnx_quantize
+        path = OnnxEncoder.model_dir(self.model_name)
+        if not OnnxEncoder.exists(path, quantized=quantized):
+            print(f"ONNX export bulunamadi ({path}), PyTorch kullaniliyor")
+            return None
+        try:
+            encoder = OnnxEncoder(path, quantized=quantized)
+        except ImportError:
+            print("onnxruntime kurulu degil, PyTorch kullaniliyor")
+            return None
+        self.backend = "onnx-int8" if quantized else "onnx"
+        return encoder
 
     def embed(self, text: str) -> np.ndarray:
         """
@@ -91,9 +159,10 @@ class EmbeddingPipeline:
             Embedding vektoru (1D numpy array)
         """
         # Cache kontrol
-        text_hash = str(hash(text))
-        if text_hash in self._cache:
-            return self._cache[text_hash]
+        if self.cache is not None:
+            cached = self.cache.get(text)
+            if cached is not None:
+                return cached
 
         if self.model is None:
             raise ValueError("Model yuklenmedi. Once load_model() cagirin.")
@@ -105,33 +174,102 @@ class EmbeddingPipeline:
         )
 
         # Cache'e ekle
-        self._cache[text_hash] = embedding
-        
+        if self.cache is not None:
+            self.cache.put(text, embedding)
+
         return embedding
 
-    def embed_batch(self, texts: list[str], show_progress: bool = True) -> np.ndarray:
+    def embed_batch(
+        self,
+        texts: list[str],
+        show_progress: bool = True,
+        use_cache: bool = True,
+        out_path: Optional[str | Path] = None,
+    ) -> np.ndarray:
         """
         Toplu embedding olusturma
         
         Args:
             texts: Metin listesi
             show_progress: Ilerleme cubugu goster
+            use_cache: Embedding cache'ini kullan (tek seferlik metinler icin False)
+            out_path: Verilirse sonuc bu .npy dosyasina parca parca yazilir
+                (index build'de tum matris bellekte tutulmaz)
             
         Returns:
-            Embedding matrisi (N x D)
+            Embedding matrisi (N x D; out_path verildiyse np.memmap)
         """
         if self.model is None:
             raise ValueError("Model yuklenmedi. Once load_model() cagirin.")
 
-        embeddings = self.model.encode(
+        if self.cache is None or not use_cache:
+            return self._encode(texts, show_progress, out_path=out_path)
+
+        # Sadece cache'te olmayan metinleri encode et
+        cached = self.cache.get_many(texts)
+        missing = [i for i, vec in enumerate(cached) if vec is None]
+        print(f"Embedding cache: {len(texts) - len(missing)}/{len(texts)} hazir")
+
+        if out_path is not None:
+            embeddings = np.lib.format.open_memmap(
+                str(out_path), mode="w+", dtype="float32", shape=(len(texts), self.dimension)
+            )
+        else:
+            embeddings = np.zeros((len(texts), self.dimension), dtype="float32")
+        for i, vec in enumerate(cached):
+            if vec is not None:
+                embeddings[i] = vec
+
+        if missing:
+            missing_texts = [texts[i] for i in missing]
+            encoded = self._encode(missing_texts, show_progress)
+            embeddings[missing] = encoded
+            self.cache.put_many(missing_texts, encoded)
+
+        if isinstance(embeddings, np.memmap):
+            embeddings.flush()
+        return embeddings
+
+    def _encode(
+        self,
+        texts: list[str],
+        show_progress: bool,
+        out_path: Optional[str | Path] = None,
+    ) -> np.ndarray:
+        """
+        Toplu encode (bkz. EncodeEngine)
+
+        Metinler uzunluga gore sirali, bellek butcesine gore boyutlanmis
+        batch'lerle encode edilir; buyuk listeler encode_workers > 1 ise
+        process havuzuna dagitilir.
+        """
+        return self._encode_engine().encode(
             texts,
-            show_progress_bar=show_progress,
-            convert_to_numpy=True,
-            normalize_embeddings=True,
-            batch_size=32,
+            dimension=self.dimension,
+            show_progress=show_progress,
+            out_path=out_path,
         )
 
-        return embeddings
+    def _encode_engine(self) -> EncodeEngine:
+        """Model ve ayarlara gore encode motoru"""
+        workers = self.encode_workers or os.cpu_count() or 1
+        factory = None
+        if isinstance(self.model, OnnxEncoder):
+            factory = OnnxEncoderFactory(
+                self.model.path,
+                quantized=self.model.quantized,
+                threads=max(1, (os.cpu_count() or 1) // workers),
+            )
+        elif self.backend == "torch":
+            factory = SentenceTransformerFactory(self.model_name)
+        return EncodeEngine(
+            self.model,
+            model_factory=factory,
+            workers=workers,
+            memory_mb=settings.embedding_encode_memory_mb,
+            max_batch_size=settings.embedding_encode_max_batch,
+            chunk_size=settings.embedding_encode_chunk_size,
+        )
 
     def build_index(self, embeddings: np.ndarray, metadata_list: list[dict]):
         """
@@ -144,53 +282,157 @@ class EmbeddingPipeline:
         if len(embeddings) != len(metadata_list):
             raise ValueError("Embedding ve metadata sayilari eslesmiyor")
 
+        # Embedding'ler float32 memmap ise kopyalanmaz
+        embeddings_float32 = np.ascontiguousarray(embeddings, dtype="float32")
+        ids = np.arange(len(metadata_list), dtype="int64")
+
         # Inner Product index (normalize edilmis vektorler icin cosine similarity)
-        self.index = faiss.IndexFlatIP(self.dimension)
+        # IDMap2: artimli guncellemede add_with_ids / remove_ids icin
+        # Sikistirma acik ise PCA/kesme + float16/sq8 (bkz. IndexCompression)
+        self.index = self.compression.create_index(self.dimension, embeddings_float32)
+        self.index.add_with_ids(embeddings_float32, ids)
 
-        # Embedding'leri ekle
-        embeddings_float32 = embeddings.astype("float32")
-        self.index.add(embeddings_float32)
+        if self.compression.rerank:
+            self.vectors, self.vector_ids = embeddings_float32, ids
+        else:
+            self.vectors = self.vector_ids = None
 
         # Metadata mapping
         self.id_to_metadata = {i: meta for i, meta in enumerate(metadata_list)}
 
-        print(f"Index olusturuldu: {self.index.ntotal} vektor ({self.dimension}D)")
+        print(
+            f"Index olusturuldu: {self.index.ntotal} vektor "
+            f"({self.compression.describe(self.dimension)})"
+        )
+
+    @classmethod
+    def current_index_dir(cls, base_path: Optional[str | Path] = None) -> Optional[Path]:
+        """
+        Aktif index neslinin dizinini bul
+
+        Args:
+            base_path: Vectorstore dizini (None ise settings'den alinir)
+
+        Returns:
+            Aktif nesil dizini, eski duzen icin base_path, index yoksa None
+        """
+        base = Path(base_path or settings.vector_store_path)
+
+        current = base / cls.CURRENT_FILE
+        if current.exists():
+            name = current.read_text(encoding="utf-8").strip()
+            if name and (base / name / cls.INDEX_FILE).exists():
+                return base / name
+
+        if (base / cls.INDEX_FILE).exists():
+            return base
+
+        return None
+
+    @classmethod
+    def index_exists(cls, base_path: Optional[str | Path] = None) -> bool:
+        """Kaydedilmis bir index var mi?"""
+        return cls.current_index_dir(base_path) is not None
+
+    @classmethod
+    def _generation_numbers(cls, base: Path) -> list[int]:
+        """Diskteki nesil numaralari (artan sirada)"""
+        if not base.exists():
+            return []
+        numbers = []
+        for child in base.iterdir():
+            match = cls._GENERATION_DIR.match(child.name)
+            if match and child.is_dir():
+                numbers.append(int(match.group(1)))
+        return sorted(numbers)
 
     def save_index(self, index_path: Optional[str] = None, metadata_path: Optional[str] = None):
         """
         Index ve metadata'yi kaydet
+
+        Yol verilmezse yeni bir nesil dizinine yazilir ve CURRENT dosyasi
+        atomik olarak (os.replace) yeni nesle cevrilir. Okuyucular her zaman
+        tutarli bir index + metadata cifti gorur.
         
         Args:
             index_path: FAISS index dosya yolu
-            metadata_path: Metadata pickle dosya yolu
+            metadata_path: Metadata dizini (MetadataStore)
         """
         base_path = Path(settings.vector_store_path)
         base_path.mkdir(parents=True, exist_ok=True)
 
-        index_file = Path(index_path) if index_path else base_path / "faiss.index"
-        metadata_file = Path(metadata_path) if metadata_path else base_path / "metadata.pkl"
-
+        if index_path or metadata_path:
+            index_file = Path(index_path) if index_path else base_path / self.INDEX_FILE
+            metadata_dir = (
+                Path(metadata_path) if metadata_path else base_path / self.METADATA_DIR
+            )
+            self._write_files(index_file, metadata_dir)
+            return
+
+        generation = max(self._generation_numbers(base_path), default=self.generation) + 1
+        name = f"gen-{generation:06d}"
+        tmp_dir = base_path / f".{name}.tmp"
+        if tmp_dir.exists():
+            shutil.rmtree(tmp_dir)
+        tmp_dir.mkdir()
+
+        self._write_files(tmp_dir / self.INDEX_FILE, tmp_dir / self.METADATA_DIR)
+        os.replace(tmp_dir, base_path / name)
+
+        tmp_current = base_path / f".{self.CURRENT_FILE}.tmp"
+        tmp_current.write_text(name, encoding="utf-8")
+        os.replace(tmp_current, base_path / self.CURRENT_FILE)
+
+        self.generation = generation
+        print(f"Index nesli aktif: {name}")
+
+        # Eski nesilleri temizle
+        for old in self._generation_numbers(base_path)[: -self.KEEP_GENERATIONS]:
+            shutil.rmtree(base_path / f"gen-{old:06d}", ignore_errors=True)
+
+    def _write_files(self, index_file: Path, metadata_dir: Path):
+        """FAISS index ve metadata dosyalarini yaz"""
         # FAISS index kaydet
         faiss.write_index(self.index, str(index_file))
         print(f"Index kaydedildi: {index_file}")
 
-        # Metadata kaydet
-        with open(metadata_file, "wb") as f:
-            pickle.dump(self.id_to_metadata, f)
-        print(f"Metadata kaydedildi: {metadata_file}")
+        # Yeniden siralama vektorleri (sikistirilmis index icin)
+        if self.vectors is not None:
+            np.save(index_file.parent / self.VECTORS_FILE, self.vectors)
+            np.save(index_file.parent / self.VECTOR_IDS_FILE, self.vector_ids)
 
-    def load_index(self, index_path: Optional[str] = None, metadata_path: Optional[str] = None):
+        # Metadata kaydet (kolonsal)
+        MetadataStore.write(metadata_dir, self.id_to_metadata)
+        print(f"Metadata kaydedildi: {metadata_dir}")
+
+    def load_index(
+        self,
+        index_path: Optional[str] = None,
+        metadata_path: Optional[str] = None,
+        mmap: bool = False,
+    ):
         """
         Index ve metadata'yi yukle
         
+        Metadata salt okunur mmap ile acilir (MetadataStore); eski pickle
+        formati da okunabilir.
+
         Args:
             index_path: FAISS index dosya yolu
-            metadata_path: Metadata pickle dosya yolu
+            metadata_path: Metadata dizini (MetadataStore) veya eski pickle dosyasi
+            mmap: FAISS index kodlarini salt okunur mmap ile ac (IO_FLAG_MMAP_IFC;
+                process'ler arasi page cache paylasimi, update_from_csv kullanilamaz)
         """
         base_path = Path(settings.vector_store_path)
+        index_dir = self.current_index_dir(base_path) or base_path
 
-        index_file = Path(index_path) if index_path else base_path / "faiss.index"
-        metadata_file = Path(metadata_path) if metadata_path else base_path / "metadata.pkl"
+        index_file = Path(index_path) if index_path else index_dir / self.INDEX_FILE
+        if metadata_path:
+            metadata_file = Path(metadata_path)
+        elif (index_dir / self.METADATA_DIR).exists():
+            metadata_file = index_dir / self.METADATA_DIR
+        else:
+            metadata_file = index_dir / self.METADATA_FILE
 
         if not index_file.exists():
             raise FileNotFoundError(f"Index dosyasi bulunamadi: {index_file}")
@@ -198,15 +440,154 @@ class EmbeddingPipeline:
             raise FileNotFoundError(f"Metadata dosyasi bulunamadi: {metadata_file}")
 
         # FAISS index yukle
-        self.index = faiss.read_index(str(index_file))
+        if mmap:
+            # IO_FLAG_MMAP flat/SQ index kodlarini map etmez (dosya bellege
+            # okunur); MMAP_IFC kod dizisini dosyadan zero-copy map eder ve
+            # worker'lar ayni page cache sayfalarini paylasir
+            self.index = faiss.read_index(
+                str(index_file), faiss.IO_FLAG_MMAP_IFC | faiss.IO_FLAG_READ_ONLY
+            )
+        else:
+            self.index = faiss.read_index(str(index_file))
         self.dimension = self.index.d
-        print(f"Index yuklendi: {self.index.ntotal} vektor")
+        self.index_mmap = mmap
+        print(f"Index yuklendi: {self.index.ntotal} vektor" + (" (mmap)" if mmap else ""))
+
+        # Tam vektorler her zaman mmap ile acilir; aramada sadece adaylar okunur
+        vectors_file = index_file.parent / self.VECTORS_FILE
+        if vectors_file.exists():
+            self.vectors = np.load(vectors_file, mmap_mode="r")
+            self.vector_ids = np.load(index_file.parent / self.VECTOR_IDS_FILE)
+        else:
+            self.vectors = self.vector_ids = None
 
         # Metadata yukle
-        with open(metadata_file, "rb") as f:
-            self.id_to_metadata = pickle.load(f)
+        if metadata_file.is_dir():
+            self.id_to_metadata = MetadataStore(metadata_file)
+        else:
+            # Eski format; bir sonraki save_index kolonsal yazar
+            with open(metadata_file, "rb") as f:
+                self.id_to_metadata = pickle.load(f)
         print(f"Metadata yuklendi: {len(self.id_to_metadata)} kayit")
 
+        match = self._GENERATION_DIR.match(index_file.parent.name)
+        self.generation = int(match.group(1)) if match else 0
+
+    def _ensure_writable_metadata(self):
+        """Salt okunur MetadataStore'u degistirilebilir dict'e cevir"""
+        if isinstance(self.id_to_metadata, MetadataStore):
+            self.id_to_metadata = self.id_to_metadata.to_dict()
+
+    def _ensure_id_map(self):
+        """Eski duz (IndexFlatIP) index'i ID eslemeli index'e cevir"""
+        if isinstance(self.index, faiss.IndexIDMap2):
+            return
+
+        vectors = self.index.reconstruct_n(0, self.index.ntotal)
+        ids = np.array(sorted(self.id_to_metadata.keys()), dtype="int64")
+        if len(ids) != len(vectors):
+            raise ValueError("Index ve metadata sayilari eslesmiyor, tam yeniden olusturun")
+
+        id_map = faiss.IndexIDMap2(faiss.IndexFlatIP(self.dimension))
+        id_map.add_with_ids(vectors, ids)
+        self.index = id_map
+
+    def update_from_csv(self, csv_path: str) -> dict:
+        """
+        Artimli guncelleme: CSV'yi mevcut metadata ile satir hash'ine gore
+        karsilastir, sadece yeni/degisen satirlari embed et
+
+        Degisen satir = eski hash silinir + yeni hash eklenir. Ayni satir
+        birden fazla kez varsa adetleri korunur. Maliyet degisen satir
+        sayisiyla orantilidir.
+
+        Args:
+            csv_path: Soru CSV dosya yolu
+
+        Returns:
+            {"added", "removed", "unchanged", "total"} istatistikleri
+        """
+        if self.index is None:
+            raise ValueError("Index yuklenmedi. Once load_index() veya build_index() cagirin.")
+        if self.index_mmap:
+            raise ValueError("mmap ile acilan index salt okunur; load_index(mmap=False) kullanin")
+
+        self._ensure_writable_metadata()
+        self._ensure_id_map()
+        texts, metadata_list = self.load_questions_from_csv(csv_path)
+
+        stored: dict[str, list[int]] = {}
+        for faiss_id in sorted(self.id_to_metadata):
+            meta = self.id_to_metadata[faiss_id]
+            row_hash = meta.get("row_hash") or self.row_hash(meta)
+            meta["row_hash"] = row_hash
+            stored.setdefault(row_hash, []).append(faiss_id)
+
+        wanted: dict[str, list[int]] = {}
+        for pos, meta in enumerate(metadata_list):
+            wanted.setdefault(meta["row_hash"], []).append(pos)
+
+        to_add: list[int] = []
+        to_remove: list[int] = []
+        unchanged = 0
+        for row_hash, positions in wanted.items():
+            have = stored.get(row_hash, [])
+            for faiss_id, pos in zip(have, positions):
+                # Satir icerigi ayni, sadece CSV'deki konumu degismis olabilir
+                self.id_to_metadata[faiss_id]["idx"] = metadata_list[pos]["idx"]
+                unchanged += 1
+            to_add.extend(positions[len(have):])
+            to_remove.extend(have[len(positions):])
+        for row_hash, ids in stored.items():
+            if row_hash not in wanted:
+                to_remove.extend(ids)
+
+        if to_remove:
+            removed = np.array(to_remove, dtype="int64")
+            self.index.remove_ids(removed)
+            for faiss_id in to_remove:
+                del self.id_to_metadata[faiss_id]
+            if self.vectors is not None:
+                keep = ~np.isin(self.vector_ids, removed)
+                self.vectors, self.vector_ids = self.vectors[keep], self.vector_ids[keep]
+
+        if to_add:
+            embeddings = self.embed_batch([texts[pos] for pos in to_add]).astype("float32")
+            next_id = max(self.id_to_metadata, default=-1) + 1
+            ids = np.arange(next_id, next_id + len(to_add), dtype="int64")
+            # Sikistirilmis index'te mevcut PCA / quantizer egitimi kullanilir
+            self.index.add_with_ids(embeddings, ids)
+            for faiss_id, pos in zip(ids.tolist(), to_add):
+                self.id_to_metadata[faiss_id] = metadata_list[pos]
+            if self.vectors is not None:
+                # Yeni id'ler mevcutlardan buyuk; siralama korunur
+                self.vectors = np.concatenate([self.vectors, embeddings])
+                self.vector_ids = np.concatenate([self.vector_ids, ids])
+
+        stats = {
+            "added": len(to_add),
+            "removed": len(to_remove),
+            "unchanged": unchanged,
+            "total": self.index.ntotal,
+        }
+        print(f"Artimli guncelleme: {stats}")
+        return stats
+
+    @staticmethod
+    def row_hash(meta: dict) -> str:
+        """
+        Soru satiri icin sabit icerik ozeti (CSV konumu 'idx' haric)
+
+        Args:
+            meta: load_questions_from_csv metadata dict'i
+
+        Returns:
+            SHA-256 hex ozet
+        """
+        content = {k: v for k, v in meta.items() if k not in ("idx", "row_hash")}
+        payload = json.dumps(content, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
     def search(
         self,
         query: str,
@@ -219,7 +600,7 @@ class EmbeddingPipeline:
         Args:
             query: Arama sorgusu
             top_k: Dondurelecek sonuc sayisi
-            filter_indices: Arama yapilacak index'ler (None = tumu)
+            filter_indices: Arama yapilacak FAISS id'leri (None = tumu)
             
         Returns:
             [(skor, metadata), ...] listesi
@@ -233,29 +614,146 @@ class EmbeddingPipeline:
 
         # Arama
         if filter_indices is not None and len(filter_indices) > 0:
-            # Filtrelenmis arama: Sadece belirli index'lerde ara
-            search_k = min(top_k * 3, self.index.ntotal)  # Daha fazla ara, sonra filtrele
-            scores, indices = self.index.search(query_embedding, search_k)
-
-            # Filtreleme
-            results = []
-            filter_set = set(filter_indices)
-            for score, idx in zip(scores[0], indices[0]):
-                if idx in filter_set and idx in self.id_to_metadata:
-                    results.append((float(score), self.id_to_metadata[idx]))
-                    if len(results) >= top_k:
-                        break
+            # On-filtreli arama: FAISS sadece aday id'leri skorlar, boylece
+            # top-k filtre icinde kesin (exact) olur ve dar filtrelerde eksik
+            # sonuc donmez
+            candidate_ids = np.unique(np.asarray(filter_indices, dtype="int64"))
+            scores, indices = self.search_vectors(
+                query_embedding, min(top_k, len(candidate_ids)), candidate_ids=candidate_ids
+            )
         else:
             # Tum index'te ara
-            scores, indices = self.index.search(query_embedding, top_k)
+            scores, indices = self.search_vectors(query_embedding, top_k)
 
-            results = []
-            for score, idx in zip(scores[0], indices[0]):
-                if idx != -1 and idx in self.id_to_metadata:
-                    results.append((float(score), self.id_to_metadata[idx]))
+        results = []
+        for score, idx in zip(scores[0], indices[0]):
+            if idx != -1 and idx in self.id_to_metadata:
+                results.append((float(score), self.id_to_metadata[idx]))
 
         return results
 
+    def search_vectors(
+        self,
+        queries: np.ndarray,
+        k: int,
+        candidate_ids: Optional[np.ndarray] = None,
+        rerank: bool = True,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Embedding'lerle index aramasi (sikistirilmis index'te yeniden siralamali)
+
+        Args:
+            queries: Sorgu vektorleri (Q x D, normalize)
+            k: Sorgu basina sonuc sayisi
+            candidate_ids: Sadece bu FAISS id'leri arasinda ara (sirali, tekil)
+            rerank: Tam vektorlerle yeniden sirala (varsa)
+
+        Returns:
+            (skorlar, id'ler) - Q x k; eksik sonuclar -1 id ile
+        """
+        queries = np.ascontiguousarray(queries, dtype="float32")
+        rerank = rerank and self.vectors is not None
+        search_k = k * max(1, self.compression.rerank_factor) if rerank else k
+        if candidate_ids is not None:
+            search_k = min(search_k, len(candidate_ids))
+            params = faiss.SearchParameters(sel=faiss.IDSelectorBatch(candidate_ids))
+            scores, ids = self.index.search(queries, search_k, params=params)
+        else:
+            scores, ids = self.index.search(queries, search_k)
+        if not rerank:
+            return scores, ids
+        return self._rerank(queries, ids, k)
+
+    def _rerank(self, queries: np.ndarray, ids: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+        """Adaylari tam hassasiyetli vektorlerle skorla, ilk k'yi dondur"""
+        out_scores = np.full((len(queries), k), -np.inf, dtype="float32")
+        out_ids = np.full((len(queries), k), -1, dtype="int64")
+        for row, (query, candidates) in enumerate(zip(queries, ids)):
+            candidates = candidates[candidates != -1]
+            positions = np.searchsorted(self.vector_ids, candidates)
+            found = positions < len(self.vector_ids)
+            found[found] = self.vector_ids[positions[found]] == candidates[found]
+            candidates, positions = candidates[found], positions[found]
+            if len(candidates) == 0:
+                continue
+            # Sirali okuma: mmap'te sadece aday satirlarin sayfalari okunur
+            order = np.argsort(positions)
+            exact = np.asarray(self.vectors[positions[order]]) @ query
+            best = np.argsort(-exact, kind="stable")[:k]
+            out_scores[row, : len(best)] = exact[best]
+            out_ids[row, : len(best)] = candidates[order][best]
+        return out_scores, out_ids
+
+    def evaluate_compression(
+        self,
+        vectors: Optional[np.ndarray] = None,
+        k: int = 10,
+        num_queries: int = 500,
+        seed: int = 0,
+    ) -> dict:
+        """
+        Sikistirilmis index'in duz (flat, float32) aramaya gore recall@k degeri
+
+        Kayitli vektorlerden ornek sorgular secilir; sorgunun kendisi
+        sonuclardan cikarilir. Kesin sonuc tam vektorler uzerinde brute
+        force ile hesaplanir.
+
+        Args:
+            vectors: Sirali id'lerle hizali tam vektorler (None ise self.vectors)
+            k: Karsilastirilan sonuc sayisi
+            num_queries: Ornek sorgu sayisi
+            seed: Orneklem tohumu
+
+        Returns:
+            {"k", "queries", "recall", "recall_without_rerank",
+             "bytes_per_vector", "compression_ratio", "mode"}
+        """
+        if self.index is None:
+            raise ValueError("Index yuklenmedi. Once load_index() veya build_index() cagirin.")
+        if vectors is None:
+            if self.vectors is None:
+                raise ValueError("Tam vektorler yok; vectors parametresini verin")
+            vectors, ids = self.vectors, self.vector_ids
+        else:
+            ids = np.array(sorted(self.id_to_metadata), dtype="int64")
+        if len(ids) != len(vectors):
+            raise ValueError("Vektor ve id sayilari eslesmiyor")
+
+        rng = np.random.default_rng(seed)
+        sample = np.sort(rng.choice(len(vectors), size=min(num_queries, len(vectors)), replace=False))
+        queries = np.ascontiguousarray(vectors[sample], dtype="float32")
+        k = min(k, len(vectors) - 1)
+
+        _, exact = faiss.knn(
+            queries, np.ascontiguousarray(vectors, dtype="float32"), k + 1,
+            metric=faiss.METRIC_INNER_PRODUCT,
+        )
+        exact = ids[exact]
+
+        def _recall(found: np.ndarray) -> float:
+            hits = 0
+            for query_id, truth, got in zip(ids[sample], exact, found):
+                truth = [i for i in truth if i != query_id][:k]
+                got = [i for i in got if i != query_id][:k]
+                hits += len(set(truth) & set(got))
+            return hits / (k * len(sample))
+
+        _, approx = self.search_vectors(queries, k + 1, rerank=False)
+        report = {
+            "k": k,
+            "queries": len(sample),
+            "recall_without_rerank": round(_recall(approx), 4),
+            "bytes_per_vector": IndexCompression.code_size(self.index),
+            "mode": self.compression.describe(self.dimension),
+        }
+        if self.vectors is not None:
+            _, reranked = self.search_vectors(queries, k + 1)
+            report["recall"] = round(_recall(reranked), 4)
+        else:
+            report["recall"] = report["recall_without_rerank"]
+        report["compression_ratio"] = round(self.dimension * 4 / report["bytes_per_vector"], 2)
+        return report
+
     def similarity(self, text1: str, text2: str) -> float:
         """
         Iki metin arasindaki benzerlik skoru
@@ -295,7 +793,7 @@ class EmbeddingPipeline:
                 continue
 
             texts.append(text)
-            metadata_list.append({
+            meta = {
                 "idx": idx,
                 "Soru_MetniOCR": text,
                 "Alt_Konu": row.get("Alt_Konu", ""),
@@ -308,30 +806,40 @@ class EmbeddingPipeline:
                 "ocr_karakter_sayisi": row.get("ocr_karakter_sayisi"),
                 "ocr_rakam_sayisi": row.get("ocr_rakam_sayisi"),
                 "ocr_cok_adimli": row.get("ocr_cok_adimli"),
-            })
+            }
+            meta["row_hash"] = EmbeddingPipeline.row_hash(meta)
+            metadata_list.append(meta)
 
         return texts, metadata_list
 
 
-def initialize_vectorstore(csv_path: str, force_rebuild: bool = False) -> EmbeddingPipeline:
+def initialize_vectorstore(
+    csv_path: str,
+    force_rebuild: bool = False,
+    incremental: bool = False,
+) -> EmbeddingPipeline:
     """
     Vectorstore baslat (yukle veya olustur)
     
     Args:
         csv_path: Soru CSV dosya yolu
         force_rebuild: Mevcut index'i yeniden olustur
+        incremental: Mevcut index'i CSV'deki degisikliklerle guncelle
         
     Returns:
         Baslatilmis EmbeddingPipeline
     """
     pipeline = EmbeddingPipeline()
     
-    index_path = Path(settings.vector_store_path) / "faiss.index"
-    
-    if index_path.exists() and not force_rebuild:
+    if EmbeddingPipeline.index_exists() and not force_rebuild:
         print("Mevcut index yukleniyor...")
         pipeline.load_model()
         pipeline.load_index()
+
+        if incremental:
+            stats = pipeline.update_from_csv(csv_path)
+            if stats["added"] or stats["removed"]:
+                pipeline.save_index()
     else:
         print("Yeni index olusturuluyor...")
         pipeline.load_model()
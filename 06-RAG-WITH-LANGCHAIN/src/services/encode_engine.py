@@ -0,0 +1,261 @@
+"""
+Toplu Encode Motoru
+Uzunluga gore siralama, bellek butcesine gore batch boyutu ve cok process'li encode
+"""
+
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+import numpy as np
+
+
+# Worker process'teki model (initializer ile bir kez yuklenir)
+_worker_model = None
+
+
+def _init_worker(model_factory: Callable[[], Any], threads: int):
+    """Worker baslangici: thread sayisini sabitle, modeli yukle"""
+    global _worker_model
+    os.environ["TOKENIZERS_PARALLELISM"] = "false"
+    try:
+        import torch
+
+        torch.set_num_threads(threads)
+    except ImportError:
+        pass
+    _worker_model = model_factory()
+
+
+def _encode_in_worker(texts: list[str], batch_size: int) -> np.ndarray:
+    return _encode_with(_worker_model, texts, batch_size)
+
+
+def _encode_with(model, texts: list[str], batch_size: int) -> np.ndarray:
+    return np.asarray(
+        model.encode(
+            texts,
+            show_progress_bar=False,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            batch_size=batch_size,
+        ),
+        dtype="float32",
+    )
+
+
+class SentenceTransformerFactory:
+    """Worker'da SentenceTransformer yukleyen (pickle edilebilir) fabrika"""
+
+    def __init__(self, model_name: str):
+        self.model_name = model_name
+
+    def __call__(self):
+        from sentence_transformers import SentenceTransformer
+
+        return SentenceTransformer(self.model_name, device="cpu")
+
+
+class EncodeEngine:
+    """
+    Buyuk metin listeleri icin encode motoru
+
+    - Metinler token uzunluguna gore siralanir; ayni parcadaki metinler
+      benzer uzunlukta oldugu icin padding azalir.
+    - Her parcanin batch boyutu, parcadaki en uzun dizinin aktivasyon
+      bellegi memory_mb butcesine sigacak sekilde secilir.
+    - workers > 1 ise parcalar (en uzundan baslayarak) process havuzuna
+      dagitilir; her worker modeli bir kez yukler ve cores / workers
+      thread kullanir. Sonuclar tamamlandikca cikti matrisine (istenirse
+      diskteki .npy memmap'e) yazilir; bellekte en fazla 2 x workers
+      parca bekler.
+    """
+
+    # Aktivasyon bellegi tahmini (float32, katman katman inference):
+    # token basina ~ACTIVATION_FACTOR x hidden, dizi basina heads x L^2 attention skoru
+    ACTIVATION_FACTOR = 16
+    MIN_BATCH_SIZE = 4
+    # Bundan kucuk listeler icin process havuzu baslatilmaz
+    MIN_PARALLEL_TEXTS = 1024
+
+    def __init__(
+        self,
+        model,
+        model_factory: Optional[Callable[[], Any]] = None,
+        workers: int = 1,
+        memory_mb: int = 512,
+        max_batch_size: int = 256,
+        chunk_size: int = 2048,
+    ):
+        """
+        Args:
+            model: Bu process'te kullanilan encoder (SentenceTransformer uyumlu)
+            model_factory: Worker'larda modeli yukleyen pickle edilebilir fabrika
+                (None ise workers > 1 kullanilamaz)
+            workers: Process sayisi (0 = cekirdek sayisi)
+            memory_mb: Batch basina aktivasyon bellegi butcesi
+            max_batch_size: Batch boyutu ust siniri
+            chunk_size: Worker'a tek seferde gonderilen metin sayisi
+        """
+        self.model = model
+        self.model_factory = model_factory
+        self.workers = workers or os.cpu_count() or 1
+        self.memory_mb = memory_mb
+        self.max_batch_size = max_batch_size
+        self.chunk_size = chunk_size
+
+        self.hidden, self.heads, self.max_length = self._model_shape(model)
+
+    @staticmethod
+    def _model_shape(model) -> tuple[int, int, int]:
+        """(hidden boyutu, attention head sayisi, maksimum dizi uzunlugu)"""
+        def _int(value, default: int) -> int:
+            return value if isinstance(value, int) and value > 0 else default
+
+        hidden = 768
+        if hasattr(model, "get_sentence_embedding_dimension"):
+            hidden = _int(model.get_sentence_embedding_dimension(), hidden)
+        heads = 12
+        try:
+            config = model[0].auto_model.config
+            hidden = _int(getattr(config, "hidden_size", None), hidden)
+            heads = _int(getattr(config, "num_attention_heads", None), heads)
+        except (TypeError, IndexError, KeyError, AttributeError):
+            pass
+        max_length = _int(getattr(model, "max_seq_length", None), 512)
+        return hidden, heads, max_length
+
+    def token_lengths(self, texts: list[str]) -> np.ndarray:
+        """Token uzunluklari (tokenizer yoksa karakter sayisindan tahmin)"""
+        tokenizer = getattr(self.model, "tokenizer", None)
+        if tokenizer is not None:
+            encoded = tokenizer(
+                texts,
+                add_special_tokens=True,
+                truncation=True,
+                max_length=self.max_length,
+            )["input_ids"]
+            lengths = np.fromiter((len(ids) for ids in encoded), dtype=np.int64, count=len(texts))
+        else:
+            lengths = np.fromiter((len(t) // 4 + 2 for t in texts), dtype=np.int64, count=len(texts))
+        return np.minimum(lengths, self.max_length)
+
+    def batch_size_for(self, length: int) -> int:
+        """Verilen dizi uzunlugu icin bellek butcesine sigan batch boyutu"""
+        length = max(1, int(length))
+        per_sequence = 4 * (
+            length * self.hidden * self.ACTIVATION_FACTOR + self.heads * length * length
+        )
+        size = int(self.memory_mb * 1024 * 1024 // per_sequence)
+        return max(self.MIN_BATCH_SIZE, min(self.max_batch_size, size))
+
+    def plan(self, texts: list[str]) -> list[tuple[np.ndarray, int]]:
+        """
+        Metinleri uzunluga gore sirali parcalara bol
+
+        Returns:
+            [(orijinal indeksler, batch_size), ...] - en uzun parca once
+        """
+        lengths = self.token_lengths(texts)
+        order = np.argsort(-lengths, kind="stable")
+        chunks = []
+        for start in range(0, len(order), self.chunk_size):
+            indices = order[start : start + self.chunk_size]
+            chunks.append((indices, self.batch_size_for(lengths[indices[0]])))
+        return chunks
+
+    def encode(
+        self,
+        texts: list[str],
+        dimension: int,
+        show_progress: bool = False,
+        out_path: Optional[str | Path] = None,
+    ) -> np.ndarray:
+        """
+        Metinleri encode et (normalize edilmis float32)
+
+        Args:
+            texts: Metin listesi
+            dimension: Embedding boyutu
+            show_progress: Ilerleme cubugu goster
+            out_path: Verilirse sonuc bu .npy dosyasina memmap olarak yazilir
+
+        Returns:
+            N x D matris (out_path verildiyse np.memmap)
+        """
+        if out_path is not None:
+            out = np.lib.format.open_memmap(
+                str(out_path), mode="w+", dtype="float32", shape=(len(texts), dimension)
+            )
+        else:
+            out = np.empty((len(texts), dimension), dtype="float32")
+        if not texts:
+            return out
+
+        chunks = self.plan(texts)
+        progress = None
+        if show_progress:
+            from tqdm.auto import tqdm
+
+            progress = tqdm(total=len(texts), desc="Encode", unit="metin")
+
+        parallel = (
+            self.workers > 1
+            and self.model_factory is not None
+            and len(texts) >= self.MIN_PARALLEL_TEXTS
+        )
+        try:
+            if parallel:
+                self._encode_parallel(texts, chunks, out, progress)
+            else:
+                for indices, batch_size in chunks:
+                    out[indices] = _encode_with(self.model, [texts[i] for i in indices], batch_size)
+                    if progress is not None:
+                        progress.update(len(indices))
+        finally:
+            if progress is not None:
+                progress.close()
+
+        if isinstance(out, np.memmap):
+            out.flush()
+        return out
+
+    def _encode_parallel(self, texts, chunks, out, progress):
+        """Parcalari process havuzunda encode et, bittikce out'a yaz"""
+        workers = min(self.workers, len(chunks))
+        threads = max(1, (os.cpu_count() or 1) // workers)
+        print(f"Encode: {len(texts)} metin, {len(chunks)} parca, {workers} process x {threads} thread")
+
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self.model_factory, threads),
+        ) as pool:
+            queue = iter(chunks)
+            running = {}
+
+            def _submit():
+                item = next(queue, None)
+                if item is None:
+                    return False
+                indices, batch_size = item
+                future = pool.submit(_encode_in_worker, [texts[i] for i in indices], batch_size)
+                running[future] = indices
+                return True
+
+            # Bellekte bekleyen sonuc sayisini sinirla
+            for _ in range(2 * workers):
+                if not _submit():
+                    break
+
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    indices = running.pop(future)
+                    out[indices] = future.result()
+                    if progress is not None:
+                        progress.update(len(indices))
+                    _submit()
@@ -3,9 +3,13 @@ R-02: Filtreleme Sistemi
 Alt konu, zorluk ve gorsel tipine gore filtreleme
 """
 
-from typing import Optional
+from typing import Optional, Union
 from dataclasses import dataclass, field
 
+import numpy as np
+
+from .metadata_store import MetadataStore
+
 
 @dataclass
 class FilterCriteria:
@@ -39,61 +43,199 @@ class FilterService:
     """
     Soru metadata filtreleme servisi
     
+    Metadata kurulusta kolonlara cevrilir:
+    - Kategorik alanlar (Alt_Konu, Gorsel_Tipi, Kaynak_Tipi, is_LGS, Zorluk)
+      icin her deger basina onceden hesaplanmis bitmap (bool maske)
+    - Zorluk aralik sorgulari icin sirali Zorluk kolonu (searchsorted)
+    
+    Boylece FilterCriteria her cagrida metadata'yi taramak yerine birkac
+    vektorel AND islemiyle cozulur. MetadataStore verildiginde kolonlar
+    dogrudan depodaki dizilerden kodlanir; satir nesnesi sadece filter()
+    sonucu icin olusturulur.
+    
     Kullanim:
         filter_service = FilterService(metadata_list)
         filtered = filter_service.filter(FilterCriteria(alt_konu="ebob_ekok"))
     """
 
-    def __init__(self, metadata_list: list[dict]):
+    # Bitmap tutulan kategorik alanlar
+    BITMAP_FIELDS = ("Alt_Konu", "Gorsel_Tipi", "Kaynak_Tipi", "is_LGS", "Zorluk")
+
+    def __init__(
+        self,
+        metadata_list: Union[list[dict], MetadataStore],
+        ids: Optional[list[int]] = None,
+    ):
         """
         Args:
-            metadata_list: Soru metadata listesi
+            metadata_list: Soru metadata listesi veya kolonsal MetadataStore
+            ids: Her metadata'nin FAISS id'si (None ise 0..N-1 sirasi,
+                MetadataStore icin depodaki id'ler)
         """
-        self.all_metadata = metadata_list
-
-    def filter(self, criteria: FilterCriteria) -> list[dict]:
+        if isinstance(metadata_list, MetadataStore):
+            self._store = metadata_list
+            self._metadata = None
+            self._id_array = np.asarray(metadata_list.ids(), dtype="int64")
+            self._row = metadata_list.row
+            factorize = metadata_list.factorize
+        else:
+            self._store = None
+            self._metadata = metadata_list
+            ids = list(ids) if ids is not None else list(range(len(metadata_list)))
+            if len(ids) != len(metadata_list):
+                raise ValueError("Metadata ve id sayilari eslesmiyor")
+            self._id_array = np.asarray(ids, dtype="int64")
+            self._row = metadata_list.__getitem__
+            factorize = self._factorize
+
+        self._build_columns(factorize)
+
+    @classmethod
+    def from_id_map(cls, id_to_metadata: Union[dict[int, dict], MetadataStore]) -> "FilterService":
         """
-        Kriterlere gore metadata'lari filtrele
-        
+        EmbeddingPipeline.id_to_metadata'dan olustur (FAISS id'leri korunur)
+
         Args:
-            criteria: Filtreleme kriterleri
-            
+            id_to_metadata: {faiss_id: metadata} eslemesi veya MetadataStore
+                (eski pickle formati ve artimli guncelleme sonrasi dict gelir)
+
         Returns:
-            Filtrelenmis metadata listesi
+            FilterService instance
         """
-        if criteria.is_empty():
-            return self.all_metadata.copy()
-
-        results = self.all_metadata.copy()
+        if isinstance(id_to_metadata, MetadataStore):
+            return cls(id_to_metadata)
+        return cls(list(id_to_metadata.values()), ids=list(id_to_metadata.keys()))
+
+    @property
+    def ids(self) -> list[int]:
+        """Satir sirasiyla FAISS id'leri"""
+        return self._id_array.tolist()
+
+    @property
+    def all_metadata(self) -> list:
+        """Tum metadata satirlari (MetadataStore icin satir gorunumleri)"""
+        if self._store is not None:
+            return [self._store.row(pos) for pos in range(self._size)]
+        return self._metadata
+
+    def _factorize(self, name: str) -> tuple[list, np.ndarray]:
+        """dict listesinden kolon kodlari (MetadataStore.factorize ile ayni sozlesme)"""
+        index: dict = {}
+        codes = np.full(len(self._metadata), -1, dtype="int64")
+        for pos, meta in enumerate(self._metadata):
+            if name in meta:
+                codes[pos] = index.setdefault(self._value_key(meta[name]), len(index))
+        return list(index), codes
+
+    def _build_columns(self, factorize):
+        """Kodlanmis kolonlardan bitmap'leri ve sirali Zorluk kolonunu olustur"""
+        n = len(self._id_array)
+        self._size = n
+        self._all_mask = np.ones(n, dtype=bool)
+
+        # Deger -> bitmap (ayni anahtara dusen degerler birlestirilir)
+        self._bitmaps: dict[str, dict] = {}
+        columns = {}
+        for name in self.BITMAP_FIELDS:
+            values, codes = factorize(name)
+            columns[name] = (values, codes)
+
+            bitmaps: dict = {}
+            for code, value in enumerate(values):
+                mask = codes == code
+                key = self._value_key(value)
+                bitmaps[key] = bitmaps[key] | mask if key in bitmaps else mask
+            self._bitmaps[name] = bitmaps
+
+        # Aralik sorgulari icin sirali Zorluk (eksik alan 0 sayilir);
+        # float donusumu sadece benzersiz degerler icin yapilir, kod -1 son
+        # elemana (0) duser
+        values, codes = columns["Zorluk"]
+        lookup = np.array([self._to_float(v) for v in values] + [0.0], dtype="float64")
+        zorluk = lookup[codes]
+        self._zorluk_order = np.argsort(zorluk, kind="stable")
+        self._zorluk_sorted = zorluk[self._zorluk_order]
+
+    @staticmethod
+    def _value_key(value):
+        """NaN degerleri (pandas bos hucre) tek bir None anahtarinda topla"""
+        if isinstance(value, float) and value != value:
+            return None
+        return value
+
+    @staticmethod
+    def _to_float(value) -> float:
+        """Sayisal olmayan degerleri NaN yap (hicbir araliga girmez)"""
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return float("nan")
+
+    def _bitmap(self, field_name: str, value) -> np.ndarray:
+        """Tek deger icin bitmap (deger yoksa bos maske)"""
+        mask = self._bitmaps[field_name].get(value)
+        if mask is None:
+            return np.zeros(self._size, dtype=bool)
+        return mask
+
+    def _range_mask(self, min_z: float, max_z: float) -> np.ndarray:
+        """Sirali Zorluk kolonu uzerinden kapali aralik maskesi"""
+        lo = np.searchsorted(self._zorluk_sorted, min_z, side="left")
+        hi = np.searchsorted(self._zorluk_sorted, max_z, side="right")
+        mask = np.zeros(self._size, dtype=bool)
+        mask[self._zorluk_order[lo:hi]] = True
+        return mask
+
+    def _mask(self, criteria: FilterCriteria) -> np.ndarray:
+        """
+        Kriterleri vektorel AND ile tek bir maskeye indir
+        """
+        mask = self._all_mask
 
         # Alt konu filtresi
         if criteria.alt_konu:
-            results = [m for m in results if m.get("Alt_Konu") == criteria.alt_konu]
+            mask = mask & self._bitmap("Alt_Konu", criteria.alt_konu)
 
         # Zorluk filtresi (tam eslesme)
         if criteria.zorluk:
-            results = [m for m in results if m.get("Zorluk") == criteria.zorluk]
+            mask = mask & self._bitmap("Zorluk", criteria.zorluk)
 
         # Zorluk aralik filtresi
         if criteria.zorluk_range:
             min_z, max_z = criteria.zorluk_range
-            results = [
-                m for m in results if min_z <= m.get("Zorluk", 0) <= max_z
-            ]
+            mask = mask & self._range_mask(min_z, max_z)
 
         # Gorsel tipi filtresi
         if criteria.gorsel_tipi:
-            results = [m for m in results if m.get("Gorsel_Tipi") == criteria.gorsel_tipi]
+            mask = mask & self._bitmap("Gorsel_Tipi", criteria.gorsel_tipi)
 
-        # Kaynak tipi filtresi
+        # Kaynak tipi filtresi (degerler arasi OR)
         if criteria.kaynak_tipi:
-            results = [m for m in results if m.get("Kaynak_Tipi") in criteria.kaynak_tipi]
+            kaynak_mask = np.zeros(self._size, dtype=bool)
+            for kaynak in criteria.kaynak_tipi:
+                kaynak_mask |= self._bitmap("Kaynak_Tipi", kaynak)
+            mask = mask & kaynak_mask
 
         # is_LGS filtresi
         if criteria.is_lgs is not None:
-            results = [m for m in results if m.get("is_LGS") == criteria.is_lgs]
+            mask = mask & self._bitmap("is_LGS", criteria.is_lgs)
+
+        return mask
+
+    def filter(self, criteria: FilterCriteria) -> list[dict]:
+        """
+        Kriterlere gore metadata'lari filtrele
+        
+        Args:
+            criteria: Filtreleme kriterleri
+            
+        Returns:
+            Filtrelenmis metadata listesi
+        """
+        if criteria.is_empty():
+            return self.all_metadata.copy()
 
-        return results
+        return [self._row(int(pos)) for pos in np.flatnonzero(self._mask(criteria))]
 
     def filter_indices(self, criteria: FilterCriteria) -> list[int]:
         """
@@ -104,48 +246,18 @@ class FilterService:
             criteria: Filtreleme kriterleri
             
         Returns:
-            Gecerli FAISS index listesi (sequential 0-based indices)
-        """
-        indices = []
-        for i, meta in enumerate(self.all_metadata):
-            if self._matches(meta, criteria):
-                # Use sequential position index (i), not original CSV row index
-                # This matches the FAISS index keys in id_to_metadata
-                indices.append(i)
-        return indices
-
-    def _matches(self, meta: dict, criteria: FilterCriteria) -> bool:
-        """
-        Tek metadata'nin kriterlere uyup uymadigini kontrol et
+            Gecerli FAISS id listesi (id_to_metadata anahtarlari)
         """
-        if criteria.alt_konu and meta.get("Alt_Konu") != criteria.alt_konu:
-            return False
-
-        if criteria.zorluk and meta.get("Zorluk") != criteria.zorluk:
-            return False
-
-        if criteria.zorluk_range:
-            z = meta.get("Zorluk", 0)
-            if not (criteria.zorluk_range[0] <= z <= criteria.zorluk_range[1]):
-                return False
-
-        if criteria.gorsel_tipi and meta.get("Gorsel_Tipi") != criteria.gorsel_tipi:
-            return False
-
-        if criteria.kaynak_tipi and meta.get("Kaynak_Tipi") not in criteria.kaynak_tipi:
-            return False
-
-        if criteria.is_lgs is not None and meta.get("is_LGS") != criteria.is_lgs:
-            return False
-
-        return True
+        # Orijinal CSV satir index'i degil, FAISS id'si kullanilir
+        # Bu, id_to_metadata anahtarlariyla eslesir
+        return self._id_array[self._mask(criteria)].tolist()
 
     def get_statistics(self) -> dict:
         """
         Metadata istatistiklerini don
         """
         stats = {
-            "total": len(self.all_metadata),
+            "total": self._size,
             "alt_konu": {},
             "zorluk": {},
             "gorsel_tipi": {},
@@ -0,0 +1,125 @@
+"""
+Index Sikistirma
+PCA / boyut kesme ve float16 / 8-bit skaler quantization ile kucuk FAISS index'leri
+"""
+
+from dataclasses import dataclass
+
+import faiss
+import numpy as np
+
+from ..config import settings
+
+
+@dataclass
+class IndexCompression:
+    """
+    FAISS index sikistirma ayarlari
+
+    - reduction: none, pca (ogrenilen PCAMatrix) veya truncate (ilk dim
+      boyut; Matryoshka egitimli modeller icin). Indirgenen vektorler
+      yeniden normalize edilir.
+    - storage: float32, float16 (QT_fp16) veya sq8 (QT_8bit,
+      IndexScalarQuantizer)
+    - rerank_factor: Sikistirilmis index'ten top_k x rerank_factor aday
+      alinir ve tam hassasiyetli vektorlerle yeniden siralanir (0 = kapali;
+      tam vektorler diske yazilmaz)
+
+    Varsayilan ayarlarda sikistirma kapali, index IndexFlatIP'dir.
+    """
+
+    reduction: str = "none"
+    dim: int = 256
+    storage: str = "float32"
+    rerank_factor: int = 4
+
+    STORAGE_TYPES = {
+        "float16": faiss.ScalarQuantizer.QT_fp16,
+        "sq8": faiss.ScalarQuantizer.QT_8bit,
+    }
+
+    def __post_init__(self):
+        if self.reduction not in ("none", "pca", "truncate"):
+            raise ValueError(f"Gecersiz boyut indirgeme: {self.reduction}")
+        if self.storage != "float32" and self.storage not in self.STORAGE_TYPES:
+            raise ValueError(f"Gecersiz index saklama tipi: {self.storage}")
+
+    @classmethod
+    def from_settings(cls) -> "IndexCompression":
+        return cls(
+            reduction=settings.index_reduction,
+            dim=settings.index_dim,
+            storage=settings.index_storage,
+            rerank_factor=settings.index_rerank_factor,
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.reduction != "none" or self.storage != "float32"
+
+    @property
+    def rerank(self) -> bool:
+        """Tam hassasiyetli yeniden siralama yapilacak mi?"""
+        return self.enabled and self.rerank_factor > 0
+
+    def output_dim(self, dimension: int) -> int:
+        """Index'te saklanan vektor boyutu"""
+        return dimension if self.reduction == "none" else min(self.dim, dimension)
+
+    def describe(self, dimension: int) -> str:
+        if not self.enabled:
+            return f"flat float32 ({dimension}D)"
+        reduction = "" if self.reduction == "none" else f"{self.reduction} {dimension}->"
+        rerank = f", rerank x{self.rerank_factor}" if self.rerank else ""
+        return f"{reduction}{self.output_dim(dimension)}D {self.storage}{rerank}"
+
+    def create_index(self, dimension: int, train_vectors: np.ndarray) -> faiss.Index:
+        """
+        Bos (egitilmis) ID eslemeli index olustur
+
+        Args:
+            dimension: Giris vektor boyutu
+            train_vectors: PCA / quantizer egitim vektorleri (N x D, float32)
+
+        Returns:
+            IndexIDMap2; giris her zaman tam boyutlu vektor alir
+
+        Raises:
+            ValueError: PCA icin yeterli egitim vektoru yoksa
+        """
+        if not self.enabled:
+            return faiss.IndexIDMap2(faiss.IndexFlatIP(dimension))
+
+        out_dim = self.output_dim(dimension)
+        if self.storage == "float32":
+            index = faiss.IndexFlatIP(out_dim)
+        else:
+            index = faiss.IndexScalarQuantizer(
+                out_dim, self.STORAGE_TYPES[self.storage], faiss.METRIC_INNER_PRODUCT
+            )
+
+        if self.reduction != "none":
+            if self.reduction == "pca":
+                if len(train_vectors) < out_dim:
+                    raise ValueError(
+                        f"PCA icin en az {out_dim} vektor gerekli ({len(train_vectors)} var)"
+                    )
+                transform = faiss.PCAMatrix(dimension, out_dim)
+            else:
+                transform = faiss.RemapDimensionsTransform(dimension, out_dim, False)
+            index = faiss.IndexPreTransform(index)
+            # Indirgenmis vektorler icin inner product = cosine
+            index.prepend_transform(faiss.NormalizationTransform(out_dim))
+            index.prepend_transform(transform)
+
+        index = faiss.IndexIDMap2(index)
+        if not index.is_trained:
+            index.train(np.ascontiguousarray(train_vectors, dtype="float32"))
+        return index
+
+    @staticmethod
+    def code_size(index: faiss.Index) -> int:
+        """Index'te vektor basina byte (ID eslemesi haric)"""
+        if isinstance(index, (faiss.IndexIDMap, faiss.IndexIDMap2)):
+            index = faiss.downcast_index(index.index)
+        return index.sa_code_size()
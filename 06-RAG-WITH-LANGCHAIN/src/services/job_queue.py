@@ -0,0 +1,459 @@
+"""
+Kalici Uretim Is Kuyrugu
+Binlerce soruluk uretim islerini arka planda, kaldigi yerden devam ederek calistirma
+"""
+
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import AsyncIterator, Optional
+
+from ..config import settings
+from .question_generator import BatchItemResult, QuestionGenerator
+
+
+class JobStatus:
+    """Is durumlari"""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+    TERMINAL = (DONE, FAILED, CANCELLED)
+
+
+class GenerationJobQueue:
+    """
+    SQLite tabanli, kalici soru uretim kuyrugu
+
+    Yapi (generated_questions_path/jobs.sqlite):
+    - jobs: is kaydi, durum ve son canlilik sinyali (heartbeat)
+    - items: is basina kalemler (kombinasyon, stil, sonuc)
+
+    Her kalem tamamlandiginda sonucu hemen commit edilir. Is calisirken
+    heartbeat kalem bitislerinden bagimsiz olarak HEARTBEAT_INTERVAL'da bir
+    tazelenir (uzun bir parca STALE_AFTER'i asabilir). Process coker veya
+    yeniden baslarsa is, heartbeat'i STALE_AFTER saniyeden eskiyse baska bir
+    worker tarafindan devralinir ve sadece bekleyen kalemler calistirilir;
+    tamamlanmis kalemler icin tekrar LLM cagrisi yapilmaz. Is sahiplenme
+    BEGIN IMMEDIATE ile yapildigindan ayni dosyayi birden fazla uvicorn
+    worker'i paylasabilir.
+    """
+
+    CHUNK_SIZE = 32
+    STALE_AFTER = 300.0
+    HEARTBEAT_INTERVAL = 30.0
+    POLL_INTERVAL = 5.0
+
+    def __init__(self, path: Optional[str | Path] = None, workers: Optional[int] = None):
+        """
+        Args:
+            path: Kuyruk dizini (None ise generated_questions_path)
+            workers: Ayni anda islenecek is sayisi (None ise settings'den alinir)
+        """
+        self.path = Path(path or settings.generated_questions_path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.workers = workers or settings.job_workers
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(
+            str(self.path / "jobs.sqlite"),
+            timeout=30,
+            isolation_level=None,  # Her kalem ayri commit edilir
+            check_same_thread=False,
+        )
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                total INTEGER NOT NULL,
+                params TEXT NOT NULL,
+                error TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL,
+                heartbeat REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS items (
+                job_id TEXT NOT NULL,
+                idx INTEGER NOT NULL,
+                combination TEXT NOT NULL,
+                style TEXT,
+                status TEXT NOT NULL,
+                result TEXT,
+                error TEXT,
+                error_type TEXT,
+                elapsed REAL,
+                PRIMARY KEY (job_id, idx)
+            );
+            CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status, created_at);
+            CREATE INDEX IF NOT EXISTS idx_items_status ON items(job_id, status, idx);
+            """
+        )
+
+        self._tasks: list[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+
+    # ------------------------------------------------------------------
+    # Is yonetimi
+    # ------------------------------------------------------------------
+
+    def submit(
+        self,
+        jobs: list[tuple[dict, Optional[str]]],
+        params: Optional[dict] = None,
+    ) -> str:
+        """
+        Yeni uretim isi olustur
+
+        Args:
+            jobs: [(combination, style_instruction), ...] listesi
+            params: Istekle ilgili ek bilgiler (kayit icin)
+
+        Returns:
+            Is kimligi
+        """
+        job_id = uuid.uuid4().hex
+        now = time.time()
+
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                self._db.execute(
+                    "INSERT INTO jobs(id, status, total, params, created_at, updated_at, heartbeat)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (job_id, JobStatus.QUEUED, len(jobs), json.dumps(params or {}), now, now, now),
+                )
+                self._db.executemany(
+                    "INSERT INTO items(job_id, idx, combination, style, status) VALUES (?, ?, ?, ?, 'pending')",
+                    [
+                        (job_id, i, json.dumps(combo, ensure_ascii=False), style)
+                        for i, (combo, style) in enumerate(jobs)
+                    ],
+                )
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return job_id
+
+    def get_job(self, job_id: str) -> Optional[dict]:
+        """
+        Is durumu ve ilerlemesi
+
+        Args:
+            job_id: Is kimligi
+
+        Returns:
+            Durum dict'i veya None (is yoksa)
+        """
+        with self._lock:
+            job = self._db.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if job is None:
+                return None
+            counts = dict(
+                self._db.execute(
+                    "SELECT status, COUNT(*) FROM items WHERE job_id = ? GROUP BY status",
+                    (job_id,),
+                ).fetchall()
+            )
+
+        done = counts.get("done", 0)
+        failed = counts.get("failed", 0)
+        return {
+            "job_id": job_id,
+            "status": job["status"],
+            "total": job["total"],
+            "completed": done,
+            "failed": failed,
+            "pending": counts.get("pending", 0),
+            "progress": round((done + failed) / job["total"], 4) if job["total"] else 1.0,
+            "params": json.loads(job["params"]),
+            "error": job["error"],
+            "created_at": job["created_at"],
+            "updated_at": job["updated_at"],
+        }
+
+    def list_jobs(self, limit: int = 20) -> list[dict]:
+        """Son isler (yeniden eskiye)"""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT id FROM jobs ORDER BY created_at DESC LIMIT ?", (limit,)
+            ).fetchall()
+        return [self.get_job(row["id"]) for row in rows]
+
+    def get_results(
+        self,
+        job_id: str,
+        offset: int = 0,
+        limit: int = 100,
+        include_failures: bool = False,
+    ) -> list[dict]:
+        """
+        Tamamlanan kalemleri sayfa sayfa getir (kalem sirasinda)
+
+        Args:
+            job_id: Is kimligi
+            offset: Atlanacak kayit sayisi
+            limit: Sayfa boyutu
+            include_failures: Basarisiz kalemleri de dondur
+
+        Returns:
+            [{"index", "status", "question" | "error", ...}] listesi
+        """
+        statuses = ("done", "failed") if include_failures else ("done",)
+        placeholders = ",".join("?" * len(statuses))
+
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT * FROM items WHERE job_id = ? AND status IN ({placeholders})"
+                " ORDER BY idx LIMIT ? OFFSET ?",
+                (job_id, *statuses, limit, offset),
+            ).fetchall()
+
+        results = []
+        for row in rows:
+            record = {
+                "index": row["idx"],
+                "status": row["status"],
+                "combination": json.loads(row["combination"]),
+            }
+            if row["status"] == "done":
+                record["question"] = json.loads(row["result"])
+            else:
+                record["error"] = row["error"]
+                record["error_type"] = row["error_type"]
+            results.append(record)
+        return results
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        Isi iptal et (devam eden kalemler tamamlanir, yenileri baslatilmaz)
+
+        Returns:
+            Is iptal edildiyse True
+        """
+        with self._lock:
+            cursor = self._db.execute(
+                "UPDATE jobs SET status = ?, updated_at = ? WHERE id = ? AND status IN (?, ?)",
+                (JobStatus.CANCELLED, time.time(), job_id, JobStatus.QUEUED, JobStatus.RUNNING),
+            )
+        return cursor.rowcount > 0
+
+    async def iter_progress(
+        self,
+        job_id: str,
+        interval: float = 1.0,
+    ) -> AsyncIterator[dict]:
+        """
+        Is ilerlemesini degistikce don, is bitince dur
+
+        Args:
+            job_id: Is kimligi
+            interval: Yoklama araligi (saniye)
+
+        Yields:
+            get_job() durum dict'i
+        """
+        last = None
+        while True:
+            state = self.get_job(job_id)
+            if state is None:
+                return
+            snapshot = (state["status"], state["completed"], state["failed"])
+            if snapshot != last:
+                last = snapshot
+                yield state
+            if state["status"] in JobStatus.TERMINAL:
+                return
+            await asyncio.sleep(interval)
+
+    # ------------------------------------------------------------------
+    # Calistirma
+    # ------------------------------------------------------------------
+
+    def _claim_job(self) -> Optional[str]:
+        """Siradaki (veya sahibi dusmus) isi sahiplen"""
+        now = time.time()
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._db.execute(
+                    "SELECT id FROM jobs WHERE status = ? OR (status = ? AND heartbeat < ?)"
+                    " ORDER BY created_at LIMIT 1",
+                    (JobStatus.QUEUED, JobStatus.RUNNING, now - self.STALE_AFTER),
+                ).fetchone()
+                if row is not None:
+                    self._db.execute(
+                        "UPDATE jobs SET status = ?, updated_at = ?, heartbeat = ? WHERE id = ?",
+                        (JobStatus.RUNNING, now, now, row["id"]),
+                    )
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+
+        return row["id"] if row is not None else None
+
+    def _status(self, job_id: str) -> Optional[str]:
+        with self._lock:
+            row = self._db.execute("SELECT status FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return row["status"] if row else None
+
+    def _params(self, job_id: str) -> dict:
+        with self._lock:
+            row = self._db.execute("SELECT params FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return json.loads(row["params"]) if row else {}
+
+    def _pending_items(self, job_id: str, limit: int) -> list[tuple[int, dict, Optional[str]]]:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT idx, combination, style FROM items"
+                " WHERE job_id = ? AND status = 'pending' ORDER BY idx LIMIT ?",
+                (job_id, limit),
+            ).fetchall()
+        return [(row["idx"], json.loads(row["combination"]), row["style"]) for row in rows]
+
+    def _record(self, job_id: str, idx: int, item: BatchItemResult):
+        """Kalem sonucunu kalici olarak yaz ve heartbeat'i tazele"""
+        now = time.time()
+        result = (
+            json.dumps(item.question.model_dump(mode="json"), ensure_ascii=False)
+            if item.ok
+            else None
+        )
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                self._db.execute(
+                    "UPDATE items SET status = ?, result = ?, error = ?, error_type = ?, elapsed = ?"
+                    " WHERE job_id = ? AND idx = ?",
+                    (
+                        "done" if item.ok else "failed",
+                        result,
+                        item.error,
+                        item.error_type,
+                        item.elapsed,
+                        job_id,
+                        idx,
+                    ),
+                )
+                self._db.execute(
+                    "UPDATE jobs SET updated_at = ?, heartbeat = ? WHERE id = ?",
+                    (now, now, job_id),
+                )
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+
+    def _touch(self, job_id: str):
+        """Calisan isin heartbeat'ini tazele"""
+        with self._lock:
+            self._db.execute(
+                "UPDATE jobs SET heartbeat = ? WHERE id = ? AND status = ?",
+                (time.time(), job_id, JobStatus.RUNNING),
+            )
+
+    async def _heartbeat(self, job_id: str):
+        """Is calistigi surece periyodik heartbeat"""
+        while True:
+            await asyncio.sleep(self.HEARTBEAT_INTERVAL)
+            self._touch(job_id)
+
+    def _set_status(self, job_id: str, status: str, error: Optional[str] = None):
+        """Is durumunu guncelle (iptal edilmis isler iptal kalir)"""
+        with self._lock:
+            self._db.execute(
+                "UPDATE jobs SET status = ?, error = ?, updated_at = ? WHERE id = ? AND status != ?",
+                (status, error, time.time(), job_id, JobStatus.CANCELLED),
+            )
+
+    async def run_job(
+        self,
+        generator: QuestionGenerator,
+        job_id: str,
+        max_attempts: int = 1,
+    ):
+        """
+        Bir isin bekleyen kalemlerini parcalar halinde calistir
+
+        Args:
+            generator: Soru uretici
+            job_id: Is kimligi
+            max_attempts: Kalem basina maksimum deneme sayisi (is
+                params'inda max_attempts varsa o kullanilir)
+        """
+        max_attempts = self._params(job_id).get("max_attempts") or max_attempts
+        heartbeat = asyncio.create_task(self._heartbeat(job_id))
+        try:
+            while self._status(job_id) == JobStatus.RUNNING:
+                pending = self._pending_items(job_id, self.CHUNK_SIZE)
+                if not pending:
+                    self._set_status(job_id, JobStatus.DONE)
+                    return
+
+                jobs = [(combo, style) for _, combo, style in pending]
+                async for item in generator.iter_batch(jobs, max_attempts=max_attempts):
+                    self._record(job_id, pending[item.index][0], item)
+        finally:
+            heartbeat.cancel()
+
+    async def _worker(self, generator: QuestionGenerator, max_attempts: int):
+        """Kuyruktan is alip calistiran dongu"""
+        while True:
+            self._wakeup.clear()
+            job_id = self._claim_job()
+            if job_id is None:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.POLL_INTERVAL)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            try:
+                await self.run_job(generator, job_id, max_attempts=max_attempts)
+            except asyncio.CancelledError:
+                # Temiz kapanis: is heartbeat beklenmeden devralinabilsin
+                self._set_status(job_id, JobStatus.QUEUED)
+                raise
+            except Exception as e:
+                print(f"Is basarisiz: {job_id}. Hata: {e}")
+                self._set_status(job_id, JobStatus.FAILED, error=str(e))
+
+    def start(self, generator: QuestionGenerator, max_attempts: int = 1):
+        """
+        Arka plan worker'larini baslat (calisan event loop icinde)
+
+        Args:
+            generator: Soru uretici
+            max_attempts: Kalem basina maksimum deneme sayisi
+        """
+        self._wakeup = asyncio.Event()
+        self._tasks = [
+            asyncio.create_task(self._worker(generator, max_attempts))
+            for _ in range(self.workers)
+        ]
+
+    async def stop(self):
+        """Worker'lari durdur; yarim kalan isleri hemen devralinabilir birak"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def close(self):
+        """Baglantiyi kapat"""
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,206 @@
+"""
+LLM Yanit Cache'i
+Prompt parmak izine gore deterministik, disk tabanli yanit saklama (record/replay)
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+from ..config import settings
+from .llm_client import BaseLLMClient
+
+
+class CacheMissError(Exception):
+    """Replay modunda kayitli yanit bulunamadi"""
+    pass
+
+
+class LLMResponseCache:
+    """
+    SQLite tabanli LLM yanit cache'i
+
+    Anahtar; provider, model, system/user prompt SHA-256 ozetleri,
+    temperature ve max_tokens'in SHA-256 ozetidir. Ayni istek ayni anahtari
+    uretir, process'ler arasinda sabittir.
+    """
+
+    def __init__(self, path: Optional[str | Path] = None, ttl: Optional[float] = None):
+        """
+        Args:
+            path: Cache dizini (None ise settings'den alinir)
+            ttl: Kayit omru (saniye, None ise settings'den; 0 = suresiz)
+        """
+        self.path = Path(path or settings.llm_cache_path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.ttl = settings.llm_cache_ttl_seconds if ttl is None else ttl
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(
+            str(self.path / "responses.sqlite"),
+            timeout=30,
+            check_same_thread=False,
+        )
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                provider TEXT NOT NULL,
+                model TEXT NOT NULL,
+                response TEXT NOT NULL,
+                created_at REAL NOT NULL
+            )
+            """
+        )
+        self._db.commit()
+
+    @staticmethod
+    def make_key(
+        provider: str,
+        model: str,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float,
+        max_tokens: int,
+    ) -> str:
+        """Istek parmak izi"""
+        fingerprint = [
+            provider,
+            model,
+            hashlib.sha256(system_prompt.encode("utf-8")).hexdigest(),
+            hashlib.sha256(user_prompt.encode("utf-8")).hexdigest(),
+            round(float(temperature), 4),
+            int(max_tokens),
+        ]
+        return hashlib.sha256(json.dumps(fingerprint).encode("utf-8")).hexdigest()
+
+    def get(self, key: str, ignore_ttl: bool = False) -> Optional[str]:
+        """
+        Kayitli yaniti getir
+
+        Args:
+            key: make_key() ciktisi
+            ignore_ttl: Suresi dolmus kayitlari da dondur
+
+        Returns:
+            Yanit metni veya None
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT response, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+
+        if row is None:
+            return None
+        if self.ttl and not ignore_ttl and time.time() - row[1] > self.ttl:
+            return None
+        return row[0]
+
+    def put(self, key: str, provider: str, model: str, response: str):
+        """Yaniti kaydet (varsa uzerine yazar)"""
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses(key, provider, model, response, created_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (key, provider, model, response, time.time()),
+            )
+            self._db.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return int(self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0])
+
+    def clear(self):
+        """Tum kayitlari sil"""
+        with self._lock:
+            self._db.execute("DELETE FROM responses")
+            self._db.commit()
+
+    def close(self):
+        """Baglantiyi kapat"""
+        with self._lock:
+            self._db.close()
+
+
+class CachedLLMClient(BaseLLMClient):
+    """
+    Herhangi bir BaseLLMClient'in onune yanit cache'i koyan sarmalayici
+
+    Modlar:
+    - on: Gecerli (TTL icinde) kayit varsa dondur, yoksa LLM'e git ve kaydet
+    - record: Her zaman LLM'e git, yaniti kaydet/guncelle
+    - replay: Sadece kayittan oku (TTL yok sayilir); kayit yoksa CacheMissError
+
+    Not: Ayni istek ayni yaniti dondurdugu icin uretim ortaminda cesitliligi
+    azaltir; benchmark, regresyon ve test calismalari icin tasarlanmistir.
+    """
+
+    MODES = ("on", "record", "replay")
+
+    def __init__(
+        self,
+        inner: BaseLLMClient,
+        cache: Optional[LLMResponseCache] = None,
+        mode: Optional[str] = None,
+    ):
+        """
+        Args:
+            inner: Asil LLM client
+            cache: Yanit cache'i (None ise settings ile olusturulur)
+            mode: on | record | replay (None ise settings'den alinir)
+        """
+        self.inner = inner
+        self.cache = cache if cache is not None else LLMResponseCache()
+        self.mode = mode or settings.llm_cache_mode
+        if self.mode not in self.MODES:
+            raise ValueError(f"Desteklenmeyen cache modu: {self.mode}")
+
+        self.provider = inner.provider
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def model_id(self) -> str:
+        return self.inner.model_id
+
+    @property
+    def usage(self):
+        """Asil client'in token kullanimi (cache isabetleri provider'a gitmez)"""
+        return self.inner.usage
+
+    async def generate(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float = 0.7,
+        max_tokens: int = 2000,
+    ) -> str:
+        """Cache'den veya asil client'tan yanit al"""
+        key = self.cache.make_key(
+            self.provider, self.model_id, system_prompt, user_prompt, temperature, max_tokens
+        )
+
+        if self.mode != "record":
+            cached = self.cache.get(key, ignore_ttl=self.mode == "replay")
+            if cached is not None:
+                self.hits += 1
+                return cached
+            if self.mode == "replay":
+                raise CacheMissError(
+                    f"Replay modunda kayit yok: {self.provider}/{self.model_id} ({key[:12]})"
+                )
+
+        self.misses += 1
+        response = await self.inner.generate(
+            system_prompt=system_prompt,
+            user_prompt=user_prompt,
+            temperature=temperature,
+            max_tokens=max_tokens,
+        )
+        self.cache.put(key, self.provider, self.model_id, response)
+        return response
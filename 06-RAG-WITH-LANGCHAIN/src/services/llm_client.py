@@ -4,19 +4,107 @@ OpenAI ve Anthropic destegi ile soru uretimi
 """
 
 import json
+import re
+import time
 from abc import ABC, abstractmethod
-from typing import Optional
+from dataclasses import dataclass
+from typing import AsyncIterator, Optional
 import asyncio
 
 from openai import AsyncOpenAI
 from tenacity import retry, stop_after_attempt, wait_exponential
 
 from ..config import settings
+from .rate_limiter import RateLimiter, estimate_tokens
+
+
+# User prompt'ta sabit (cache'lenebilir) kismi degisen kisimdan ayiran metin.
+# Oncesi her cagrida aynidir; Anthropic'te cache_control breakpoint'i buraya konur.
+PROMPT_CACHE_BOUNDARY = "\n\n---\n\n"
+
+
+@dataclass
+class LLMUsage:
+    """
+    Provider'in raporladigi token kullanimi (client basina kumulatif)
+
+    input_tokens cache'ten okunanlar dahil toplam girdidir;
+    cached_input_tokens bunun prefix cache'ten okunan kismidir.
+    """
+
+    requests: int = 0
+    input_tokens: int = 0
+    cached_input_tokens: int = 0
+    cache_write_tokens: int = 0
+    output_tokens: int = 0
+    streams: int = 0
+    first_token_seconds: float = 0.0
+
+    def record(
+        self,
+        input_tokens: Optional[int] = 0,
+        cached_input_tokens: Optional[int] = 0,
+        cache_write_tokens: Optional[int] = 0,
+        output_tokens: Optional[int] = 0,
+    ):
+        """Tek cagrinin kullanimini ekle (None degerler 0 sayilir)"""
+        self.requests += 1
+        self.input_tokens += input_tokens or 0
+        self.cached_input_tokens += cached_input_tokens or 0
+        self.cache_write_tokens += cache_write_tokens or 0
+        self.output_tokens += output_tokens or 0
+
+    def record_first_token(self, seconds: float):
+        """Akisli cagrida ilk parcaya kadar gecen sure"""
+        self.streams += 1
+        self.first_token_seconds += seconds
+
+    @property
+    def uncached_input_tokens(self) -> int:
+        return self.input_tokens - self.cached_input_tokens
+
+    def to_dict(self) -> dict:
+        return {
+            "requests": self.requests,
+            "input_tokens": self.input_tokens,
+            "cached_input_tokens": self.cached_input_tokens,
+            "uncached_input_tokens": self.uncached_input_tokens,
+            "cache_write_tokens": self.cache_write_tokens,
+            "output_tokens": self.output_tokens,
+            "cache_hit_ratio": (
+                round(self.cached_input_tokens / self.input_tokens, 4)
+                if self.input_tokens else 0.0
+            ),
+            "avg_first_token_seconds": (
+                round(self.first_token_seconds / self.streams, 3) if self.streams else None
+            ),
+        }
 
 
 class BaseLLMClient(ABC):
     """LLM Client temel sinifi"""
 
+    # Eszamanlilik limiti ve cache anahtarlari icin provider adi
+    provider: str = "base"
+
+    @property
+    def usage(self) -> LLMUsage:
+        """Bu client'in kumulatif token kullanimi"""
+        if "_usage" not in self.__dict__:
+            self._usage = LLMUsage()
+        return self._usage
+
+    @property
+    def model_id(self) -> str:
+        """Rate limit/cache anahtari icin model adi"""
+        return getattr(self, "model", None) or getattr(self, "model_name", None) or "default"
+
+    async def _throttle(self, system_prompt: str, user_prompt: str, max_tokens: int):
+        """Provider/model RPM-TPM butcesi olusana kadar bekle"""
+        limiter = LLMClientFactory.get_rate_limiter(self.provider, self.model_id)
+        if limiter is not None:
+            await limiter.acquire(estimate_tokens(system_prompt + user_prompt, max_tokens))
+
     @abstractmethod
     async def generate(
         self,
@@ -39,12 +127,38 @@ class BaseLLMClient(ABC):
         """
         pass
 
+    async def stream(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float = 0.7,
+        max_tokens: int = 2000,
+    ) -> AsyncIterator[str]:
+        """
+        LLM yanitini parca parca al
+
+        Varsayilan: generate() sonucunu tek parca olarak verir. Akis destekleyen
+        client'lar bunu override eder. Tuketici erken cikarsa (aclose) baglanti
+        kapatilir ve kalan token'lar uretilmez.
+
+        Yields:
+            Yanit metni parcalari
+        """
+        yield await self.generate(
+            system_prompt=system_prompt,
+            user_prompt=user_prompt,
+            temperature=temperature,
+            max_tokens=max_tokens,
+        )
+
 
 class OpenAIClient(BaseLLMClient):
     """
     OpenAI GPT modelleri icin client
     """
 
+    provider = "openai"
+
     def __init__(
         self,
         api_key: Optional[str] = None,
@@ -76,6 +190,8 @@ class OpenAIClient(BaseLLMClient):
             {"role": "user", "content": user_prompt},
         ]
 
+        await self._throttle(system_prompt, user_prompt, max_tokens)
+
         response = await self.client.chat.completions.create(
             model=self.model,
             messages=messages,
@@ -83,15 +199,71 @@ class OpenAIClient(BaseLLMClient):
             max_tokens=max_tokens,
             response_format={"type": "json_object"},  # JSON mode
         )
+        self._record_usage(response.usage)
 
         return response.choices[0].message.content
 
+    def _record_usage(self, usage):
+        """prompt_tokens cache'ten okunanlari (prompt_tokens_details.cached_tokens) icerir"""
+        if usage is None:
+            return
+        details = getattr(usage, "prompt_tokens_details", None)
+        self.usage.record(
+            input_tokens=usage.prompt_tokens,
+            cached_input_tokens=getattr(details, "cached_tokens", 0),
+            output_tokens=usage.completion_tokens,
+        )
+
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=2, max=30),
+    )
+    async def _open_stream(self, system_prompt, user_prompt, temperature, max_tokens):
+        await self._throttle(system_prompt, user_prompt, max_tokens)
+        return await self.client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt},
+            ],
+            temperature=temperature,
+            max_tokens=max_tokens,
+            response_format={"type": "json_object"},  # JSON mode
+            stream=True,
+            stream_options={"include_usage": True},
+        )
+
+    async def stream(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float = 0.7,
+        max_tokens: int = 2000,
+    ) -> AsyncIterator[str]:
+        """OpenAI API ile akisli yanit al (kullanim son parcada gelir)"""
+        started = time.perf_counter()
+        response = await self._open_stream(system_prompt, user_prompt, temperature, max_tokens)
+        first = True
+        try:
+            async for chunk in response:
+                if getattr(chunk, "usage", None):
+                    self._record_usage(chunk.usage)
+                if chunk.choices and chunk.choices[0].delta.content:
+                    if first:
+                        self.usage.record_first_token(time.perf_counter() - started)
+                        first = False
+                    yield chunk.choices[0].delta.content
+        finally:
+            await response.close()
+
 
 class AnthropicClient(BaseLLMClient):
     """
     Anthropic Claude modelleri icin client (opsiyonel)
     """
 
+    provider = "anthropic"
+
     def __init__(
         self,
         api_key: Optional[str] = None,
@@ -124,22 +296,106 @@ class AnthropicClient(BaseLLMClient):
         if self.client is None:
             raise ValueError("Anthropic client baslatilmadi. API key kontrol edin.")
 
+        await self._throttle(system_prompt, user_prompt, max_tokens)
+
         response = await self.client.messages.create(
-            model=self.model,
-            max_tokens=max_tokens,
-            temperature=temperature,
-            system=system_prompt,
-            messages=[
-                {"role": "user", "content": user_prompt},
-            ],
+            **self._request(system_prompt, user_prompt, temperature, max_tokens)
         )
+        self._record_usage(response.usage)
 
         return response.content[0].text
 
+    def _request(self, system_prompt, user_prompt, temperature, max_tokens) -> dict:
+        """
+        messages.create argumanlari
+
+        settings.llm_prompt_caching acikken system prompt'un ve user
+        prompt'un sabit kisminin (PROMPT_CACHE_BOUNDARY oncesi) sonuna
+        cache_control breakpoint'i konur. Model minimumunun (~1024 token)
+        altindaki prefix'ler API tarafindan cache'lenmez.
+        """
+        system = system_prompt
+        content = user_prompt
+        if settings.llm_prompt_caching:
+            breakpoint_ = {"type": "ephemeral"}
+            system = [{"type": "text", "text": system_prompt, "cache_control": breakpoint_}]
+            prefix, boundary, rest = user_prompt.partition(PROMPT_CACHE_BOUNDARY)
+            if boundary and rest:
+                content = [
+                    {"type": "text", "text": prefix + boundary, "cache_control": breakpoint_},
+                    {"type": "text", "text": rest},
+                ]
+
+        return {
+            "model": self.model,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            "system": system,
+            "messages": [{"role": "user", "content": content}],
+        }
+
+    def _record_usage(self, usage, output_tokens: Optional[int] = None):
+        """input_tokens sadece cache disi girdidir; cache okuma/yazma ayri raporlanir"""
+        if usage is None:
+            return
+        cached = getattr(usage, "cache_read_input_tokens", 0) or 0
+        written = getattr(usage, "cache_creation_input_tokens", 0) or 0
+        self.usage.record(
+            input_tokens=(usage.input_tokens or 0) + cached + written,
+            cached_input_tokens=cached,
+            cache_write_tokens=written,
+            output_tokens=usage.output_tokens if output_tokens is None else output_tokens,
+        )
+
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=2, max=30),
+    )
+    async def _open_stream(self, system_prompt, user_prompt, temperature, max_tokens):
+        await self._throttle(system_prompt, user_prompt, max_tokens)
+        return await self.client.messages.create(
+            **self._request(system_prompt, user_prompt, temperature, max_tokens),
+            stream=True,
+        )
+
+    async def stream(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float = 0.7,
+        max_tokens: int = 2000,
+    ) -> AsyncIterator[str]:
+        """Anthropic API ile akisli yanit al"""
+        if self.client is None:
+            raise ValueError("Anthropic client baslatilmadi. API key kontrol edin.")
+
+        started = time.perf_counter()
+        response = await self._open_stream(system_prompt, user_prompt, temperature, max_tokens)
+        # Girdi kullanimi message_start'ta, cikti sayisi message_delta'da gelir
+        input_usage = None
+        output_tokens = 0
+        first = True
+        try:
+            async for event in response:
+                if event.type == "message_start":
+                    input_usage = getattr(event.message, "usage", None)
+                elif event.type == "message_delta" and getattr(event, "usage", None):
+                    output_tokens = event.usage.output_tokens or 0
+                elif event.type == "content_block_delta" and getattr(event.delta, "text", None):
+                    if first:
+                        self.usage.record_first_token(time.perf_counter() - started)
+                        first = False
+                    yield event.delta.text
+        finally:
+            await response.close()
+            self._record_usage(input_usage, output_tokens=output_tokens)
+
 
 class GeminiClient(BaseLLMClient):
     """Google Gemini modelleri icin client - yeni google.genai SDK kullanir"""
 
+    provider = "gemini"
+
     def __init__(
         self,
         api_key: Optional[str] = None,
@@ -173,42 +429,108 @@ class GeminiClient(BaseLLMClient):
         temperature: float = 0.7,
         max_tokens: int = 2000,
     ) -> str:
-        """Gemini API ile yanit al"""
+        """
+        Gemini API ile yanit al
+
+        SDK'nin async yuzeyi (client.aio) kullanilir; cagri bir thread
+        tutmaz ve ayni client instance'i (factory cache'i) uzerinden tum
+        cagrilar SDK'nin tek HTTP oturumunu/baglanti havuzunu paylasir.
+        Eszamanlilik sadece provider semaforu ile sinirlanir.
+        """
         if self.client is None:
             raise ValueError("Gemini client baslatilmadi. GEMINI_API_KEY veya kutuphane eksik.")
 
-        def _call_model() -> str:
-            try:
-                response = self.client.models.generate_content(
-                    model=self.model_name,
-                    contents=[
-                        self._types.Content(
-                            role="user",
-                            parts=[self._types.Part(text=f"{system_prompt}\n\n{user_prompt}")]
-                        )
-                    ],
-                    config=self._types.GenerateContentConfig(
-                        temperature=temperature,
-                        max_output_tokens=max_tokens,
-                        # Cevabin saf JSON olmasini zorla
-                        response_mime_type="application/json",
-                    ),
+        await self._throttle(system_prompt, user_prompt, max_tokens)
+
+        try:
+            response = await self.client.aio.models.generate_content(
+                **self._request(system_prompt, user_prompt, temperature, max_tokens)
+            )
+        except Exception as e:
+            print(f"[GeminiClient] generate_content hatasi: {e!r}")
+            raise ValueError(f"Gemini generate_content hatasi: {e!r}")
+
+        # Sadece yanit kesildiyse (or. MAX_TOKENS) uyar; ham yanit log'lanmaz
+        candidates = getattr(response, "candidates", None)
+        finish_reason = getattr(candidates[0], "finish_reason", None) if candidates else None
+        if finish_reason is not None and getattr(finish_reason, "name", str(finish_reason)) != "STOP":
+            print(f"[GeminiClient] Finish reason: {finish_reason}")
+        self._record_usage(getattr(response, "usage_metadata", None))
+        if settings.debug and getattr(response, "usage_metadata", None):
+            print(f"[GeminiClient] Usage: {response.usage_metadata}")
+
+        return response.text
+
+    def _record_usage(self, usage):
+        """prompt_token_count (implicit) cache'ten okunanlari icerir"""
+        if usage is None:
+            return
+        self.usage.record(
+            input_tokens=getattr(usage, "prompt_token_count", 0),
+            cached_input_tokens=getattr(usage, "cached_content_token_count", 0),
+            output_tokens=getattr(usage, "candidates_token_count", 0),
+        )
+
+    def _request(self, system_prompt, user_prompt, temperature, max_tokens) -> dict:
+        """
+        generate_content argumanlari
+
+        System prompt ve user prompt'un sabit kismi metnin basinda kalir;
+        Gemini'nin implicit prefix cache'i bunu otomatik kullanir.
+        """
+        return {
+            "model": self.model_name,
+            "contents": [
+                self._types.Content(
+                    role="user",
+                    parts=[self._types.Part(text=f"{system_prompt}\n\n{user_prompt}")]
                 )
-                result = response.text
-                print(f"[GeminiClient] Raw response (first 500 chars): {result[:500]}")
-                # Finish reason ve usage bilgisini log'la
-                if hasattr(response, 'candidates') and response.candidates:
-                    candidate = response.candidates[0]
-                    if hasattr(candidate, 'finish_reason'):
-                        print(f"[GeminiClient] Finish reason: {candidate.finish_reason}")
-                if hasattr(response, 'usage_metadata'):
-                    print(f"[GeminiClient] Usage: {response.usage_metadata}")
-                return result
-            except Exception as e:
-                print(f"[GeminiClient] generate_content hatasi: {e!r}")
-                raise ValueError(f"Gemini generate_content hatasi: {e!r}")
-
-        return await asyncio.to_thread(_call_model)
+            ],
+            "config": self._types.GenerateContentConfig(
+                temperature=temperature,
+                max_output_tokens=max_tokens,
+                # Cevabin saf JSON olmasini zorla
+                response_mime_type="application/json",
+            ),
+        }
+
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=2, max=30),
+    )
+    async def _open_stream(self, system_prompt, user_prompt, temperature, max_tokens):
+        await self._throttle(system_prompt, user_prompt, max_tokens)
+        return await self.client.aio.models.generate_content_stream(
+            **self._request(system_prompt, user_prompt, temperature, max_tokens)
+        )
+
+    async def stream(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float = 0.7,
+        max_tokens: int = 2000,
+    ) -> AsyncIterator[str]:
+        """Gemini API ile akisli yanit al"""
+        if self.client is None:
+            raise ValueError("Gemini client baslatilmadi. GEMINI_API_KEY veya kutuphane eksik.")
+
+        started = time.perf_counter()
+        response = await self._open_stream(system_prompt, user_prompt, temperature, max_tokens)
+        # Her parca o ana kadarki kumulatif kullanimi tasir; sonuncusu kaydedilir
+        usage = None
+        first = True
+        try:
+            async for chunk in response:
+                usage = getattr(chunk, "usage_metadata", None) or usage
+                if chunk.text:
+                    if first:
+                        self.usage.record_first_token(time.perf_counter() - started)
+                        first = False
+                    yield chunk.text
+        finally:
+            await response.aclose()
+            self._record_usage(usage)
 
 
 class LLMClientFactory:
@@ -217,6 +539,23 @@ class LLMClientFactory:
     """
 
     _instances: dict[str, BaseLLMClient] = {}
+    _semaphores: dict[str, tuple[asyncio.AbstractEventLoop, asyncio.Semaphore]] = {}
+    _rate_limiters: dict[str, tuple[asyncio.AbstractEventLoop, RateLimiter]] = {}
+
+    # Model adi onekine gore tek yanit cikti token limiti (en uzun onek eslesir)
+    MAX_OUTPUT_TOKENS: dict[str, int] = {
+        "gpt-3.5-turbo": 4096,
+        "gpt-4": 4096,
+        "gpt-4o": 16384,
+        "gpt-4.1": 32768,
+        "claude-3": 4096,
+        "claude-3-5": 8192,
+        "claude-3-7": 64000,
+        "gemini-1.5": 8192,
+        "gemini-2": 8192,
+        "gemini-2.5": 65536,
+    }
+    DEFAULT_MAX_OUTPUT_TOKENS = 4096
 
     @classmethod
     def create(
@@ -240,20 +579,185 @@ class LLMClientFactory:
 
         if cache_key not in cls._instances:
             if provider == "openai":
-                cls._instances[cache_key] = OpenAIClient(**kwargs)
+                client = OpenAIClient(**kwargs)
             elif provider == "anthropic":
-                cls._instances[cache_key] = AnthropicClient(**kwargs)
+                client = AnthropicClient(**kwargs)
             elif provider == "gemini":
-                cls._instances[cache_key] = GeminiClient(**kwargs)
+                client = GeminiClient(**kwargs)
             else:
                 raise ValueError(f"Desteklenmeyen provider: {provider}")
 
+            # Opsiyonel yanit cache'i (benchmark/regresyon icin record/replay)
+            if settings.llm_cache_mode != "off":
+                from .llm_cache import CachedLLMClient
+
+                client = CachedLLMClient(client)
+
+            cls._instances[cache_key] = client
+
         return cls._instances[cache_key]
 
+    @classmethod
+    def get_semaphore(cls, provider: Optional[str] = None) -> asyncio.Semaphore:
+        """
+        Provider icin paylasilan eszamanlilik semaforunu al
+
+        Ayni provider'a giden tum cagrilar (tek soru ve toplu uretim) ayni
+        limiti paylasir. Limit settings.llm_concurrency_overrides'ta provider
+        icin tanimliysa o, degilse settings.llm_max_concurrency kullanilir.
+
+        Args:
+            provider: LLM provider (None ise settings'den alinir)
+
+        Returns:
+            asyncio.Semaphore instance
+        """
+        provider = provider or settings.llm_provider
+        loop = asyncio.get_running_loop()
+
+        cached = cls._semaphores.get(provider)
+        # Semafor olusturuldugu event loop'a baglidir (testlerde loop degisebilir)
+        if cached is None or cached[0] is not loop:
+            limit = settings.llm_concurrency_overrides.get(
+                provider, settings.llm_max_concurrency
+            )
+            cached = (loop, asyncio.Semaphore(max(1, limit)))
+            cls._semaphores[provider] = cached
+
+        return cached[1]
+
+    @classmethod
+    def get_rate_limiter(
+        cls,
+        provider: Optional[str] = None,
+        model: Optional[str] = None,
+    ) -> Optional[RateLimiter]:
+        """
+        Provider/model icin paylasilan RPM/TPM limiter'ini al
+
+        Limitler settings.rate_limit_overrides'ta once "provider:model",
+        sonra "provider" anahtariyla aranir; yoksa settings.rate_limit_rpm ve
+        settings.rate_limit_tpm kullanilir. Ikisi de tanimsizsa None doner.
+
+        Args:
+            provider: LLM provider (None ise settings'den alinir)
+            model: Model adi (None ise settings'den alinir)
+
+        Returns:
+            RateLimiter instance veya None (limit yok)
+        """
+        provider = provider or settings.llm_provider
+        model = model or settings.llm_model
+        key = f"{provider}:{model}"
+
+        limits = settings.rate_limit_overrides.get(key) or settings.rate_limit_overrides.get(
+            provider, {}
+        )
+        rpm = limits.get("rpm", settings.rate_limit_rpm)
+        tpm = limits.get("tpm", settings.rate_limit_tpm)
+        if not rpm and not tpm:
+            return None
+
+        loop = asyncio.get_running_loop()
+        cached = cls._rate_limiters.get(key)
+        # Limiter'in lock'u event loop'a baglidir (testlerde loop degisebilir)
+        if cached is None or cached[0] is not loop:
+            cached = (loop, RateLimiter(rpm=rpm, tpm=tpm))
+            cls._rate_limiters[key] = cached
+
+        return cached[1]
+
+    @classmethod
+    def get_max_output_tokens(cls, model: Optional[str] = None) -> int:
+        """
+        Modelin tek yanitta uretebilecegi maksimum token sayisi
+
+        settings.llm_max_output_tokens tanimliysa o, degilse MAX_OUTPUT_TOKENS
+        tablosunda en uzun onek eslesmesi, o da yoksa DEFAULT_MAX_OUTPUT_TOKENS.
+
+        Args:
+            model: Model adi (None ise settings'den alinir)
+
+        Returns:
+            Cikti token limiti
+        """
+        if settings.llm_max_output_tokens:
+            return settings.llm_max_output_tokens
+
+        model = model or settings.llm_model
+        matches = [prefix for prefix in cls.MAX_OUTPUT_TOKENS if model.startswith(prefix)]
+        if not matches:
+            return cls.DEFAULT_MAX_OUTPUT_TOKENS
+        return cls.MAX_OUTPUT_TOKENS[max(matches, key=len)]
+
     @classmethod
     def clear_cache(cls):
         """Instance cache'i temizle"""
         cls._instances.clear()
+        cls._semaphores.clear()
+        cls._rate_limiters.clear()
+
+
+def parse_llm_batch_response(response: str) -> list:
+    """
+    Coklu soru yanitini parse et
+
+    Beklenen bicim {"sorular": [...]} nesnesidir (OpenAI JSON modu ust
+    seviye dizi dondurmez); ust seviye dizi de kabul edilir. Dizi elemanlari
+    tek tek okunur; yanit max_tokens nedeniyle yarida kesildiyse
+    tamamlanmis elemanlar yine dondurulur. Sarmalayicisiz tek bir soru
+    nesnesi tek elemanli liste olarak doner.
+
+    Args:
+        response: LLM yaniti (string)
+
+    Returns:
+        Tamamlanmis elemanlarin listesi
+
+    Raises:
+        json.JSONDecodeError: Hic eleman okunamadi
+    """
+    text = response.strip()
+    # ```json ... ``` blogunu temizle (kapanis yoksa metnin sonuna kadar)
+    if "```" in text:
+        fence = text.find("```")
+        newline = text.find("\n", fence)
+        start = newline + 1 if newline != -1 else fence + 3
+        end = text.find("```", start)
+        text = text[start:] if end == -1 else text[start:end]
+
+    start = text.find("[")
+    if start == -1 or ("{" in text and text.find("{") < start):
+        # Dizi bir nesnenin icinde: sadece "sorular" dizisi okunur (cozum
+        # gibi bir sorunun kendi listesi soru listesi sanilmaz)
+        wrapped = re.search(r'"sorular"\s*:\s*\[', text)
+        if wrapped:
+            start = wrapped.end() - 1
+        else:
+            data = json.loads(text[text.find("{"): text.rfind("}") + 1])
+            if isinstance(data, dict) and "soru" in data:
+                return [data]
+            raise json.JSONDecodeError("JSON dizisi bulunamadi", text, 0)
+
+    decoder = json.JSONDecoder()
+    items = []
+    pos = start + 1
+    while True:
+        # Bosluk ve virgulleri atla
+        while pos < len(text) and (text[pos].isspace() or text[pos] == ","):
+            pos += 1
+        if pos >= len(text) or text[pos] == "]":
+            break
+        try:
+            item, pos = decoder.raw_decode(text, pos)
+        except json.JSONDecodeError:
+            # Yarida kesilen son eleman
+            break
+        items.append(item)
+
+    if not items:
+        raise json.JSONDecodeError("JSON dizisinde tamamlanmis eleman yok", text, start)
+    return items
 
 
 def parse_llm_response(response: str) -> dict:
@@ -0,0 +1,281 @@
+"""
+Kolonsal Metadata Deposu
+FAISS id -> soru metadata eslemesinin memory-mapped, salt okunur disk formati
+"""
+
+import json
+import math
+import numbers
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, Iterator
+
+import numpy as np
+
+
+class MetadataRow(Mapping):
+    """
+    Tek satirin hafif gorunumu
+
+    Degerler erisildikce depodan okunur; satir icin kopya tutulmaz.
+    dict gibi okunur (get, [], items, **row); degistirilemez.
+    """
+
+    __slots__ = ("_store", "_pos")
+
+    def __init__(self, store: "MetadataStore", pos: int):
+        self._store = store
+        self._pos = pos
+
+    def __getitem__(self, key: str) -> Any:
+        return self._store.value(self._pos, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return (name for name in self._store.columns if self._store.has_value(self._pos, name))
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def to_dict(self) -> dict:
+        """Bagimsiz (degistirilebilir) dict kopyasi"""
+        return {key: self[key] for key in self}
+
+    def __repr__(self) -> str:
+        return f"MetadataRow({self.to_dict()!r})"
+
+
+class MetadataStore(Mapping):
+    """
+    Memory-mapped kolonsal metadata deposu
+
+    Dizin duzeni:
+    - schema.json: satir sayisi ve kolon tipleri
+    - ids.npy: sirali FAISS id'leri
+    - <kolon>.npy: sayisal kolonlar (int64 / float64 / bool)
+    - <kolon>.offsets.npy + <kolon>.data: metin kolonlari (UTF-8, ofset tablosu)
+    - <kolon>.present.npy: sadece bazi satirlarda olan kolonlar icin
+
+    Dosyalar salt okunur mmap ile acilir; ayni dosyayi acan tum worker'lar
+    isletim sisteminin page cache'ini paylasir. Acilis maliyeti ve worker
+    basina bellek, satir sayisiyla degil erisilen sayfalarla orantilidir.
+    """
+
+    SCHEMA_FILE = "schema.json"
+    VERSION = 1
+
+    def __init__(self, path: str | Path):
+        """
+        Args:
+            path: write() ile yazilmis depo dizini
+        """
+        self.path = Path(path)
+        schema = json.loads((self.path / self.SCHEMA_FILE).read_text(encoding="utf-8"))
+        if schema.get("version") != self.VERSION:
+            raise ValueError(f"Desteklenmeyen metadata surumu: {schema.get('version')}")
+
+        self.kinds: dict[str, str] = {c["name"]: c["kind"] for c in schema["columns"]}
+        self.columns: list[str] = list(self.kinds)
+        self._ids = np.load(self.path / "ids.npy", mmap_mode="r")
+
+        self._files = {c["name"]: c["file"] for c in schema["columns"]}
+        self._arrays: dict[str, np.ndarray] = {}
+        self._offsets: dict[str, np.ndarray] = {}
+        self._data: dict[str, np.ndarray] = {}
+        self._present: dict[str, np.ndarray] = {}
+        for column in schema["columns"]:
+            name, base = column["name"], self.path / column["file"]
+            if column["kind"] in ("str", "json"):
+                self._offsets[name] = np.load(f"{base}.offsets.npy", mmap_mode="r")
+                self._data[name] = self._map_bytes(Path(f"{base}.data"))
+            else:
+                self._arrays[name] = np.load(f"{base}.npy", mmap_mode="r")
+            if column.get("sparse"):
+                self._present[name] = np.load(f"{base}.present.npy", mmap_mode="r")
+
+    @staticmethod
+    def _map_bytes(path: Path) -> np.ndarray:
+        # Bos dosya mmap edilemez
+        if path.stat().st_size == 0:
+            return np.empty(0, dtype=np.uint8)
+        return np.memmap(path, dtype=np.uint8, mode="r")
+
+    @classmethod
+    def write(cls, path: str | Path, id_to_metadata: Mapping[int, Mapping]):
+        """
+        Eslemeyi kolonsal formatta diske yaz
+
+        Args:
+            path: Hedef dizin (yoksa olusturulur)
+            id_to_metadata: {faiss_id: metadata} eslemesi
+        """
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+
+        ids = sorted(int(i) for i in id_to_metadata)
+        rows = [id_to_metadata[i] for i in ids]
+        np.save(path / "ids.npy", np.asarray(ids, dtype=np.int64))
+
+        names: dict[str, None] = {}
+        for row in rows:
+            names.update(dict.fromkeys(row))
+
+        columns = []
+        for number, name in enumerate(names):
+            present = np.array([name in row for row in rows], dtype=bool)
+            values = [row.get(name) for row in rows]
+            kind = cls._infer_kind([v for v, p in zip(values, present) if p])
+            file = f"col{number:03d}"
+            base = path / file
+
+            if kind in ("str", "json"):
+                encode = (
+                    (lambda v: v) if kind == "str"
+                    else (lambda v: json.dumps(v, ensure_ascii=False, default=str))
+                )
+                chunks = [
+                    encode(v).encode("utf-8") if p else b""
+                    for v, p in zip(values, present)
+                ]
+                offsets = np.zeros(len(chunks) + 1, dtype=np.int64)
+                offsets[1:] = np.cumsum([len(c) for c in chunks])
+                np.save(f"{base}.offsets.npy", offsets)
+                Path(f"{base}.data").write_bytes(b"".join(chunks))
+            else:
+                dtype = {"int": np.int64, "float": np.float64, "bool": bool}[kind]
+                fill = {"int": 0, "float": math.nan, "bool": False}[kind]
+                np.save(f"{base}.npy", np.array(
+                    [v if p else fill for v, p in zip(values, present)], dtype=dtype
+                ))
+
+            sparse = not present.all()
+            if sparse:
+                np.save(f"{base}.present.npy", present)
+            columns.append({"name": name, "kind": kind, "file": file, "sparse": sparse})
+
+        schema = {"version": cls.VERSION, "rows": len(ids), "columns": columns}
+        (path / cls.SCHEMA_FILE).write_text(
+            json.dumps(schema, ensure_ascii=False, indent=2), encoding="utf-8"
+        )
+
+    @staticmethod
+    def _infer_kind(values: list) -> str:
+        """Kolon tipi: bool, int, float, str veya json (karisik/None iceren)"""
+        if values and all(isinstance(v, (bool, np.bool_)) for v in values):
+            return "bool"
+        if values and all(
+            isinstance(v, numbers.Integral) and not isinstance(v, (bool, np.bool_)) for v in values
+        ):
+            return "int"
+        if values and all(
+            isinstance(v, numbers.Real) and not isinstance(v, (bool, np.bool_)) for v in values
+        ):
+            return "float"
+        if all(isinstance(v, str) for v in values):
+            return "str"
+        return "json"
+
+    def _position(self, faiss_id) -> int:
+        try:
+            key = int(faiss_id)
+        except (TypeError, ValueError):
+            return -1
+        pos = int(np.searchsorted(self._ids, key))
+        if pos < len(self._ids) and self._ids[pos] == key:
+            return pos
+        return -1
+
+    def has_value(self, pos: int, name: str) -> bool:
+        """Satirda kolon var mi?"""
+        present = self._present.get(name)
+        return name in self.kinds and (present is None or bool(present[pos]))
+
+    def value(self, pos: int, name: str) -> Any:
+        """Satir pozisyonundaki kolon degeri"""
+        if not self.has_value(pos, name):
+            raise KeyError(name)
+
+        kind = self.kinds[name]
+        if kind in ("str", "json"):
+            offsets = self._offsets[name]
+            raw = self._data[name][offsets[pos] : offsets[pos + 1]].tobytes().decode("utf-8")
+            return raw if kind == "str" else json.loads(raw)
+        return self._arrays[name][pos].item()
+
+    def column(self, name: str) -> np.ndarray:
+        """Sayisal kolonun tamami (mmap gorunumu, kopya yok)"""
+        if self.kinds.get(name) not in ("int", "float", "bool"):
+            raise KeyError(f"Sayisal kolon degil: {name}")
+        return self._arrays[name]
+
+    def factorize(self, name: str) -> tuple[list, np.ndarray]:
+        """
+        Kolonu kategorik kodlara cevir (satir nesnesi olusturmadan)
+
+        Sayisal kolonlar dogrudan, metin kolonlari sabit genislikli bytes
+        dizisi uzerinden np.unique ile kodlanir; sadece benzersiz degerler
+        decode edilir.
+
+        Args:
+            name: Kolon adi
+
+        Returns:
+            (benzersiz degerler, satir basina kod); kolonu olmayan satirlarin kodu -1
+        """
+        kind = self.kinds.get(name)
+        if kind is None:
+            return [], np.full(len(self._ids), -1, dtype=np.int64)
+
+        if kind in ("str", "json"):
+            uniques, codes = np.unique(self._fixed_width(name), return_inverse=True)
+            raws = [raw.decode("utf-8") for raw in uniques.tolist()]
+            values = raws if kind == "str" else [json.loads(raw) if raw else None for raw in raws]
+        else:
+            uniques, codes = np.unique(self.column(name), return_inverse=True)
+            values = uniques.tolist()
+
+        codes = codes.reshape(-1).astype(np.int64)
+        present = self._present.get(name)
+        if present is not None:
+            codes[~present] = -1
+        return values, codes
+
+    def _fixed_width(self, name: str) -> np.ndarray:
+        """Metin kolonunu sabit genislikli bytes dizisine cevir (vektorel)"""
+        offsets = np.asarray(self._offsets[name])
+        starts, lengths = offsets[:-1], np.diff(offsets)
+        width = int(lengths.max()) if len(lengths) else 0
+        if width == 0:
+            return np.zeros(len(lengths), dtype="S1")
+
+        data = self._data[name]
+        cols = np.arange(width)
+        index = np.minimum(starts[:, None] + cols, len(data) - 1)
+        padded = np.where(cols < lengths[:, None], data[index], 0).astype(np.uint8)
+        return np.ascontiguousarray(padded).view(f"S{width}").reshape(-1)
+
+    def row(self, pos: int) -> MetadataRow:
+        """Satir pozisyonundaki satir gorunumu"""
+        return MetadataRow(self, pos)
+
+    def ids(self) -> np.ndarray:
+        """Sirali FAISS id'leri"""
+        return self._ids
+
+    def __getitem__(self, faiss_id) -> MetadataRow:
+        pos = self._position(faiss_id)
+        if pos < 0:
+            raise KeyError(faiss_id)
+        return MetadataRow(self, pos)
+
+    def __contains__(self, faiss_id) -> bool:
+        return self._position(faiss_id) >= 0
+
+    def __iter__(self) -> Iterator[int]:
+        return (int(i) for i in self._ids)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def to_dict(self) -> dict[int, dict]:
+        """Degistirilebilir {faiss_id: dict} kopyasi (artimli guncelleme icin)"""
+        return {int(i): MetadataRow(self, pos).to_dict() for pos, i in enumerate(self._ids)}
@@ -0,0 +1,381 @@
+"""
+MinHash / LSH Tekrar Indeksi
+Soru gecmisinde alt-dogrusal (sub-linear) yakin-tekrar aramasi
+"""
+
+import hashlib
+import re
+import sqlite3
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+
+# Turkce buyuk harf -> kucuk harf (str.lower 'I' -> 'i' yapar) ve ASCII katlama;
+# LLM ciktisi ile OCR/elle yazilmis metin ayni token'lara duser
+_TR_UPPER = str.maketrans({"I": "ı", "İ": "i"})
+_TR_FOLD = str.maketrans("ıişğüöçâîû", "iisguocaiu")
+_TOKEN_RE = re.compile(r"\w+")
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64(0xFFFFFFFF)
+
+# numpy 2.0'da trapz -> trapezoid
+_trapezoid = getattr(np, "trapezoid", None) or np.trapz
+
+
+def normalize_tokens(text: str) -> list[str]:
+    """
+    Turkce normalize edilmis kelime listesi
+
+    Args:
+        text: Ham metin
+
+    Returns:
+        Kucuk harf, aksansiz, noktalama temizlenmis token'lar
+    """
+    text = text.translate(_TR_UPPER).lower().translate(_TR_FOLD)
+    return _TOKEN_RE.findall(text)
+
+
+def shingle(tokens: list[str], size: int = 1) -> set[str]:
+    """
+    Kelime k-gram'lari (shingle)
+
+    Args:
+        tokens: normalize_tokens() ciktisi
+        size: Shingle uzunlugu (kelime); metin daha kisaysa tek shingle
+
+    Returns:
+        Shingle seti
+    """
+    if size <= 1:
+        return set(tokens)
+    if len(tokens) < size:
+        return {" ".join(tokens)} if tokens else set()
+    return {" ".join(tokens[i : i + size]) for i in range(len(tokens) - size + 1)}
+
+
+@lru_cache(maxsize=32)
+def optimal_lsh_params(threshold: float, num_perm: int) -> tuple[int, int]:
+    """
+    Esik icin (band, satir) sayisi
+
+    Yanlis negatif (kacan tekrar) ve yanlis pozitif (gereksiz aday) olasilik
+    alanlarinin toplamini minimize eder. Adaylar imza benzerligi ile tekrar
+    dogrulandigi icin yanlis negatife daha yuksek agirlik verilir.
+
+    Args:
+        threshold: Jaccard esigi (0-1)
+        num_perm: Imza uzunlugu
+
+    Returns:
+        (bands, rows); bands * rows <= num_perm
+    """
+    fp_weight, fn_weight = 0.3, 0.7
+    grid_low = np.linspace(0.0, threshold, 200)
+    grid_high = np.linspace(threshold, 1.0, 200)
+
+    best, best_error = (1, num_perm), float("inf")
+    for bands in range(1, num_perm + 1):
+        for rows in range(1, num_perm // bands + 1):
+            fp = _trapezoid(1 - (1 - grid_low ** rows) ** bands, grid_low)
+            fn = _trapezoid((1 - grid_high ** rows) ** bands, grid_high)
+            error = fp_weight * fp + fn_weight * fn
+            if error < best_error:
+                best, best_error = (bands, rows), error
+    return best
+
+
+class MinHasher:
+    """
+    Vektorize MinHash imza uretici
+
+    Her shingle bir kez 32-bit hash'lenir; num_perm adet (a*h + b) mod p
+    permutasyonu numpy ile tek seferde uygulanir. Ayni seed ile tum
+    process'ler ayni imzayi uretir (paylasimli indeks icin gerekli).
+    """
+
+    def __init__(self, num_perm: int = 128, seed: int = 1):
+        """
+        Args:
+            num_perm: Permutasyon (imza) sayisi
+            seed: Permutasyon katsayilari icin seed
+        """
+        self.num_perm = num_perm
+        self.seed = seed
+        rng = np.random.default_rng(seed)
+        # a < 2^31, h < 2^32 -> a*h + b uint64'e tasmadan sigar
+        self._a = rng.integers(1, 1 << 31, size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, 1 << 32, size=num_perm, dtype=np.uint64)
+
+    def signature(self, shingles: set[str]) -> Optional[np.ndarray]:
+        """
+        Shingle setinin MinHash imzasi
+
+        Args:
+            shingles: shingle() ciktisi
+
+        Returns:
+            (num_perm,) uint32 imza; bos set icin None
+        """
+        if not shingles:
+            return None
+
+        hashes = np.fromiter(
+            (
+                int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=4).digest(), "little")
+                for s in shingles
+            ),
+            dtype=np.uint64,
+            count=len(shingles),
+        )
+        permuted = (np.outer(hashes, self._a) + self._b) % _MERSENNE_PRIME & _MAX_HASH
+        return permuted.min(axis=0).astype(np.uint32)
+
+
+class MinHashLSH:
+    """
+    Bellek ici MinHash LSH indeksi (halka tampon)
+
+    Imzalar bands x rows parcaya bolunur, her band bir hash bucket'ina duser.
+    Sorgu sadece en az bir bucket'i paylasan adaylara bakar; aday benzerligi
+    imzalarin esit pozisyon orani ile tahmin edilir. Kapasite dolunca en eski
+    imza indeksten cikarilir. Ekleme ve sorgu kilitlidir; asyncio.to_thread
+    ile farkli thread'lerden cagrilabilir.
+    """
+
+    def __init__(self, threshold: float = 0.85, num_perm: int = 128, capacity: int = 100):
+        """
+        Args:
+            threshold: Tekrar esigi (LSH bantlari buna gore secilir)
+            num_perm: Imza uzunlugu
+            capacity: Saklanacak en fazla imza sayisi
+        """
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.capacity = capacity
+        self.bands, self.rows = optimal_lsh_params(threshold, num_perm)
+
+        self._signatures = np.empty((min(capacity, 1024), num_perm), dtype=np.uint32)
+        self._buckets: list[dict[int, set[int]]] = [{} for _ in range(self.bands)]
+        self._count = 0  # Toplam eklenen (seq = eklenme sirasi)
+        self._lock = threading.Lock()
+
+    def band_keys(self, signature: np.ndarray) -> list[int]:
+        """Imzanin band bucket anahtarlari (signed 64-bit, SQLite uyumlu)"""
+        keys = []
+        for band in range(self.bands):
+            chunk = signature[band * self.rows : (band + 1) * self.rows].tobytes()
+            digest = hashlib.blake2b(chunk, digest_size=8).digest()
+            keys.append(int.from_bytes(digest, "little", signed=True))
+        return keys
+
+    def add(self, signature: np.ndarray):
+        """Imzayi ekle (kapasite doluysa en eskiyi cikar)"""
+        with self._lock:
+            self._add(signature)
+
+    def _add(self, signature: np.ndarray):
+        seq = self._count
+        slot = seq % self.capacity
+
+        if seq >= self.capacity:
+            old_seq = seq - self.capacity
+            for band, key in enumerate(self.band_keys(self._signatures[slot])):
+                bucket = self._buckets[band].get(key)
+                if bucket is not None:
+                    bucket.discard(old_seq)
+                    if not bucket:
+                        del self._buckets[band][key]
+        elif slot >= len(self._signatures):
+            grown = np.empty(
+                (min(self.capacity, len(self._signatures) * 2), self.num_perm), dtype=np.uint32
+            )
+            grown[: len(self._signatures)] = self._signatures
+            self._signatures = grown
+
+        self._signatures[slot] = signature
+        for band, key in enumerate(self.band_keys(signature)):
+            self._buckets[band].setdefault(key, set()).add(seq)
+        self._count += 1
+
+    def max_similarity(self, signature: np.ndarray) -> float:
+        """
+        Indeksteki en benzer imzanin tahmini Jaccard benzerligi
+
+        Args:
+            signature: Sorgu imzasi
+
+        Returns:
+            0-1 arasi benzerlik (aday yoksa 0.0)
+        """
+        candidates = self._candidates(signature)
+        if len(candidates) == 0:
+            return 0.0
+        return float((candidates == signature).mean(axis=1).max())
+
+    def _candidates(self, signature: np.ndarray) -> np.ndarray:
+        keys = self.band_keys(signature)
+        seqs: set[int] = set()
+        with self._lock:
+            for band, key in enumerate(keys):
+                seqs |= self._buckets[band].get(key, set())
+            if not seqs:
+                return np.empty((0, self.num_perm), dtype=np.uint32)
+            slots = np.fromiter(seqs, dtype=np.int64, count=len(seqs)) % self.capacity
+            return self._signatures[slots]
+
+    def __len__(self) -> int:
+        return min(self._count, self.capacity)
+
+    def clear(self):
+        """Tum imzalari sil"""
+        with self._lock:
+            self._buckets = [{} for _ in range(self.bands)]
+            self._count = 0
+
+    def close(self):
+        pass
+
+
+class SQLiteMinHashLSH(MinHashLSH):
+    """
+    Disk tabanli, process'ler arasi paylasilan MinHash LSH indeksi
+
+    Tum uvicorn worker'lari ayni SQLite dosyasini (WAL) kullanir; bir worker'in
+    ekledigi soru digerlerinin tekrar kontrolunde hemen gorunur. Kontrol ve
+    ekleme ayri adimlar oldugu icin ayni anda uretilen iki tekrar nadiren
+    ikisi de kabul edilebilir.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        threshold: float = 0.85,
+        num_perm: int = 128,
+        capacity: int = 100,
+        seed: int = 1,
+    ):
+        """
+        Args:
+            path: SQLite dosya yolu
+            threshold: Tekrar esigi
+            num_perm: Imza uzunlugu
+            capacity: Saklanacak en fazla imza sayisi
+            seed: MinHasher seed'i (dosyada saklanir, uyumsuzsa hata)
+        """
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.capacity = capacity
+        self.bands, self.rows = optimal_lsh_params(threshold, num_perm)
+
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS signatures (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                signature BLOB NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS buckets (
+                band INTEGER NOT NULL,
+                key INTEGER NOT NULL,
+                seq INTEGER NOT NULL,
+                PRIMARY KEY (band, key, seq)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS buckets_seq ON buckets(seq);
+            """
+        )
+        self._check_meta({
+            "num_perm": str(num_perm),
+            "seed": str(seed),
+            "bands": str(self.bands),
+            "rows": str(self.rows),
+        })
+
+    def _check_meta(self, expected: dict[str, str]):
+        """Ayni dosyayi kullanan tum process'ler ayni imza/band ayarini kullanmali"""
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                stored = dict(self._db.execute("SELECT key, value FROM meta").fetchall())
+                if not stored:
+                    self._db.executemany(
+                        "INSERT INTO meta(key, value) VALUES (?, ?)", expected.items()
+                    )
+                self._db.commit()
+            except Exception:
+                self._db.rollback()
+                raise
+
+        if stored and stored != expected:
+            raise ValueError(
+                f"Tekrar indeksi farkli ayarlarla olusturulmus: {stored} != {expected} ({self.path})"
+            )
+
+    def add(self, signature: np.ndarray):
+        """Imzayi ekle, kapasiteyi asan en eski imzalari sil"""
+        keys = self.band_keys(signature)
+        with self._lock:
+            try:
+                cursor = self._db.execute(
+                    "INSERT INTO signatures(signature) VALUES (?)",
+                    (signature.astype(np.uint32).tobytes(),),
+                )
+                seq = cursor.lastrowid
+                self._db.executemany(
+                    "INSERT OR IGNORE INTO buckets(band, key, seq) VALUES (?, ?, ?)",
+                    [(band, key, seq) for band, key in enumerate(keys)],
+                )
+                cutoff = seq - self.capacity
+                if cutoff > 0:
+                    self._db.execute("DELETE FROM buckets WHERE seq <= ?", (cutoff,))
+                    self._db.execute("DELETE FROM signatures WHERE seq <= ?", (cutoff,))
+                self._db.commit()
+            except Exception:
+                self._db.rollback()
+                raise
+
+    def _candidates(self, signature: np.ndarray) -> np.ndarray:
+        keys = self.band_keys(signature)
+        placeholders = ", ".join("(?, ?)" for _ in keys)
+        params = [value for band, key in enumerate(keys) for value in (band, key)]
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT s.signature FROM signatures s WHERE s.seq IN ("
+                f"SELECT b.seq FROM buckets b WHERE (b.band, b.key) IN (VALUES {placeholders}))",
+                params,
+            ).fetchall()
+
+        if not rows:
+            return np.empty((0, self.num_perm), dtype=np.uint32)
+        return np.frombuffer(b"".join(row[0] for row in rows), dtype=np.uint32).reshape(
+            len(rows), self.num_perm
+        )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return int(self._db.execute("SELECT COUNT(*) FROM signatures").fetchone()[0])
+
+    def clear(self):
+        """Tum imzalari sil (tum worker'lar icin)"""
+        with self._lock:
+            self._db.execute("DELETE FROM buckets")
+            self._db.execute("DELETE FROM signatures")
+            self._db.commit()
+
+    def close(self):
+        """Baglantiyi kapat"""
+        with self._lock:
+            self._db.close()
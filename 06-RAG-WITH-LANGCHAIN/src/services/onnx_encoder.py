@@ -0,0 +1,296 @@
+"""
+ONNX Runtime Embedding Encoder
+SentenceTransformer modelinin ONNX'e (istege bagli int8) disa aktarimi ve torch'suz inference
+"""
+
+import json
+import re
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+
+class OnnxTokenizer:
+    """
+    tokenizers kutuphanesi uzerinde hafif tokenizer
+
+    HuggingFace tokenizer cagri arayuzunun (input_ids dondurme) EncodeEngine'in
+    kullandigi kismini saglar; transformers/torch import etmez.
+    """
+
+    def __init__(self, path: str | Path, max_length: int, do_lower_case: bool = False):
+        from tokenizers import Tokenizer
+
+        self.max_length = max_length
+        self.do_lower_case = do_lower_case
+        self._tokenizer = Tokenizer.from_file(str(path))
+        self._tokenizer.no_padding()
+        self._tokenizer.enable_truncation(max_length)
+
+    def _prepare(self, texts: list[str]) -> list[str]:
+        return [t.lower() for t in texts] if self.do_lower_case else list(texts)
+
+    def __call__(
+        self,
+        texts: list[str],
+        add_special_tokens: bool = True,
+        truncation: bool = True,
+        max_length: Optional[int] = None,
+    ) -> dict:
+        encoded = self._tokenizer.encode_batch(
+            self._prepare(texts), add_special_tokens=add_special_tokens
+        )
+        limit = (max_length or self.max_length) if truncation else None
+        return {"input_ids": [e.ids[:limit] for e in encoded]}
+
+    def batch(self, texts: list[str]) -> dict[str, np.ndarray]:
+        """Padding'li batch tensorleri (int64)"""
+        encoded = self._tokenizer.encode_batch(self._prepare(texts))
+        width = max(len(e.ids) for e in encoded)
+        arrays = {
+            name: np.zeros((len(encoded), width), dtype=np.int64)
+            for name in ("input_ids", "attention_mask", "token_type_ids")
+        }
+        for row, e in enumerate(encoded):
+            n = len(e.ids)
+            arrays["input_ids"][row, :n] = e.ids
+            arrays["attention_mask"][row, :n] = e.attention_mask
+            arrays["token_type_ids"][row, :n] = e.type_ids
+        return arrays
+
+
+class OnnxEncoder:
+    """
+    ONNX Runtime ile calisan SentenceTransformer uyumlu encoder
+
+    Transformer govdesi ONNX'e aktarilir (last_hidden_state ciktisi); mean
+    pooling ve L2 normalizasyonu numpy ile yapilir, boylece ciktilar
+    SentenceTransformer.encode ile ayni tanimi izler. Int8 dinamik
+    quantization ile agirliklar ~4x kuculur ve CPU'da tek sorgu gecikmesi
+    duser; torch import edilmedigi icin acilis da hizlanir.
+
+    Dizin duzeni:
+    - encoder.json: model adi, boyut, maksimum dizi uzunlugu, girisler
+    - tokenizer.json: fast tokenizer
+    - model.onnx: float32 model
+    - model.int8.onnx: dinamik int8 quantize edilmis model
+    """
+
+    CONFIG_FILE = "encoder.json"
+    TOKENIZER_FILE = "tokenizer.json"
+    MODEL_FILE = "model.onnx"
+    QUANTIZED_FILE = "model.int8.onnx"
+
+    def __init__(self, path: str | Path, quantized: bool = True, threads: Optional[int] = None):
+        """
+        Args:
+            path: export() ile olusturulmus dizin
+            quantized: int8 modeli kullan (False ise float32)
+            threads: ONNX Runtime intra-op thread sayisi (None = varsayilan)
+        """
+        import onnxruntime as ort
+
+        self.path = Path(path)
+        self.config = json.loads((self.path / self.CONFIG_FILE).read_text(encoding="utf-8"))
+        self.quantized = quantized
+        self.model_name: str = self.config["model_name"]
+        self.max_seq_length: int = self.config["max_seq_length"]
+        self.tokenizer = OnnxTokenizer(
+            self.path / self.TOKENIZER_FILE,
+            self.max_seq_length,
+            do_lower_case=self.config.get("do_lower_case", False),
+        )
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads:
+            options.intra_op_num_threads = threads
+        self.session = ort.InferenceSession(
+            str(self.path / (self.QUANTIZED_FILE if quantized else self.MODEL_FILE)),
+            sess_options=options,
+            providers=["CPUExecutionProvider"],
+        )
+        self._inputs = [i.name for i in self.session.get_inputs()]
+
+    @staticmethod
+    def model_dir(model_name: str, base_path: Optional[str | Path] = None) -> Path:
+        """Model adina gore export dizini (settings.embedding_onnx_path altinda)"""
+        if base_path is None:
+            from ..config import settings
+
+            base_path = settings.embedding_onnx_path
+        return Path(base_path) / re.sub(r"[^\w.-]+", "__", model_name).strip("_")
+
+    @classmethod
+    def exists(cls, path: str | Path, quantized: bool = True) -> bool:
+        """Dizinde kullanilabilir export var mi?"""
+        path = Path(path)
+        model_file = cls.QUANTIZED_FILE if quantized else cls.MODEL_FILE
+        return all(
+            (path / name).exists() for name in (cls.CONFIG_FILE, cls.TOKENIZER_FILE, model_file)
+        )
+
+    @classmethod
+    def export(
+        cls,
+        model_name: str,
+        path: str | Path,
+        quantize: bool = True,
+        opset: int = 17,
+    ) -> Path:
+        """
+        SentenceTransformer modelini ONNX'e aktar (torch, onnx ve onnxruntime gerekir)
+
+        Args:
+            model_name: HuggingFace model adi veya yerel SentenceTransformer dizini
+            path: Hedef dizin
+            quantize: Dinamik int8 quantize edilmis kopyayi da yaz
+            opset: ONNX opset surumu
+
+        Returns:
+            Export dizini
+
+        Raises:
+            ValueError: Model mean pooling disinda bir yapiya sahipse
+        """
+        import torch
+        from sentence_transformers import SentenceTransformer
+
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+
+        model = SentenceTransformer(model_name, device="cpu")
+        modules = list(model)
+        pooling = modules[1] if len(modules) > 1 else None
+        # sentence-transformers >= 6: pooling_mode, oncesi: get_pooling_mode_str()
+        pooling_mode = getattr(pooling, "pooling_mode", None) or (
+            pooling.get_pooling_mode_str() if hasattr(pooling, "get_pooling_mode_str") else None
+        )
+        if (
+            type(pooling).__name__ != "Pooling"
+            or pooling_mode != "mean"
+            or any(type(m).__name__ != "Normalize" for m in modules[2:])
+        ):
+            raise ValueError(
+                f"Desteklenmeyen model yapisi ({[type(m).__name__ for m in modules]}); "
+                "sadece Transformer + mean Pooling (+ Normalize) aktarilabilir"
+            )
+
+        transformer = modules[0]
+        tokenizer = transformer.tokenizer
+        if not getattr(tokenizer, "is_fast", False):
+            raise ValueError("ONNX export icin fast tokenizer gerekli")
+
+        sample = tokenizer(["ornek metin", "ikinci ornek"], padding=True, return_tensors="pt")
+        input_names = [
+            name for name in ("input_ids", "attention_mask", "token_type_ids") if name in sample
+        ]
+
+        class _Body(torch.nn.Module):
+            def __init__(self, auto_model):
+                super().__init__()
+                self.auto_model = auto_model
+
+            def forward(self, *inputs):
+                return self.auto_model(**dict(zip(input_names, inputs))).last_hidden_state
+
+        body = _Body(transformer.auto_model).eval()
+        axes = {"batch": 0, "sequence": 1}
+        with torch.no_grad():
+            torch.onnx.export(
+                body,
+                tuple(sample[name] for name in input_names),
+                str(path / cls.MODEL_FILE),
+                input_names=input_names,
+                output_names=["last_hidden_state"],
+                dynamic_axes={
+                    name: {v: k for k, v in axes.items()}
+                    for name in [*input_names, "last_hidden_state"]
+                },
+                opset_version=opset,
+                do_constant_folding=True,
+                dynamo=False,
+            )
+
+        if quantize:
+            from onnxruntime.quantization import QuantType, quantize_dynamic
+
+            quantize_dynamic(
+                str(path / cls.MODEL_FILE),
+                str(path / cls.QUANTIZED_FILE),
+                weight_type=QuantType.QInt8,
+            )
+
+        tokenizer.backend_tokenizer.save(str(path / cls.TOKENIZER_FILE))
+        dimension = getattr(
+            model, "get_embedding_dimension", model.get_sentence_embedding_dimension
+        )()
+        config = {
+            "model_name": model_name,
+            "dimension": dimension,
+            "max_seq_length": model.max_seq_length,
+            "do_lower_case": bool(getattr(transformer, "do_lower_case", False)),
+            "inputs": input_names,
+            "opset": opset,
+        }
+        (path / cls.CONFIG_FILE).write_text(json.dumps(config, indent=2), encoding="utf-8")
+        print(f"ONNX export: {path} (int8: {quantize})")
+        return path
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.config["dimension"]
+
+    def _forward(self, texts: list[str]) -> np.ndarray:
+        """Tek batch: transformer + mean pooling"""
+        arrays = self.tokenizer.batch(texts)
+        hidden = self.session.run(None, {name: arrays[name] for name in self._inputs})[0]
+        mask = arrays["attention_mask"][..., None].astype(np.float32)
+        summed = (hidden * mask).sum(axis=1)
+        return summed / np.clip(mask.sum(axis=1), 1e-9, None)
+
+    def encode(
+        self,
+        sentences: str | list[str],
+        batch_size: int = 32,
+        show_progress_bar: bool = False,
+        convert_to_numpy: bool = True,
+        normalize_embeddings: bool = False,
+        **kwargs,
+    ) -> np.ndarray:
+        """
+        SentenceTransformer.encode ile ayni arayuz
+
+        Args:
+            sentences: Metin veya metin listesi
+            batch_size: Batch boyutu
+            normalize_embeddings: L2 normalizasyonu uygula
+
+        Returns:
+            Tek metin icin 1D, liste icin N x D float32 dizi
+        """
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        out = np.empty((len(texts), self.get_sentence_embedding_dimension()), dtype=np.float32)
+        if texts:
+            # Benzer uzunluktaki metinler ayni batch'e duser (daha az padding)
+            order = np.argsort([-len(t) for t in texts], kind="stable")
+            for start in range(0, len(texts), batch_size):
+                indices = order[start : start + batch_size]
+                out[indices] = self._forward([texts[i] for i in indices])
+
+        if normalize_embeddings:
+            out /= np.clip(np.linalg.norm(out, axis=1, keepdims=True), 1e-12, None)
+        return out[0] if single else out
+
+
+class OnnxEncoderFactory:
+    """EncodeEngine worker'larinda OnnxEncoder yukleyen (pickle edilebilir) fabrika"""
+
+    def __init__(self, path: str | Path, quantized: bool = True, threads: Optional[int] = None):
+        self.path = str(path)
+        self.quantized = quantized
+        self.threads = threads
+
+    def __call__(self) -> OnnxEncoder:
+        return OnnxEncoder(self.path, quantized=self.quantized, threads=self.threads)
@@ -6,6 +6,8 @@ LGS tarzi soru uretimi icin system ve user prompt sablonlari
 from typing import Optional
 import random
 
+from .llm_client import PROMPT_CACHE_BOUNDARY
+
 
 class PromptBuilder:
     """
@@ -16,6 +18,10 @@ class PromptBuilder:
     - Dinamik user prompt
     - Stil varyasyonlari (cesitlilik icin)
     - JSON cikti formati
+
+    Prompt duzeni provider prefix cache'ine gore kurulur: system prompt ve
+    user prompt'un sabit kismi (gorev + JSON sablonu) once, degisen alanlar
+    (konu, zorluk, stil) PROMPT_CACHE_BOUNDARY'den sonra gelir.
     """
 
     def __init__(self):
@@ -62,7 +68,12 @@ Kurallar:
         formatted_examples: str,
         additional_instructions: Optional[str] = None,
     ) -> str:
-        """Tam soru uretimi icin user prompt"""
+        """
+        Tam soru uretimi icin user prompt
+
+        Sabit kisim (gorev + JSON sablonu) her cagrida ayni oldugu icin
+        basta; konu/zorluk/stil PROMPT_CACHE_BOUNDARY'den sonra gelir.
+        """
         alt_konu = combination.get("alt_konu", "ebob_ekok")
         zorluk = combination.get("zorluk", 3)
         gorsel_tipi = combination.get("gorsel_tipi", "yok")
@@ -72,23 +83,21 @@ Kurallar:
         # Not: formatted_examples RAG tarafindan hazirlansa da, token tasarrufu icin
         # burada gondermiyoruz. Sadece konu, zorluk ve stil talimati ile calisiyoruz.
 
-        return f"""Konu: {alt_konu}
-    Zorluk: {zorluk}/5
-    Gorsel tipi: {gorsel_tipi}
-
-    Gorevin:
-- Bu konuya ve zorluga uygun, gercek hayat senaryolu bir hikaye yaz.
+        return f"""Gorevin:
+- Asagida verilen konuya ve zorluga uygun, gercek hayat senaryolu bir hikaye yaz.
 - Hikayeden sonra KONUYU ODAK ALAN tek bir coktan secmeli soru yaz.
 - En az A, B, C, D olmak uzere 4 secenek yaz.
 - Sadece bir dogru cevap olsun.
 - Cozumu adim adim, aciklayici sekilde yaz.
-- Eger gorsel_tipi "yok" degilse, gorselin nasil olacagini aciklayan KISA bir ifade yaz.
-
-Ek stil talimati (opsiyonel, bos olabilir): {extra}
+- Eger gorsel tipi "yok" degilse, gorselin nasil olacagini aciklayan KISA bir ifade yaz.
+- Ek stil talimati verildiyse ona uy.
 
 Sadece asagidaki JSON formatinda cevap ver. JSON disinda hicbir aciklama yazma:
 
-{self._get_output_format()}"""
+{self._get_output_format()}{PROMPT_CACHE_BOUNDARY}Konu: {alt_konu}
+Zorluk: {zorluk}/5
+Gorsel tipi: {gorsel_tipi}
+Ek stil talimati (opsiyonel, bos olabilir): {extra}"""
 
     def _get_output_format(self) -> str:
                 """Tam soru JSON formati"""
@@ -111,6 +120,68 @@ Sadece asagidaki JSON formatinda cevap ver. JSON disinda hicbir aciklama yazma:
     ],
     "kontroller": null
 }
+```"""
+
+    def build_batch_user_prompt(self, slots: list[tuple[dict, Optional[str]]]) -> str:
+        """
+        Tek cagrida birden fazla soru icin user prompt
+
+        System prompt ve cikti sablonu K soru icin bir kez gonderilir; her
+        slot kendi kombinasyon ve stil talimatini tasir. Maddeler (degisen
+        kisim) PROMPT_CACHE_BOUNDARY'den sonra gelir.
+
+        Args:
+            slots: [(combination, style_instruction), ...] listesi
+
+        Returns:
+            {"sorular": [...]} nesnesi (K elemanli dizi) isteyen user prompt;
+            OpenAI JSON modu ust seviye dizi dondurmedigi icin dizi sarmalanir
+        """
+        lines = []
+        for no, (combination, style) in enumerate(slots, start=1):
+            lines.append(
+                f"{no}. Konu: {combination.get('alt_konu', 'ebob_ekok')} | "
+                f"Zorluk: {combination.get('zorluk', 3)}/5 | "
+                f"Gorsel tipi: {combination.get('gorsel_tipi', 'yok')} | "
+                f"Ek stil talimati: {style or '-'}"
+            )
+        items = "\n".join(lines)
+
+        return f"""Asagida numaralanmis her madde icin BIR soru uret.
+
+Her soru icin:
+- Maddedeki konuya ve zorluga uygun, gercek hayat senaryolu bir hikaye yaz.
+- Hikayeden sonra KONUYU ODAK ALAN tek bir coktan secmeli soru yaz.
+- En az A, B, C, D olmak uzere 4 secenek yaz.
+- Sadece bir dogru cevap olsun.
+- Cozumu adim adim, aciklayici sekilde yaz.
+- Eger gorsel tipi "yok" degilse, gorselin nasil olacagini aciklayan KISA bir ifade yaz.
+- Sorular birbirinden farkli senaryolar kullansin.
+
+Sadece asagidaki formatta bir JSON nesnesi dondur; "sorular" dizisi maddelerle ayni
+sirada olsun (madde basina bir eleman). "no" alani madde numarasidir. JSON disinda
+hicbir aciklama yazma:
+
+{self._get_batch_output_format()}{PROMPT_CACHE_BOUNDARY}Maddeler ({len(slots)} adet, {len(slots)} elemanli "sorular" dizisi bekleniyor):
+{items}"""
+
+    def _get_batch_output_format(self) -> str:
+        """Coklu soru JSON formati (tek soru formati + madde numarasi, "sorular" dizisinde)"""
+        return """```json
+{
+    "sorular": [
+        {
+            "no": 1,
+            "hikaye": "Gercek hayat senaryolu, kisa matematik hikayesi.",
+            "soru": "Hikayeye uygun coktan secmeli soru metni.",
+            "gorsel_aciklama": "Eger varsa, gorselin kisaca aciklamasi (yok ise null).",
+            "secenekler": {"A": "...", "B": "...", "C": "...", "D": "..."},
+            "dogru_cevap": "A",
+            "cozum": ["1. adim: ...", "2. adim: ..."],
+            "kontroller": null
+        }
+    ]
+}
 ```"""
 
     def get_random_style(self, exclude_recent: int = 3, recent_styles: Optional[list[str]] = None) -> str:
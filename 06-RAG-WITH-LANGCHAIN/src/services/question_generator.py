@@ -3,9 +3,13 @@ R-06: Soru Uretim Pipeline
 generate_question(config, examples) fonksiyonu ve tam pipeline
 """
 
+import asyncio
+import inspect
 import json
+import time
 import uuid
-from typing import Optional
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Awaitable, Callable, Optional
 from datetime import datetime
 
 from ..models.question import GeneratedQuestion, RetrievedQuestion
@@ -13,7 +17,14 @@ from ..models.combination import Combination
 from .retriever import QuestionRetriever
 from .output_formatter import RAGOutputFormatter
 from .prompt_builder import PromptBuilder
-from .llm_client import BaseLLMClient, parse_llm_response
+from .llm_client import (
+    BaseLLMClient,
+    LLMClientFactory,
+    parse_llm_batch_response,
+    parse_llm_response,
+)
+from .stream_parser import IncrementalJSONParser
+from .semantic_dedup import SemanticDuplicateGuard
 from tenacity import RetryError
 from ..config import settings
 
@@ -33,6 +44,65 @@ class InsufficientExamplesError(Exception):
     pass
 
 
+class DuplicateQuestionError(ValidationError):
+    """Uretilen soru kaynak bankadaki veya onceki bir soruyla semantik olarak ayni"""
+    pass
+
+
+# Ek kabul kontrolu: soru kabul edilirse True (senkron veya awaitable)
+AcceptCheck = Callable[[GeneratedQuestion], bool | Awaitable[bool]]
+
+
+@dataclass
+class BatchItemResult:
+    """Toplu uretimde tek bir kalemin sonucu"""
+
+    index: int
+    combination: dict
+    style_instruction: Optional[str] = None
+    question: Optional[GeneratedQuestion] = None
+    error: Optional[str] = None
+    error_type: Optional[str] = None
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        """Kalem basarili mi?"""
+        return self.question is not None
+
+
+@dataclass
+class BatchResult:
+    """Toplu uretim sonucu (kalem bazinda hata takibi ile)"""
+
+    items: list[BatchItemResult] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def questions(self) -> list[GeneratedQuestion]:
+        """Basarili sorular (istek sirasinda)"""
+        return [r.question for r in sorted(self.items, key=lambda r: r.index) if r.ok]
+
+    @property
+    def failures(self) -> list[BatchItemResult]:
+        """Basarisiz kalemler (istek sirasinda)"""
+        return [r for r in sorted(self.items, key=lambda r: r.index) if not r.ok]
+
+    def stats(self) -> dict:
+        """Ozet istatistikler"""
+        errors_by_type: dict[str, int] = {}
+        for r in self.failures:
+            errors_by_type[r.error_type] = errors_by_type.get(r.error_type, 0) + 1
+
+        return {
+            "requested": len(self.items),
+            "generated": len(self.items) - len(self.failures),
+            "failed": len(self.failures),
+            "errors_by_type": errors_by_type,
+            "elapsed_seconds": round(self.elapsed, 3),
+        }
+
+
 class QuestionGenerator:
     """
     Tam soru uretim pipeline'i
@@ -51,6 +121,7 @@ class QuestionGenerator:
         formatter: RAGOutputFormatter,
         prompt_builder: PromptBuilder,
         llm_client: BaseLLMClient,
+        duplicate_guard: Optional[SemanticDuplicateGuard] = None,
     ):
         """
         Args:
@@ -58,17 +129,20 @@ class QuestionGenerator:
             formatter: RAG cikti formatlayici
             prompt_builder: Prompt olusturucu
             llm_client: LLM API client
+            duplicate_guard: Toplu uretimde semantik tekrar kontrolu (opsiyonel)
         """
         self.retriever = retriever
         self.formatter = formatter
         self.prompt_builder = prompt_builder
         self.llm = llm_client
+        self.duplicate_guard = duplicate_guard
 
     async def generate_question(
         self,
         combination: dict,
         style_instruction: Optional[str] = None,
         max_attempts: int = 1,
+        accept: Optional[AcceptCheck] = None,
     ) -> GeneratedQuestion:
         """
         Tek soru uret
@@ -77,6 +151,8 @@ class QuestionGenerator:
             combination: {alt_konu, zorluk, gorsel_tipi, lgs_skor}
             style_instruction: Stil talimati (cesitlilik icin)
             max_attempts: Maksimum deneme sayisi
+            accept: Ek kabul kontrolu (or. tekrar kontrolu); reddedilen soru
+                yeniden uretilir
             
         Returns:
             GeneratedQuestion instance
@@ -85,13 +161,144 @@ class QuestionGenerator:
             QuestionGenerationError: Uretim basarisiz
             InsufficientExamplesError: Yeterli ornek yok
         """
-        # Step 1: Retrieval
-        examples = self.retriever.retrieve_examples(combination, top_k=5)
+        examples, system_prompt, user_prompt = self._build_prompts(combination, style_instruction)
 
-        if len(examples) < 3:
-            raise InsufficientExamplesError(
-                f"Yetersiz ornek: {len(examples)} bulundu, minimum 3 gerekli"
+        # Step 4 & 5: Generate with retry
+        last_error = None
+        raw_llm_response = None
+        for attempt in range(max_attempts):
+            # Temperature: her denemede biraz artir
+            temperature = 0.7 + (attempt * 0.1)
+            try:
+                question = await self._generate_candidate(
+                    combination,
+                    style_instruction,
+                    system_prompt,
+                    user_prompt,
+                    temperature=temperature,
+                    attempt=attempt + 1,
+                    retrieval_count=len(examples),
+                )
+                await self._check_accept(accept, question)
+                return question
+            except Exception as e:
+                last_error = self._describe_error(e)
+                raw_llm_response = getattr(e, "raw_response", raw_llm_response)
+
+        error = QuestionGenerationError(
+            f"Max {max_attempts} deneme sonrasi basarisiz. Son hata: {last_error}"
+        )
+        error.raw_response = raw_llm_response  # Ham yaniti exception'a ekle
+        raise error
+
+    async def generate_question_hedged(
+        self,
+        combination: dict,
+        style_instruction: Optional[str] = None,
+        candidates: Optional[int] = None,
+        accept: Optional[AcceptCheck] = None,
+        hedge_delay: Optional[float] = None,
+    ) -> GeneratedQuestion:
+        """
+        Spekulatif uretim: ayni kombinasyon icin N adayi paralel baslat,
+        validasyondan (ve accept kontrolunden) ilk gecen adayi dondur
+
+        Seri yeniden denemenin aksine basarisiz bir cikti ek bir LLM tur
+        suresi eklemez. Adaylar kademeli temperature ile uretilir (0.7,
+        0.8, ... en fazla 1.0); kazanan bulununca kalan adaylar iptal edilir.
+
+        Args:
+            combination: {alt_konu, zorluk, gorsel_tipi, lgs_skor}
+            style_instruction: Stil talimati (cesitlilik icin)
+            candidates: Paralel aday sayisi (None ise settings'den alinir)
+            accept: Ek kabul kontrolu (or. tekrar kontrolu); False donerse aday elenir
+            hedge_delay: Adaylar arasi baslatma gecikmesi (saniye, None ise settings'den)
+
+        Returns:
+            GeneratedQuestion instance
+
+        Raises:
+            QuestionGenerationError: Hicbir aday gecerli degil
+            InsufficientExamplesError: Yeterli ornek yok
+        """
+        candidates = candidates or settings.generation_hedge_candidates
+        if hedge_delay is None:
+            hedge_delay = settings.generation_hedge_delay
+
+        examples, system_prompt, user_prompt = self._build_prompts(combination, style_instruction)
+
+        async def _candidate(i: int) -> GeneratedQuestion:
+            if i and hedge_delay:
+                await asyncio.sleep(i * hedge_delay)
+            question = await self._generate_candidate(
+                combination,
+                style_instruction,
+                system_prompt,
+                user_prompt,
+                temperature=min(1.0, 0.7 + i * 0.1),
+                attempt=i + 1,
+                retrieval_count=len(examples),
             )
+            await self._check_accept(accept, question)
+            return question
+
+        tasks = [asyncio.create_task(_candidate(i)) for i in range(candidates)]
+        last_error = None
+        raw_llm_response = None
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                try:
+                    question = await next_done
+                except Exception as e:
+                    last_error = self._describe_error(e)
+                    raw_llm_response = getattr(e, "raw_response", raw_llm_response)
+                    continue
+                question.metadata["hedge_candidates"] = candidates
+                return question
+        finally:
+            # Kazanan bulundu (veya cagiran iptal edildi): kalan adaylari durdur
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+        error = QuestionGenerationError(
+            f"{candidates} paralel adaydan hicbiri gecerli degil. Son hata: {last_error}"
+        )
+        error.raw_response = raw_llm_response
+        raise error
+
+    @staticmethod
+    async def _check_accept(accept: Optional[AcceptCheck], question: GeneratedQuestion):
+        """
+        Ek kabul kontrolunu calistir (senkron veya async)
+
+        Raises:
+            DuplicateQuestionError: Soru kabul edilmedi
+        """
+        if accept is None:
+            return
+        accepted = accept(question)
+        if inspect.isawaitable(accepted):
+            accepted = await accepted
+        if not accepted:
+            raise DuplicateQuestionError("Aday kabul edilmedi (tekrar eden soru)")
+
+    def _build_prompts(
+        self,
+        combination: dict,
+        style_instruction: Optional[str],
+    ) -> tuple[list[RetrievedQuestion], str, str]:
+        """
+        Retrieval + formatlama + prompt olusturma
+
+        Returns:
+            (examples, system_prompt, user_prompt)
+
+        Raises:
+            InsufficientExamplesError: Yeterli ornek yok
+        """
+        # Step 1: Retrieval
+        examples = self._retrieve(combination)
 
         # Step 2: Format
         formatted_examples = self.formatter.format_examples(examples, combination)
@@ -104,68 +311,295 @@ class QuestionGenerator:
             additional_instructions=style_instruction,
         )
 
-        # Step 4 & 5: Generate with retry
-        last_error = None
-        raw_llm_response = None
+        return examples, system_prompt, user_prompt
+
+    def _retrieve(self, combination: dict) -> list[RetrievedQuestion]:
+        """
+        Kombinasyon icin benzer sorular
+
+        Raises:
+            InsufficientExamplesError: Yeterli ornek yok
+        """
+        examples = self.retriever.retrieve_examples(combination, top_k=5)
+
+        if len(examples) < 3:
+            raise InsufficientExamplesError(
+                f"Yetersiz ornek: {len(examples)} bulundu, minimum 3 gerekli"
+            )
+        return examples
+
+    async def _generate_candidate(
+        self,
+        combination: dict,
+        style_instruction: Optional[str],
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float,
+        attempt: int,
+        retrieval_count: int,
+    ) -> GeneratedQuestion:
+        """
+        Tek LLM cagrisi + parse + validasyon
+
+        Parse/validasyon hatalarinda ham yanit exception'in raw_response
+        alanina eklenir.
+        """
+        # Akis destegi: stream() async generator olmali (bkz. BaseLLMClient.stream)
+        if settings.llm_streaming and inspect.isasyncgenfunction(getattr(self.llm, "stream", None)):
+            question_data = await self._stream_candidate(
+                combination, system_prompt, user_prompt, temperature
+            )
+        else:
+            question_data = await self._generate_response(
+                combination, system_prompt, user_prompt, temperature
+            )
+
+        return self._to_question(
+            question_data,
+            combination,
+            style_instruction,
+            temperature=temperature,
+            attempt=attempt,
+            retrieval_count=retrieval_count,
+        )
+
+    @staticmethod
+    def _to_question(
+        question_data: dict,
+        combination: dict,
+        style_instruction: Optional[str],
+        temperature: float,
+        attempt: int,
+        retrieval_count: int,
+        **metadata,
+    ) -> GeneratedQuestion:
+        """Dogrulanmis LLM ciktisini GeneratedQuestion'a cevir"""
+        return GeneratedQuestion(
+            id=str(uuid.uuid4()),
+            alt_konu=combination.get("alt_konu", ""),
+            zorluk=combination.get("zorluk", 3),
+            gorsel_tipi=combination.get("gorsel_tipi", "yok"),
+            hikaye=question_data.get("hikaye", ""),
+            soru=question_data.get("soru", ""),
+            gorsel_aciklama=question_data.get("gorsel_aciklama"),
+            secenekler=question_data.get("secenekler", {}),
+            dogru_cevap=question_data.get("dogru_cevap", "A"),
+            cozum=question_data.get("cozum", []),
+            kontroller=question_data.get("kontroller"),
+            metadata={
+                "attempt": attempt,
+                "retrieval_count": retrieval_count,
+                "style_instruction": style_instruction,
+                "temperature": temperature,
+                "combination_lgs_skor": combination.get("lgs_skor"),
+                **metadata,
+            },
+            created_at=datetime.now(),
+        )
+
+    async def _generate_group(
+        self,
+        slots: list[tuple[int, dict, Optional[str]]],
+        max_attempts: int = 1,
+    ) -> list[BatchItemResult]:
+        """
+        Birden fazla soruyu tek LLM cagrisinda uret
+
+        System prompt ve cikti sablonu K soru icin bir kez gonderilir; yanit
+        K elemanli JSON dizisidir. Her eleman _validate_question ile ayri
+        dogrulanir; sonraki denemede sadece basarisiz slotlar (daha kucuk
+        bir dizi olarak) tekrar istenir. max_tokens slot sayisiyla olceklenir
+        ve modelin cikti limitini asmaz.
+
+        Args:
+            slots: [(index, combination, style_instruction), ...]
+            max_attempts: Slot basina maksimum deneme sayisi
+
+        Returns:
+            Slot basina BatchItemResult (slots sirasinda)
+        """
+        started = time.perf_counter()
+        results = [
+            BatchItemResult(index=index, combination=combo, style_instruction=style)
+            for index, combo, style in slots
+        ]
+
+        # Retrieval (yetersiz ornekli slot LLM'e hic gitmez)
+        pending: list[tuple[BatchItemResult, int]] = []
+        for result in results:
+            try:
+                pending.append((result, len(self._retrieve(result.combination))))
+            except InsufficientExamplesError as e:
+                result.error = str(e)
+                result.error_type = type(e).__name__
+
+        output_limit = self._max_output_tokens()
+        last_errors: dict[int, str] = {}
         for attempt in range(max_attempts):
+            if not pending:
+                break
+            temperature = 0.7 + (attempt * 0.1)
+            user_prompt = self.prompt_builder.build_batch_user_prompt(
+                [(result.combination, result.style_instruction) for result, _ in pending]
+            )
+
             try:
-                # Temperature: her denemede biraz artir
-                temperature = 0.7 + (attempt * 0.1)
+                async with self._llm_slot():
+                    response = await self.llm.generate(
+                        system_prompt=self.prompt_builder.system_prompt,
+                        user_prompt=user_prompt,
+                        temperature=temperature,
+                        max_tokens=min(settings.llm_max_tokens * len(pending), output_limit),
+                    )
+                elements = self._assign_elements(parse_llm_batch_response(response), len(pending))
+            except Exception as e:
+                for result, _ in pending:
+                    last_errors[result.index] = self._describe_error(e)
+                continue
 
-                # LLM cagri
-                response = await self.llm.generate(
-                    system_prompt=system_prompt,
-                    user_prompt=user_prompt,
+            failed = []
+            for (result, retrieval_count), data in zip(pending, elements):
+                try:
+                    if not isinstance(data, dict):
+                        raise ValidationError("Yanitta bu madde icin soru yok")
+                    self._validate_question(data, result.combination)
+                except Exception as e:
+                    last_errors[result.index] = self._describe_error(e)
+                    failed.append((result, retrieval_count))
+                    continue
+
+                result.question = self._to_question(
+                    data,
+                    result.combination,
+                    result.style_instruction,
                     temperature=temperature,
-                    max_tokens=settings.llm_max_tokens,
-                )
-                raw_llm_response = response  # Ham yaniti sakla
-
-                # Parse JSON (tam soru formati bekleniyor)
-                question_data = parse_llm_response(response)
-
-                # Validate
-                self._validate_question(question_data, combination)
-
-                # Return
-                return GeneratedQuestion(
-                    id=str(uuid.uuid4()),
-                    alt_konu=combination.get("alt_konu", ""),
-                    zorluk=combination.get("zorluk", 3),
-                    gorsel_tipi=combination.get("gorsel_tipi", "yok"),
-                    hikaye=question_data.get("hikaye", ""),
-                    soru=question_data.get("soru", ""),
-                    gorsel_aciklama=question_data.get("gorsel_aciklama"),
-                    secenekler=question_data.get("secenekler", {}),
-                    dogru_cevap=question_data.get("dogru_cevap", "A"),
-                    cozum=question_data.get("cozum", []),
-                    kontroller=question_data.get("kontroller"),
-                    metadata={
-                        "attempt": attempt + 1,
-                        "retrieval_count": len(examples),
-                        "style_instruction": style_instruction,
-                        "temperature": temperature,
-                        "combination_lgs_skor": combination.get("lgs_skor"),
-                    },
-                    created_at=datetime.now(),
+                    attempt=attempt + 1,
+                    retrieval_count=retrieval_count,
+                    batch_size=len(pending),
                 )
+            pending = failed
 
-            except json.JSONDecodeError as e:
-                last_error = f"JSON parse hatasi: {e}"
-            except ValidationError as e:
-                last_error = f"Validasyon hatasi: {e}"
-            except RetryError as e:
-                # tenacity RetryError icindeki son hatayi cikart
-                inner = e.last_attempt.exception()
-                last_error = f"LLM retry hatasi: {inner!r}"
-            except Exception as e:
-                last_error = f"Beklenmeyen hata: {e}"
+        for result, _ in pending:
+            result.error = (
+                f"Max {max_attempts} deneme sonrasi basarisiz. "
+                f"Son hata: {last_errors.get(result.index)}"
+            )
+            result.error_type = QuestionGenerationError.__name__
 
-        error = QuestionGenerationError(
-            f"Max {max_attempts} deneme sonrasi basarisiz. Son hata: {last_error}"
+        elapsed = time.perf_counter() - started
+        for result in results:
+            result.elapsed = elapsed
+        return results
+
+    @staticmethod
+    def _assign_elements(elements: list, count: int) -> list:
+        """
+        Dizi elemanlarini slotlara esle
+
+        Tum elemanlar gecerli ve benzersiz "no" alani tasiyorsa ona gore,
+        aksi halde siraya gore eslenir. Eksik slotlar None kalir.
+        """
+        slots = [None] * count
+        numbers = [
+            element.get("no") if isinstance(element, dict) else None
+            for element in elements
+        ]
+        numbered = all(
+            isinstance(no, int) and not isinstance(no, bool) and 1 <= no <= count
+            for no in numbers
+        ) and len(set(numbers)) == len(numbers)
+
+        if numbered:
+            for no, element in zip(numbers, elements):
+                slots[no - 1] = element
+        else:
+            for i, element in enumerate(elements[:count]):
+                slots[i] = element
+        return slots
+
+    async def _generate_response(
+        self,
+        combination: dict,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float,
+    ) -> dict:
+        """Tam yaniti bekle, sonra parse + validasyon"""
+        # LLM cagri (provider eszamanlilik limiti icinde)
+        async with self._llm_slot():
+            response = await self.llm.generate(
+                system_prompt=system_prompt,
+                user_prompt=user_prompt,
+                temperature=temperature,
+                max_tokens=settings.llm_max_tokens,
+            )
+
+        try:
+            # Parse JSON (tam soru formati bekleniyor)
+            question_data = parse_llm_response(response)
+
+            # Validate
+            self._validate_question(question_data, combination)
+        except Exception as e:
+            e.raw_response = response  # Ham yaniti sakla
+            raise
+
+        return question_data
+
+    async def _stream_candidate(
+        self,
+        combination: dict,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float,
+    ) -> dict:
+        """
+        Yaniti akisla al, alanlari geldikce dogrula
+
+        Ust seviye bir alan tamamlandiginda _validate_field cagrilir; yapi
+        bozuksa (StreamParseError) veya alan gecersizse (ValidationError) akis
+        kapatilir ve kalan token'lar uretilmez. Nesne kapaninca akisin geri
+        kalani okunmaz.
+        """
+        parser = IncrementalJSONParser(
+            on_field=lambda key, value: self._validate_field(key, value, parser.fields)
         )
-        error.raw_response = raw_llm_response  # Ham yaniti exception'a ekle
-        raise error
+
+        try:
+            async with self._llm_slot():
+                chunks = self.llm.stream(
+                    system_prompt=system_prompt,
+                    user_prompt=user_prompt,
+                    temperature=temperature,
+                    max_tokens=settings.llm_max_tokens,
+                )
+                try:
+                    async for chunk in chunks:
+                        if parser.feed(chunk):
+                            break
+                finally:
+                    await chunks.aclose()
+
+            question_data = parser.result()
+            self._validate_question(question_data, combination)
+        except Exception as e:
+            e.raw_response = parser.text  # O ana kadar gelen ham yanit
+            raise
+
+        return question_data
+
+    @staticmethod
+    def _describe_error(e: Exception) -> str:
+        """Deneme hatasini okunabilir mesaja cevir"""
+        if isinstance(e, json.JSONDecodeError):
+            return f"JSON parse hatasi: {e}"
+        if isinstance(e, ValidationError):
+            return f"Validasyon hatasi: {e}"
+        if isinstance(e, RetryError):
+            # tenacity RetryError icindeki son hatayi cikart
+            inner = e.last_attempt.exception()
+            return f"LLM retry hatasi: {inner!r}"
+        return f"Beklenmeyen hata: {e}"
 
     def _validate_question(self, data: dict, combination: dict):
         """Tam soru validasyonu"""
@@ -196,6 +630,260 @@ class QuestionGenerator:
         if not isinstance(cozum, list) or len(cozum) == 0:
             raise ValidationError("Eksik alan: cozum (en az bir adim olmali)")
 
+    def _validate_field(self, key: str, value, fields: dict):
+        """
+        Akista tamamlanan tek alanin validasyonu
+
+        _validate_question ile ayni kurallar; sadece o ana kadar gelen
+        alanlara bakar, eksik alan kontrolu nesne tamamlaninca yapilir.
+        """
+        if key in ("hikaye", "soru") and (not isinstance(value, str) or not value.strip()):
+            raise ValidationError(f"Eksik alan: {key}")
+
+        if key == "secenekler":
+            if not isinstance(value, dict) or len(value) < 4:
+                raise ValidationError("Eksik veya hatali alan: secenekler (en az A,B,C,D olmali)")
+            if not {"A", "B", "C", "D"}.issubset(set(value.keys())):
+                raise ValidationError("Secenekler A, B, C, D icermeli")
+
+        if key == "dogru_cevap":
+            dogru_cevap = str(value or "").strip()
+            if not dogru_cevap:
+                raise ValidationError("dogru_cevap, secenekler'den biri olmali")
+            secenekler = fields.get("secenekler")
+            if isinstance(secenekler, dict) and dogru_cevap not in secenekler:
+                raise ValidationError("dogru_cevap, secenekler'den biri olmali")
+
+        if key == "cozum" and (not isinstance(value, list) or len(value) == 0):
+            raise ValidationError("Eksik alan: cozum (en az bir adim olmali)")
+
+    def _llm_slot(self) -> asyncio.Semaphore:
+        """LLM provider'inin paylasilan eszamanlilik semaforu"""
+        provider = getattr(self.llm, "provider", None)
+        if not isinstance(provider, str):
+            provider = None
+        return LLMClientFactory.get_semaphore(provider)
+
+    def _max_output_tokens(self) -> int:
+        """LLM modelinin tek yanit cikti token limiti"""
+        model = getattr(self.llm, "model_id", None)
+        if not isinstance(model, str):
+            model = None
+        return LLMClientFactory.get_max_output_tokens(model)
+
+    async def iter_batch(
+        self,
+        jobs: list[tuple[dict, Optional[str]]],
+        max_attempts: int = 1,
+        check_duplicates: bool = True,
+        questions_per_call: Optional[int] = None,
+    ) -> AsyncIterator[BatchItemResult]:
+        """
+        Toplu uretimi eszamanli calistir, sonuclari bittikce don
+
+        Her kalem ayri bir task olarak baslatilir; ayni anda acik LLM cagrisi
+        sayisi provider semaforu ile sinirlanir. Bir kalemin hatasi digerlerini
+        durdurmaz, BatchItemResult.error alaninda raporlanir.
+
+        duplicate_guard varsa, ayni anda tamamlanan kalemler tek encoder
+        cagrisiyla semantik tekrar kontrolunden gecer; tekrarlar
+        DuplicateQuestionError olarak raporlanir.
+
+        questions_per_call > 1 ise kalemler K'lik gruplara bolunur ve her
+        grup tek LLM cagrisinda uretilir (bkz. _generate_group). K x
+        LLM_MAX_TOKENS modelin cikti limitini asiyorsa K limite sigacak
+        sekilde dusurulur.
+
+        Args:
+            jobs: [(combination, style_instruction), ...] listesi
+            max_attempts: Kalem basina maksimum deneme sayisi
+            check_duplicates: Tamamlanan kalemleri duplicate_guard ile kontrol et
+            questions_per_call: LLM cagrisi basina soru sayisi (None ise settings'den)
+
+        Yields:
+            BatchItemResult (tamamlanma sirasinda)
+        """
+
+        per_call = questions_per_call or settings.generation_questions_per_call
+        if per_call > 1:
+            output_limit = self._max_output_tokens()
+            fits = max(1, output_limit // settings.llm_max_tokens)
+            if fits < per_call:
+                print(
+                    f"Cagri basina soru sayisi {per_call} -> {fits} "
+                    f"(model cikti limiti {output_limit} token)"
+                )
+                per_call = fits
+
+        async def _run(index: int, combo: dict, style: Optional[str]) -> list[BatchItemResult]:
+            started = time.perf_counter()
+            result = BatchItemResult(index=index, combination=combo, style_instruction=style)
+            try:
+                result.question = await self.generate_question(
+                    combination=combo,
+                    style_instruction=style,
+                    max_attempts=max_attempts,
+                )
+            except (QuestionGenerationError, InsufficientExamplesError) as e:
+                result.error = str(e)
+                result.error_type = type(e).__name__
+            result.elapsed = time.perf_counter() - started
+            return [result]
+
+        if per_call > 1:
+            slots = [(i, combo, style) for i, (combo, style) in enumerate(jobs)]
+            tasks = [
+                asyncio.create_task(self._generate_group(slots[i : i + per_call], max_attempts))
+                for i in range(0, len(slots), per_call)
+            ]
+        else:
+            tasks = [
+                asyncio.create_task(_run(i, combo, style))
+                for i, (combo, style) in enumerate(jobs)
+            ]
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                items = sorted(
+                    (item for task in done for item in task.result()),
+                    key=lambda r: r.index,
+                )
+                if check_duplicates:
+                    await self.filter_duplicates(items)
+                for item in items:
+                    yield item
+        finally:
+            # Tuketici erken cikarsa (or. istemci baglantiyi kapatti) kalanlari iptal et
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    async def generate_batch_detailed(
+        self,
+        combinations: list[dict],
+        ensure_diversity: bool = True,
+        max_per_combination: int = 1,
+        styles: Optional[list[Optional[str]]] = None,
+        max_attempts: int = 1,
+        questions_per_call: Optional[int] = None,
+    ) -> BatchResult:
+        """
+        Eszamanli toplu soru uretimi (kalem bazinda hata takibi ile)
+
+        Args:
+            combinations: Kombinasyon listesi
+            ensure_diversity: Cesitlilik garantisi (styles verilmemisse stil sec)
+            max_per_combination: Kombinasyon basina soru sayisi
+            styles: Kalem basina hazir stil talimatlari (opsiyonel)
+            max_attempts: Kalem basina maksimum deneme sayisi
+            questions_per_call: LLM cagrisi basina soru sayisi (None ise settings'den)
+
+        Returns:
+            BatchResult
+        """
+        jobs = self.build_jobs(
+            combinations,
+            ensure_diversity=ensure_diversity,
+            max_per_combination=max_per_combination,
+            styles=styles,
+        )
+
+        started = time.perf_counter()
+        result = BatchResult()
+        # Tekrar kontrolu sonda tum parti icin tek encoder cagrisiyla yapilir
+        async for item in self.iter_batch(
+            jobs,
+            max_attempts=max_attempts,
+            check_duplicates=False,
+            questions_per_call=questions_per_call,
+        ):
+            result.items.append(item)
+        await self.filter_duplicates(result.items)
+        for item in result.items:
+            if not item.ok:
+                print(f"Kombinasyon atlandi: {item.combination}. Hata: {item.error}")
+        result.elapsed = time.perf_counter() - started
+
+        return result
+
+    async def filter_duplicates(self, items: list[BatchItemResult]) -> int:
+        """
+        Basarili kalemleri semantik tekrar kontrolunden gecir
+
+        Tekrar olan kalemlerin sorusu dusurulur ve DuplicateQuestionError
+        olarak isaretlenir; yeni sorular tekrar gecmisine eklenir. Encode ve
+        arama thread'de calisir (event loop bloklanmaz). Embedding hatasinda
+        kontrol atlanir, kalemler tekrar degil sayilir.
+
+        Args:
+            items: Toplu uretim kalemleri (yerinde guncellenir)
+
+        Returns:
+            Tekrar olarak isaretlenen kalem sayisi
+        """
+        if self.duplicate_guard is None:
+            return 0
+
+        generated = [item for item in items if item.ok]
+        if not generated:
+            return 0
+
+        try:
+            matches = await asyncio.to_thread(
+                self.duplicate_guard.check,
+                [self.duplicate_guard.question_text(item.question) for item in generated],
+            )
+        except Exception as e:
+            print(f"Semantik tekrar kontrolu atlandi: {e}")
+            return 0
+        duplicates = 0
+        for item, match in zip(generated, matches):
+            if match is None:
+                continue
+            item.question = None
+            item.error = f"Semantik tekrar ({match.source}, benzerlik {match.score:.3f})"
+            item.error_type = DuplicateQuestionError.__name__
+            duplicates += 1
+        return duplicates
+
+    def build_jobs(
+        self,
+        combinations: list[dict],
+        ensure_diversity: bool = True,
+        max_per_combination: int = 1,
+        styles: Optional[list[Optional[str]]] = None,
+    ) -> list[tuple[dict, Optional[str]]]:
+        """
+        Toplu uretim kalemlerini (kombinasyon, stil) olarak hazirla
+
+        Args:
+            combinations: Kombinasyon listesi
+            ensure_diversity: Cesitlilik garantisi (styles verilmemisse stil sec)
+            max_per_combination: Kombinasyon basina soru sayisi
+            styles: Kalem basina hazir stil talimatlari (opsiyonel)
+
+        Returns:
+            [(combination, style_instruction), ...] listesi
+        """
+        jobs: list[tuple[dict, Optional[str]]] = []
+        used_styles: list[str] = []
+
+        for combo in combinations:
+            for _ in range(max_per_combination):
+                style = None
+                if styles is not None and len(jobs) < len(styles):
+                    style = styles[len(jobs)]
+                elif ensure_diversity:
+                    # Stiller task'lar baslamadan sirayla secilir, cesitlilik korunur
+                    style = self.prompt_builder.get_random_style(
+                        exclude_recent=3, recent_styles=used_styles
+                    )
+                    used_styles.append(style)
+                jobs.append((combo, style))
+
+        return jobs
+
     async def generate_batch(
         self,
         combinations: list[dict],
@@ -211,34 +899,14 @@ class QuestionGenerator:
             max_per_combination: Kombinasyon basina maksimum soru
             
         Returns:
-            GeneratedQuestion listesi
+            GeneratedQuestion listesi (basarisiz kombinasyonlar atlanir)
         """
-        results = []
-        used_styles = []
-
-        for combo in combinations:
-            for _ in range(max_per_combination):
-                try:
-                    # Cesitlilik icin rastgele stil
-                    style = None
-                    if ensure_diversity:
-                        style = self.prompt_builder.get_random_style(
-                            exclude_recent=3, recent_styles=used_styles
-                        )
-                        used_styles.append(style)
-
-                    question = await self.generate_question(
-                        combination=combo,
-                        style_instruction=style,
-                    )
-                    results.append(question)
-
-                except (QuestionGenerationError, InsufficientExamplesError) as e:
-                    # Hatali kombinasyonu atla, devam et
-                    print(f"Kombinasyon atlandi: {combo}. Hata: {e}")
-                    continue
-
-        return results
+        result = await self.generate_batch_detailed(
+            combinations,
+            ensure_diversity=ensure_diversity,
+            max_per_combination=max_per_combination,
+        )
+        return result.questions
 
 
 async def generate_single_question(
@@ -0,0 +1,123 @@
+"""
+LLM Rate Limiter
+Provider/model bazinda istek (RPM) ve token (TPM) butcesi uygulayan token bucket
+"""
+
+import asyncio
+import time
+from typing import Optional
+
+
+def estimate_tokens(text: str, max_tokens: int = 0) -> int:
+    """
+    Istegin TPM butcesinden dusecegi token sayisini tahmin et
+
+    Provider'lar limiti istek aninda giris + max_tokens uzerinden ayirir;
+    giris icin ~4 karakter/token yaklasimi kullanilir.
+
+    Args:
+        text: Prompt metni (system + user)
+        max_tokens: Istenen maksimum cikti token'i
+
+    Returns:
+        Tahmini token sayisi
+    """
+    return len(text) // 4 + 1 + max_tokens
+
+
+class TokenBucket:
+    """
+    Dakika bazli surekli dolan token bucket
+
+    Kapasite burst_seconds kadarlik butcedir; buyuk istekler kapasiteyi
+    asabilir (seviye eksiye duser) ve sonraki istekler borc kapanana kadar
+    bekler. Boylece ortalama hiz her zaman limitte kalir.
+    """
+
+    def __init__(self, rate_per_minute: float, burst_seconds: float = 1.0):
+        """
+        Args:
+            rate_per_minute: Dakikadaki birim sayisi (istek veya token)
+            burst_seconds: Bosta biriktirilebilecek butce (saniye cinsinden)
+        """
+        self.rate = rate_per_minute / 60.0
+        self.capacity = max(self.rate * burst_seconds, 1.0)
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """amount kadar butce icin beklenmesi gereken sure (saniye)"""
+        self._refill(now)
+        need = min(amount, self.capacity)
+        if self.level >= need:
+            return 0.0
+        return (need - self.level) / self.rate
+
+    def take(self, amount: float, now: float):
+        """Butceden dus"""
+        self._refill(now)
+        self.level -= amount
+
+
+class RateLimiter:
+    """
+    RPM + TPM butcesini birlikte uygulayan async limiter
+
+    Bekleyen cagrilar tek bir asyncio.Lock arkasinda FIFO sirayla ilerler;
+    siradaki cagri butce olusana kadar uyur, sonra butceyi duser. Istekler
+    bu sayede limite esit hizda akar, 429 -> geri cekilme salinimi olusmaz.
+    """
+
+    def __init__(
+        self,
+        rpm: Optional[int] = None,
+        tpm: Optional[int] = None,
+        burst_seconds: float = 1.0,
+    ):
+        """
+        Args:
+            rpm: Dakikadaki istek limiti (None = sinirsiz)
+            tpm: Dakikadaki token limiti (None = sinirsiz)
+            burst_seconds: Bosta biriktirilebilecek butce (saniye)
+        """
+        self.rpm = rpm
+        self.tpm = tpm
+        self._requests = TokenBucket(rpm, burst_seconds) if rpm else None
+        self._tokens = TokenBucket(tpm, burst_seconds) if tpm else None
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, tokens: int = 0) -> float:
+        """
+        Bir istek icin butce ayir (gerekirse bekle)
+
+        Args:
+            tokens: Tahmini token sayisi (bkz. estimate_tokens)
+
+        Returns:
+            Beklenen toplam sure (saniye)
+        """
+        waited = 0.0
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                wait = 0.0
+                if self._requests is not None:
+                    wait = max(wait, self._requests.wait_time(1, now))
+                if self._tokens is not None and tokens:
+                    wait = max(wait, self._tokens.wait_time(tokens, now))
+                if wait <= 0:
+                    break
+                await asyncio.sleep(wait)
+                waited += wait
+
+            now = time.monotonic()
+            if self._requests is not None:
+                self._requests.take(1, now)
+            if self._tokens is not None and tokens:
+                self._tokens.take(tokens, now)
+
+        return waited
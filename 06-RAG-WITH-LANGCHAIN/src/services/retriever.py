@@ -20,6 +20,7 @@ class RetrievalConfig:
     max_results: int = 8
     similarity_threshold: float = 0.5
     prefer_lgs: bool = True
+    cache_results: bool = True
 
 
 class QuestionRetriever:
@@ -58,6 +59,10 @@ class QuestionRetriever:
         self.filter = filter_service
         self.config = config or RetrievalConfig()
 
+        # Kombinasyon -> siralanmis sonuc cache'i (index nesline bagli)
+        self._cache: dict[tuple, list[RetrievedQuestion]] = {}
+        self._cache_generation = getattr(embedding_pipeline, "generation", 0)
+
     def retrieve_examples(
         self,
         combination: dict,
@@ -65,6 +70,9 @@ class QuestionRetriever:
     ) -> list[RetrievedQuestion]:
         """
         Kombinasyona uygun ornek sorulari getir
+
+        Sonuclar kombinasyon bazinda cache'lenir; index nesli degisince
+        cache otomatik temizlenir.
         
         Args:
             combination: {alt_konu, zorluk, gorsel_tipi, lgs_skor}
@@ -77,6 +85,62 @@ class QuestionRetriever:
             ValueError: Yeterli ornek bulunamazsa
         """
         top_k = top_k or self.config.top_k
+
+        if not self.config.cache_results:
+            return self._retrieve_uncached(combination, top_k)
+
+        self._check_generation()
+        key = self._cache_key(combination, top_k)
+        cached = self._cache.get(key)
+        if cached is None:
+            cached = self._retrieve_uncached(combination, top_k)
+            self._cache[key] = cached
+
+        # Cagiran listeyi degistirse bile cache etkilenmesin
+        return list(cached)
+
+    def warm_cache(self, combinations: list[dict], top_k: Optional[int] = None) -> int:
+        """
+        Kombinasyonlarin retrieval sonuclarini onceden hesapla
+
+        Args:
+            combinations: Kombinasyon listesi (dict)
+            top_k: Dondurelecek soru sayisi (None = config'den)
+
+        Returns:
+            Cache'teki kayit sayisi
+        """
+        for combination in combinations:
+            self.retrieve_examples(combination, top_k=top_k)
+        return len(self._cache)
+
+    def invalidate_cache(self):
+        """Retrieval cache'ini temizle (index/metadata degistiginde)"""
+        self._cache.clear()
+        self._cache_generation = getattr(self.embedding, "generation", 0)
+
+    def _check_generation(self):
+        """Index nesli degistiyse cache'i gecersiz kil"""
+        if getattr(self.embedding, "generation", 0) != self._cache_generation:
+            self.invalidate_cache()
+
+    def _cache_key(self, combination: dict, top_k: int) -> tuple:
+        """
+        Normalize kombinasyon + retrieval konfigurasyonu anahtari
+
+        lgs_skor/rank gibi alanlar filtrelemeyi ve siralamayi etkilemedigi
+        icin anahtara dahil edilmez.
+        """
+        return (
+            combination.get("alt_konu"),
+            int(combination.get("zorluk", 3)),
+            combination.get("gorsel_tipi", "yok"),
+            top_k,
+            self.config.max_results,
+        )
+
+    def _retrieve_uncached(self, combination: dict, top_k: int) -> list[RetrievedQuestion]:
+        """Fallback kademesi ve yeniden siralama (cache'siz)"""
         results: list[RetrievedQuestion] = []
 
         # 4 seviyeli fallback stratejisi
@@ -167,10 +231,10 @@ class QuestionRetriever:
         if not valid_indices:
             return []
 
-        # Embedding benzerligi ile ara
+        # Embedding benzerligi ile ara (on-filtreli, filtre icinde kesin top-k)
         search_results = self.embedding.search(
             query=query,
-            top_k=top_k * 2,  # Daha fazla ara, sonra filtrele
+            top_k=top_k,
             filter_indices=valid_indices,
         )
 
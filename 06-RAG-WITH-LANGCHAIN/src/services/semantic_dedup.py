@@ -0,0 +1,189 @@
+"""
+Semantik Tekrar Kontrolu
+Uretilen sorulari kaynak soru bankasi ve onceki uretimlerle embedding uzerinden karsilastirma
+"""
+
+import threading
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from .embedding_service import EmbeddingPipeline
+
+
+@dataclass
+class DuplicateMatch:
+    """Esik ustu en benzer kayit"""
+
+    score: float
+    source: str  # "bank" (kaynak CSV), "generated" (onceki uretim) veya "batch" (ayni parti)
+    text: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        return {"score": round(self.score, 4), "source": self.source, "text": self.text}
+
+
+class SemanticDuplicateGuard:
+    """
+    Embedding tabanli tekrar kontrolu
+
+    Aday metinler (hikaye + soru) tek encoder cagrisi ile embed edilir ve
+    ayni matris uzerinden:
+    - Kaynak soru bankasinin FAISS index'inde (LLM'in mevcut soruyu
+      yeniden yazmasi)
+    - Kabul edilen son uretimlerin kayan penceresinde
+    - Ayni partideki daha once kabul edilen adaylarda
+    aranir. Cosine benzerligi esigi asan aday tekrar sayilir.
+
+    Encode ve arama CPU'da senkron calisir; async koddan
+    asyncio.to_thread ile cagrilmalidir. Gecmis bir kilitle korunur.
+    """
+
+    def __init__(
+        self,
+        pipeline: EmbeddingPipeline,
+        threshold: float = 0.9,
+        max_history: int = 10000,
+    ):
+        """
+        Args:
+            pipeline: Model ve index'i yuklu EmbeddingPipeline
+            threshold: Cosine benzerlik esigi (0-1)
+            max_history: Kayan pencerede tutulacak kabul edilmis uretim sayisi
+        """
+        self.pipeline = pipeline
+        self.threshold = threshold
+        self.max_history = max_history
+
+        self._history: Optional[np.ndarray] = None  # (max_history, D) halka tampon
+        self._history_texts: list[Optional[str]] = [None] * max_history
+        self._count = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def question_text(question) -> str:
+        """Karsilastirilan metin: hikaye + soru"""
+        return f"{question.hikaye} {question.soru}"
+
+    def check(self, texts: list[str], record: bool = True) -> list[Optional[DuplicateMatch]]:
+        """
+        Aday partisini tek encoder cagrisi ile kontrol et
+
+        Args:
+            texts: Aday metinleri
+            record: Tekrar olmayan adaylari gecmise ekle
+
+        Returns:
+            Her aday icin DuplicateMatch (tekrar) veya None (yeni)
+        """
+        if not texts:
+            return []
+
+        vectors = self.pipeline.embed_batch(texts, show_progress=False, use_cache=False)
+        vectors = np.asarray(vectors, dtype="float32").reshape(len(texts), -1)
+        with self._lock:
+            return self._check_vectors(texts, vectors, record)
+
+    def _check_vectors(
+        self, texts: list[str], vectors: np.ndarray, record: bool
+    ) -> list[Optional[DuplicateMatch]]:
+        """Banka, gecmis ve parti karsilastirmasi (kilit altinda cagrilir)"""
+        bank_scores, bank_texts = self._search_bank(vectors)
+        history_scores, history_texts = self._search_history(vectors)
+
+        matches: list[Optional[DuplicateMatch]] = []
+        accepted: list[int] = []
+        for i, text in enumerate(texts):
+            match = None
+            if bank_scores[i] >= self.threshold:
+                match = DuplicateMatch(float(bank_scores[i]), "bank", bank_texts[i])
+            elif history_scores[i] >= self.threshold:
+                match = DuplicateMatch(float(history_scores[i]), "generated", history_texts[i])
+            elif accepted:
+                # Ayni partide daha once kabul edilen adaylar
+                batch_scores = vectors[accepted] @ vectors[i]
+                best = int(np.argmax(batch_scores))
+                if batch_scores[best] >= self.threshold:
+                    match = DuplicateMatch(float(batch_scores[best]), "batch", texts[accepted[best]])
+
+            if match is None:
+                accepted.append(i)
+            matches.append(match)
+
+        if record and accepted:
+            self._add(vectors[accepted], [texts[i] for i in accepted])
+
+        return matches
+
+    def record(self, texts: list[str]):
+        """
+        Kabul edilen metinleri gecmise ekle (kontrol yapmadan)
+
+        check(record=False) ile kontrol edilip sonradan kabul edilen adaylar
+        icin; boylece reddedilen veya yarisi kaybeden adaylar gecmise girmez.
+        """
+        if not texts:
+            return
+        vectors = self.pipeline.embed_batch(texts, show_progress=False, use_cache=False)
+        with self._lock:
+            self._add(np.asarray(vectors, dtype="float32").reshape(len(texts), -1), texts)
+
+    def is_duplicate(self, text: str, record: bool = False) -> bool:
+        """Tek metin kontrolu (bkz. check)"""
+        return self.check([text], record=record)[0] is not None
+
+    def _search_bank(self, vectors: np.ndarray) -> tuple[np.ndarray, list[Optional[str]]]:
+        """Kaynak soru bankasinda en yakin kayit"""
+        index = self.pipeline.index
+        if index is None or index.ntotal == 0:
+            return np.full(len(vectors), -1.0, dtype="float32"), [None] * len(vectors)
+
+        # Sikistirilmis index'te skorlar tam vektorlerle yeniden hesaplanir
+        scores, ids = self.pipeline.search_vectors(vectors, 1)
+        texts = [
+            self.pipeline.id_to_metadata.get(int(idx), {}).get("Soru_MetniOCR")
+            if idx != -1
+            else None
+            for idx in ids[:, 0]
+        ]
+        return scores[:, 0], texts
+
+    def _search_history(self, vectors: np.ndarray) -> tuple[np.ndarray, list[Optional[str]]]:
+        """Kabul edilen uretimlerde en yakin kayit"""
+        size = len(self)
+        if size == 0:
+            return np.full(len(vectors), -1.0, dtype="float32"), [None] * len(vectors)
+
+        scores = vectors @ self._history[:size].T
+        best = np.argmax(scores, axis=1)
+        return scores[np.arange(len(vectors)), best], [self._history_texts[j] for j in best]
+
+    def _add(self, vectors: np.ndarray, texts: list[str]):
+        """Kabul edilen adaylari halka tampona ekle (dolunca en eskinin uzerine yazar)"""
+        if self._history is None:
+            self._history = np.zeros((self.max_history, vectors.shape[1]), dtype="float32")
+
+        for vector, text in zip(vectors, texts):
+            slot = self._count % self.max_history
+            self._history[slot] = vector
+            self._history_texts[slot] = text
+            self._count += 1
+
+    def __len__(self) -> int:
+        return min(self._count, self.max_history)
+
+    def clear(self):
+        """Uretim gecmisini temizle"""
+        with self._lock:
+            self._history_texts = [None] * self.max_history
+            self._count = 0
+
+    def get_stats(self) -> dict:
+        """Istatistikleri don"""
+        return {
+            "threshold": self.threshold,
+            "history_size": len(self),
+            "max_history": self.max_history,
+            "bank_size": self.pipeline.index.ntotal if self.pipeline.index is not None else 0,
+        }
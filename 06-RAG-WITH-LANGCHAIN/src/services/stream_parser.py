@@ -0,0 +1,200 @@
+"""
+Artimli JSON Parser
+Akisli LLM ciktisini parca parca okuyup sema uyumsuzlugunda erken durdurma
+"""
+
+import json
+from typing import Any, Callable, Optional
+
+
+class StreamParseError(json.JSONDecodeError):
+    """Akis, beklenen JSON yapisina uyamayacagi anda firlatilir"""
+    pass
+
+
+class IncrementalJSONParser:
+    """
+    Tek gecisli, artimli ust seviye JSON nesnesi tarayicisi
+
+    feed() ile gelen her parca sadece bir kez taranir. Ust seviye bir alanin
+    degeri tamamlandiginda o deger hemen parse edilir ve on_field callback'i
+    cagrilir; boylece validasyon son token gelmeden baslar. Asagidaki
+    durumlarda StreamParseError ile akis erken kesilir:
+
+    - '{' oncesinde MAX_PREFIX karakterden fazla metin (kod blogu/aciklama)
+    - Ust seviyede gecersiz yapi (anahtar, ':' veya ',' beklenirken baska karakter)
+    - Beklenen tipte olmayan alan (or. secenekler nesne degil)
+    - Alan degeri gecerli JSON degil
+    """
+
+    MAX_PREFIX = 256
+
+    # Alanin ilk karakterine gore tip kontrolu
+    EXPECTED_TYPES = {
+        "hikaye": '"',
+        "soru": '"',
+        "dogru_cevap": '"',
+        "secenekler": "{",
+        "cozum": "[",
+    }
+
+    def __init__(self, on_field: Optional[Callable[[str, Any], None]] = None):
+        """
+        Args:
+            on_field: Ust seviye alan tamamlaninca cagrilir (key, value);
+                exception firlatirsa akis durdurulur
+        """
+        self.on_field = on_field
+        self.text = ""
+        self.fields: dict[str, Any] = {}
+        self.done = False
+
+        self._pos = 0
+        self._start: Optional[int] = None
+        self._end: Optional[int] = None
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._state = "key"
+        self._key_start = 0
+        self._key: Optional[str] = None
+        self._value_start = 0
+
+    def feed(self, chunk: str) -> bool:
+        """
+        Yeni parcayi isle
+
+        Args:
+            chunk: Akistan gelen metin parcasi
+
+        Returns:
+            Ust seviye nesne tamamlandiysa True (akisin geri kalani okunmayabilir)
+
+        Raises:
+            StreamParseError: Yapi beklenen semaya uyamaz
+        """
+        if self.done:
+            return True
+
+        self.text += chunk
+        text = self.text
+
+        for i in range(self._pos, len(text)):
+            ch = text[i]
+
+            if self._start is None:
+                if ch == "{":
+                    self._start = i
+                    self._depth = 1
+                elif i >= self.MAX_PREFIX:
+                    self._fail("JSON nesnesi baslangici bulunamadi", i)
+                continue
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._depth == 1:
+                        if self._state == "key_string":
+                            self._key = json.loads(text[self._key_start : i + 1])
+                            self._state = "colon"
+                        elif self._state == "value_string":
+                            self._finish_value(i + 1)
+                continue
+
+            if self._depth > 1:
+                if ch == '"':
+                    self._in_string = True
+                elif ch in "{[":
+                    self._depth += 1
+                elif ch in "}]":
+                    self._depth -= 1
+                    if self._depth == 1:
+                        self._finish_value(i + 1)
+                continue
+
+            if ch.isspace() and self._state != "value_scalar":
+                continue
+
+            if self._state == "key":
+                if ch == '"':
+                    self._in_string = True
+                    self._key_start = i
+                    self._state = "key_string"
+                elif ch == "}" and not self.fields:
+                    self._close(i)
+                    return True
+                else:
+                    self._fail("Anahtar bekleniyordu", i)
+            elif self._state == "colon":
+                if ch != ":":
+                    self._fail("':' bekleniyordu", i)
+                self._state = "value"
+            elif self._state == "value":
+                self._value_start = i
+                expected = self.EXPECTED_TYPES.get(self._key)
+                if expected is not None and ch != expected:
+                    self._fail(f"'{self._key}' alani beklenen tipte degil", i)
+                if ch == '"':
+                    self._in_string = True
+                    self._state = "value_string"
+                elif ch in "{[":
+                    self._depth += 1
+                    self._state = "value_nested"
+                else:
+                    self._state = "value_scalar"
+            elif self._state == "value_scalar":
+                if ch in ",}" or ch.isspace():
+                    self._finish_value(i)
+                    if ch == ",":
+                        self._state = "key"
+                    elif ch == "}":
+                        self._close(i)
+                        return True
+            elif self._state == "comma":
+                if ch == ",":
+                    self._state = "key"
+                elif ch == "}":
+                    self._close(i)
+                    return True
+                else:
+                    self._fail("',' veya '}' bekleniyordu", i)
+
+        self._pos = len(text)
+        return False
+
+    def result(self) -> dict:
+        """
+        Tamamlanan nesneyi dondur
+
+        Raises:
+            StreamParseError: Nesne tamamlanmadi
+        """
+        if not self.done:
+            self._fail("Yanit tamamlanmadan kesildi", len(self.text))
+        return json.loads(self.text[self._start : self._end])
+
+    def _finish_value(self, end: int):
+        """Ust seviye alan degerini parse et ve callback'i cagir"""
+        raw = self.text[self._value_start : end]
+        try:
+            value = json.loads(raw)
+        except json.JSONDecodeError as e:
+            self._fail(f"'{self._key}' degeri gecersiz: {e.msg}", self._value_start)
+
+        self.fields[self._key] = value
+        self._state = "comma"
+        if self.on_field is not None:
+            self.on_field(self._key, value)
+
+    def _close(self, i: int):
+        self._depth = 0
+        self._end = i + 1
+        self._pos = i + 1
+        self.done = True
+
+    def _fail(self, msg: str, pos: int):
+        raise StreamParseError(msg, self.text, pos)
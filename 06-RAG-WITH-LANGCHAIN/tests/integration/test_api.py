@@ -282,3 +282,111 @@ class TestErrorHandling:
         
         assert response.status_code == 404
 
+
+
+@pytest.mark.api
+class TestBatchStreamEndpoint:
+    """Akisli toplu uretim endpoint testleri"""
+
+    @pytest.fixture
+    def stream_generator(self, sample_question_metadata, monkeypatch):
+        """Sahte LLM'li gercek QuestionGenerator (ikinci cagri hatali)"""
+        from api import main
+        from services.question_generator import QuestionGenerator
+        from services.output_formatter import RAGOutputFormatter
+        from services.prompt_builder import PromptBuilder
+        from services.llm_client import LLMClientFactory
+        from models.question import RetrievedQuestion
+
+        valid = json.dumps({
+            "hikaye": "Test hikayesi",
+            "soru": "Test sorusu?",
+            "secenekler": {"A": "1", "B": "2", "C": "3", "D": "4"},
+            "dogru_cevap": "C",
+            "cozum": ["Adım 1: ..."],
+        })
+        llm = MagicMock()
+        llm.provider = "test-stream"
+        llm.generate = AsyncMock(side_effect=[valid, "invalid json", valid])
+
+        retriever = MagicMock()
+        retriever.retrieve_examples.return_value = [
+            RetrievedQuestion(
+                soru_metni=m["Soru_MetniOCR"],
+                alt_konu=m["Alt_Konu"],
+                zorluk=m["Zorluk"],
+                gorsel_tipi=m["Gorsel_Tipi"],
+                kaynak_tipi=m["Kaynak_Tipi"],
+            )
+            for m in sample_question_metadata
+        ]
+
+        LLMClientFactory.clear_cache()
+        monkeypatch.setattr(main, "_selector", None)
+        monkeypatch.setattr(
+            main,
+            "_generator",
+            QuestionGenerator(
+                retriever=retriever,
+                formatter=RAGOutputFormatter(),
+                prompt_builder=PromptBuilder(),
+                llm_client=llm,
+            ),
+        )
+        yield
+        LLMClientFactory.clear_cache()
+
+    def test_ndjson_stream(self, stream_generator):
+        """Her kalem ayri satirda, en sonda istatistik kaydi gelmeli"""
+        from fastapi.testclient import TestClient
+        from api.main import app
+
+        client = TestClient(app)
+        response = client.post("/api/v1/generate/batch/stream", json={"count": 3})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        records = [json.loads(line) for line in response.text.splitlines()]
+
+        assert [r["type"] for r in records].count("question") == 2
+        assert [r["type"] for r in records].count("failure") == 1
+        assert records[-1]["type"] == "stats"
+        assert records[-1]["generated"] == 2
+        assert records[-1]["failed"] == 1
+
+    def test_unfilled_combinations_counted_as_failures(self, stream_generator, monkeypatch):
+        """Selector az kombinasyon donerse requested = generated + failed olmali"""
+        from fastapi.testclient import TestClient
+        import api.main as main
+
+        selector = MagicMock()
+        selector.select_multiple.return_value = [
+            {"alt_konu": "ebob_ekok", "zorluk": 3, "gorsel_tipi": "yok"}
+        ] * 2
+        monkeypatch.setattr(main, "_selector", selector)
+
+        client = TestClient(main.app)
+        response = client.post("/api/v1/generate/batch/stream", json={"count": 3})
+        stats = [json.loads(line) for line in response.text.splitlines()][-1]
+
+        assert stats["requested"] == 3
+        assert stats["generated"] == 1
+        assert stats["failed"] == 2
+        assert stats["errors_by_type"]["NoCombinationAvailable"] == 1
+
+    def test_sse_stream(self, stream_generator):
+        """SSE formatinda event/data bloklari donmeli"""
+        from fastapi.testclient import TestClient
+        from api.main import app
+
+        client = TestClient(app)
+        response = client.post(
+            "/api/v1/generate/batch/stream",
+            params={"format": "sse"},
+            json={"count": 3, "ensure_diversity": False},
+        )
+
+        assert response.headers["content-type"].startswith("text/event-stream")
+        events = [block for block in response.text.split("\n\n") if block]
+        assert len(events) == 4
+        assert events[-1].startswith("event: stats\ndata: ")
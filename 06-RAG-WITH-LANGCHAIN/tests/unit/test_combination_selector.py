@@ -193,3 +193,103 @@ class TestCombinationSelectorEdgeCases:
         assert selector_low_temp.select() is not None
         assert selector_high_temp.select() is not None
 
+
+
+class TestPrecomputedSampler:
+    """Onceden hesaplanmis sampler testleri (ConfigSchema tabanli)"""
+
+    @pytest.fixture
+    def config(self):
+        from models.config_schema import ConfigSchema
+
+        return ConfigSchema.create_mock()
+
+    def test_unique_selection_covers_all(self, config):
+        """ensure_diversity ile tum kombinasyonlar tekrarsiz secilebilmeli"""
+        from services.combination_selector import CombinationSelector
+
+        selector = CombinationSelector(config)
+        selected = selector.select_multiple(len(config.combinations) + 5)
+
+        keys = {(c.alt_konu, c.zorluk, c.gorsel_tipi) for c in selected}
+        assert len(selected) == len(config.combinations)
+        assert len(keys) == len(selected)
+
+    def test_sampler_reused_per_filter(self, config):
+        """Ayni filtre/politika icin sampler bir kez olusturulmali"""
+        from services.combination_selector import CombinationSelector
+        from models.combination import CombinationFilters
+
+        selector = CombinationSelector(config)
+        filters = CombinationFilters(alt_konu="ebob_ekok")
+        for _ in range(20):
+            assert selector.select(filters=filters).alt_konu == "ebob_ekok"
+        selector.select_multiple(3, filters=CombinationFilters(alt_konu="ebob_ekok"))
+        selector.select()
+
+        assert len(selector._samplers) == 2
+
+    def test_first_draw_matches_weights(self, config):
+        """Tekrarsiz secimin ilk elemani lgs_skor^alpha ile orantili olmali"""
+        import numpy as np
+        from services.combination_selector import CombinationSelector
+
+        np.random.seed(0)
+        selector = CombinationSelector(config)
+        weights = np.array([c.lgs_skor ** selector.policy.alpha for c in config.combinations])
+        weights /= weights.sum()
+
+        counts = np.zeros(len(config.combinations))
+        index = {id(c): i for i, c in enumerate(config.combinations)}
+        for _ in range(20000):
+            counts[index[id(selector.select_multiple(2)[0])]] += 1
+
+        assert np.abs(counts / counts.sum() - weights).max() < 0.015
+
+    def test_exclude_respected(self, config):
+        """exclude listesindeki kombinasyonlar secilmemeli"""
+        from services.combination_selector import CombinationSelector
+
+        selector = CombinationSelector(config)
+        exclude = [c.model_dump() for c in config.combinations[1:]]
+
+        for _ in range(20):
+            assert selector.select(exclude=exclude) is config.combinations[0]
+        with pytest.raises(ValueError):
+            selector.select(exclude=[c.model_dump() for c in config.combinations])
+
+    def test_top_k_slides_over_remaining(self, config):
+        """top_k modunda her secim kalanlarin en iyi k'sindan yapilmali"""
+        from services.combination_selector import CombinationSelector
+        from models.combination import SelectionPolicy
+
+        selector = CombinationSelector(config, SelectionPolicy(mode="top_k", top_k=2))
+        scores = sorted((c.lgs_skor for c in config.combinations), reverse=True)
+
+        selected = [c.lgs_skor for c in selector.select_multiple(5)]
+
+        for i, score in enumerate(selected):
+            remaining = [s for s in scores if s not in selected[:i]]
+            assert score in remaining[:2]
+
+    def test_with_replacement(self, config):
+        """ensure_diversity=False ile count kadar secim donmeli"""
+        from services.combination_selector import CombinationSelector
+
+        selector = CombinationSelector(config)
+        assert len(selector.select_multiple(1000, ensure_diversity=False)) == 1000
+
+    def test_upper_edge_draw_skips_zero_weight(self, monkeypatch):
+        """Cekilis tam toplama denk gelirse maskeli/sifir agirlikli aday donmemeli"""
+        import numpy as np
+        from services.combination_selector import _Sampler
+
+        candidates = [MagicMock(lgs_skor=s) for s in (0.9, 0.8, 0.7)]
+        monkeypatch.setattr(np.random, "random", lambda size=None: np.ones(size) if size else 1.0)
+
+        sampler = _Sampler(candidates, ["a", "b", "c"], np.array([1.0, 2.0, 3.0]), "weighted_sampling", 1)
+        assert sampler.draw(mask=np.array([True, True, False])) == 1
+
+        sampler = _Sampler(candidates, ["a", "b", "c"], np.array([1.0, 2.0, 0.0]), "weighted_sampling", 1)
+        assert sampler.draw() == 1
+        assert sampler.draw_many(3) == [1, 1, 1]
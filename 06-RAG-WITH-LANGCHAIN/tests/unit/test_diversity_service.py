@@ -0,0 +1,216 @@
+"""
+Unit Tests for DiversityService duplicate detection
+"""
+
+import random
+
+import pytest
+
+
+VOCAB = [f"kelime{i}" for i in range(5000)]
+
+
+def _question(rng: random.Random, words: int = 30) -> str:
+    return " ".join(rng.choice(VOCAB) for _ in range(words))
+
+
+class TestNormalization:
+    """Turkce normalizasyon testleri"""
+
+    def test_turkish_case_and_diacritics(self):
+        """I/İ ve aksanli harfler ayni token'a dusmeli"""
+        from services.minhash_lsh import normalize_tokens
+
+        assert normalize_tokens("SAYILARININ EBOB'u İÇİN") == ["sayilarinin", "ebob", "u", "icin"]
+        assert normalize_tokens("sayılarının ebob'u için") == ["sayilarinin", "ebob", "u", "icin"]
+
+    def test_shingles(self):
+        """Kelime k-gram'lari uretilmeli"""
+        from services.minhash_lsh import shingle
+
+        assert shingle(["a", "b", "c"], 2) == {"a b", "b c"}
+        assert shingle(["a"], 3) == {"a"}
+        assert shingle([], 2) == set()
+
+
+class TestMinHashLSH:
+    """MinHash imza ve LSH indeks testleri"""
+
+    def test_signature_estimates_jaccard(self):
+        """Imza benzerligi gercek Jaccard'a yakin olmali"""
+        from services.minhash_lsh import MinHasher
+
+        hasher = MinHasher(num_perm=256)
+        a = {f"s{i}" for i in range(100)}
+        b = {f"s{i}" for i in range(20, 120)}  # Jaccard = 80 / 120
+
+        estimate = (hasher.signature(a) == hasher.signature(b)).mean()
+
+        assert abs(estimate - 80 / 120) < 0.1
+
+    def test_signatures_stable_across_instances(self):
+        """Ayni seed farkli instance'larda ayni imzayi uretmeli"""
+        from services.minhash_lsh import MinHasher
+
+        shingles = {"ebob", "ekok", "problem"}
+        assert (MinHasher().signature(shingles) == MinHasher().signature(shingles)).all()
+
+    def test_capacity_evicts_oldest(self):
+        """Kapasite dolunca en eski imza unutulmali"""
+        from services.minhash_lsh import MinHasher, MinHashLSH
+
+        hasher = MinHasher()
+        index = MinHashLSH(capacity=3)
+        signatures = [hasher.signature({f"soru{i}", f"metin{i}"}) for i in range(5)]
+        for sig in signatures:
+            index.add(sig)
+
+        assert len(index) == 3
+        assert index.max_similarity(signatures[0]) < 1.0
+        assert index.max_similarity(signatures[4]) == 1.0
+
+
+class TestDuplicateDetection:
+    """DiversityService tekrar tespiti testleri"""
+
+    def test_exact_and_near_duplicates(self):
+        """Ayni ve cok benzer metin tekrar sayilmali, farkli metin sayilmamali"""
+        from services.diversity_service import DiversityService
+
+        rng = random.Random(0)
+        diversity = DiversityService(max_history=1000)
+        base = _question(rng, 60)
+        diversity.add_to_history(base)
+
+        assert diversity.is_duplicate(base)
+        assert diversity.is_duplicate(base.upper() + ".")
+        assert diversity.is_duplicate(base + " ek")
+        assert not diversity.is_duplicate(_question(rng, 60))
+        assert not diversity.is_duplicate("")
+
+    def test_large_history(self):
+        """Buyuk gecmiste tekrar bulunmali, yeni metin yanlis pozitif vermemeli"""
+        from services.diversity_service import DiversityService
+
+        rng = random.Random(1)
+        diversity = DiversityService(max_history=10000)
+        texts = [_question(rng) for _ in range(10000)]
+        for text in texts:
+            diversity.add_to_history(text)
+
+        assert diversity.get_stats()["history_size"] == 10000
+        assert all(diversity.is_duplicate(t) for t in rng.sample(texts, 50))
+        assert not any(diversity.is_duplicate(_question(rng)) for _ in range(50))
+
+    def test_shared_history_across_instances(self, tmp_path):
+        """Ayni dosyayi kullanan servisler (worker'lar) gecmisi paylasmali"""
+        from services.diversity_service import DiversityService
+
+        path = tmp_path / "diversity.sqlite"
+        worker_a = DiversityService(history_path=path)
+        worker_b = DiversityService(history_path=path)
+        text = _question(random.Random(2))
+
+        worker_a.add_to_history(text)
+
+        assert worker_b.is_duplicate(text)
+        assert len(worker_b.history) == 1
+
+        worker_b.clear_history()
+        assert not worker_a.is_duplicate(text)
+        worker_a.close()
+        worker_b.close()
+
+    def test_shared_history_capacity(self, tmp_path):
+        """Paylasimli gecmiste kapasiteyi asan eski kayitlar silinmeli"""
+        from services.diversity_service import DiversityService
+
+        rng = random.Random(3)
+        diversity = DiversityService(max_history=5, history_path=tmp_path / "d.sqlite")
+        texts = [_question(rng) for _ in range(8)]
+        for text in texts:
+            diversity.add_to_history(text)
+
+        assert len(diversity.history) == 5
+        assert not diversity.is_duplicate(texts[0])
+        assert diversity.is_duplicate(texts[-1])
+        diversity.close()
+
+    def test_mismatched_settings_rejected(self, tmp_path):
+        """Farkli imza ayariyla ayni dosya acilamamali"""
+        from services.diversity_service import DiversityService
+
+        path = tmp_path / "d.sqlite"
+        DiversityService(history_path=path, num_perm=128).close()
+
+        with pytest.raises(ValueError):
+            DiversityService(history_path=path, num_perm=64)
+
+
+def _combinations() -> list[dict]:
+    return [
+        {"alt_konu": ak, "zorluk": z, "gorsel_tipi": gt, "lgs_skor": round(0.3 + 0.05 * z, 2)}
+        for ak in ["carpanlar", "ebob_ekok", "aralarinda_asal"]
+        for z in range(1, 6)
+        for gt in ["yok", "resimli", "sematik", "tablo"]
+    ]
+
+
+class TestDiverseCombinations:
+    """Gumbel-top-k kombinasyon secimi testleri"""
+
+    def test_unique_selection(self):
+        """Secim tekrarsiz ve count uzunlugunda olmali"""
+        from services.diversity_service import DiversityService
+
+        combos = _combinations()
+        selected = DiversityService().get_diverse_combinations(combos, 25)
+
+        assert len(selected) == 25
+        assert len({id(c) for c in selected}) == 25
+
+    def test_first_pick_proportional_to_weight(self):
+        """Ilk secim lgs_skor^2 ile orantili olmali"""
+        import numpy as np
+        from services.diversity_service import DiversityService
+
+        np.random.seed(0)
+        combos = _combinations()[:5]
+        weights = np.array([c["lgs_skor"] ** 2 for c in combos])
+        weights /= weights.sum()
+        diversity = DiversityService()
+
+        counts = np.zeros(len(combos))
+        for _ in range(20000):
+            counts[combos.index(diversity.get_diverse_combinations(combos, 2)[0])] += 1
+
+        assert np.abs(counts / counts.sum() - weights).max() < 0.015
+
+    def test_stratified_spread(self):
+        """Katmanli secim alt konulara esit dagilmali, ilk secimler de yayilmali"""
+        from collections import Counter
+        from services.diversity_service import DiversityService
+
+        selected = DiversityService().get_diverse_combinations(
+            _combinations(), 30, stratify_by=["alt_konu"]
+        )
+
+        assert Counter(c["alt_konu"] for c in selected) == {
+            "carpanlar": 10, "ebob_ekok": 10, "aralarinda_asal": 10
+        }
+        assert len({c["alt_konu"] for c in selected[:3]}) == 3
+
+    def test_stratified_small_strata_redistributed(self):
+        """Kucuk katmanin eksigi diger katmanlara gecmeli"""
+        from collections import Counter
+        from services.diversity_service import DiversityService
+
+        combos = _combinations()[:20] + [
+            {"alt_konu": "aralarinda_asal", "zorluk": 1, "gorsel_tipi": "yok", "lgs_skor": 0.9}
+        ]
+        selected = DiversityService().get_diverse_combinations(combos, 15, stratify_by=["alt_konu"])
+
+        counts = Counter(c["alt_konu"] for c in selected)
+        assert len(selected) == 15
+        assert counts["aralarinda_asal"] == 1
+        assert counts["carpanlar"] == 14
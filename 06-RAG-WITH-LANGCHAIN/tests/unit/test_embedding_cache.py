@@ -0,0 +1,120 @@
+"""
+Unit Tests for EmbeddingCache
+"""
+
+import multiprocessing
+import random
+import time
+
+import numpy as np
+import pytest
+
+TEXTS = [f"metin {i}" for i in range(64)]
+
+
+def _vector(i: int, dimension: int = 16) -> np.ndarray:
+    """Metin numarasiyla dolu vektor (hangi metne ait oldugu okunabilir)"""
+    return np.full(dimension, i, dtype="float32")
+
+
+def _writer(path, seconds: float, seed: int):
+    """Kucuk kapasiteli cache'e surekli yazip LRU silme tetikleyen process"""
+    from services.embedding_cache import EmbeddingCache
+
+    cache = EmbeddingCache("model-a", dimension=16, path=path, max_entries=8)
+    rng = random.Random(seed)
+    deadline = time.time() + seconds
+    while time.time() < deadline:
+        batch = rng.sample(range(len(TEXTS)), 4)
+        cache.put_many([TEXTS[i] for i in batch], np.stack([_vector(i) for i in batch]))
+    cache.close()
+
+
+@pytest.fixture
+def cache_dir(tmp_path):
+    """Gecici cache dizini"""
+    return tmp_path / "embedding_cache"
+
+
+class TestEmbeddingCache:
+    """Test suite for EmbeddingCache"""
+
+    def test_put_and_get(self, cache_dir):
+        """Yazilan vektor ayni metinle okunabilmeli"""
+        from services.embedding_cache import EmbeddingCache
+
+        cache = EmbeddingCache("model-a", dimension=4, path=cache_dir, max_entries=10)
+        vec = np.array([0.1, 0.2, 0.3, 0.4], dtype="float32")
+        cache.put("24 ve 36 sayılarının EBOB'u", vec)
+
+        np.testing.assert_allclose(cache.get("24 ve 36 sayılarının EBOB'u"), vec)
+        assert cache.get("baska metin") is None
+
+    def test_key_is_stable_and_model_scoped(self, cache_dir):
+        """Anahtar sabit olmali ve model adina bagli olmali"""
+        from services.embedding_cache import EmbeddingCache
+
+        cache_a = EmbeddingCache("model-a", dimension=4, path=cache_dir, max_entries=10)
+        cache_b = EmbeddingCache("model-b", dimension=4, path=cache_dir, max_entries=10)
+
+        assert cache_a.make_key("soru") == cache_a.make_key("soru")
+        assert cache_a.make_key("soru") != cache_b.make_key("soru")
+        # Bosluk farklari ayni anahtari uretmeli
+        assert cache_a.make_key("  iki   kelime ") == cache_a.make_key("iki kelime")
+
+    def test_persists_across_instances(self, cache_dir):
+        """Cache yeni bir instance (yeniden baslatma) sonrasi da okunabilmeli"""
+        from services.embedding_cache import EmbeddingCache
+
+        first = EmbeddingCache("model-a", dimension=3, path=cache_dir, max_entries=10)
+        first.put_many(["a", "b"], np.eye(2, 3, dtype="float32"))
+        first.close()
+
+        second = EmbeddingCache("model-a", dimension=3, path=cache_dir, max_entries=10)
+        results = second.get_many(["a", "b", "c"])
+
+        np.testing.assert_allclose(results[0], [1, 0, 0])
+        np.testing.assert_allclose(results[1], [0, 1, 0])
+        assert results[2] is None
+
+    def test_lru_eviction(self, cache_dir):
+        """Kapasite dolunca en az kullanilan kayit silinmeli"""
+        from services.embedding_cache import EmbeddingCache
+
+        cache = EmbeddingCache("model-a", dimension=2, path=cache_dir, max_entries=2)
+        cache.put("eski", np.array([1, 0], dtype="float32"))
+        cache.put("yeni", np.array([0, 1], dtype="float32"))
+        cache.get("eski")  # eski'yi tazele
+        cache.put("en_yeni", np.array([1, 1], dtype="float32"))
+
+        assert len(cache) == 2
+        assert cache.get("yeni") is None
+        np.testing.assert_allclose(cache.get("eski"), [1, 0])
+        np.testing.assert_allclose(cache.get("en_yeni"), [1, 1])
+
+    def test_concurrent_processes_never_return_foreign_vector(self, cache_dir):
+        """Baska process'in silip uzerine yazdigi slot yanlis metnin vektorunu dondurmemeli"""
+        from services.embedding_cache import EmbeddingCache
+
+        cache = EmbeddingCache("model-a", dimension=16, path=cache_dir, max_entries=8)
+        context = multiprocessing.get_context("fork")
+        writers = [
+            context.Process(target=_writer, args=(cache_dir, 1.5, seed)) for seed in range(2)
+        ]
+        for process in writers:
+            process.start()
+
+        hits, wrong = 0, 0
+        rng = random.Random(42)
+        while any(process.is_alive() for process in writers):
+            batch = rng.sample(range(len(TEXTS)), 8)
+            for i, vec in zip(batch, cache.get_many([TEXTS[i] for i in batch])):
+                if vec is not None:
+                    hits += 1
+                    wrong += int(not np.array_equal(vec, _vector(i)))
+        for process in writers:
+            process.join()
+
+        assert all(process.exitcode == 0 for process in writers)
+        assert hits > 0
+        assert wrong == 0
@@ -0,0 +1,311 @@
+"""
+Unit Tests for EmbeddingPipeline index management
+"""
+
+import hashlib
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+
+class FakeEncoder:
+    """Metinden deterministik vektor ureten sahte SentenceTransformer"""
+
+    def __init__(self, dimension: int = 8):
+        self.dimension = dimension
+        self.encoded: list[str] = []
+
+    def _vector(self, text: str) -> np.ndarray:
+        seed = int(hashlib.md5(text.encode("utf-8")).hexdigest()[:8], 16)
+        vec = np.random.default_rng(seed).normal(size=self.dimension).astype("float32")
+        return vec / np.linalg.norm(vec)
+
+    def encode(self, texts, **kwargs):
+        if isinstance(texts, str):
+            self.encoded.append(texts)
+            return self._vector(texts)
+        self.encoded.extend(texts)
+        return np.stack([self._vector(t) for t in texts])
+
+
+@pytest.fixture
+def vector_store(tmp_path, monkeypatch):
+    """Gecici vectorstore dizini"""
+    from config import settings
+
+    monkeypatch.setattr(settings, "vector_store_path", tmp_path / "vectorstore")
+    return tmp_path / "vectorstore"
+
+
+@pytest.fixture
+def fake_pipeline():
+    """Sahte encoder'li EmbeddingPipeline"""
+    from services.embedding_service import EmbeddingPipeline
+
+    pipeline = EmbeddingPipeline(model_name="fake")
+    pipeline.model = FakeEncoder()
+    pipeline.dimension = pipeline.model.dimension
+    return pipeline
+
+
+def _build(pipeline, csv_path):
+    from services.embedding_service import EmbeddingPipeline
+
+    texts, metadata = EmbeddingPipeline.load_questions_from_csv(str(csv_path))
+    pipeline.build_index(pipeline.embed_batch(texts, show_progress=False), metadata)
+    pipeline.save_index()
+
+
+class TestIncrementalIndex:
+    """Artimli index guncelleme testleri"""
+
+    def test_save_creates_generation(self, vector_store, fake_pipeline, sample_questions_path):
+        """save_index yeni nesil yazip CURRENT'i guncellemeli"""
+        from services.embedding_service import EmbeddingPipeline
+
+        _build(fake_pipeline, sample_questions_path)
+        _build(fake_pipeline, sample_questions_path)
+
+        assert (vector_store / "CURRENT").read_text() == "gen-000002"
+        assert EmbeddingPipeline.index_exists()
+
+        loaded = EmbeddingPipeline(model_name="fake")
+        loaded.load_index()
+        assert loaded.generation == 2
+        assert loaded.index.ntotal == fake_pipeline.index.ntotal
+
+    def test_update_embeds_only_delta(
+        self, vector_store, fake_pipeline, sample_questions_path, tmp_path
+    ):
+        """Sadece yeni ve degisen satirlar embed edilmeli"""
+        _build(fake_pipeline, sample_questions_path)
+        total = fake_pipeline.index.ntotal
+        fake_pipeline.model.encoded.clear()
+
+        df = pd.read_csv(sample_questions_path)
+        df.loc[0, "Zorluk"] = 5  # Degisen satir
+        df = df.drop(index=1)  # Silinen satir
+        new_row = df.iloc[[0]].copy()
+        new_row["Soru_MetniOCR"] = "Yeni eklenen soru metni"
+        df = pd.concat([df, new_row], ignore_index=True)
+        updated_csv = tmp_path / "updated.csv"
+        df.to_csv(updated_csv, index=False)
+
+        stats = fake_pipeline.update_from_csv(str(updated_csv))
+
+        assert stats["added"] == 2
+        assert stats["removed"] == 2
+        assert stats["total"] == total
+        assert len(fake_pipeline.model.encoded) == 2
+        assert set(fake_pipeline.id_to_metadata) == set(
+            fake_pipeline.index.id_map.at(i) for i in range(fake_pipeline.index.ntotal)
+        )
+
+    def test_search_after_update(self, vector_store, fake_pipeline, sample_questions_path, tmp_path):
+        """Guncellemeden sonra yeni soru aranabilir olmali"""
+        _build(fake_pipeline, sample_questions_path)
+
+        df = pd.read_csv(sample_questions_path)
+        new_row = df.iloc[[0]].copy()
+        new_row["Soru_MetniOCR"] = "Tamamen yeni bir EBOB problemi"
+        pd.concat([df, new_row], ignore_index=True).to_csv(tmp_path / "new.csv", index=False)
+
+        fake_pipeline.update_from_csv(str(tmp_path / "new.csv"))
+        results = fake_pipeline.search("Tamamen yeni bir EBOB problemi", top_k=1)
+
+        assert results[0][1]["Soru_MetniOCR"] == "Tamamen yeni bir EBOB problemi"
+
+    def test_no_change_is_noop(self, vector_store, fake_pipeline, sample_questions_path):
+        """Degismeyen CSV hicbir embedding uretmemeli"""
+        _build(fake_pipeline, sample_questions_path)
+        fake_pipeline.model.encoded.clear()
+
+        stats = fake_pipeline.update_from_csv(str(sample_questions_path))
+
+        assert stats["added"] == 0
+        assert stats["removed"] == 0
+        assert fake_pipeline.model.encoded == []
+
+    def test_mmap_load_matches_and_is_read_only(
+        self, vector_store, fake_pipeline, sample_questions_path
+    ):
+        """mmap ile acilan index ayni sonuclari vermeli, guncellemeyi reddetmeli"""
+        from services.embedding_service import EmbeddingPipeline
+
+        _build(fake_pipeline, sample_questions_path)
+
+        mapped = EmbeddingPipeline(model_name="fake")
+        mapped.model = fake_pipeline.model
+        mapped.load_index(mmap=True)
+
+        query = fake_pipeline.embed("EBOB problemi").reshape(1, -1)
+        expected = fake_pipeline.index.search(query, 5)
+        actual = mapped.index.search(query, 5)
+        np.testing.assert_array_equal(actual[1], expected[1])
+        np.testing.assert_allclose(actual[0], expected[0], rtol=1e-6)
+
+        with pytest.raises(ValueError):
+            mapped.update_from_csv(str(sample_questions_path))
+
+    @pytest.mark.skipif(
+        not Path("/proc/self/maps").exists(), reason="/proc/self/maps gerekli (Linux)"
+    )
+    def test_mmap_load_maps_index_file(
+        self, vector_store, fake_pipeline, sample_questions_path
+    ):
+        """mmap=True index dosyasini gercekten process adres alanina map etmeli"""
+        from services.embedding_service import EmbeddingPipeline
+
+        _build(fake_pipeline, sample_questions_path)
+        index_dir = EmbeddingPipeline.current_index_dir(vector_store) or vector_store
+        index_file = (index_dir / EmbeddingPipeline.INDEX_FILE).resolve()
+
+        mapped = EmbeddingPipeline(model_name="fake")
+        mapped.model = fake_pipeline.model
+        mapped.load_index(mmap=True)
+
+        maps = Path("/proc/self/maps").read_text()
+        assert str(index_file) in maps
+
+
+class TestPrefilteredSearch:
+    """On-filtreli arama testleri"""
+
+    def test_narrow_filter_returns_exact_top_k(self, fake_pipeline):
+        """Dar filtrede global en iyi sonuclar disarida olsa bile top-k dolmali"""
+        texts = [f"soru {i}" for i in range(200)]
+        metadata = [{"Soru_MetniOCR": t} for t in texts]
+        fake_pipeline.build_index(fake_pipeline.embed_batch(texts), metadata)
+
+        query_vec = fake_pipeline.embed("sorgu")
+        all_scores = fake_pipeline.index.index.reconstruct_n(0, 200) @ query_vec
+        # Global olarak en dusuk skorlu 3 kayit: ust sonuclarla hic kesismez
+        narrow = np.argsort(all_scores)[:3].tolist()
+
+        results = fake_pipeline.search("sorgu", top_k=5, filter_indices=narrow)
+
+        assert len(results) == 3
+        expected = [texts[i] for i in sorted(narrow, key=lambda i: -all_scores[i])]
+        assert [meta["Soru_MetniOCR"] for _, meta in results] == expected
+
+    def test_filter_with_non_contiguous_ids(self, vector_store, fake_pipeline, sample_questions_path, tmp_path):
+        """Silme sonrasi (bosluklu id'ler) filtreli arama dogru calismali"""
+        from services.filter_service import FilterService, FilterCriteria
+
+        _build(fake_pipeline, sample_questions_path)
+        df = pd.read_csv(sample_questions_path).drop(index=[0, 1])
+        df.to_csv(tmp_path / "smaller.csv", index=False)
+        fake_pipeline.update_from_csv(str(tmp_path / "smaller.csv"))
+
+        filter_service = FilterService.from_id_map(fake_pipeline.id_to_metadata)
+        ids = filter_service.filter_indices(FilterCriteria(alt_konu="ebob_ekok"))
+        results = fake_pipeline.search("EBOB", top_k=10, filter_indices=ids)
+
+        assert len(results) == len(ids)
+        assert all(meta["Alt_Konu"] == "ebob_ekok" for _, meta in results)
+
+
+class LowRankEncoder(FakeEncoder):
+    """Dusuk rankli (PCA ile sikistirilabilir) 64 boyutlu vektorler ureten encoder"""
+
+    BASIS = np.random.default_rng(42).normal(size=(12, 64)).astype("float32")
+
+    def __init__(self):
+        super().__init__(dimension=64)
+
+    def _vector(self, text: str) -> np.ndarray:
+        seed = int(hashlib.md5(text.encode("utf-8")).hexdigest()[:8], 16)
+        rng = np.random.default_rng(seed)
+        vec = rng.normal(size=12).astype("float32") @ self.BASIS
+        vec += 0.05 * rng.normal(size=64).astype("float32")
+        return vec / np.linalg.norm(vec)
+
+
+@pytest.fixture
+def compressed_pipeline():
+    """PCA 64->16 + sq8 index'li EmbeddingPipeline"""
+    from services.embedding_service import EmbeddingPipeline
+    from services.index_compression import IndexCompression
+
+    pipeline = EmbeddingPipeline(model_name="fake")
+    pipeline.model = LowRankEncoder()
+    pipeline.dimension = 64
+    pipeline.compression = IndexCompression(reduction="pca", dim=16, storage="sq8", rerank_factor=4)
+    return pipeline
+
+
+class TestIndexCompression:
+    """Sikistirilmis index testleri"""
+
+    def test_recall_and_size(self, compressed_pipeline):
+        """Yeniden siralamali recall@10 yuksek, vektor basina byte 16x kucuk"""
+        texts = [f"soru {i}" for i in range(1000)]
+        compressed_pipeline.build_index(
+            compressed_pipeline.embed_batch(texts), [{"Soru_MetniOCR": t} for t in texts]
+        )
+
+        report = compressed_pipeline.evaluate_compression(k=10, num_queries=200)
+
+        assert report["bytes_per_vector"] == 16
+        assert report["compression_ratio"] == 16
+        assert report["recall"] >= 0.95
+        assert report["recall"] >= report["recall_without_rerank"]
+
+    def test_rerank_returns_exact_scores(self, compressed_pipeline):
+        """Skorlar tam hassasiyetli cosine degerleri ve azalan sirada"""
+        texts = [f"soru {i}" for i in range(300)]
+        embeddings = compressed_pipeline.embed_batch(texts)
+        compressed_pipeline.build_index(embeddings, [{"Soru_MetniOCR": t} for t in texts])
+
+        results = compressed_pipeline.search("soru 7", top_k=5)
+        query = compressed_pipeline.embed("soru 7")
+
+        assert results[0][1]["Soru_MetniOCR"] == "soru 7"
+        scores = [score for score, _ in results]
+        assert scores == sorted(scores, reverse=True)
+        for score, meta in results:
+            expected = float(embeddings[texts.index(meta["Soru_MetniOCR"])] @ query)
+            assert score == pytest.approx(expected, abs=1e-5)
+
+    def test_save_load_and_update(
+        self, vector_store, compressed_pipeline, sample_questions_path, tmp_path
+    ):
+        """Tam vektorler kaydedilir, mmap ile acilir ve guncellemede hizali kalir"""
+        from services.embedding_service import EmbeddingPipeline
+        from services.index_compression import IndexCompression
+
+        compressed_pipeline.compression = IndexCompression(
+            reduction="truncate", dim=32, storage="float16"
+        )
+        _build(compressed_pipeline, sample_questions_path)
+
+        loaded = EmbeddingPipeline(model_name="fake")
+        loaded.model = compressed_pipeline.model
+        loaded.load_index()
+        assert isinstance(loaded.vectors, np.memmap)
+        assert loaded.search("EBOB", top_k=3) == compressed_pipeline.search("EBOB", top_k=3)
+
+        df = pd.read_csv(sample_questions_path).drop(index=[0])
+        new_row = df.iloc[[0]].copy()
+        new_row["Soru_MetniOCR"] = "Tamamen yeni bir EBOB problemi"
+        pd.concat([df, new_row], ignore_index=True).to_csv(tmp_path / "new.csv", index=False)
+        loaded.update_from_csv(str(tmp_path / "new.csv"))
+
+        assert loaded.vector_ids.tolist() == sorted(loaded.id_to_metadata)
+        assert len(loaded.vectors) == loaded.index.ntotal
+        results = loaded.search("Tamamen yeni bir EBOB problemi", top_k=1)
+        assert results[0][1]["Soru_MetniOCR"] == "Tamamen yeni bir EBOB problemi"
+        assert results[0][0] == pytest.approx(1.0, abs=1e-5)
+
+    def test_filtered_search(self, compressed_pipeline):
+        """On-filtreli arama sikistirilmis index'te de sadece adaylari dondurur"""
+        texts = [f"soru {i}" for i in range(200)]
+        compressed_pipeline.build_index(
+            compressed_pipeline.embed_batch(texts), [{"Soru_MetniOCR": t} for t in texts]
+        )
+
+        results = compressed_pipeline.search("sorgu", top_k=5, filter_indices=[3, 50, 120])
+
+        assert sorted(meta["Soru_MetniOCR"] for _, meta in results) == ["soru 120", "soru 3", "soru 50"]
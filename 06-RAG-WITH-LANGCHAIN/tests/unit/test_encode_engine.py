@@ -0,0 +1,142 @@
+"""
+Unit Tests for EncodeEngine
+"""
+
+import hashlib
+
+import numpy as np
+import pytest
+
+
+class FakeEncoder:
+    """Metinden deterministik vektor ureten, batch boyutlarini kaydeden sahte encoder"""
+
+    def __init__(self, dimension: int = 8):
+        self.dimension = dimension
+        self.batch_sizes: list[int] = []
+        self.calls: list[list[str]] = []
+
+    def _vector(self, text: str) -> np.ndarray:
+        seed = int(hashlib.md5(text.encode("utf-8")).hexdigest()[:8], 16)
+        vec = np.random.default_rng(seed).normal(size=self.dimension).astype("float32")
+        return vec / np.linalg.norm(vec)
+
+    def encode(self, texts, batch_size=32, **kwargs):
+        self.batch_sizes.append(batch_size)
+        self.calls.append(list(texts))
+        return np.stack([self._vector(t) for t in texts])
+
+
+class FakeEncoderFactory:
+    """Worker process'te FakeEncoder olusturan pickle edilebilir fabrika"""
+
+    def __call__(self):
+        return FakeEncoder()
+
+
+@pytest.fixture
+def texts():
+    """Farkli uzunlukta metinler"""
+    return [("kelime " * (i % 37 + 1)).strip() + f" {i}" for i in range(200)]
+
+
+def expected(texts):
+    return np.stack([FakeEncoder()._vector(t) for t in texts])
+
+
+class TestPlan:
+    """Siralama ve batch boyutu testleri"""
+
+    def test_chunks_sorted_longest_first(self, texts):
+        """Parcalar uzunluga gore azalan sirada ve tum metinleri kapsar"""
+        from services.encode_engine import EncodeEngine
+
+        engine = EncodeEngine(FakeEncoder(), chunk_size=50)
+        chunks = engine.plan(texts)
+        lengths = engine.token_lengths(texts)
+
+        order = np.concatenate([indices for indices, _ in chunks])
+        assert sorted(order.tolist()) == list(range(len(texts)))
+        assert np.all(np.diff(lengths[order]) <= 0)
+        assert len(chunks) == 4
+
+    def test_shorter_texts_get_larger_batches(self):
+        """Kisa diziler daha buyuk batch alir, ust ve alt sinir korunur"""
+        from services.encode_engine import EncodeEngine
+
+        engine = EncodeEngine(FakeEncoder(), memory_mb=64, max_batch_size=128)
+
+        assert engine.batch_size_for(16) >= engine.batch_size_for(128) >= engine.batch_size_for(512)
+        assert engine.batch_size_for(1) == 128
+        assert engine.batch_size_for(512) >= EncodeEngine.MIN_BATCH_SIZE
+
+
+class TestEncode:
+    """Encode sonucu testleri"""
+
+    def test_in_process_preserves_order(self, texts):
+        """Siralanmis batch'ler orijinal sira ile geri yazilir"""
+        from services.encode_engine import EncodeEngine
+
+        encoder = FakeEncoder()
+        engine = EncodeEngine(encoder, chunk_size=64, memory_mb=1)
+        result = engine.encode(texts, dimension=8)
+
+        np.testing.assert_allclose(result, expected(texts))
+        # Ilk (en uzun) parca en kucuk batch'i alir
+        assert encoder.batch_sizes[0] == min(encoder.batch_sizes)
+
+    def test_out_path_writes_npy(self, texts, tmp_path):
+        """out_path verildiginde sonuc .npy memmap olarak yazilir"""
+        from services.encode_engine import EncodeEngine
+
+        path = tmp_path / "embeddings.npy"
+        result = EncodeEngine(FakeEncoder(), chunk_size=64).encode(texts, dimension=8, out_path=path)
+
+        assert isinstance(result, np.memmap)
+        np.testing.assert_allclose(np.load(path), expected(texts))
+
+    def test_empty(self):
+        """Bos liste bos matris dondurur"""
+        from services.encode_engine import EncodeEngine
+
+        assert EncodeEngine(FakeEncoder()).encode([], dimension=8).shape == (0, 8)
+
+    def test_parallel_matches_in_process(self, texts, monkeypatch):
+        """Process havuzu ayni sonucu uretir; ana process modeli kullanilmaz"""
+        from services.encode_engine import EncodeEngine
+
+        monkeypatch.setattr(EncodeEngine, "MIN_PARALLEL_TEXTS", 10)
+        local = FakeEncoder()
+        engine = EncodeEngine(local, model_factory=FakeEncoderFactory(), workers=2, chunk_size=40)
+        result = engine.encode(texts, dimension=8)
+
+        np.testing.assert_allclose(result, expected(texts))
+        assert local.calls == []
+
+
+class TestPipelineIntegration:
+    """EmbeddingPipeline entegrasyonu"""
+
+    def test_embed_batch_uses_engine_and_cache(self, texts, tmp_path, monkeypatch):
+        """embed_batch out_path ile cache'li metinleri de dosyaya yazar"""
+        from config import settings
+        from services.embedding_cache import EmbeddingCache
+        from services.embedding_service import EmbeddingPipeline
+
+        monkeypatch.setattr(settings, "embedding_encode_chunk_size", 32)
+        pipeline = EmbeddingPipeline()
+        pipeline.model = FakeEncoder()
+        pipeline.dimension = 8
+        pipeline.cache = EmbeddingCache("fake", 8, path=tmp_path / "cache")
+
+        first = pipeline.embed_batch(texts[:50])
+        pipeline.model.calls.clear()
+        path = tmp_path / "all.npy"
+        result = pipeline.embed_batch(texts, show_progress=False, out_path=path)
+
+        np.testing.assert_allclose(first, expected(texts[:50]))
+        assert isinstance(result, np.memmap)
+        np.testing.assert_allclose(np.load(path), expected(texts))
+        # Ikinci cagrida sadece cache'te olmayan 150 metin encode edildi
+        assert sum(len(c) for c in pipeline.model.calls) == 150
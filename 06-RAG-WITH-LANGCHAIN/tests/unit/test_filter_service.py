@@ -222,3 +222,115 @@ class TestFilterServiceEdgeCases:
         for item in results:
             assert item["Zorluk"] == 4
 
+
+
+class TestFilterServiceColumnar:
+    """Kolonsal/bitmap filtrelemenin satir satir tarama ile esdegerligi"""
+
+    @staticmethod
+    def _reference(metadata, criteria):
+        """Eski satir bazli eslesme mantigi"""
+        results = []
+        for i, m in enumerate(metadata):
+            if criteria.alt_konu and m.get("Alt_Konu") != criteria.alt_konu:
+                continue
+            if criteria.zorluk and m.get("Zorluk") != criteria.zorluk:
+                continue
+            if criteria.zorluk_range and not (
+                criteria.zorluk_range[0] <= m.get("Zorluk", 0) <= criteria.zorluk_range[1]
+            ):
+                continue
+            if criteria.gorsel_tipi and m.get("Gorsel_Tipi") != criteria.gorsel_tipi:
+                continue
+            if criteria.kaynak_tipi and m.get("Kaynak_Tipi") not in criteria.kaynak_tipi:
+                continue
+            if criteria.is_lgs is not None and m.get("is_LGS") != criteria.is_lgs:
+                continue
+            results.append(i)
+        return results
+
+    def test_matches_reference_on_random_data(self):
+        """Tum fallback seviyelerinde sonuclar eski mantikla ayni olmali"""
+        import random
+        from services.filter_service import FilterService, create_fallback_filter
+
+        rng = random.Random(42)
+        metadata = [
+            {
+                "Alt_Konu": rng.choice(["ebob_ekok", "carpanlar", "aralarinda_asal"]),
+                "Zorluk": rng.randint(1, 5),
+                "Gorsel_Tipi": rng.choice(["yok", "resimli", "tablo", "sematik"]),
+                "Kaynak_Tipi": rng.choice(["cikmis", "ornek", "baslangic"]),
+                "is_LGS": rng.randint(0, 1),
+            }
+            for _ in range(500)
+        ]
+        service = FilterService(metadata)
+
+        for zorluk in range(1, 6):
+            combination = {"alt_konu": "ebob_ekok", "zorluk": zorluk, "gorsel_tipi": "tablo"}
+            for level in range(1, 5):
+                criteria = create_fallback_filter(combination, level)
+                assert service.filter_indices(criteria) == self._reference(metadata, criteria)
+
+    def test_filter_indices_use_faiss_ids(self, sample_question_metadata):
+        """ids verildiginde pozisyon degil FAISS id'leri donmeli"""
+        from services.filter_service import FilterService, FilterCriteria
+
+        ids = [100 + 2 * i for i in range(len(sample_question_metadata))]
+        service = FilterService(sample_question_metadata, ids=ids)
+
+        indices = service.filter_indices(FilterCriteria(alt_konu="ebob_ekok"))
+
+        assert indices == [100, 102, 104]
+
+    def test_nan_values_do_not_match(self):
+        """Bos (NaN) hucreler hicbir kategorik degerle eslesmemeli"""
+        from services.filter_service import FilterService, FilterCriteria
+
+        metadata = [
+            {"Alt_Konu": "ebob_ekok", "Kaynak_Tipi": float("nan"), "Zorluk": 3},
+            {"Alt_Konu": "ebob_ekok", "Kaynak_Tipi": "cikmis", "Zorluk": 3},
+        ]
+        service = FilterService(metadata)
+
+        assert service.filter_indices(FilterCriteria(kaynak_tipi=["cikmis"])) == [1]
+
+    def test_store_matches_dict_path(self, tmp_path, monkeypatch):
+        """MetadataStore'dan kurulan servis satir olusturmadan ayni sonuclari vermeli"""
+        import random
+        from services.filter_service import FilterService, create_fallback_filter
+        from services.metadata_store import MetadataRow, MetadataStore
+
+        rng = random.Random(7)
+        id_map = {}
+        for i in range(300):
+            meta = {
+                "Alt_Konu": rng.choice(["ebob_ekok", "carpanlar", "üslü_ifadeler"]),
+                "Zorluk": rng.randint(1, 5),
+                "Kaynak_Tipi": rng.choice(["cikmis", "ornek", float("nan")]),
+                "is_LGS": rng.randint(0, 1),
+            }
+            if i % 3:
+                meta["Gorsel_Tipi"] = rng.choice(["yok", "tablo"])
+            id_map[3 * i + 1] = meta
+        MetadataStore.write(tmp_path / "metadata", id_map)
+        store = MetadataStore(tmp_path / "metadata")
+        reference = FilterService.from_id_map(id_map)
+
+        def no_rows(*args):
+            raise AssertionError("kurulusta satir olusturuldu")
+
+        monkeypatch.setattr(MetadataRow, "__init__", no_rows)
+        service = FilterService.from_id_map(store)
+        monkeypatch.undo()
+
+        for zorluk in range(1, 6):
+            for gorsel in ("yok", "tablo"):
+                combination = {"alt_konu": "ebob_ekok", "zorluk": zorluk, "gorsel_tipi": gorsel}
+                for level in range(1, 5):
+                    criteria = create_fallback_filter(combination, level)
+                    assert service.filter_indices(criteria) == reference.filter_indices(criteria)
+
+        results = service.filter(create_fallback_filter({"alt_konu": "carpanlar"}, 4))
+        assert results and all(row["Alt_Konu"] == "carpanlar" for row in results)
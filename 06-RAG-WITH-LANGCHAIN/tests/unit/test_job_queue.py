@@ -0,0 +1,203 @@
+"""
+Unit Tests for GenerationJobQueue
+"""
+
+import asyncio
+import json
+import time
+
+import pytest
+
+
+VALID_RESPONSE = json.dumps({
+    "hikaye": "Test hikayesi",
+    "soru": "Test sorusu?",
+    "secenekler": {"A": "1", "B": "2", "C": "3", "D": "4"},
+    "dogru_cevap": "C",
+    "cozum": ["Adım 1: ..."]
+})
+
+
+class CountingLLM:
+    """Cagri sayan sahte LLM client"""
+
+    provider = "test-jobs"
+
+    def __init__(self, fail_on: set[int] | None = None):
+        self.fail_on = fail_on or set()
+        self.calls = 0
+
+    async def generate(self, system_prompt, user_prompt, temperature=0.7, max_tokens=2000):
+        self.calls += 1
+        call_no = self.calls
+        await asyncio.sleep(0)
+        if call_no in self.fail_on:
+            return "invalid json"
+        return VALID_RESPONSE
+
+
+@pytest.fixture
+def generator_factory(sample_question_metadata):
+    """QuestionGenerator olusturucu (retriever mock)"""
+    from unittest.mock import MagicMock
+    from services.question_generator import QuestionGenerator
+    from services.output_formatter import RAGOutputFormatter
+    from services.prompt_builder import PromptBuilder
+    from services.llm_client import LLMClientFactory
+    from models.question import RetrievedQuestion
+
+    LLMClientFactory.clear_cache()
+    retriever = MagicMock()
+    retriever.retrieve_examples.return_value = [
+        RetrievedQuestion(
+            soru_metni=m["Soru_MetniOCR"],
+            alt_konu=m["Alt_Konu"],
+            zorluk=m["Zorluk"],
+            gorsel_tipi=m["Gorsel_Tipi"],
+            kaynak_tipi=m["Kaynak_Tipi"],
+        )
+        for m in sample_question_metadata
+    ]
+
+    def _make(llm):
+        return QuestionGenerator(
+            retriever=retriever,
+            formatter=RAGOutputFormatter(),
+            prompt_builder=PromptBuilder(),
+            llm_client=llm,
+        )
+
+    yield _make
+    LLMClientFactory.clear_cache()
+
+
+@pytest.fixture
+def queue(tmp_path):
+    """Gecici dizinde is kuyrugu"""
+    from services.job_queue import GenerationJobQueue
+
+    q = GenerationJobQueue(path=tmp_path, workers=1)
+    yield q
+    q.close()
+
+
+class TestGenerationJobQueue:
+    """Kalici is kuyrugu testleri"""
+
+    async def test_job_runs_to_completion(self, queue, generator_factory, single_combination):
+        """Is tamamlanmali, sonuclar sayfalanabilmeli"""
+        from services.job_queue import JobStatus
+
+        llm = CountingLLM(fail_on={3})
+        job_id = queue.submit([(single_combination, None)] * 5)
+        assert queue._claim_job() == job_id
+
+        await queue.run_job(generator_factory(llm), job_id)
+
+        state = queue.get_job(job_id)
+        assert state["status"] == JobStatus.DONE
+        assert state["completed"] == 4
+        assert state["failed"] == 1
+        assert state["progress"] == 1.0
+
+        page = queue.get_results(job_id, offset=1, limit=2)
+        assert [r["index"] for r in page] == [1, 3]
+        assert page[0]["question"]["soru"] == "Test sorusu?"
+        assert len(queue.get_results(job_id, include_failures=True)) == 5
+
+    async def test_job_params_max_attempts(self, queue, generator_factory, single_combination):
+        """Istekteki max_attempts kalemlerin deneme sayisini belirlemeli"""
+        from services.job_queue import JobStatus
+
+        llm = CountingLLM(fail_on={1})
+        job_id = queue.submit([(single_combination, None)], params={"max_attempts": 2})
+        queue._claim_job()
+
+        await queue.run_job(generator_factory(llm), job_id)
+
+        state = queue.get_job(job_id)
+        assert state["status"] == JobStatus.DONE
+        assert state["completed"] == 1
+        assert llm.calls == 2
+
+    async def test_crashed_job_resumes_without_recomputing(
+        self, queue, generator_factory, single_combination, tmp_path
+    ):
+        """Coken process'in isi sadece kalan kalemlerle devam etmeli"""
+        from services.job_queue import GenerationJobQueue, JobStatus
+
+        job_id = queue.submit([(single_combination, None)] * 6)
+        queue._claim_job()
+        # Ilk iki kalem tamamlanmis, sonra process dusmus gibi
+        first = generator_factory(CountingLLM())
+        pending = queue._pending_items(job_id, 2)
+        async for item in first.iter_batch([(c, s) for _, c, s in pending]):
+            queue._record(job_id, pending[item.index][0], item)
+        queue._db.execute("UPDATE jobs SET heartbeat = ?", (time.time() - 1000,))
+
+        restarted = GenerationJobQueue(path=tmp_path, workers=1)
+        assert restarted._claim_job() == job_id
+
+        llm = CountingLLM()
+        await restarted.run_job(generator_factory(llm), job_id)
+
+        assert llm.calls == 4
+        assert restarted.get_job(job_id)["status"] == JobStatus.DONE
+        assert restarted.get_job(job_id)["completed"] == 6
+        restarted.close()
+
+    async def test_heartbeat_refreshed_during_long_item(
+        self, queue, generator_factory, single_combination, monkeypatch
+    ):
+        """Kalem bitmeden de heartbeat tazelenmeli (uzun parca devralinmamali)"""
+        job_id = queue.submit([(single_combination, None)])
+        queue._claim_job()
+        queue._db.execute("UPDATE jobs SET heartbeat = 0")
+        monkeypatch.setattr(queue, "HEARTBEAT_INTERVAL", 0.01)
+
+        heartbeats = []
+
+        class SlowLLM(CountingLLM):
+            async def generate(self, *args, **kwargs):
+                await asyncio.sleep(0.1)
+                row = queue._db.execute("SELECT heartbeat FROM jobs").fetchone()
+                heartbeats.append(row["heartbeat"])
+                return await super().generate(*args, **kwargs)
+
+        await queue.run_job(generator_factory(SlowLLM()), job_id)
+
+        assert heartbeats[0] > 0
+
+    async def test_fresh_running_job_not_stolen(self, queue, single_combination):
+        """Heartbeat'i taze calisan is baska worker'a verilmemeli"""
+        queue.submit([(single_combination, None)])
+        assert queue._claim_job() is not None
+        assert queue._claim_job() is None
+
+    async def test_cancel_stops_pending_items(self, queue, generator_factory, single_combination):
+        """Iptal edilen is yeni kalem baslatmamali"""
+        from services.job_queue import JobStatus
+
+        job_id = queue.submit([(single_combination, None)] * 3)
+        queue._claim_job()
+        assert queue.cancel(job_id)
+
+        llm = CountingLLM()
+        await queue.run_job(generator_factory(llm), job_id)
+
+        assert llm.calls == 0
+        assert queue.get_job(job_id)["status"] == JobStatus.CANCELLED
+        assert queue.cancel(job_id) is False
+
+    async def test_background_worker_drains_queue(self, queue, generator_factory, single_combination):
+        """start() ile baslatilan worker kuyruktaki isi bitirmeli"""
+        from services.job_queue import JobStatus
+
+        queue.start(generator_factory(CountingLLM()))
+        job_id = queue.submit([(single_combination, None)] * 3)
+
+        states = [state async for state in queue.iter_progress(job_id, interval=0.01)]
+        await queue.stop()
+
+        assert states[-1]["status"] == JobStatus.DONE
+        assert states[-1]["completed"] == 3
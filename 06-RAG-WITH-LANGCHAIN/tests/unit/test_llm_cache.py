@@ -0,0 +1,113 @@
+"""
+Unit Tests for LLM response cache
+"""
+
+import time
+
+import pytest
+
+
+class EchoLLM:
+    """Her cagrida farkli yanit donen sahte LLM client"""
+
+    provider = "test-echo"
+    model_id = "echo-1"
+
+    def __init__(self):
+        self.calls = 0
+
+    async def generate(self, system_prompt, user_prompt, temperature=0.7, max_tokens=2000):
+        self.calls += 1
+        return f"yanit-{self.calls}"
+
+
+@pytest.fixture
+def response_cache(tmp_path):
+    """Gecici dizinde yanit cache'i"""
+    from services.llm_cache import LLMResponseCache
+
+    cache = LLMResponseCache(path=tmp_path, ttl=0)
+    yield cache
+    cache.close()
+
+
+class TestCachedLLMClient:
+    """Record/replay yanit cache testleri"""
+
+    async def test_hit_skips_llm(self, response_cache):
+        """Ayni istek ikinci kez LLM'e gitmemeli"""
+        from services.llm_cache import CachedLLMClient
+
+        inner = EchoLLM()
+        client = CachedLLMClient(inner, cache=response_cache, mode="on")
+
+        first = await client.generate("sistem", "kullanici", temperature=0.7)
+        second = await client.generate("sistem", "kullanici", temperature=0.7)
+
+        assert first == second == "yanit-1"
+        assert inner.calls == 1
+        assert (client.hits, client.misses) == (1, 1)
+
+    async def test_key_includes_sampling_params(self, response_cache):
+        """Temperature/max_tokens/prompt degisince farkli kayit kullanilmali"""
+        from services.llm_cache import CachedLLMClient
+
+        inner = EchoLLM()
+        client = CachedLLMClient(inner, cache=response_cache, mode="on")
+
+        await client.generate("sistem", "kullanici", temperature=0.7)
+        await client.generate("sistem", "kullanici", temperature=0.8)
+        await client.generate("sistem", "kullanici", temperature=0.7, max_tokens=100)
+        await client.generate("sistem", "baska", temperature=0.7)
+
+        assert inner.calls == 4
+
+    async def test_ttl_expiry(self, tmp_path):
+        """Suresi dolan kayit yeniden uretilmeli"""
+        from services.llm_cache import CachedLLMClient, LLMResponseCache
+
+        cache = LLMResponseCache(path=tmp_path, ttl=60)
+        inner = EchoLLM()
+        client = CachedLLMClient(inner, cache=cache, mode="on")
+
+        await client.generate("s", "u")
+        cache._db.execute("UPDATE responses SET created_at = ?", (time.time() - 120,))
+        result = await client.generate("s", "u")
+
+        assert result == "yanit-2"
+        cache.close()
+
+    async def test_record_then_replay(self, response_cache):
+        """record ile kaydedilen calisma replay'de LLM'siz tekrarlanmali"""
+        from services.llm_cache import CachedLLMClient, CacheMissError
+
+        recorder = CachedLLMClient(EchoLLM(), cache=response_cache, mode="record")
+        recorded = await recorder.generate("s", "u")
+        # record modu mevcut kaydi kullanmaz, gunceller
+        assert await recorder.generate("s", "u") == "yanit-2"
+
+        inner = EchoLLM()
+        replayer = CachedLLMClient(inner, cache=response_cache, mode="replay")
+
+        assert recorded == "yanit-1"
+        assert await replayer.generate("s", "u") == "yanit-2"
+        assert inner.calls == 0
+        with pytest.raises(CacheMissError):
+            await replayer.generate("s", "kayitsiz")
+
+    def test_factory_wraps_when_enabled(self, tmp_path, monkeypatch):
+        """LLM_CACHE_MODE acikken factory client'i sarmalamali"""
+        from config import settings
+        from services.llm_client import LLMClientFactory
+        from services.llm_cache import CachedLLMClient
+
+        monkeypatch.setattr(settings, "llm_cache_mode", "on")
+        monkeypatch.setattr(settings, "llm_cache_path", tmp_path)
+        LLMClientFactory.clear_cache()
+
+        client = LLMClientFactory.create(provider="openai", api_key="test", model="gpt-test")
+
+        assert isinstance(client, CachedLLMClient)
+        assert client.provider == "openai"
+        assert client.model_id == "gpt-test"
+        LLMClientFactory.clear_cache()
@@ -0,0 +1,180 @@
+"""
+Unit Tests for LLM clients
+"""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+
+@pytest.fixture
+def gemini_client(monkeypatch):
+    """Sahte async SDK'li GeminiClient (rate limit kapali)"""
+    pytest.importorskip("google.genai")
+    from config import settings
+    from services.llm_client import GeminiClient
+
+    monkeypatch.setattr(settings, "rate_limit_rpm", None)
+    monkeypatch.setattr(settings, "rate_limit_tpm", None)
+
+    client = GeminiClient(api_key="test-key", model="gemini-test")
+
+    async def generate_content(**kwargs):
+        await asyncio.sleep(0.05)
+        return SimpleNamespace(
+            text='{"soru": "Test?"}',
+            candidates=[SimpleNamespace(finish_reason=SimpleNamespace(name="STOP"))],
+            usage_metadata=None,
+        )
+
+    client.client = MagicMock()
+    client.client.aio.models.generate_content = AsyncMock(side_effect=generate_content)
+    client.client.models.generate_content.side_effect = AssertionError("sync API kullanilmamali")
+    return client
+
+
+class TestGeminiClient:
+    """Gemini async client testleri"""
+
+    async def test_uses_async_surface(self, gemini_client, monkeypatch):
+        """Cagri thread havuzuna gitmeden client.aio uzerinden yapilmali"""
+        async def _no_thread(*args, **kwargs):
+            raise AssertionError("asyncio.to_thread kullanilmamali")
+
+        monkeypatch.setattr(asyncio, "to_thread", _no_thread)
+
+        result = await gemini_client.generate("sistem", "kullanici", temperature=0.3, max_tokens=100)
+
+        assert result == '{"soru": "Test?"}'
+        kwargs = gemini_client.client.aio.models.generate_content.call_args.kwargs
+        assert kwargs["model"] == "gemini-test"
+        assert kwargs["config"].max_output_tokens == 100
+
+    async def test_calls_overlap(self, gemini_client):
+        """Eszamanli cagrilar birbirini beklememeli"""
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+
+        await asyncio.gather(*(gemini_client.generate("s", "u") for _ in range(20)))
+
+        assert loop.time() - started < 0.5
+
+    async def test_does_not_print_raw_response(self, gemini_client, capsys):
+        """Ham yanit her cagrida yazdirilmamali"""
+        await gemini_client.generate("s", "u")
+
+        assert "Test?" not in capsys.readouterr().out
+
+
+@pytest.fixture
+def anthropic_client(monkeypatch):
+    """Sahte SDK'li AnthropicClient (rate limit kapali)"""
+    from config import settings
+    from services.llm_client import AnthropicClient
+
+    monkeypatch.setattr(settings, "rate_limit_rpm", None)
+    monkeypatch.setattr(settings, "rate_limit_tpm", None)
+    monkeypatch.setattr(settings, "llm_prompt_caching", True)
+
+    client = AnthropicClient(api_key=None, model="claude-test")
+    client.client = MagicMock()
+    client.client.messages.create = AsyncMock(return_value=SimpleNamespace(
+        content=[SimpleNamespace(text='{"soru": "Test?"}')],
+        usage=SimpleNamespace(
+            input_tokens=40,
+            cache_read_input_tokens=900,
+            cache_creation_input_tokens=0,
+            output_tokens=120,
+        ),
+    ))
+    return client
+
+
+class TestPromptCaching:
+    """Prefix cache duzeni ve token muhasebesi testleri"""
+
+    async def test_anthropic_cache_breakpoints(self, anthropic_client, single_combination):
+        """System prompt ve sabit user prefix'i cache_control almali"""
+        from services.llm_client import PROMPT_CACHE_BOUNDARY
+        from services.prompt_builder import PromptBuilder
+
+        builder = PromptBuilder()
+        user_prompt = builder.build_user_prompt(single_combination, "", "Spor senaryosu")
+
+        await anthropic_client.generate(builder.system_prompt, user_prompt)
+
+        kwargs = anthropic_client.client.messages.create.call_args.kwargs
+        assert kwargs["system"][0]["cache_control"] == {"type": "ephemeral"}
+        prefix, variable = kwargs["messages"][0]["content"]
+        assert prefix["cache_control"] == {"type": "ephemeral"}
+        assert prefix["text"].endswith(PROMPT_CACHE_BOUNDARY)
+        assert "cache_control" not in variable
+        assert "Spor senaryosu" in variable["text"]
+        assert prefix["text"] + variable["text"] == user_prompt
+
+    async def test_anthropic_usage_recorded(self, anthropic_client):
+        """Cache okuma token'lari ayri sayilmali"""
+        await anthropic_client.generate("s", "u")
+        await anthropic_client.generate("s", "u")
+
+        usage = anthropic_client.usage.to_dict()
+        assert usage["requests"] == 2
+        assert usage["input_tokens"] == 2 * 940
+        assert usage["cached_input_tokens"] == 2 * 900
+        assert usage["uncached_input_tokens"] == 2 * 40
+        assert usage["output_tokens"] == 2 * 120
+
+    async def test_caching_disabled_sends_plain_strings(self, anthropic_client, monkeypatch):
+        """LLM_PROMPT_CACHING kapaliyken istek eski bicimde olmali"""
+        from config import settings
+
+        monkeypatch.setattr(settings, "llm_prompt_caching", False)
+        await anthropic_client.generate("sistem", "kullanici")
+
+        kwargs = anthropic_client.client.messages.create.call_args.kwargs
+        assert kwargs["system"] == "sistem"
+        assert kwargs["messages"][0]["content"] == "kullanici"
+
+    async def test_openai_cached_tokens(self, monkeypatch):
+        """OpenAI prompt_tokens_details.cached_tokens kaydedilmeli"""
+        from config import settings
+        from services.llm_client import OpenAIClient
+
+        monkeypatch.setattr(settings, "rate_limit_rpm", None)
+        monkeypatch.setattr(settings, "rate_limit_tpm", None)
+        client = OpenAIClient(api_key="test-key", model="gpt-test")
+        client.client = MagicMock()
+        client.client.chat.completions.create = AsyncMock(return_value=SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content="{}"))],
+            usage=SimpleNamespace(
+                prompt_tokens=1500,
+                completion_tokens=300,
+                prompt_tokens_details=SimpleNamespace(cached_tokens=1280),
+            ),
+        ))
+
+        await client.generate("s", "u")
+
+        assert client.usage.cached_input_tokens == 1280
+        assert client.usage.uncached_input_tokens == 220
+        assert client.usage.to_dict()["cache_hit_ratio"] == round(1280 / 1500, 4)
+
+    def test_static_prefix_shared_across_requests(self):
+        """Farkli kombinasyon/stil icin sabit prefix birebir ayni olmali"""
+        from services.llm_client import PROMPT_CACHE_BOUNDARY
+        from services.prompt_builder import PromptBuilder
+
+        builder = PromptBuilder()
+        first = builder.build_user_prompt(
+            {"alt_konu": "ebob_ekok", "zorluk": 2, "gorsel_tipi": "yok"}, "", "Alisveris"
+        )
+        second = builder.build_user_prompt(
+            {"alt_konu": "carpanlar", "zorluk": 5, "gorsel_tipi": "sematik"}, "", None
+        )
+        batch = builder.build_batch_user_prompt([({"alt_konu": "ebob_ekok"}, None)] * 2)
+
+        assert first.split(PROMPT_CACHE_BOUNDARY)[0] == second.split(PROMPT_CACHE_BOUNDARY)[0]
+        assert "carpanlar" not in second.split(PROMPT_CACHE_BOUNDARY)[0]
+        assert "2 adet" in batch.split(PROMPT_CACHE_BOUNDARY)[1]
@@ -0,0 +1,137 @@
+"""
+Unit Tests for MetadataStore
+"""
+
+import math
+import pickle
+
+import numpy as np
+import pytest
+
+
+ROWS = {
+    0: {"idx": 0, "Soru_MetniOCR": "24 ve 36 sayılarının EBOB'u kaçtır?", "Zorluk": 3,
+        "egitim_agirligi": 0.5, "is_LGS": 1, "ocr_kelime_sayisi": np.float64("nan"),
+        "ocr_cok_adimli": True, "Alt_Konu": "ebob_ekok"},
+    2: {"idx": 1, "Soru_MetniOCR": "", "Zorluk": np.int64(5),
+        "egitim_agirligi": 1, "is_LGS": 0, "ocr_kelime_sayisi": 12.0,
+        "ocr_cok_adimli": False, "Alt_Konu": float("nan"), "ekstra": {"a": 1}},
+    7: {"idx": 2, "Soru_MetniOCR": "Üç basamaklı sayı", "Zorluk": 1,
+        "egitim_agirligi": 0.25, "is_LGS": 0, "ocr_kelime_sayisi": None,
+        "ocr_cok_adimli": False, "Alt_Konu": "carpanlar"},
+}
+
+
+@pytest.fixture
+def store(tmp_path):
+    from services.metadata_store import MetadataStore
+
+    MetadataStore.write(tmp_path / "metadata", ROWS)
+    return MetadataStore(tmp_path / "metadata")
+
+
+class TestMetadataStore:
+    """Kolonsal metadata deposu testleri"""
+
+    def test_roundtrip(self, store):
+        """Degerler tip ve icerik olarak korunmali"""
+        assert list(store) == [0, 2, 7]
+        assert store[0]["Soru_MetniOCR"] == ROWS[0]["Soru_MetniOCR"]
+        assert store[2]["Zorluk"] == 5 and isinstance(store[2]["Zorluk"], int)
+        assert store[2]["egitim_agirligi"] == 1.0
+        assert store[0]["ocr_cok_adimli"] is True
+        assert math.isnan(store[0]["ocr_kelime_sayisi"])
+        assert store[7]["ocr_kelime_sayisi"] is None
+        assert math.isnan(store[2]["Alt_Konu"])
+        assert store[7]["Alt_Konu"] == "carpanlar"
+
+    def test_sparse_column(self, store):
+        """Sadece bazi satirlarda olan alanlar diger satirlarda olmamali"""
+        assert store[2]["ekstra"] == {"a": 1}
+        assert "ekstra" not in store[0]
+        assert store[0].get("ekstra", "yok") == "yok"
+        assert set(store[2]) == set(ROWS[2])
+
+    def test_lookup_by_numpy_id(self, store):
+        """FAISS'in dondurdugu numpy id'leri ile erisim olmali"""
+        assert np.int64(7) in store
+        assert 3 not in store
+        assert store[np.int64(7)]["idx"] == 2
+        with pytest.raises(KeyError):
+            store[3]
+
+    def test_files_are_memory_mapped(self, store):
+        """Kolonlar kopyalanmadan mmap ile acilmali"""
+        assert isinstance(store.column("Zorluk"), np.memmap)
+        assert isinstance(store.ids(), np.memmap)
+
+    def test_factorize(self, store):
+        """Kodlar satir degerlerine, eksik satirlar -1'e esit olmali"""
+        values, codes = store.factorize("Zorluk")
+        assert [values[c] for c in codes] == [3, 5, 1]
+
+        values, codes = store.factorize("Soru_MetniOCR")
+        assert [values[c] for c in codes] == [ROWS[i]["Soru_MetniOCR"] for i in (0, 2, 7)]
+
+        values, codes = store.factorize("ekstra")
+        assert codes[0] == codes[2] == -1 and values[codes[1]] == {"a": 1}
+
+        values, codes = store.factorize("yok")
+        assert values == [] and codes.tolist() == [-1, -1, -1]
+
+    def test_to_dict_is_writable(self, store):
+        """to_dict bagimsiz, degistirilebilir kopya vermeli"""
+        copy = store.to_dict()
+        copy[0]["idx"] = 99
+
+        assert store[0]["idx"] == 0
+        assert copy[7]["Soru_MetniOCR"] == ROWS[7]["Soru_MetniOCR"]
+
+
+class TestPipelineMetadata:
+    """EmbeddingPipeline ile entegrasyon"""
+
+    def test_save_and_load_columnar(self, tmp_path, monkeypatch):
+        """save_index kolonsal yazmali, load_index mmap depo ile acmali"""
+        from config import settings
+        from services.embedding_service import EmbeddingPipeline
+        from services.filter_service import FilterService, FilterCriteria
+        from services.metadata_store import MetadataStore
+
+        monkeypatch.setattr(settings, "vector_store_path", tmp_path / "vs")
+        pipeline = EmbeddingPipeline(model_name="fake")
+        pipeline.dimension = 4
+        vectors = np.eye(3, 4, dtype="float32")
+        metadata = [dict(row) for row in ROWS.values()]
+        pipeline.build_index(vectors, metadata)
+        pipeline.save_index()
+
+        assert not (tmp_path / "vs" / "gen-000001" / "metadata.pkl").exists()
+
+        loaded = EmbeddingPipeline(model_name="fake")
+        loaded.load_index()
+        assert isinstance(loaded.id_to_metadata, MetadataStore)
+
+        scores, ids = loaded.index.search(vectors[2:3], 1)
+        assert loaded.id_to_metadata[ids[0][0]]["Soru_MetniOCR"] == ROWS[7]["Soru_MetniOCR"]
+
+        filters = FilterService.from_id_map(loaded.id_to_metadata)
+        assert filters.filter_indices(FilterCriteria(alt_konu="carpanlar")) == [2]
+
+    def test_legacy_pickle(self, tmp_path, monkeypatch):
+        """Eski metadata.pkl formati okunabilmeli"""
+        import faiss
+        from config import settings
+        from services.embedding_service import EmbeddingPipeline
+
+        monkeypatch.setattr(settings, "vector_store_path", tmp_path)
+        index = faiss.IndexFlatIP(4)
+        index.add(np.eye(3, 4, dtype="float32"))
+        faiss.write_index(index, str(tmp_path / "faiss.index"))
+        with open(tmp_path / "metadata.pkl", "wb") as f:
+            pickle.dump({0: {"a": 1}, 1: {"a": 2}, 2: {"a": 3}}, f)
+
+        pipeline = EmbeddingPipeline(model_name="fake")
+        pipeline.load_index()
+
+        assert pipeline.id_to_metadata[1] == {"a": 2}
@@ -0,0 +1,154 @@
+"""
+Unit Tests for OnnxEncoder (PyTorch ile dogruluk esitligi)
+"""
+
+import numpy as np
+import pytest
+
+pytest.importorskip("onnx")
+pytest.importorskip("onnxruntime")
+pytest.importorskip("sentence_transformers")
+
+
+TEXTS = [
+    "bir iki uc",
+    "ucgen alan cevre problem cozum",
+    "kesir",
+    "ebob ekok sayi oran " * 6,
+    "bilinmeyen kelimeler iceren soru",
+]
+
+
+def _build_model(path, pooling_mode: str = "mean") -> str:
+    """Indirme gerektirmeyen kucuk BERT + pooling SentenceTransformer modeli"""
+    import torch
+    from sentence_transformers import SentenceTransformer, models
+    from transformers import BertConfig, BertModel, BertTokenizerFast
+
+    words = "bir iki uc dort bes ucgen kare sayi kesir oran problem cozum ebob ekok alan cevre soru".split()
+    vocab = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]", *words, "##ler", "##lar", "##in"]
+    path.mkdir(parents=True, exist_ok=True)
+    (path / "vocab.txt").write_text("\n".join(vocab), encoding="utf-8")
+
+    torch.manual_seed(0)
+    bert = BertModel(BertConfig(
+        vocab_size=len(vocab),
+        hidden_size=32,
+        num_hidden_layers=2,
+        num_attention_heads=4,
+        intermediate_size=64,
+        max_position_embeddings=64,
+    ))
+    bert.save_pretrained(path / "hf")
+    BertTokenizerFast(vocab_file=str(path / "vocab.txt")).save_pretrained(path / "hf")
+
+    model = SentenceTransformer(modules=[
+        models.Transformer(str(path / "hf"), max_seq_length=32),
+        models.Pooling(32, pooling_mode),
+    ])
+    model.save(str(path / "st"))
+    return str(path / "st")
+
+
+@pytest.fixture(scope="module")
+def exported(tmp_path_factory):
+    """(model dizini, export dizini, PyTorch referans ciktisi)"""
+    from sentence_transformers import SentenceTransformer
+
+    from services.onnx_encoder import OnnxEncoder
+
+    root = tmp_path_factory.mktemp("onnx")
+    model_path = _build_model(root / "model")
+    export_dir = OnnxEncoder.export(model_path, OnnxEncoder.model_dir(model_path, root / "exports"))
+    reference = SentenceTransformer(model_path, device="cpu").encode(TEXTS, normalize_embeddings=True)
+    return model_path, export_dir, reference
+
+
+class TestParity:
+    """ONNX ciktisi PyTorch ciktisiyla eslesir"""
+
+    def test_float32_matches_pytorch(self, exported):
+        """float32 model ayni vektorleri uretir"""
+        from services.onnx_encoder import OnnxEncoder
+
+        _, export_dir, reference = exported
+        encoder = OnnxEncoder(export_dir, quantized=False)
+        actual = encoder.encode(TEXTS, normalize_embeddings=True, batch_size=2)
+
+        np.testing.assert_allclose(actual, reference, atol=1e-5)
+
+    def test_int8_close_to_pytorch(self, exported):
+        """int8 model yuksek cosine benzerligi korur"""
+        from services.onnx_encoder import OnnxEncoder
+
+        _, export_dir, reference = exported
+        actual = OnnxEncoder(export_dir).encode(TEXTS, normalize_embeddings=True)
+
+        assert (actual * reference).sum(axis=1).min() > 0.99
+        np.testing.assert_allclose(np.linalg.norm(actual, axis=1), 1.0, atol=1e-5)
+
+    def test_single_text_and_tokenizer(self, exported):
+        """Tek metin 1D doner; tokenizer EncodeEngine ile uyumlu"""
+        from services.encode_engine import EncodeEngine
+        from services.onnx_encoder import OnnxEncoder
+
+        _, export_dir, reference = exported
+        encoder = OnnxEncoder(export_dir, quantized=False)
+        vector = encoder.encode(TEXTS[3], normalize_embeddings=True)
+
+        assert vector.shape == (32,)
+        np.testing.assert_allclose(vector, reference[3], atol=1e-5)
+
+        engine = EncodeEngine(encoder, chunk_size=2)
+        assert engine.hidden == 32
+        assert engine.token_lengths(TEXTS).max() <= encoder.max_seq_length
+        np.testing.assert_allclose(engine.encode(TEXTS, dimension=32), reference, atol=1e-5)
+
+    def test_rejects_non_mean_pooling(self, tmp_path):
+        """Mean disi pooling aktarilmaz"""
+        from services.onnx_encoder import OnnxEncoder
+
+        model_path = _build_model(tmp_path / "cls", pooling_mode="cls")
+        with pytest.raises(ValueError):
+            OnnxEncoder.export(model_path, tmp_path / "out")
+
+
+class TestPipelineBackend:
+    """EmbeddingPipeline backend secimi"""
+
+    def test_onnx_backend(self, exported, monkeypatch):
+        """EMBEDDING_BACKEND=onnx iken export kullanilir"""
+        from config import settings
+        from services.embedding_service import EmbeddingPipeline
+        from services.onnx_encoder import OnnxEncoder
+
+        model_path, export_dir, reference = exported
+        monkeypatch.setattr(settings, "embedding_provider", "huggingface")
+        monkeypatch.setattr(settings, "embedding_backend", "onnx")
+        monkeypatch.setattr(settings, "embedding_onnx_path", export_dir.parent)
+        monkeypatch.setattr(settings, "embedding_cache_enabled", False)
+
+        pipeline = EmbeddingPipeline(model_name=model_path)
+        pipeline.load_model()
+
+        assert isinstance(pipeline.model, OnnxEncoder)
+        assert pipeline.backend == "onnx-int8"
+        assert pipeline.dimension == 32
+        assert float(pipeline.embed(TEXTS[1]) @ reference[1]) > 0.99
+
+    def test_missing_export_falls_back_to_torch(self, exported, monkeypatch, tmp_path):
+        """Export yoksa PyTorch modeli yuklenir"""
+        from config import settings
+        from services.embedding_service import EmbeddingPipeline
+
+        model_path, _, reference = exported
+        monkeypatch.setattr(settings, "embedding_provider", "huggingface")
+        monkeypatch.setattr(settings, "embedding_backend", "onnx")
+        monkeypatch.setattr(settings, "embedding_onnx_path", tmp_path / "empty")
+        monkeypatch.setattr(settings, "embedding_cache_enabled", False)
+
+        pipeline = EmbeddingPipeline(model_name=model_path)
+        pipeline.load_model()
+
+        assert pipeline.backend == "torch"
+        np.testing.assert_allclose(pipeline.embed(TEXTS[0]), reference[0], atol=1e-5)
@@ -0,0 +1,540 @@
+"""
+Unit Tests for QuestionGenerator batch engine
+"""
+
+import asyncio
+import json
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+
+VALID_RESPONSE = json.dumps({
+    "hikaye": "Test hikayesi",
+    "soru": "Test sorusu?",
+    "secenekler": {"A": "1", "B": "2", "C": "3", "D": "4"},
+    "dogru_cevap": "C",
+    "cozum": ["Adım 1: ..."]
+})
+
+
+class SlowLLM:
+    """Sabit gecikmeli sahte LLM client"""
+
+    provider = "test-slow"
+
+    def __init__(self, delay: float = 0.05, fail_on: set[int] | None = None):
+        self.delay = delay
+        self.fail_on = fail_on or set()
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def generate(self, system_prompt, user_prompt, temperature=0.7, max_tokens=2000):
+        self.calls += 1
+        call_no = self.calls
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+        if call_no in self.fail_on:
+            return "invalid json"
+        return VALID_RESPONSE
+
+
+@pytest.fixture
+def generator_factory(sample_question_metadata):
+    """QuestionGenerator olusturucu (retriever mock)"""
+    from services.question_generator import QuestionGenerator
+    from services.output_formatter import RAGOutputFormatter
+    from services.prompt_builder import PromptBuilder
+    from models.question import RetrievedQuestion
+
+    retriever = MagicMock()
+    retriever.retrieve_examples.return_value = [
+        RetrievedQuestion(
+            soru_metni=m["Soru_MetniOCR"],
+            alt_konu=m["Alt_Konu"],
+            zorluk=m["Zorluk"],
+            gorsel_tipi=m["Gorsel_Tipi"],
+            kaynak_tipi=m["Kaynak_Tipi"],
+        )
+        for m in sample_question_metadata
+    ]
+
+    def _make(llm):
+        return QuestionGenerator(
+            retriever=retriever,
+            formatter=RAGOutputFormatter(),
+            prompt_builder=PromptBuilder(),
+            llm_client=llm,
+        )
+
+    return _make
+
+
+class TestConcurrentBatch:
+    """Eszamanli toplu uretim testleri"""
+
+    @pytest.fixture(autouse=True)
+    def _reset_semaphores(self, monkeypatch):
+        from services.llm_client import LLMClientFactory
+        from config import settings
+
+        monkeypatch.setattr(settings, "llm_concurrency_overrides", {"test-slow": 4})
+        LLMClientFactory.clear_cache()
+        yield
+        LLMClientFactory.clear_cache()
+
+    async def test_batch_runs_concurrently(self, generator_factory, single_combination):
+        """Batch suresi cagri surelerinin toplamindan cok kisa olmali"""
+        llm = SlowLLM(delay=0.1)
+        generator = generator_factory(llm)
+
+        started = time.perf_counter()
+        result = await generator.generate_batch_detailed([single_combination] * 8)
+        elapsed = time.perf_counter() - started
+
+        assert len(result.questions) == 8
+        assert elapsed < 8 * 0.1 * 0.6
+
+    async def test_in_flight_limit_respected(self, generator_factory, single_combination):
+        """Ayni anda acik cagri sayisi provider limitini asmamali"""
+        llm = SlowLLM(delay=0.02)
+        generator = generator_factory(llm)
+
+        await generator.generate_batch_detailed([single_combination] * 12)
+
+        assert llm.max_in_flight == 4
+
+    async def test_per_item_failure_accounting(self, generator_factory, single_combination):
+        """Basarisiz kalemler ayri raporlanmali, digerleri etkilenmemeli"""
+        llm = SlowLLM(delay=0.0, fail_on={2, 5})
+        generator = generator_factory(llm)
+
+        result = await generator.generate_batch_detailed([single_combination] * 6)
+        stats = result.stats()
+
+        assert stats["requested"] == 6
+        assert stats["generated"] == 4
+        assert stats["failed"] == 2
+        assert stats["errors_by_type"] == {"QuestionGenerationError": 2}
+        assert all(item.error for item in result.failures)
+
+    async def test_unexpected_error_propagates(self, generator_factory, single_combination):
+        """Uretim disi (beklenmeyen) hatalar kalem hatasi olarak yutulmamali"""
+        generator = generator_factory(SlowLLM(delay=0.0))
+        generator.retriever.retrieve_examples.side_effect = RuntimeError("retriever bozuk")
+
+        with pytest.raises(RuntimeError, match="retriever bozuk"):
+            await generator.generate_batch([single_combination] * 2)
+
+    async def test_generate_batch_returns_questions(self, generator_factory, single_combination):
+        """generate_batch geriye uyumlu olarak soru listesi donmeli"""
+        generator = generator_factory(SlowLLM(delay=0.0))
+
+        questions = await generator.generate_batch([single_combination] * 3)
+
+        assert len(questions) == 3
+        assert all(q.metadata["style_instruction"] for q in questions)
+
+
+class ScriptedLLM:
+    """Temperature'a gore sabit gecikme/yanit donen sahte LLM client"""
+
+    provider = "test-hedge"
+
+    def __init__(self, script: dict[float, tuple[float, str]]):
+        self.script = script
+        self.started: list[float] = []
+        self.cancelled = 0
+
+    async def generate(self, system_prompt, user_prompt, temperature=0.7, max_tokens=2000):
+        temperature = round(temperature, 1)
+        self.started.append(temperature)
+        delay, response = self.script[temperature]
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        return response
+
+
+class TestHedgedGeneration:
+    """Spekulatif (paralel aday) uretim testleri"""
+
+    @pytest.fixture(autouse=True)
+    def _reset_semaphores(self, monkeypatch):
+        from services.llm_client import LLMClientFactory
+        from config import settings
+
+        monkeypatch.setattr(settings, "llm_concurrency_overrides", {"test-hedge": 8})
+        LLMClientFactory.clear_cache()
+        yield
+        LLMClientFactory.clear_cache()
+
+    async def test_first_valid_wins_and_rest_cancelled(self, generator_factory, single_combination):
+        """Hizli ama gecersiz aday atlanmali, ilk gecerli aday donmeli"""
+        llm = ScriptedLLM({
+            0.7: (0.01, "invalid json"),
+            0.8: (0.05, VALID_RESPONSE),
+            0.9: (1.0, VALID_RESPONSE),
+        })
+        generator = generator_factory(llm)
+
+        started = time.perf_counter()
+        question = await generator.generate_question_hedged(single_combination, candidates=3)
+        elapsed = time.perf_counter() - started
+        await asyncio.sleep(0)
+
+        assert question.metadata["temperature"] == pytest.approx(0.8)
+        assert question.metadata["hedge_candidates"] == 3
+        assert elapsed < 0.5
+        assert llm.cancelled == 1
+
+    async def test_accept_rejects_duplicates(self, generator_factory, single_combination):
+        """accept False donen aday elenmeli"""
+        llm = ScriptedLLM({
+            0.7: (0.01, VALID_RESPONSE),
+            0.8: (0.03, VALID_RESPONSE.replace("Test sorusu?", "Yeni soru?")),
+        })
+        generator = generator_factory(llm)
+
+        question = await generator.generate_question_hedged(
+            single_combination,
+            candidates=2,
+            accept=lambda q: q.soru != "Test sorusu?",
+        )
+
+        assert question.soru == "Yeni soru?"
+
+    async def test_single_candidate_regenerates_duplicate(self, generator_factory, single_combination):
+        """Tek aday yolunda reddedilen soru yeniden uretilmeli (async accept)"""
+        from services.question_generator import QuestionGenerationError
+
+        llm = ScriptedLLM({
+            0.7: (0.0, VALID_RESPONSE),
+            0.8: (0.0, VALID_RESPONSE.replace("Test sorusu?", "Yeni soru?")),
+        })
+        generator = generator_factory(llm)
+
+        async def accept(q):
+            return q.soru != "Test sorusu?"
+
+        question = await generator.generate_question(
+            single_combination, max_attempts=2, accept=accept
+        )
+        assert question.soru == "Yeni soru?"
+
+        with pytest.raises(QuestionGenerationError, match="tekrar"):
+            await generator.generate_question(
+                single_combination, max_attempts=1, accept=accept
+            )
+
+    async def test_all_candidates_fail(self, generator_factory, single_combination):
+        """Hicbir aday gecmezse ham yanitla birlikte hata verilmeli"""
+        from services.question_generator import QuestionGenerationError
+
+        llm = ScriptedLLM({0.7: (0.0, "invalid json"), 0.8: (0.0, "invalid json")})
+        generator = generator_factory(llm)
+
+        with pytest.raises(QuestionGenerationError) as exc_info:
+            await generator.generate_question_hedged(single_combination, candidates=2)
+
+        assert exc_info.value.raw_response == "invalid json"
+
+
+class StreamingLLM:
+    """Yaniti parca parca akitan sahte LLM client"""
+
+    provider = "test-stream"
+
+    def __init__(self, response: str, chunk_size: int = 8):
+        self.chunks = [response[i : i + chunk_size] for i in range(0, len(response), chunk_size)]
+        self.consumed = 0
+        self.closed = False
+        self.generate_calls = 0
+
+    async def generate(self, system_prompt, user_prompt, temperature=0.7, max_tokens=2000):
+        self.generate_calls += 1
+        return "".join(self.chunks)
+
+    async def stream(self, system_prompt, user_prompt, temperature=0.7, max_tokens=2000):
+        try:
+            for chunk in self.chunks:
+                self.consumed += 1
+                await asyncio.sleep(0)
+                yield chunk
+        finally:
+            self.closed = True
+
+
+class TestStreamingGeneration:
+    """Akisli uretim ve erken kesme testleri"""
+
+    @pytest.fixture(autouse=True)
+    def _enable_streaming(self, monkeypatch):
+        from config import settings
+
+        monkeypatch.setattr(settings, "llm_streaming", True)
+
+    async def test_valid_stream(self, generator_factory, single_combination):
+        """Gecerli akis soruya donusmeli, generate() cagrilmamali"""
+        llm = StreamingLLM(VALID_RESPONSE + "\nEk aciklama metni" * 20)
+        generator = generator_factory(llm)
+
+        question = await generator.generate_question(single_combination, max_attempts=1)
+
+        assert question.dogru_cevap == "C"
+        assert llm.generate_calls == 0
+        assert llm.closed
+        assert llm.consumed < len(llm.chunks)  # Kapanis sonrasi okunmadi
+
+    async def test_invalid_field_aborts_early(self, generator_factory, single_combination):
+        """Gecersiz alan gelince akisin geri kalani okunmamali"""
+        from services.question_generator import QuestionGenerationError
+
+        response = json.dumps({
+            "hikaye": "Test hikayesi",
+            "soru": "Test sorusu?",
+            "secenekler": {"A": "1", "B": "2"},
+            "dogru_cevap": "A",
+            "cozum": ["Adim " + str(i) for i in range(200)],
+        })
+        llm = StreamingLLM(response)
+        generator = generator_factory(llm)
+
+        with pytest.raises(QuestionGenerationError) as exc_info:
+            await generator.generate_question(single_combination, max_attempts=1)
+
+        assert "secenekler" in str(exc_info.value)
+        assert llm.closed
+        assert llm.consumed < len(llm.chunks) // 2
+        assert exc_info.value.raw_response.startswith('{"hikaye"')
+
+    async def test_answer_checked_against_options(self, generator_factory, single_combination):
+        """dogru_cevap secenekler disindaysa alan gelir gelmez reddedilmeli"""
+        from services.question_generator import QuestionGenerationError
+
+        data = json.loads(VALID_RESPONSE)
+        data["dogru_cevap"] = "E"
+        llm = StreamingLLM(json.dumps(data))
+        generator = generator_factory(llm)
+
+        with pytest.raises(QuestionGenerationError, match="dogru_cevap"):
+            await generator.generate_question(single_combination, max_attempts=1)
+        assert llm.consumed < len(llm.chunks)
+
+    @pytest.mark.parametrize(
+        "key, value",
+        [
+            ("hikaye", None),
+            ("secenekler", ["1", "2", "3", "4"]),
+            ("dogru_cevap", None),
+            ("cozum", "tek adim"),
+        ],
+    )
+    def test_wrong_field_type_rejected(self, generator_factory, key, value):
+        """Yanlis tipteki alan ValidationError olmali (AttributeError degil)"""
+        from services.question_generator import ValidationError
+
+        generator = generator_factory(StreamingLLM(VALID_RESPONSE))
+
+        with pytest.raises(ValidationError):
+            generator._validate_field(key, value, {"secenekler": ["A", "B"]})
+
+    async def test_streaming_disabled(self, generator_factory, single_combination, monkeypatch):
+        """LLM_STREAMING kapaliyken generate() kullanilmali"""
+        from config import settings
+
+        monkeypatch.setattr(settings, "llm_streaming", False)
+        llm = StreamingLLM(VALID_RESPONSE)
+        generator = generator_factory(llm)
+
+        await generator.generate_question(single_combination, max_attempts=1)
+
+        assert llm.generate_calls == 1
+        assert llm.consumed == 0
+
+
+class BatchLLM:
+    """Istenen madde sayisi kadar elemanli "sorular" dizisi donduren sahte LLM"""
+
+    provider = "test-batch"
+
+    def __init__(self, invalid_first: set[int] | None = None):
+        self.invalid_first = invalid_first or set()
+        self.requests: list[int] = []
+        self.max_tokens: list[int] = []
+
+    async def generate(self, system_prompt, user_prompt, temperature=0.7, max_tokens=2000):
+        import re
+
+        count = len(re.findall(r"^\d+\. Konu:", user_prompt, flags=re.M))
+        self.requests.append(count)
+        self.max_tokens.append(max_tokens)
+        items = []
+        for no in range(1, count + 1):
+            item = dict(json.loads(VALID_RESPONSE), no=no, hikaye=f"Hikaye {len(self.requests)}-{no}")
+            if len(self.requests) == 1 and no in self.invalid_first:
+                item["dogru_cevap"] = "Z"
+            items.append(item)
+        # Siralama "no" alanina gore duzeltilmeli
+        return "```json\n" + json.dumps({"sorular": items[::-1]}) + "\n```"
+
+
+class TestMultiQuestionPrompt:
+    """Tek cagrida coklu soru uretimi testleri"""
+
+    @pytest.fixture(autouse=True)
+    def _reset_semaphores(self, monkeypatch):
+        from config import settings
+        from services.llm_client import LLMClientFactory
+
+        monkeypatch.setattr(settings, "llm_max_output_tokens", 100_000)
+        LLMClientFactory.clear_cache()
+        yield
+        LLMClientFactory.clear_cache()
+
+    async def test_groups_share_one_call(self, generator_factory, single_combination):
+        """K soru tek cagrida istenmeli, max_tokens K ile olceklenmeli"""
+        from config import settings
+
+        llm = BatchLLM()
+        generator = generator_factory(llm)
+
+        result = await generator.generate_batch_detailed(
+            [single_combination] * 7, questions_per_call=3
+        )
+
+        assert len(result.questions) == 7
+        assert sorted(llm.requests) == [1, 3, 3]
+        assert max(llm.max_tokens) == settings.llm_max_tokens * 3
+        assert all(q.metadata["batch_size"] in (1, 3) for q in result.questions)
+
+    async def test_group_size_capped_by_output_limit(
+        self, generator_factory, single_combination, monkeypatch
+    ):
+        """K x LLM_MAX_TOKENS cikti limitini asarsa K dusurulmeli"""
+        from config import settings
+
+        monkeypatch.setattr(settings, "llm_max_output_tokens", settings.llm_max_tokens * 2 + 1)
+        llm = BatchLLM()
+        generator = generator_factory(llm)
+
+        result = await generator.generate_batch_detailed(
+            [single_combination] * 5, questions_per_call=4
+        )
+
+        assert len(result.questions) == 5
+        assert sorted(llm.requests) == [1, 2, 2]
+        assert max(llm.max_tokens) <= settings.llm_max_output_tokens
+
+    async def test_only_failed_slots_rerequested(self, generator_factory, single_combination):
+        """Gecersiz elemanlar sadece kendileri icin tekrar istenmeli"""
+        llm = BatchLLM(invalid_first={2, 4})
+        generator = generator_factory(llm)
+
+        result = await generator.generate_batch_detailed(
+            [single_combination] * 4, questions_per_call=4, max_attempts=2
+        )
+
+        assert llm.requests == [4, 2]
+        assert len(result.questions) == 4
+        retried = [q for q in result.questions if q.metadata["attempt"] == 2]
+        assert len(retried) == 2
+
+    async def test_exhausted_slots_reported(self, generator_factory, single_combination):
+        """Deneme hakki biten slot QuestionGenerationError olarak raporlanmali"""
+        llm = BatchLLM(invalid_first={1})
+        generator = generator_factory(llm)
+
+        result = await generator.generate_batch_detailed(
+            [single_combination] * 3, questions_per_call=3, max_attempts=1
+        )
+
+        assert result.stats()["errors_by_type"] == {"QuestionGenerationError": 1}
+        assert "dogru_cevap" in result.failures[0].error
+        assert result.failures[0].index == 0
+
+
+class TestOutputTokenLimit:
+    """LLMClientFactory.get_max_output_tokens testleri"""
+
+    def test_longest_prefix_wins(self, monkeypatch):
+        """Model adi en uzun onek ile eslesmeli, bilinmeyen model varsayilani almali"""
+        from config import settings
+        from services.llm_client import LLMClientFactory
+
+        monkeypatch.setattr(settings, "llm_max_output_tokens", None)
+
+        assert LLMClientFactory.get_max_output_tokens("gpt-4-turbo-preview") == 4096
+        assert LLMClientFactory.get_max_output_tokens("gpt-4o-mini") == 16384
+        assert (
+            LLMClientFactory.get_max_output_tokens("yerel-model")
+            == LLMClientFactory.DEFAULT_MAX_OUTPUT_TOKENS
+        )
+
+    def test_settings_override(self, monkeypatch):
+        """LLM_MAX_OUTPUT_TOKENS tablodan once gelmeli"""
+        from config import settings
+        from services.llm_client import LLMClientFactory
+
+        monkeypatch.setattr(settings, "llm_max_output_tokens", 1234)
+
+        assert LLMClientFactory.get_max_output_tokens("gpt-4o") == 1234
+
+
+class TestBatchResponseParsing:
+    """parse_llm_batch_response testleri"""
+
+    def test_truncated_array_keeps_complete_items(self):
+        """Yarida kesilen yanitta tamamlanmis elemanlar korunmali"""
+        from services.llm_client import parse_llm_batch_response
+
+        text = '[{"no": 1, "soru": "a"}, {"no": 2, "soru": "b"}, {"no": 3, "so'
+
+        assert [item["no"] for item in parse_llm_batch_response(text)] == [1, 2]
+
+    def test_wrapped_list(self):
+        """{"sorular": [...]} bicimi kabul edilmeli"""
+        from services.llm_client import parse_llm_batch_response
+
+        text = 'Iste sorular: {"sorular": [{"no": 1}, {"no": 2}]}'
+
+        assert len(parse_llm_batch_response(text)) == 2
+
+    def test_truncated_wrapped_list_keeps_complete_items(self):
+        """JSON modu yanitinda da yarida kesilen eleman atilip digerleri korunmali"""
+        from services.llm_client import parse_llm_batch_response
+
+        text = '{"sorular": [{"no": 1, "cozum": ["a", "b"]}, {"no": 2}, {"no": 3, "hik'
+
+        assert [item["no"] for item in parse_llm_batch_response(text)] == [1, 2]
+
+    def test_single_question_object_not_split(self):
+        """Sarmalayicisiz tek soru nesnesinin cozum adimlari soru sanilmamali"""
+        from services.llm_client import parse_llm_batch_response
+
+        question = json.loads(VALID_RESPONSE)
+
+        assert parse_llm_batch_response(json.dumps(question)) == [question]
+
+    def test_batch_prompt_requests_wrapper(self):
+        """Coklu soru promptu JSON modu ile uyumlu "sorular" nesnesi istemeli"""
+        from services.prompt_builder import PromptBuilder
+
+        prompt = PromptBuilder().build_batch_user_prompt([({"alt_konu": "kesir"}, None)] * 2)
+
+        assert '"sorular": [' in prompt
+
+    def test_no_items_raises(self):
+        """Hic eleman yoksa JSONDecodeError firlatmali"""
+        from services.llm_client import parse_llm_batch_response
+
+        with pytest.raises(json.JSONDecodeError):
+            parse_llm_batch_response("[{\"no\": 1, ")
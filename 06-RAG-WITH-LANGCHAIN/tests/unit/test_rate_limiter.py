@@ -0,0 +1,74 @@
+"""
+Unit Tests for RateLimiter
+"""
+
+import asyncio
+import time
+
+import pytest
+
+
+class TestRateLimiter:
+    """Token bucket rate limiter testleri"""
+
+    async def test_rpm_paces_requests(self):
+        """Burst sonrasi istekler limit hizinda ilerlemeli"""
+        from services.rate_limiter import RateLimiter
+
+        limiter = RateLimiter(rpm=1200)  # 20/sn, 1 sn burst
+
+        started = time.monotonic()
+        await asyncio.gather(*(limiter.acquire() for _ in range(30)))
+        elapsed = time.monotonic() - started
+
+        # 20 istek hemen, kalan 10 istek 20/sn hizla ~0.5 sn
+        assert 0.4 < elapsed < 0.9
+
+    async def test_tpm_budget(self):
+        """Token butcesi asilinca bekletilmeli"""
+        from services.rate_limiter import RateLimiter
+
+        limiter = RateLimiter(tpm=60_000)  # 1000 token/sn
+
+        assert await limiter.acquire(tokens=1000) == 0
+        waited = await limiter.acquire(tokens=500)
+
+        assert waited == pytest.approx(0.5, abs=0.1)
+
+    async def test_fifo_order(self):
+        """Bekleyen cagrilar geldikleri sirada ilerlemeli"""
+        from services.rate_limiter import RateLimiter
+
+        limiter = RateLimiter(rpm=600)  # 10/sn
+        order: list[int] = []
+
+        async def call(i: int):
+            await limiter.acquire()
+            order.append(i)
+
+        await asyncio.gather(*(call(i) for i in range(15)))
+
+        assert order == list(range(15))
+
+    async def test_factory_resolves_overrides(self, monkeypatch):
+        """Limiter provider:model anahtarina gore paylasilmali"""
+        from config import settings
+        from services.llm_client import LLMClientFactory
+
+        monkeypatch.setattr(settings, "rate_limit_rpm", None)
+        monkeypatch.setattr(settings, "rate_limit_tpm", None)
+        monkeypatch.setattr(
+            settings,
+            "rate_limit_overrides",
+            {"gemini": {"rpm": 100}, "openai:gpt-4o": {"rpm": 10, "tpm": 5000}},
+        )
+        LLMClientFactory.clear_cache()
+
+        gemini = LLMClientFactory.get_rate_limiter("gemini", "gemini-2.5-flash")
+        openai = LLMClientFactory.get_rate_limiter("openai", "gpt-4o")
+
+        assert gemini is LLMClientFactory.get_rate_limiter("gemini", "gemini-2.5-flash")
+        assert gemini.rpm == 100 and gemini.tpm is None
+        assert (openai.rpm, openai.tpm) == (10, 5000)
+        assert LLMClientFactory.get_rate_limiter("anthropic", "claude") is None
+        LLMClientFactory.clear_cache()
@@ -0,0 +1,284 @@
+"""
+Unit Tests for startup Readiness tracking
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+
+class TestReadiness:
+    """Bilesen hazirlik kaydi testleri"""
+
+    async def test_load_records_status_and_timing(self):
+        """Basarili yukleme ready durumu ve sure kaydetmeli"""
+        from api.readiness import Readiness
+
+        readiness = Readiness(["search", "llm"])
+        assert readiness.status == "starting"
+
+        result = await readiness.load("search", lambda: 42)
+
+        assert result == 42
+        assert readiness.is_ready("search")
+        snapshot = readiness.snapshot()
+        assert snapshot["search"]["status"] == "ready"
+        assert snapshot["search"]["seconds"] >= 0
+        assert snapshot["llm"]["status"] == "pending"
+
+    async def test_blocking_loader_runs_off_loop(self):
+        """blocking=True yukleyici event loop thread'inde calismamali"""
+        from api.readiness import Readiness
+
+        readiness = Readiness(["search"])
+        loop_thread = threading.get_ident()
+
+        thread = await readiness.load("search", threading.get_ident)
+
+        assert thread != loop_thread
+
+    async def test_waiters_released_when_ready(self):
+        """Bekleyen istek bilesen hazir olunca devam etmeli"""
+        from api.readiness import Readiness
+
+        readiness = Readiness(["generator"])
+        waiter = asyncio.create_task(readiness.wait("generator", timeout=5))
+        await asyncio.sleep(0)
+        assert not waiter.done()
+
+        await readiness.load("generator", lambda: "ok", blocking=False)
+        await waiter
+
+        assert readiness.status == "healthy"
+
+    async def test_failure_propagates_to_waiters(self):
+        """Yukleme hatasi bekleyenlere ComponentUnavailable olarak donmeli"""
+        from api.readiness import ComponentUnavailable, Readiness
+
+        def broken():
+            raise RuntimeError("index bozuk")
+
+        readiness = Readiness(["search"])
+        waiter = asyncio.create_task(readiness.wait("search", timeout=5))
+
+        with pytest.raises(RuntimeError):
+            await readiness.load("search", broken)
+        with pytest.raises(ComponentUnavailable, match="index bozuk"):
+            await waiter
+
+        assert readiness.status == "degraded"
+        assert readiness.snapshot()["search"]["error"] == "index bozuk"
+
+    async def test_wait_timeout(self):
+        """Sure dolarsa ComponentUnavailable firlatmali"""
+        from api.readiness import ComponentUnavailable, Readiness
+
+        readiness = Readiness(["search"])
+
+        with pytest.raises(ComponentUnavailable, match="yuklenmedi"):
+            await readiness.wait("search", timeout=0.01)
+
+
+@pytest.fixture
+def app_state(monkeypatch):
+    """main modulunun global servislerini test sonunda geri al"""
+    from unittest.mock import MagicMock
+    import api.main as main
+
+    for name in ("_generator", "_selector", "_diversity", "_jobs", "_preloaded", "_readiness"):
+        monkeypatch.setattr(main, name, None)
+    monkeypatch.setattr(main, "_create_llm_client", MagicMock)
+    monkeypatch.setattr(main, "_create_diversity", lambda: main.DiversityService())
+    return main
+
+
+class TestLifespan:
+    """Arka plan baslatma ve istek bekletme"""
+
+    def test_requests_wait_for_generator(self, app_state, monkeypatch):
+        """Port hemen acilmali; istek generator hazir olana kadar beklemeli"""
+        import time
+        from unittest.mock import AsyncMock, MagicMock
+        from fastapi.testclient import TestClient
+
+        main = app_state
+
+        def slow_search():
+            time.sleep(0.3)
+            pipeline = MagicMock()
+            return pipeline, MagicMock()
+
+        generator = MagicMock()
+        generator.build_jobs.return_value = []
+        monkeypatch.setattr(main, "load_search_stack", slow_search)
+        monkeypatch.setattr(main, "_build_generator", lambda *args: generator)
+        monkeypatch.setattr(main, "_start_jobs", lambda g: MagicMock(stop=AsyncMock()))
+        monkeypatch.setattr(main.QuestionRetriever, "warm_cache", lambda self, combos: 0)
+        monkeypatch.setattr(main.settings, "startup_wait_timeout", 5.0)
+
+        with TestClient(main.app) as client:
+            health = client.get("/api/v1/health").json()
+            assert health["status"] == "starting"
+            assert client.get("/api/v1/ready").status_code == 503
+
+            response = client.post("/api/v1/generate/batch/stream", json={"count": 1})
+            assert response.status_code == 200
+
+            health = client.get("/api/v1/health").json()
+            assert health["components"]["generator"]["status"] == "ready"
+            assert health["components"]["search"]["seconds"] >= 0.3
+            assert client.get("/api/v1/ready").status_code == 200
+
+    def test_list_jobs_waits_for_queue(self, app_state, monkeypatch):
+        """Is listesi kuyruk yuklenene kadar beklemeli, bos liste donmemeli"""
+        import time
+        from unittest.mock import AsyncMock, MagicMock
+        from fastapi.testclient import TestClient
+
+        main = app_state
+
+        def slow_search():
+            time.sleep(0.2)
+            return MagicMock(), MagicMock()
+
+        queue = MagicMock(stop=AsyncMock())
+        queue.list_jobs.return_value = [{"job_id": "onceki-is"}]
+        monkeypatch.setattr(main, "load_search_stack", slow_search)
+        monkeypatch.setattr(main, "_build_generator", lambda *args: MagicMock())
+        monkeypatch.setattr(main, "_start_jobs", lambda g: queue)
+        monkeypatch.setattr(main.QuestionRetriever, "warm_cache", lambda self, combos: 0)
+        monkeypatch.setattr(main.settings, "startup_wait_timeout", 5.0)
+
+        with TestClient(main.app) as client:
+            response = client.get("/api/v1/jobs")
+
+        assert response.json() == {"jobs": [{"job_id": "onceki-is"}]}
+
+    def test_failed_dependency_returns_503(self, app_state, monkeypatch):
+        """Bagimlilik yuklenemezse istek beklemeden 503 almali"""
+        from fastapi.testclient import TestClient
+
+        main = app_state
+
+        def broken():
+            raise RuntimeError("model indirilemedi")
+
+        monkeypatch.setattr(main, "load_search_stack", broken)
+
+        with TestClient(main.app) as client:
+            response = client.post("/api/v1/generate/batch", json={"count": 1})
+            assert response.status_code == 503
+            assert "search" in response.json()["detail"]
+            assert response.headers["Retry-After"] == "5"
+
+            health = client.get("/api/v1/health").json()
+            assert health["status"] == "degraded"
+            assert health["components"]["search"]["error"] == "model indirilemedi"
+
+
+class TestGenerateEndpoint:
+    """Tek soru uretiminde event loop'un bloklanmamasi"""
+
+    async def test_diversity_checks_run_off_loop(self, app_state, mock_generated_question):
+        """Tekrar kontrolu ve gecmise ekleme event loop thread'inde calismamali"""
+        from types import SimpleNamespace
+        from models.api_models import GenerateRequest
+        from models.question import GeneratedQuestion
+
+        main = app_state
+        question = GeneratedQuestion(
+            **mock_generated_question, alt_konu="ebob_ekok", zorluk=3, gorsel_tipi="yok"
+        )
+        loop_thread = threading.get_ident()
+        threads = {}
+
+        class RecordingDiversity(main.DiversityService):
+            def is_duplicate(self, new_question, threshold=None):
+                threads["is_duplicate"] = threading.get_ident()
+                return super().is_duplicate(new_question, threshold)
+
+            def add_to_history(self, question):
+                threads["add_to_history"] = threading.get_ident()
+                super().add_to_history(question)
+
+        async def generate_question(combination, style_instruction, max_attempts, accept):
+            assert await accept(question)
+            return question
+
+        main._diversity = RecordingDiversity()
+        main._generator = SimpleNamespace(duplicate_guard=None, generate_question=generate_question)
+
+        response = await main.generate_question(GenerateRequest(
+            specific_combination={"alt_konu": "ebob_ekok", "zorluk": 3},
+            style_instruction="kisa",
+            hedge_candidates=1,
+        ))
+
+        assert response.success
+        assert set(threads) == {"is_duplicate", "add_to_history"}
+        assert loop_thread not in threads.values()
+        assert len(main._diversity.history) == 1
+
+
+class TestPreload:
+    """Prefork on-yukleme testleri"""
+
+    def test_empty_vectorstore_built_in_child(
+        self, app_state, tmp_path, monkeypatch, sample_questions_path
+    ):
+        """Bos vectorstore'da index child process'te olusturulmali, parent embed etmemeli"""
+        import os
+
+        import numpy as np
+        from config import settings
+        from services.embedding_service import EmbeddingPipeline
+
+        main = app_state
+        (tmp_path / "vectorstore").mkdir()
+        monkeypatch.setattr(settings, "vector_store_path", tmp_path / "vectorstore")
+        monkeypatch.setattr(settings, "questions_csv_path", sample_questions_path)
+        monkeypatch.setattr(settings, "embedding_cache_enabled", False)
+
+        class Encoder:
+            def encode(self, texts, **kwargs):
+                rng = np.random.default_rng(len(texts))
+                vectors = rng.normal(size=(len(texts), 8)).astype("float32")
+                return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+        def load_model(self):
+            self.model = Encoder()
+            self.dimension = 8
+
+        parent = os.getpid()
+        embed_batch = EmbeddingPipeline.embed_batch
+
+        def child_only(self, *args, **kwargs):
+            if os.getpid() == parent:
+                raise AssertionError("fork oncesi parent'ta inference yapildi")
+            return embed_batch(self, *args, **kwargs)
+
+        monkeypatch.setattr(EmbeddingPipeline, "load_model", load_model)
+        monkeypatch.setattr(EmbeddingPipeline, "embed_batch", child_only)
+
+        main.preload()
+
+        pipeline, _ = main._preloaded
+        texts, _ = EmbeddingPipeline.load_questions_from_csv(str(sample_questions_path))
+        assert pipeline.index.ntotal == len(texts)
+        assert pipeline.index_mmap
+
+    def test_failed_child_build_raises(self, app_state, tmp_path, monkeypatch):
+        """Child index olusturamazsa preload RuntimeError firlatmali"""
+        import os
+
+        from config import settings
+
+        main = app_state
+        monkeypatch.setattr(settings, "vector_store_path", tmp_path / "vectorstore")
+        monkeypatch.setattr(settings, "questions_csv_path", tmp_path / "yok.csv")
+        monkeypatch.setattr(main, "build_search_index", lambda: os._exit(3))
+
+        with pytest.raises(RuntimeError, match="cikis kodu 3"):
+            main.preload()
+        assert main._preloaded is None
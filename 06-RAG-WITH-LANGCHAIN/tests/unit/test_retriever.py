@@ -171,3 +171,42 @@ class TestRetrieverFallbackStrategy:
         # Note: might be less if not enough matching data
         assert isinstance(results, list)
 
+
+
+class TestRetrievalCache:
+    """Kombinasyon bazli retrieval cache testleri"""
+
+    def test_repeated_call_skips_filtering(self, mock_embedding_pipeline, sample_question_metadata, single_combination):
+        """Ayni kombinasyon ikinci kez filtre calistirmamali"""
+        from services.retriever import QuestionRetriever
+        from services.filter_service import FilterService
+
+        filter_service = FilterService(sample_question_metadata)
+        retriever = QuestionRetriever(mock_embedding_pipeline, filter_service)
+
+        first = retriever.retrieve_examples(single_combination, top_k=3)
+        with patch.object(filter_service, "filter_indices") as filter_indices:
+            second = retriever.retrieve_examples(
+                {**single_combination, "lgs_skor": 0.1}, top_k=3
+            )
+
+        filter_indices.assert_not_called()
+        assert second == first
+        assert second is not first
+
+    def test_generation_change_invalidates(self, mock_embedding_pipeline, sample_question_metadata, single_combination):
+        """Index nesli degisince cache temizlenmeli"""
+        from services.retriever import QuestionRetriever
+        from services.filter_service import FilterService
+
+        mock_embedding_pipeline.generation = 1
+        filter_service = FilterService(sample_question_metadata)
+        retriever = QuestionRetriever(mock_embedding_pipeline, filter_service)
+
+        assert retriever.warm_cache([single_combination]) == 1
+
+        mock_embedding_pipeline.generation = 2
+        with patch.object(filter_service, "filter_indices", return_value=[]) as filter_indices:
+            retriever.retrieve_examples(single_combination)
+
+        filter_indices.assert_called()
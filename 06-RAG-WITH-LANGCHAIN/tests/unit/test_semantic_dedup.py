@@ -0,0 +1,210 @@
+"""
+Unit Tests for SemanticDuplicateGuard
+"""
+
+import hashlib
+import json
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+
+class CountingEncoder:
+    """Metinden deterministik vektor ureten, encode cagrilarini sayan sahte model"""
+
+    def __init__(self, dimension: int = 16):
+        self.dimension = dimension
+        self.calls = 0
+
+    def _vector(self, text: str) -> np.ndarray:
+        seed = int(hashlib.md5(text.encode("utf-8")).hexdigest()[:8], 16)
+        vec = np.random.default_rng(seed).normal(size=self.dimension).astype("float32")
+        return vec / np.linalg.norm(vec)
+
+    def encode(self, texts, **kwargs):
+        self.calls += 1
+        if isinstance(texts, str):
+            return self._vector(texts)
+        return np.stack([self._vector(t) for t in texts])
+
+
+BANK = [f"Kaynak soru {i}: 24 ve 36 sayilarinin EBOB'u" for i in range(20)]
+
+
+@pytest.fixture
+def pipeline():
+    """Sahte encoder ve kucuk soru bankasi index'li EmbeddingPipeline"""
+    from services.embedding_service import EmbeddingPipeline
+
+    pipeline = EmbeddingPipeline(model_name="fake")
+    pipeline.model = CountingEncoder()
+    pipeline.dimension = pipeline.model.dimension
+    pipeline.build_index(
+        pipeline.embed_batch(BANK, show_progress=False),
+        [{"Soru_MetniOCR": text} for text in BANK],
+    )
+    pipeline.model.calls = 0
+    return pipeline
+
+
+class TestSemanticDuplicateGuard:
+    """Semantik tekrar kontrolu testleri"""
+
+    def test_bank_duplicate(self, pipeline):
+        """Kaynak bankadaki soru tekrar sayilmali"""
+        from services.semantic_dedup import SemanticDuplicateGuard
+
+        guard = SemanticDuplicateGuard(pipeline, threshold=0.95)
+        matches = guard.check([BANK[3], "Tamamen yeni bir soru"])
+
+        assert matches[0].source == "bank"
+        assert matches[0].text == BANK[3]
+        assert matches[1] is None
+
+    def test_one_encoder_pass_per_batch(self, pipeline):
+        """Parti ne kadar buyuk olursa olsun tek encode cagrisi yapilmali"""
+        from services.semantic_dedup import SemanticDuplicateGuard
+
+        guard = SemanticDuplicateGuard(pipeline)
+        guard.check([f"Yeni soru {i}" for i in range(50)])
+
+        assert pipeline.model.calls == 1
+        assert len(guard) == 50
+
+    def test_generated_and_batch_duplicates(self, pipeline):
+        """Onceki uretimler ve ayni partideki tekrarlar yakalanmali"""
+        from services.semantic_dedup import SemanticDuplicateGuard
+
+        guard = SemanticDuplicateGuard(pipeline, threshold=0.95)
+        guard.check(["Uretim A"])
+        matches = guard.check(["Uretim A", "Uretim B", "Uretim B"])
+
+        assert matches[0].source == "generated"
+        assert matches[1] is None
+        assert matches[2].source == "batch"
+        assert len(guard) == 2
+
+    def test_rolling_history(self, pipeline):
+        """Pencere dolunca en eski uretim unutulmali"""
+        from services.semantic_dedup import SemanticDuplicateGuard
+
+        guard = SemanticDuplicateGuard(pipeline, threshold=0.95, max_history=3)
+        guard.check([f"Uretim {i}" for i in range(5)])
+
+        assert len(guard) == 3
+        assert not guard.is_duplicate("Uretim 0")
+        assert guard.is_duplicate("Uretim 4")
+
+    def test_check_without_record_then_record(self, pipeline):
+        """record=False gecmise eklememeli; record() sadece verilen metni eklemeli"""
+        from services.semantic_dedup import SemanticDuplicateGuard
+
+        guard = SemanticDuplicateGuard(pipeline, threshold=0.95)
+
+        assert guard.check(["Uretim A"], record=False) == [None]
+        assert len(guard) == 0
+        guard.record(["Uretim A"])
+        assert len(guard) == 1
+        assert guard.is_duplicate("Uretim A")
+
+    async def test_batch_marks_duplicates(self, pipeline, single_combination):
+        """Toplu uretimde tekrar sorular tek encoder cagrisiyla elenmeli"""
+        from services.semantic_dedup import SemanticDuplicateGuard
+        from services.question_generator import QuestionGenerator, DuplicateQuestionError
+        from services.output_formatter import RAGOutputFormatter
+        from services.prompt_builder import PromptBuilder
+        from models.question import RetrievedQuestion
+
+        responses = iter([
+            {"hikaye": "Kaynak soru 5:", "soru": "24 ve 36 sayilarinin EBOB'u"},
+            {"hikaye": "Yeni", "soru": "soru"},
+            {"hikaye": "Yeni", "soru": "soru"},
+        ])
+
+        class FakeLLM:
+            provider = "test-dedup"
+
+            async def generate(self, system_prompt, user_prompt, temperature=0.7, max_tokens=2000):
+                data = next(responses)
+                data.update({
+                    "secenekler": {"A": "1", "B": "2", "C": "3", "D": "4"},
+                    "dogru_cevap": "A",
+                    "cozum": ["Adim 1"],
+                })
+                return json.dumps(data)
+
+        retriever = MagicMock()
+        retriever.retrieve_examples.return_value = [
+            RetrievedQuestion(
+                soru_metni="Ornek", alt_konu="ebob_ekok", zorluk=4,
+                gorsel_tipi="sematik", kaynak_tipi="lgs",
+            )
+        ] * 3
+        generator = QuestionGenerator(
+            retriever=retriever,
+            formatter=RAGOutputFormatter(),
+            prompt_builder=PromptBuilder(),
+            llm_client=FakeLLM(),
+            duplicate_guard=SemanticDuplicateGuard(pipeline, threshold=0.95),
+        )
+
+        result = await generator.generate_batch_detailed(
+            [single_combination] * 3, ensure_diversity=False
+        )
+
+        assert pipeline.model.calls == 1
+        assert result.stats()["generated"] == 1
+        assert result.stats()["errors_by_type"] == {DuplicateQuestionError.__name__: 2}
+
+    async def test_filter_duplicates_runs_off_loop(self, pipeline):
+        """Encode + arama event loop thread'inde calismamali"""
+        import threading
+        from services.semantic_dedup import SemanticDuplicateGuard
+        from services.question_generator import QuestionGenerator, BatchItemResult
+
+        guard = SemanticDuplicateGuard(pipeline, threshold=0.95)
+        threads = []
+        original = guard.check
+
+        def check(texts, record=True):
+            threads.append(threading.get_ident())
+            return original(texts, record)
+
+        guard.check = check
+        generator = QuestionGenerator(
+            retriever=MagicMock(), formatter=MagicMock(), prompt_builder=MagicMock(),
+            llm_client=MagicMock(), duplicate_guard=guard,
+        )
+        item = BatchItemResult(index=0, combination={})
+        item.question = MagicMock(hikaye="Yeni", soru="soru")
+
+        assert await generator.filter_duplicates([item]) == 0
+        assert threads and threads[0] != threading.get_ident()
+
+    async def test_openai_provider_without_local_encoder(self, monkeypatch):
+        """OpenAI embedding'de guard kurulmamali; model yoksa toplu uretim durmamali"""
+        import api.main as main
+        from config import settings
+        from services.embedding_service import EmbeddingPipeline
+        from services.semantic_dedup import SemanticDuplicateGuard
+        from services.question_generator import QuestionGenerator, BatchItemResult
+
+        monkeypatch.setattr(settings, "embedding_provider", "openai")
+        monkeypatch.setattr(settings, "semantic_dedup_enabled", True)
+        pipeline = EmbeddingPipeline()
+        pipeline.load_model()
+
+        generator = main._build_generator(pipeline, MagicMock(), MagicMock())
+        assert generator.duplicate_guard is None
+
+        # Guard yine de verilirse embedding hatasi kalemleri dusurmemeli
+        generator = QuestionGenerator(
+            retriever=MagicMock(), formatter=MagicMock(), prompt_builder=MagicMock(),
+            llm_client=MagicMock(), duplicate_guard=SemanticDuplicateGuard(pipeline),
+        )
+        item = BatchItemResult(index=0, combination={})
+        item.question = MagicMock(hikaye="Yeni", soru="soru")
+
+        assert await generator.filter_duplicates([item]) == 0
+        assert item.ok
@@ -0,0 +1,108 @@
+"""
+Unit Tests for IncrementalJSONParser
+"""
+
+import json
+
+import pytest
+
+
+QUESTION = {
+    "hikaye": "Ali'nin 12 elmasi var.",
+    "soru": "Kac \"kutu\" gerekir?",
+    "secenekler": {"A": "1", "B": "2", "C": "3", "D": "4"},
+    "dogru_cevap": "C",
+    "cozum": ["Adim 1: {12/4}", "Adim 2: [3]"],
+    "kontroller": {"ebob": 4},
+}
+
+
+def _feed_all(parser, text: str, size: int) -> bool:
+    done = False
+    for i in range(0, len(text), size):
+        done = parser.feed(text[i : i + size])
+        if done:
+            break
+    return done
+
+
+class TestIncrementalJSONParser:
+    """Artimli JSON parser testleri"""
+
+    @pytest.mark.parametrize("size", [1, 3, 7, 1000])
+    def test_chunk_boundaries(self, size):
+        """Parca boyutundan bagimsiz ayni sonuc uretilmeli"""
+        from services.stream_parser import IncrementalJSONParser
+
+        parser = IncrementalJSONParser()
+        assert _feed_all(parser, json.dumps(QUESTION, ensure_ascii=False, indent=2), size)
+        assert parser.result() == QUESTION
+        assert parser.fields == QUESTION
+
+    def test_fenced_response(self):
+        """Markdown kod blogu ve kapanis sonrasi metin yok sayilmali"""
+        from services.stream_parser import IncrementalJSONParser
+
+        parser = IncrementalJSONParser()
+        text = "```json\n" + json.dumps(QUESTION) + "\n```\nAciklama"
+
+        assert parser.feed(text)
+        assert parser.result() == QUESTION
+
+    def test_fields_reported_in_order(self):
+        """on_field her alan tamamlaninca, akis bitmeden cagrilmali"""
+        from services.stream_parser import IncrementalJSONParser
+
+        seen = []
+        parser = IncrementalJSONParser(on_field=lambda key, value: seen.append(key))
+        text = json.dumps(QUESTION)
+        cut = text.index('"dogru_cevap"')
+
+        assert not parser.feed(text[:cut])
+        assert seen == ["hikaye", "soru", "secenekler"]
+
+        parser.feed(text[cut:])
+        assert seen == list(QUESTION)
+
+    def test_wrong_type_aborts(self):
+        """Beklenen tipte olmayan alan ilk karakterde hata vermeli"""
+        from services.stream_parser import IncrementalJSONParser, StreamParseError
+
+        parser = IncrementalJSONParser()
+        with pytest.raises(StreamParseError, match="secenekler"):
+            parser.feed('{"hikaye": "x", "secenekler": ["A", "B"')
+
+    def test_long_prefix_aborts(self):
+        """JSON baslamadan uzun aciklama gelirse akis kesilmeli"""
+        from services.stream_parser import IncrementalJSONParser, StreamParseError
+
+        parser = IncrementalJSONParser()
+        with pytest.raises(StreamParseError):
+            parser.feed("Tabii, iste sorunuz: " * 20)
+
+    def test_invalid_structure_aborts(self):
+        """Ust seviyede gecersiz yapi hemen yakalanmali"""
+        from services.stream_parser import IncrementalJSONParser, StreamParseError
+
+        parser = IncrementalJSONParser()
+        with pytest.raises(StreamParseError):
+            parser.feed('{"hikaye": "x" "soru": "y"}')
+
+    def test_incomplete_result_raises(self):
+        """Tamamlanmamis nesne icin result() JSONDecodeError vermeli"""
+        from services.stream_parser import IncrementalJSONParser
+
+        parser = IncrementalJSONParser()
+        parser.feed('{"hikaye": "x", "soru": "ya')
+
+        with pytest.raises(json.JSONDecodeError):
+            parser.result()
+        assert parser.fields == {"hikaye": "x"}
+
+    def test_scalar_values(self):
+        """Sayi, bool ve null degerleri parse edilmeli"""
+        from services.stream_parser import IncrementalJSONParser
+
+        parser = IncrementalJSONParser()
+        assert _feed_all(parser, '{"a": 12, "b": true,"c":null , "d": -1.5}', 2)
+        assert parser.result() == {"a": 12, "b": True, "c": None, "d": -1.5}